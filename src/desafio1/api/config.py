@@ -1,5 +1,98 @@
+import os
+from typing import List, Optional
+
+# Diretório em que o IrisModelTrainer grava os modelos e que contém os artefatos de
+# knn, dt e lr, relativo à raiz do repositório.
+DEFAULT_MODEL_PATH = "./saved_models/iris_*_v1_*.pkl"
+
+
 class Settings:
-    model_path: str = "./saved_models/iris_knn_v1_*.pkl"
+    # Todas as famílias de modelo encontradas (knn, dt, lr, nb) são carregadas e roteáveis.
+    model_path: str = os.getenv("IRIS_MODEL_PATH", DEFAULT_MODEL_PATH)
+    # Famílias carregadas no startup, separadas por vírgula (vazio carrega todas).
+    serve_models: List[str] = [
+        name for name in os.getenv("IRIS_SERVE_MODELS", "").split(",") if name
+    ]
+    # Carrega o dataset Íris no startup (desligado: nenhum endpoint o utiliza).
+    load_dataset_on_startup: bool = os.getenv("IRIS_LOAD_DATASET", "0") == "1"
+    # Fonte do dataset Íris: "sklearn" (cópia local do scikit-learn), uma URL ou um CSV
+    # no formato do UCI. É materializada uma vez em IRIS_DATASET_CACHE_DIR.
+    dataset_source: str = os.getenv("IRIS_DATASET_SOURCE", "sklearn")
+    dataset_cache_dir: str = os.getenv("IRIS_DATASET_CACHE_DIR", "./data/cache")
+    # Modelo usado quando a requisição não informa `?model=`.
+    default_model: str = os.getenv("IRIS_DEFAULT_MODEL", "knn")
+    # SLO de latência (p95 de uma predição unitária, em ms): quando definido, o modelo
+    # padrão passa a ser o mais preciso entre os que o atendem, segundo os arquivos
+    # <modelo>.profile.json gerados no treino. `?model=` continua escolhendo qualquer um.
+    latency_slo_ms: Optional[float] = (
+        float(os.environ["IRIS_LATENCY_SLO_MS"])
+        if os.getenv("IRIS_LATENCY_SLO_MS")
+        else None
+    )
+    # Modelo avaliado em segundo plano, só para comparação (vazio desliga).
+    shadow_model: str = os.getenv("IRIS_SHADOW_MODEL", "")
+    # Implementação usada para servir o modelo KNN: "sklearn" (pickle do Pipeline) ou
+    # "numpy" (NumpyKNNScorer, a partir do artefato .knn exportado no treino).
+    scorer: str = os.getenv("IRIS_SCORER", "sklearn")
+    # Intervalo, em segundos, entre verificações de novos artefatos; 0 desliga.
+    model_watch_interval_s: float = float(
+        os.getenv("IRIS_MODEL_WATCH_INTERVAL_S", "10")
+    )
+    # Quantidade máxima de linhas aceitas em uma única chamada de predição em lote.
+    max_batch_size: int = int(os.getenv("IRIS_MAX_BATCH_SIZE", "5000"))
+    # Linhas avaliadas por chamada ao modelo na predição em streaming (NDJSON/CSV).
+    stream_chunk_size: int = int(os.getenv("IRIS_STREAM_CHUNK_SIZE", "1024"))
+    # Tamanho máximo, em bytes, de uma linha da predição em streaming.
+    stream_max_line_bytes: int = int(
+        os.getenv("IRIS_STREAM_MAX_LINE_BYTES", str(64 * 1024))
+    )
+    # Micro-batching do endpoint de predição unitária.
+    microbatch_enabled: bool = os.getenv("IRIS_MICROBATCH_ENABLED", "1") == "1"
+    microbatch_max_size: int = int(os.getenv("IRIS_MICROBATCH_MAX_SIZE", "64"))
+    microbatch_max_wait_ms: float = float(os.getenv("IRIS_MICROBATCH_MAX_WAIT_MS", "2"))
+    microbatch_max_queue: int = int(os.getenv("IRIS_MICROBATCH_MAX_QUEUE", "1024"))
+    # Executor da inferência: "thread", "process" ou "none" (inline no event loop).
+    inference_executor: str = os.getenv("IRIS_INFERENCE_EXECUTOR", "thread")
+    inference_workers: int = int(os.getenv("IRIS_INFERENCE_WORKERS", "4"))
+    inference_max_in_flight: int = int(os.getenv("IRIS_INFERENCE_MAX_IN_FLIGHT", "64"))
+    # Métricas no formato do Prometheus em /metrics (contadores, latência e estágios).
+    metrics_enabled: bool = os.getenv("IRIS_METRICS_ENABLED", "1") == "1"
+    # Monitoramento de drift: compara as linhas avaliadas com o perfil de referência
+    # gravado no treino (<modelo>.reference.json), em uma janela de
+    # IRIS_DRIFT_WINDOW_FLUSHES intervalos de IRIS_DRIFT_FLUSH_INTERVAL_S segundos.
+    drift_enabled: bool = os.getenv("IRIS_DRIFT_ENABLED", "1") == "1"
+    drift_buffer_rows: int = int(os.getenv("IRIS_DRIFT_BUFFER_ROWS", "4096"))
+    drift_flush_interval_s: float = float(
+        os.getenv("IRIS_DRIFT_FLUSH_INTERVAL_S", "10")
+    )
+    drift_window_flushes: int = int(os.getenv("IRIS_DRIFT_WINDOW_FLUSHES", "30"))
+    # Log das predições servidas em Parquet, particionado por ano/mês/dia. Com a fila
+    # cheia (IRIS_PREDICTION_LOG_MAX_QUEUE_ROWS), "drop" descarta e "block" aguarda.
+    prediction_log_enabled: bool = os.getenv("IRIS_PREDICTION_LOG_ENABLED", "0") == "1"
+    prediction_log_dir: str = os.getenv(
+        "IRIS_PREDICTION_LOG_DIR", "./data/prediction_log"
+    )
+    prediction_log_max_queue_rows: int = int(
+        os.getenv("IRIS_PREDICTION_LOG_MAX_QUEUE_ROWS", "100000")
+    )
+    prediction_log_flush_rows: int = int(
+        os.getenv("IRIS_PREDICTION_LOG_FLUSH_ROWS", "20000")
+    )
+    prediction_log_flush_interval_s: float = float(
+        os.getenv("IRIS_PREDICTION_LOG_FLUSH_INTERVAL_S", "5")
+    )
+    prediction_log_policy: str = os.getenv("IRIS_PREDICTION_LOG_POLICY", "drop")
+    # Cache de predições: chave = modelo + características arredondadas para
+    # IRIS_CACHE_PRECISION casas decimais (vazio usa o valor exato).
+    cache_enabled: bool = os.getenv("IRIS_CACHE_ENABLED", "0") == "1"
+    cache_max_entries: int = int(os.getenv("IRIS_CACHE_MAX_ENTRIES", "100000"))
+    cache_max_bytes: int = int(os.getenv("IRIS_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    cache_ttl_s: float = float(os.getenv("IRIS_CACHE_TTL_S", "300"))
+    cache_precision: Optional[int] = (
+        int(os.environ["IRIS_CACHE_PRECISION"])
+        if os.getenv("IRIS_CACHE_PRECISION")
+        else None
+    )
 
 
 settings = Settings()
@@ -1,28 +1,278 @@
-import pandas as pd
+"""
+Ingestão do dataset Íris com cache local versionado.
+
+Toda fonte (a cópia do scikit-learn, a URL do UCI ou um arquivo CSV local no mesmo
+formato) é normalizada para o mesmo schema e materializada uma única vez em um arquivo
+Arrow IPC sem compressão, nomeado pelo SHA-256 do conteúdo. As cargas seguintes abrem
+esse arquivo com memory map: as colunas apontam direto para as páginas do arquivo, sem
+cópia nem decodificação, e nenhuma requisição de rede é feita. O `index.json` do cache
+guarda a versão atual de cada fonte; versões antigas continuam no diretório.
+
+O trainer (`IrisModelTrainer.load_data`) e a API (`app.state.iris_data`) usam as
+mesmas funções.
+"""
+
+import hashlib
+import io
+import json
+import os
+import urllib.request
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from desafio1.api.config import settings
+from numpy import ndarray
 from pandas import DataFrame
 
+UCI_IRIS_URL = (
+    "https://archive.ics.uci.edu/ml/machine-learning-databases/iris/iris.data"
+)
+# Fonte especial: a cópia do dataset distribuída com o scikit-learn (funciona offline).
+SKLEARN_SOURCE = "sklearn"
+FEATURE_COLUMNS = ("sepal_length", "sepal_width", "petal_length", "petal_width")
+# Mesma ordem do `target` do scikit-learn e do CLASS_MAPPING da API.
+SPECIES = ("setosa", "versicolor", "virginica")
+IRIS_SCHEMA = pa.schema(
+    [(name, pa.float64()) for name in FEATURE_COLUMNS]
+    + [("species", pa.string()), ("target", pa.int64())]
+)
+INDEX_FILE = "index.json"
+
+
+class DatasetCache:
+    """
+    Diretório de versões materializadas, uma por conteúdo distinto.
+
+    Args:
+        cache_dir (str): Diretório do cache (criado quando necessário).
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+
+    def path_for(self, digest: str) -> str:
+        """Retorna o arquivo Arrow de uma versão."""
+        return os.path.join(self.cache_dir, f"iris-{digest[:16]}.arrow")
+
+    def index(self) -> Dict[str, Dict[str, Any]]:
+        """Retorna a versão atual de cada fonte já materializada."""
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def lookup(self, source: str) -> Optional[str]:
+        """
+        Retorna o arquivo da versão atual de uma fonte, se ele existir.
+
+        Args:
+            source (str): Fonte do dataset.
+        """
+        entry = self.index().get(source)
+        if entry is None:
+            return None
+        path = self.path_for(entry["digest"])
+        return path if os.path.exists(path) else None
+
+    def store(self, source: str, table: pa.Table) -> str:
+        """
+        Grava uma tabela como nova versão de uma fonte e a torna a versão atual.
+
+        Conteúdos iguais geram o mesmo arquivo, que não é regravado. As escritas são
+        atômicas (arquivo temporário + rename), para que processos concorrentes nunca
+        leiam um arquivo incompleto.
+
+        Args:
+            source (str): Fonte do dataset.
+            table (pa.Table): Tabela no schema `IRIS_SCHEMA`.
+
+        Returns:
+            str: Caminho do arquivo Arrow.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        data = sink.getvalue()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+        if not os.path.exists(path):
+            _atomic_write(path, data.to_pybytes())
+
+        index = self.index()
+        index[source] = {
+            "digest": digest,
+            "file": os.path.basename(path),
+            "rows": table.num_rows,
+            "materialized_at": datetime.now(timezone.utc).isoformat(),
+        }
+        _atomic_write(
+            os.path.join(self.cache_dir, INDEX_FILE),
+            json.dumps(index, indent=2).encode(),
+        )
+        return path
+
+    @staticmethod
+    def open(path: str) -> pa.Table:
+        """
+        Abre uma versão com memory map, sem copiar os dados para a memória do processo.
+
+        Args:
+            path (str): Arquivo Arrow.
+
+        Returns:
+            pa.Table: Tabela cujas colunas apontam para o arquivo mapeado.
+        """
+        with pa.memory_map(path, "r") as source:
+            return pa.ipc.open_file(source).read_all()
+
+
+def fetch_iris_table(source: str) -> pa.Table:
+    """
+    Lê o dataset na fonte original e o converte para `IRIS_SCHEMA`.
+
+    Args:
+        source (str): `"sklearn"`, uma URL ou o caminho de um CSV no formato do UCI
+            (sem cabeçalho; espécie como `Iris-setosa`).
+
+    Returns:
+        pa.Table: Dataset normalizado.
+
+    Raises:
+        ConnectionError: Se a fonte não puder ser lida.
+    """
+    if source == SKLEARN_SOURCE:
+        from sklearn import datasets
+
+        X, y = datasets.load_iris(return_X_y=True)
+        columns = {name: X[:, i] for i, name in enumerate(FEATURE_COLUMNS)}
+        species = [SPECIES[t] for t in y]
+        return pa.table(
+            {**columns, "species": species, "target": y.astype(np.int64)},
+            schema=IRIS_SCHEMA,
+        )
+
+    try:
+        if os.path.exists(source):
+            with open(source, "rb") as f:
+                data = f.read()
+        else:
+            with urllib.request.urlopen(source, timeout=30) as response:
+                data = response.read()
+    except (OSError, ValueError) as e:
+        raise ConnectionError(f"Não foi possível baixar o dataset Íris: {e}") from e
+
+    raw = pa_csv.read_csv(
+        io.BytesIO(data),
+        read_options=pa_csv.ReadOptions(column_names=[*FEATURE_COLUMNS, "species"]),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.float64() for name in FEATURE_COLUMNS}
+        ),
+    )
+    species = [name.removeprefix("Iris-") for name in raw["species"].to_pylist()]
+    unknown = set(species) - set(SPECIES)
+    if unknown:
+        raise ValueError(f"Espécies desconhecidas no dataset: {sorted(unknown)}")
+    return pa.table(
+        {
+            **{name: raw[name] for name in FEATURE_COLUMNS},
+            "species": species,
+            "target": [SPECIES.index(name) for name in species],
+        },
+        schema=IRIS_SCHEMA,
+    )
+
+
+def load_iris_table(
+    source: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    refresh: bool = False,
+) -> pa.Table:
+    """
+    Carrega o dataset Íris pelo cache, materializando-o na primeira vez.
+
+    Args:
+        source (str, optional): Fonte do dataset; padrão `settings.dataset_source`.
+        cache_dir (str, optional): Diretório do cache; padrão
+            `settings.dataset_cache_dir`.
+        refresh (bool): Lê a fonte de novo; se o conteúdo mudou, grava uma nova versão.
+
+    Returns:
+        pa.Table: Dataset no schema `IRIS_SCHEMA`, mapeado do arquivo em cache.
+    """
+    source = source or settings.dataset_source
+    cache = DatasetCache(cache_dir or settings.dataset_cache_dir)
+    path = None if refresh else cache.lookup(source)
+    if path is None:
+        path = cache.store(source, fetch_iris_table(source))
+    return cache.open(path)
+
+
+def load_iris_arrays(
+    source: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    refresh: bool = False,
+) -> Tuple[ndarray, ndarray]:
+    """
+    Carrega os atributos e os alvos no formato de `datasets.load_iris(return_X_y=True)`.
+
+    Args:
+        source (str, optional): Fonte do dataset (ver `load_iris_table`).
+        cache_dir (str, optional): Diretório do cache.
+        refresh (bool): Lê a fonte de novo.
+
+    Returns:
+        Tuple[ndarray, ndarray]: Matriz (n_amostras, 4) de atributos e vetor de alvos.
+    """
+    # Com um único bloco (como gravado por `store`), as colunas viram arrays NumPy
+    # sobre a memória mapeada; só a matriz X é montada em uma cópia contígua.
+    table = load_iris_table(source, cache_dir, refresh).combine_chunks()
+    X = np.column_stack(
+        [table[name].chunk(0).to_numpy(zero_copy_only=True) for name in FEATURE_COLUMNS]
+    )
+    return X, table["target"].chunk(0).to_numpy(zero_copy_only=True)
+
+
+def load_iris_frame(
+    source: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    refresh: bool = False,
+) -> DataFrame:
+    """
+    Carrega o dataset como DataFrame do pandas.
+
+    Args:
+        source (str, optional): Fonte do dataset (ver `load_iris_table`).
+        cache_dir (str, optional): Diretório do cache.
+        refresh (bool): Lê a fonte de novo.
+
+    Returns:
+        DataFrame: Colunas de `IRIS_SCHEMA`.
+    """
+    return load_iris_table(source, cache_dir, refresh).to_pandas()
+
 
 def download_iris_dataset() -> DataFrame:
     """
     Baixa o dataset Íris do UCI Machine Learning Repository e retorna como um DataFrame do pandas.
+    Só a primeira chamada acessa a rede; as seguintes usam o cache local.
 
     Returns:
         DataFrame: Um DataFrame contendo os dados do dataset Íris, com as colunas 'sepal_length',
-                    'sepal_width', 'petal_length', 'petal_width' e 'species'.
+                    'sepal_width', 'petal_length', 'petal_width', 'species' e 'target'.
 
     Exceções:
-        ConexãoFalhaException: Lança uma exceção caso não seja possível baixar o dataset.
-    """
-    url = "https://archive.ics.uci.edu/ml/machine-learning-databases/iris/iris.data"
-    column_names = [
-        "sepal_length",
-        "sepal_width",
-        "petal_length",
-        "petal_width",
-        "species",
-    ]
-    try:
-        data = pd.read_csv(url, names=column_names)
-        return data
-    except Exception as e:
-        raise ConnectionError(f"Não foi possível baixar o dataset Íris: {e}")
+        ConnectionError: Lança uma exceção caso não seja possível baixar o dataset.
+    """
+    return load_iris_frame(UCI_IRIS_URL)
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,240 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+from desafio1.api.services.executor import ExecutorSaturatedError, InferenceExecutor
+from desafio1.api.services.metrics import METRICS
+from desafio1.api.services.prediction_service import predict_with_proba
+
+# Limites superiores (inclusivos) das faixas do histograma de tamanho de lote.
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+# Marcador colocado na fila por `stop`: a tarefa de consumo avalia o lote em montagem
+# e encerra ao encontrá-lo.
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Agrupa predições de linhas únicas em lotes avaliados com uma só chamada ao modelo.
+
+    Cada requisição coloca sua linha em uma fila asyncio e aguarda um future. Uma tarefa
+    em segundo plano esvazia a fila quando o lote atinge `max_batch_size` linhas ou
+    quando a primeira linha do lote espera `max_wait_ms`, o que ocorrer primeiro.
+
+    Linhas destinadas a modelos diferentes podem compartilhar a fila; no flush elas são
+    agrupadas por modelo e cada grupo é avaliado com uma chamada.
+
+    Args:
+        models_getter (Callable[[], Dict[str, Any]]): Função que retorna os modelos
+            atuais por nome. Os modelos são consultados a cada lote, então trocas de
+            modelo valem a partir do próximo lote.
+        default_model (str): Modelo usado quando `submit` não recebe um nome.
+        max_batch_size (int): Quantidade máxima de linhas por lote.
+        max_wait_ms (float): Tempo máximo que a primeira linha de um lote aguarda.
+        max_queue_depth (int): Quantidade máxima de linhas aguardando na fila; acima
+            disso `submit` falha com `ExecutorSaturatedError`.
+        executor (InferenceExecutor, optional): Executor usado para avaliar cada lote
+            fora do event loop. Sem ele, o lote é avaliado no próprio loop.
+    """
+
+    def __init__(
+        self,
+        models_getter: Callable[[], Dict[str, Any]],
+        default_model: str = "knn",
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        max_queue_depth: int = 1024,
+        executor: Optional[InferenceExecutor] = None,
+    ) -> None:
+        self.models_getter = models_getter
+        self.default_model = default_model
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000
+        self.max_queue_depth = max_queue_depth
+        self.executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        # Lote retirado da fila e ainda não respondido.
+        self._batch: List[Tuple[List[float], str, asyncio.Future]] = []
+        self._histogram: Dict[int, int] = {bucket: 0 for bucket in BATCH_SIZE_BUCKETS}
+        self._histogram_overflow = 0
+        self._flush_latencies: Deque[float] = deque(maxlen=2048)
+        self._batches = 0
+        self._rows = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._stopping
+
+    async def start(self) -> None:
+        """
+        Inicia a tarefa que consome a fila. Deve ser chamado dentro do event loop da API.
+        """
+        self._queue = asyncio.Queue(maxsize=self.max_queue_depth)
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Deixa de aceitar linhas e aguarda a tarefa de consumo avaliar todas as linhas
+        já enfileiradas, inclusive o lote em montagem, sem esperar `max_wait_ms`.
+
+        Se a tarefa de consumo tiver falhado, as linhas sem resposta recebem um
+        `RuntimeError` em vez de ficarem aguardando para sempre.
+        """
+        if self._task is None:
+            return
+        self._stopping = True
+        if not self._task.done():
+            await self._queue.put(_STOP)
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        pending, self._batch = self._batch, []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        error = RuntimeError("O micro-batcher foi encerrado.")
+        for item in pending:
+            if item is not _STOP and not item[2].done():
+                item[2].set_exception(error)
+
+    async def submit(
+        self, features: List[float], model_name: Optional[str] = None
+    ) -> Tuple[int, float]:
+        """
+        Enfileira uma linha e aguarda o resultado do lote em que ela for incluída.
+
+        Args:
+            features (List[float]): Características de uma flor.
+            model_name (str, optional): Modelo a ser usado; o padrão quando omitido.
+
+        Returns:
+            Tuple[int, float]: Classe predita e a probabilidade associada.
+
+        Raises:
+            ExecutorSaturatedError: Se a fila já tiver `max_queue_depth` linhas.
+        """
+        if not self.running:
+            raise RuntimeError("O micro-batcher não está em execução.")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((features, model_name or self.default_model, future))
+        except asyncio.QueueFull:
+            raise ExecutorSaturatedError(
+                "Fila do micro-batcher cheia; tente novamente."
+            ) from None
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stop = False
+        while not stop:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            self._batch = [item]
+            deadline = loop.time() + self.max_wait_s
+            while len(self._batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    item = self._queue.get_nowait()
+                else:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if item is _STOP:
+                    stop = True
+                    break
+                self._batch.append(item)
+            await self._flush(self._batch)
+            self._batch = []
+
+    async def _flush(
+        self, batch: List[Tuple[List[float], str, asyncio.Future]]
+    ) -> None:
+        start = time.perf_counter()
+        groups: Dict[str, List[Tuple[List[float], asyncio.Future]]] = {}
+        for features, model_name, future in batch:
+            groups.setdefault(model_name, []).append((features, future))
+        for model_name, rows in groups.items():
+            METRICS.observe_batch_size("microbatch", len(rows))
+            try:
+                await self._predict_rows(model_name, rows)
+            except ValueError as e:
+                if len(rows) == 1:
+                    self._fail(rows, e)
+                    continue
+                # Uma linha inválida não derruba as demais do lote: cada linha é
+                # avaliada sozinha e só a inválida recebe o erro.
+                for row in rows:
+                    try:
+                        await self._predict_rows(model_name, [row])
+                    except Exception as e:
+                        self._fail([row], e)
+            except Exception as e:
+                self._fail(rows, e)
+        self._record(len(batch), time.perf_counter() - start)
+
+    async def _predict_rows(
+        self, model_name: str, rows: List[Tuple[List[float], asyncio.Future]]
+    ) -> None:
+        data = np.array([features for features, _ in rows], dtype=np.float64)
+        if self.executor is not None:
+            labels, probabilities = await self.executor.predict(data, model_name)
+        else:
+            model = self.models_getter()[model_name]
+            labels, probabilities = predict_with_proba(model, data)
+        for (_, future), label, probability in zip(
+            rows, labels.tolist(), probabilities.tolist()
+        ):
+            if not future.done():
+                future.set_result((label, probability))
+
+    @staticmethod
+    def _fail(rows: List[Tuple[List[float], asyncio.Future]], error: Exception) -> None:
+        for _, future in rows:
+            if not future.done():
+                future.set_exception(error)
+
+    def _record(self, batch_size: int, latency_s: float) -> None:
+        self._batches += 1
+        self._rows += batch_size
+        self._flush_latencies.append(latency_s)
+        for bucket in BATCH_SIZE_BUCKETS:
+            if batch_size <= bucket:
+                self._histogram[bucket] += 1
+                break
+        else:
+            self._histogram_overflow += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas usadas para ajustar `max_batch_size` e `max_wait_ms`.
+
+        Returns:
+            Dict[str, Any]: Profundidade da fila, histograma de tamanho dos lotes e
+                percentis da latência de avaliação de cada lote.
+        """
+        histogram = {f"<={bucket}": count for bucket, count in self._histogram.items()}
+        histogram[f">{BATCH_SIZE_BUCKETS[-1]}"] = self._histogram_overflow
+        latencies_ms = np.asarray(self._flush_latencies) * 1000
+        has_samples = latencies_ms.size > 0
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_s * 1000,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self._batches,
+            "rows": self._rows,
+            "mean_batch_size": self._rows / self._batches if self._batches else 0.0,
+            "batch_size_histogram": histogram,
+            "flush_latency_ms": {
+                "p50": float(np.percentile(latencies_ms, 50)) if has_samples else 0.0,
+                "p99": float(np.percentile(latencies_ms, 99)) if has_samples else 0.0,
+                "max": float(latencies_ms.max()) if has_samples else 0.0,
+            },
+        }
@@ -1,13 +1,27 @@
 import pandas as pd
-from sklearn import datasets
+from desafio1.api.data_ingestion import load_iris_frame
 
 
 def download_iris_dataset() -> pd.DataFrame:
     """
     Faz o download do dataset Íris e retorna um DataFrame do pandas.
+    A fonte é `settings.dataset_source`, lida uma única vez e servida do cache local
+    nas chamadas seguintes.
 
     Returns:
         pd.DataFrame: DataFrame contendo o dataset Íris.
     """
-    iris = datasets.load_iris(as_frame=True)
-    return iris.frame
+    return load_iris_frame()
+
+
+def load_iris_data(file_path: str) -> pd.DataFrame:
+    """
+    Carrega o dataset Íris a partir de um arquivo CSV com cabeçalho.
+
+    Args:
+        file_path (str): Caminho do arquivo CSV.
+
+    Returns:
+        pd.DataFrame: DataFrame com as colunas do arquivo.
+    """
+    return pd.read_csv(file_path)
@@ -0,0 +1,432 @@
+"""
+Monitoramento de drift das entradas da API, em memória fixa.
+
+No treino, `build_reference` resume as linhas de treino em um histograma por
+atributo, com bordas nos quantis do treino (bins de mesma frequência), e na
+frequência de cada classe prevista pelo modelo. O perfil é gravado em
+`<modelo>.reference.json`, ao lado do artefato.
+
+Na API, o DriftMonitor copia cada linha avaliada para um buffer pré-alocado (uma
+atribuição por requisição) e, quando o buffer enche, soma as linhas de uma vez aos
+histogramas do intervalo atual, com as bordas do perfil de referência. A cada
+`flush_interval_s` segundos o intervalo é fechado e entra em uma janela circular de
+`window_flushes` intervalos; a memória usada não depende do tráfego. Os scores
+comparam a janela com a referência:
+
+- PSI (population stability index) por atributo e das classes previstas;
+- KS aproximado: maior diferença entre as distribuições acumuladas, nas bordas dos
+  bins;
+- quantis p05/p50/p95 estimados dos histogramas, ao lado dos da referência.
+"""
+
+import asyncio
+import json
+import os
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from desafio1.api.services.model_registry import reference_path
+from desafio1.models.schemas.iris_schema import CLASS_MAPPING, FEATURE_NAMES
+from numpy import ndarray
+
+# Faixas usuais do PSI: abaixo de 0,1 estável, acima de 0,25 drift relevante.
+PSI_WARNING = 0.1
+PSI_DRIFT = 0.25
+QUANTILES = (0.05, 0.5, 0.95)
+# Proporção mínima de cada bin no PSI, para bins vazios não gerarem log(0).
+MIN_PROPORTION = 1e-4
+
+
+def histogram(X: ndarray, edges: ndarray) -> ndarray:
+    """
+    Conta as linhas de X em cada bin, por atributo.
+
+    Args:
+        X (ndarray): Matriz (n_linhas, n_atributos).
+        edges (ndarray): Bordas internas (n_atributos, n_bins - 1), crescentes; o
+            primeiro e o último bin são abertos.
+
+    Returns:
+        ndarray: Contagens (n_atributos, n_bins).
+    """
+    n_bins = edges.shape[1] + 1
+    counts = np.empty((len(edges), n_bins), dtype=np.int64)
+    for j, feature_edges in enumerate(edges):
+        bins = np.searchsorted(feature_edges, X[:, j], side="right")
+        counts[j] = np.bincount(bins, minlength=n_bins)
+    return counts
+
+
+def psi(expected: ndarray, actual: ndarray) -> float:
+    """
+    Calcula o population stability index entre duas contagens por bin.
+
+    Args:
+        expected (ndarray): Contagens da referência.
+        actual (ndarray): Contagens observadas.
+
+    Returns:
+        float: PSI (0 para distribuições iguais).
+    """
+    e = np.maximum(expected / expected.sum(), MIN_PROPORTION)
+    a = np.maximum(actual / actual.sum(), MIN_PROPORTION)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def ks_statistic(expected: ndarray, actual: ndarray) -> float:
+    """
+    Aproxima a estatística de Kolmogorov-Smirnov pelas distribuições acumuladas nas
+    bordas dos bins.
+
+    Args:
+        expected (ndarray): Contagens da referência.
+        actual (ndarray): Contagens observadas.
+
+    Returns:
+        float: Maior diferença absoluta entre as distribuições acumuladas.
+    """
+    cdf_e = np.cumsum(expected) / expected.sum()
+    cdf_a = np.cumsum(actual) / actual.sum()
+    return float(np.abs(cdf_e - cdf_a).max())
+
+
+def histogram_quantiles(
+    counts: ndarray,
+    edges: ndarray,
+    low: float,
+    high: float,
+    quantiles: Sequence[float] = QUANTILES,
+) -> List[float]:
+    """
+    Estima quantis de um histograma, interpolando linearmente dentro de cada bin.
+
+    Args:
+        counts (ndarray): Contagens de um atributo.
+        edges (ndarray): Bordas internas dos bins.
+        low (float): Menor valor observado (limite do primeiro bin).
+        high (float): Maior valor observado (limite do último bin).
+        quantiles (Sequence[float]): Quantis desejados, em [0, 1].
+
+    Returns:
+        List[float]: Um valor por quantil.
+    """
+    bounds = np.concatenate([[low], np.clip(edges, low, high), [high]])
+    cumulative = np.concatenate([[0], np.cumsum(counts)])
+    total = cumulative[-1]
+    values = []
+    for q in quantiles:
+        target = q * total
+        i = int(
+            np.clip(np.searchsorted(cumulative, target, side="left"), 1, len(counts))
+        )
+        in_bin = counts[i - 1]
+        fraction = (target - cumulative[i - 1]) / in_bin if in_bin else 0.0
+        values.append(float(bounds[i - 1] + fraction * (bounds[i] - bounds[i - 1])))
+    return values
+
+
+def build_reference(
+    model: Any, chunks: Iterable[ndarray], n_bins: int = 10
+) -> Dict[str, Any]:
+    """
+    Monta o perfil de referência a partir das linhas de treino, bloco a bloco.
+
+    As bordas dos bins são os quantis do primeiro bloco (no treino em memória, a base
+    de treino inteira, já embaralhada); os blocos seguintes só somam contagens, o que
+    permite montar o perfil no treino fora da memória. O primeiro bloco deve ser
+    representativo: em uma base ordenada (ex.: por classe), as bordas ficam
+    concentradas em parte da distribuição e o PSI perde resolução.
+
+    Args:
+        model (Any): Modelo treinado, usado para a frequência das classes previstas.
+        chunks (Iterable[ndarray]): Blocos de linhas de treino.
+        n_bins (int): Bins por atributo.
+
+    Returns:
+        Dict[str, Any]: Perfil serializável em JSON.
+    """
+    n_classes = len(CLASS_MAPPING)
+    edges: Optional[ndarray] = None
+    for X in chunks:
+        if edges is None:
+            levels = np.linspace(0, 1, n_bins + 1)[1:-1]
+            edges = np.quantile(X, levels, axis=0).T
+            counts = np.zeros((len(edges), n_bins), dtype=np.int64)
+            class_counts = np.zeros(n_classes, dtype=np.int64)
+            low, high = X.min(axis=0), X.max(axis=0)
+        counts += histogram(X, edges)
+        predictions = np.asarray(model.predict(X), dtype=np.int64)
+        class_counts += np.bincount(predictions, minlength=n_classes)[:n_classes]
+        low, high = np.minimum(low, X.min(axis=0)), np.maximum(high, X.max(axis=0))
+    if edges is None:
+        raise ValueError("Nenhuma linha para montar o perfil de referência.")
+    return {
+        "features": list(FEATURE_NAMES),
+        "rows": int(counts[0].sum()),
+        "edges": edges.tolist(),
+        "counts": counts.tolist(),
+        "min": low.tolist(),
+        "max": high.tolist(),
+        "class_counts": class_counts.tolist(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def save_reference(model_path: str, reference: Dict[str, Any]) -> str:
+    """
+    Grava o perfil de referência em `<modelo>.reference.json`.
+
+    Args:
+        model_path (str): Caminho do modelo `.pkl`.
+        reference (Dict[str, Any]): Perfil montado com `build_reference`.
+
+    Returns:
+        str: Caminho do arquivo gravado.
+    """
+    path = reference_path(model_path)
+    with open(path, "w") as f:
+        json.dump(reference, f, indent=2)
+    return path
+
+
+def load_reference(model_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Lê o perfil de referência de um modelo, se ele existir.
+
+    Args:
+        model_path (str): Caminho do modelo `.pkl`.
+
+    Returns:
+        Optional[Dict[str, Any]]: Perfil, ou None para modelos treinados sem ele.
+    """
+    path = reference_path(model_path)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+class _ModelSketch:
+    """Buffer e histogramas de um modelo, com as bordas do seu perfil de referência."""
+
+    def __init__(
+        self, reference: Dict[str, Any], buffer_rows: int, window_flushes: int
+    ) -> None:
+        self.reference = reference
+        self.edges = np.asarray(reference["edges"], dtype=np.float64)
+        self.reference_counts = np.asarray(reference["counts"], dtype=np.int64)
+        self.reference_classes = np.asarray(reference["class_counts"], dtype=np.int64)
+        n_features = len(self.edges)
+        self.buffer = np.empty((buffer_rows, n_features), dtype=np.float64)
+        self.labels = np.empty(buffer_rows, dtype=np.int64)
+        self.pending = 0
+        self.window: Deque[Dict[str, ndarray]] = deque(maxlen=window_flushes)
+        self.current = self._empty()
+        self.total_rows = 0
+
+    def _empty(self) -> Dict[str, ndarray]:
+        return {
+            "counts": np.zeros_like(self.reference_counts),
+            "class_counts": np.zeros_like(self.reference_classes),
+            "min": np.full(len(self.edges), np.inf),
+            "max": np.full(len(self.edges), -np.inf),
+        }
+
+    def add(self, X: ndarray, labels: ndarray) -> None:
+        interval = self.current
+        interval["counts"] += histogram(X, self.edges)
+        n_classes = len(self.reference_classes)
+        interval["class_counts"] += np.bincount(
+            labels[(labels >= 0) & (labels < n_classes)], minlength=n_classes
+        )
+        interval["min"] = np.minimum(interval["min"], X.min(axis=0))
+        interval["max"] = np.maximum(interval["max"], X.max(axis=0))
+        self.total_rows += len(X)
+
+    def fold(self) -> None:
+        n = self.pending
+        if n:
+            self.add(self.buffer[:n], self.labels[:n])
+            self.pending = 0
+
+    def rotate(self) -> None:
+        self.fold()
+        self.window.append(self.current)
+        self.current = self._empty()
+
+
+class DriftMonitor:
+    """
+    Acumula a distribuição das linhas avaliadas por modelo e a compara com o perfil de
+    referência gravado no treino.
+
+    `record` só copia as linhas para um buffer; o histograma é atualizado em lote
+    quando o buffer enche ou no fechamento periódico do intervalo. Modelos sem perfil
+    de referência (ex.: o ensemble) são ignorados.
+
+    Args:
+        buffer_rows (int): Linhas acumuladas por modelo antes de atualizar os
+            histogramas.
+        flush_interval_s (float): Duração de cada intervalo da janela, em segundos.
+        window_flushes (int): Intervalos fechados mantidos na janela comparada com a
+            referência, além do intervalo em andamento.
+    """
+
+    def __init__(
+        self,
+        buffer_rows: int = 4096,
+        flush_interval_s: float = 10.0,
+        window_flushes: int = 30,
+    ) -> None:
+        self.buffer_rows = buffer_rows
+        self.flush_interval_s = flush_interval_s
+        self.window_flushes = window_flushes
+        self._sketches: Dict[str, _ModelSketch] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def set_reference(
+        self, model_name: str, reference: Optional[Dict[str, Any]]
+    ) -> None:
+        """
+        Define o perfil de referência de um modelo e recomeça a sua janela, pois uma
+        nova versão do modelo pode ter sido treinada com outra distribuição.
+
+        Args:
+            model_name (str): Nome do modelo.
+            reference (Dict[str, Any], optional): Perfil de `build_reference`; None
+                deixa de monitorar o modelo.
+        """
+        sketches = dict(self._sketches)
+        if reference is None:
+            sketches.pop(model_name, None)
+        else:
+            sketches[model_name] = _ModelSketch(
+                reference, self.buffer_rows, self.window_flushes
+            )
+        self._sketches = sketches
+
+    def record(self, model_name: str, data: Any, labels: Any) -> None:
+        """
+        Registra linhas avaliadas e as classes previstas para elas.
+
+        Args:
+            model_name (str): Modelo que avaliou as linhas.
+            data (Any): Matriz (n_linhas, n_atributos) ou uma única linha.
+            labels (Any): Classe prevista de cada linha (ou um inteiro, para uma linha).
+        """
+        sketch = self._sketches.get(model_name)
+        if sketch is None:
+            return
+        if np.ndim(labels) == 0:
+            # Caminho da predição unitária: uma atribuição no buffer.
+            if sketch.pending == self.buffer_rows:
+                sketch.fold()
+            sketch.buffer[sketch.pending] = data
+            sketch.labels[sketch.pending] = labels
+            sketch.pending += 1
+            return
+        n = len(labels)
+        if sketch.pending + n > self.buffer_rows:
+            sketch.fold()
+        if n > self.buffer_rows:
+            sketch.add(np.asarray(data, dtype=np.float64), np.asarray(labels))
+            return
+        start, end = sketch.pending, sketch.pending + n
+        sketch.buffer[start:end] = data
+        sketch.labels[start:end] = labels
+        sketch.pending = end
+
+    def flush(self) -> None:
+        """Fecha o intervalo atual de todos os modelos e o move para a janela."""
+        for sketch in self._sketches.values():
+            sketch.rotate()
+
+    async def start(self) -> None:
+        """Inicia o fechamento periódico dos intervalos, dentro do event loop da API."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Interrompe o fechamento periódico e fecha o intervalo em andamento."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_s)
+            self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Compara a janela de cada modelo com o seu perfil de referência.
+
+        Returns:
+            Dict[str, Any]: Por modelo: linhas na janela e desde a referência, status
+                (`ok`, `warning` ou `drift`, pelo maior PSI), PSI, KS e quantis de
+                cada atributo e PSI e frequências das classes previstas.
+        """
+        result = {}
+        for model_name, sketch in self._sketches.items():
+            sketch.fold()
+            intervals = [*sketch.window, sketch.current]
+            counts = sum(interval["counts"] for interval in intervals)
+            class_counts = sum(interval["class_counts"] for interval in intervals)
+            window_rows = int(counts[0].sum())
+            report: Dict[str, Any] = {
+                "window_rows": window_rows,
+                "total_rows": sketch.total_rows,
+                "reference_rows": sketch.reference["rows"],
+                "window_s": self.flush_interval_s * len(intervals),
+            }
+            if not window_rows:
+                report["status"] = "no_data"
+                result[model_name] = report
+                continue
+            low = np.min([interval["min"] for interval in intervals], axis=0)
+            high = np.max([interval["max"] for interval in intervals], axis=0)
+            features = {}
+            for j, name in enumerate(sketch.reference["features"]):
+                reference_counts = sketch.reference_counts[j]
+                features[name] = {
+                    "psi": psi(reference_counts, counts[j]),
+                    "ks": ks_statistic(reference_counts, counts[j]),
+                    "quantiles": histogram_quantiles(
+                        counts[j], sketch.edges[j], low[j], high[j]
+                    ),
+                    "reference_quantiles": histogram_quantiles(
+                        reference_counts,
+                        sketch.edges[j],
+                        sketch.reference["min"][j],
+                        sketch.reference["max"][j],
+                    ),
+                }
+            reference_classes = sketch.reference_classes
+            report["features"] = features
+            report["predictions"] = {
+                "psi": psi(reference_classes, class_counts),
+                "frequencies": {
+                    CLASS_MAPPING[i]: float(v)
+                    for i, v in enumerate(class_counts / class_counts.sum())
+                },
+                "reference_frequencies": {
+                    CLASS_MAPPING[i]: float(v)
+                    for i, v in enumerate(reference_classes / reference_classes.sum())
+                },
+            }
+            max_psi = max(
+                report["predictions"]["psi"], *(f["psi"] for f in features.values())
+            )
+            report["status"] = (
+                "drift"
+                if max_psi >= PSI_DRIFT
+                else "warning" if max_psi >= PSI_WARNING else "ok"
+            )
+            result[model_name] = report
+        return result
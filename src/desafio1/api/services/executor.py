@@ -0,0 +1,121 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from desafio1.api.services.prediction_service import predict_with_proba
+from numpy import ndarray
+
+# Modelos carregados em cada processo do pool; definidos pelo initializer do pool.
+_worker_models: Dict[str, Any] = {}
+
+
+def _init_worker(models: Dict[str, Any]) -> None:
+    global _worker_models
+    _worker_models = models
+
+
+def _predict_in_worker(model_name: str, data: ndarray) -> Tuple[ndarray, ndarray]:
+    return predict_with_proba(_worker_models[model_name], data)
+
+
+class ExecutorSaturatedError(Exception):
+    def __init__(self, message="Limite de inferências simultâneas atingido."):
+        self.message = message
+        super().__init__(self.message)
+
+
+class InferenceExecutor:
+    """
+    Executa a inferência fora do event loop, em um pool de threads ou de processos, com
+    um limite de inferências simultâneas.
+
+    Quando o limite `max_in_flight` é atingido, novas chamadas falham imediatamente com
+    `ExecutorSaturatedError`, em vez de acumular uma fila sem limite no pool.
+
+    Args:
+        models_getter (Callable[[], Dict[str, Any]]): Função que retorna os modelos
+            atuais, indexados pelo nome usado no roteamento.
+        default_model (str): Modelo usado quando nenhum nome é informado.
+        kind (str): "thread" ou "process".
+        max_workers (int): Quantidade de threads ou processos do pool.
+        max_in_flight (int): Quantidade máxima de inferências em andamento ou na fila.
+    """
+
+    def __init__(
+        self,
+        models_getter: Callable[[], Dict[str, Any]],
+        default_model: str = "knn",
+        kind: str = "thread",
+        max_workers: int = 4,
+        max_in_flight: int = 64,
+    ) -> None:
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Tipo de executor desconhecido: {kind}")
+        self.models_getter = models_getter
+        self.default_model = default_model
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.rejected = 0
+        self._pool: Optional[Executor] = None
+        self._create_pool()
+
+    def _create_pool(self) -> None:
+        if self.kind == "thread":
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="inference"
+            )
+        else:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.models_getter(),),
+            )
+
+    def reload_model(self) -> None:
+        """
+        Propaga a troca de modelo para o pool. No pool de processos, um novo pool é
+        criado com os modelos atuais e o anterior termina as inferências já enviadas.
+        """
+        if self.kind == "process":
+            old_pool = self._pool
+            self._create_pool()
+            old_pool.shutdown(wait=False)
+
+    async def predict(
+        self, data: ndarray, model_name: Optional[str] = None
+    ) -> Tuple[ndarray, ndarray]:
+        """
+        Executa `predict_with_proba` no pool e aguarda o resultado sem bloquear o loop.
+
+        Args:
+            data (ndarray): Matriz (n_amostras, n_atributos) com as características.
+            model_name (str, optional): Modelo a ser usado; o padrão quando omitido.
+
+        Returns:
+            Tuple[ndarray, ndarray]: Classes preditas e probabilidade da classe escolhida.
+
+        Raises:
+            ExecutorSaturatedError: Se já houver `max_in_flight` inferências em andamento.
+        """
+        if self.in_flight >= self.max_in_flight:
+            self.rejected += 1
+            raise ExecutorSaturatedError()
+        model_name = model_name or self.default_model
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            if self.kind == "thread":
+                model = self.models_getter()[model_name]
+                return await loop.run_in_executor(
+                    self._pool, predict_with_proba, model, data
+                )
+            return await loop.run_in_executor(
+                self._pool, _predict_in_worker, model_name, data
+            )
+        finally:
+            self.in_flight -= 1
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
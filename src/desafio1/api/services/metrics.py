@@ -0,0 +1,347 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from desafio1.api.config import settings
+
+HTTP_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+# Os estágios de uma predição ficam na faixa de microssegundos a milissegundos.
+STAGE_LATENCY_BUCKETS = (
+    0.000005,
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    1.0,
+)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+# Chaves gravadas em `scope["state"]` para medir estágios que começam ou terminam
+# fora do handler (validação do corpo e serialização da resposta).
+REQUEST_START_KEY = "metrics_request_start"
+RESPONSE_BUILD_START_KEY = "metrics_response_build_start"
+
+LabelValues = Tuple[str, ...]
+
+
+class Counter:
+    """Contador monotônico com rótulos, no formato do Prometheus."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str]) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> List[Tuple[str, LabelValues, float]]:
+        with self._lock:
+            return [(self.name, labels, v) for labels, v in self._values.items()]
+
+    def sample_labelnames(self, sample_name: str) -> Tuple[str, ...]:
+        return self.labelnames
+
+
+class Histogram:
+    """Histograma cumulativo com rótulos, no formato do Prometheus."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float],
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # rótulos -> (contagem por bucket, incluindo +Inf, soma)
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(
+                labels, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    def samples(self) -> List[Tuple[str, LabelValues, float]]:
+        samples = []
+        with self._lock:
+            for labels, (counts, total) in self._values.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    samples.append(
+                        (
+                            f"{self.name}_bucket",
+                            labels + (_format_value(bound),),
+                            cumulative,
+                        )
+                    )
+                samples.append((f"{self.name}_sum", labels, total[0]))
+                samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+    def sample_labelnames(self, sample_name: str) -> Tuple[str, ...]:
+        if sample_name.endswith("_bucket"):
+            return self.labelnames + ("le",)
+        return self.labelnames
+
+
+class _NullTimer:
+    """Contexto sem efeito, usado quando as métricas estão desligadas."""
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+class _StageTimer:
+    def __init__(self, histogram: Histogram, stage: str) -> None:
+        self.histogram = histogram
+        self.stage = stage
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.histogram.observe(time.perf_counter() - self.start, self.stage)
+
+
+NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """
+    Métricas da API expostas em `/metrics` no formato texto do Prometheus.
+
+    Com `enabled` desligado, todos os métodos retornam imediatamente e o middleware
+    repassa a requisição sem instrumentá-la. Estágios medidos dentro de workers do
+    executor `process` ficam no processo filho e não aparecem aqui.
+
+    Args:
+        enabled (bool): Liga a coleta.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.requests = Counter(
+            "iris_http_requests_total",
+            "Requisições HTTP atendidas.",
+            ("method", "handler", "status"),
+        )
+        self.errors = Counter(
+            "iris_http_request_errors_total",
+            "Requisições HTTP com status 5xx ou exceção não tratada.",
+            ("method", "handler"),
+        )
+        self.latency = Histogram(
+            "iris_http_request_duration_seconds",
+            "Latência das requisições HTTP, até o último byte da resposta.",
+            ("method", "handler"),
+            HTTP_LATENCY_BUCKETS,
+        )
+        self.stages = Histogram(
+            "iris_prediction_stage_duration_seconds",
+            "Duração de cada estágio da predição.",
+            ("stage",),
+            STAGE_LATENCY_BUCKETS,
+        )
+        self.batch_sizes = Histogram(
+            "iris_prediction_batch_size",
+            "Linhas avaliadas por chamada ao modelo.",
+            ("source",),
+            BATCH_SIZE_BUCKETS,
+        )
+        self.model_versions: Dict[str, str] = {}
+        self._collectors = (
+            self.requests,
+            self.errors,
+            self.latency,
+            self.stages,
+            self.batch_sizes,
+        )
+
+    def stage(self, name: str) -> Any:
+        """
+        Mede a duração de um estágio com `with METRICS.stage("scale"):`.
+
+        Args:
+            name (str): Nome do estágio.
+
+        Returns:
+            Any: Gerenciador de contexto (sem efeito se as métricas estiverem desligadas).
+        """
+        if not self.enabled:
+            return NULL_TIMER
+        return _StageTimer(self.stages, name)
+
+    def observe_batch_size(self, source: str, size: int) -> None:
+        """Registra quantas linhas foram avaliadas de uma vez e por qual caminho."""
+        if self.enabled:
+            self.batch_sizes.observe(size, source)
+
+    def set_model_version(self, model: str, version: str) -> None:
+        """Registra a versão em uso de uma família de modelo."""
+        self.model_versions[model] = version
+
+    def handler_started(self, scope: Dict[str, Any]) -> None:
+        """
+        Registra o estágio `parse`: do recebimento da requisição (roteamento, leitura
+        do corpo e validação pelo pydantic) até a entrada no handler.
+
+        Args:
+            scope (Dict[str, Any]): Scope ASGI da requisição.
+        """
+        if not self.enabled:
+            return
+        start = scope.get("state", {}).get(REQUEST_START_KEY)
+        if start is not None:
+            self.stages.observe(time.perf_counter() - start, "parse")
+
+    def handler_finishing(self, scope: Dict[str, Any]) -> None:
+        """
+        Inicia o estágio `response_build`, encerrado pelo middleware quando a resposta
+        começa a ser enviada (montagem e serialização da resposta).
+
+        Args:
+            scope (Dict[str, Any]): Scope ASGI da requisição.
+        """
+        if self.enabled and "state" in scope:
+            scope["state"][RESPONSE_BUILD_START_KEY] = time.perf_counter()
+
+    def render(self) -> str:
+        """
+        Gera o texto de exposição do Prometheus (versão 0.0.4).
+
+        Returns:
+            str: Todas as métricas coletadas.
+        """
+        lines = []
+        for collector in self._collectors:
+            lines.append(f"# HELP {collector.name} {collector.help}")
+            lines.append(f"# TYPE {collector.name} {collector.kind}")
+            for name, labels, value in collector.samples():
+                labelnames = collector.sample_labelnames(name)
+                lines.append(
+                    f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}"
+                )
+        lines.append("# HELP iris_model_info Versão em uso de cada família de modelo.")
+        lines.append("# TYPE iris_model_info gauge")
+        for model, version in sorted(self.model_versions.items()):
+            labels = _format_labels(("model", "version"), (model, version))
+            lines.append(f"iris_model_info{labels} 1")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que conta as requisições e mede a latência por rota.
+
+    A rota é identificada pelo nome da função do endpoint (ex.: `get_prediction`), e
+    não pelo path recebido, para que a quantidade de séries não cresça com a entrada;
+    requisições sem rota correspondente usam `unmatched`.
+
+    Args:
+        app (Callable): Aplicação ASGI envolvida.
+        metrics (Metrics): Destino das medições.
+    """
+
+    def __init__(self, app: Callable, metrics: Optional["Metrics"] = None) -> None:
+        self.app = app
+        self.metrics = metrics or METRICS
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        metrics = self.metrics
+        if scope["type"] != "http" or not metrics.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        state = scope.setdefault("state", {})
+        state[REQUEST_START_KEY] = start
+        status = 500
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                build_start = state.get(RESPONSE_BUILD_START_KEY)
+                if build_start is not None:
+                    metrics.stages.observe(
+                        time.perf_counter() - build_start, "response_build"
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            handler = getattr(scope.get("endpoint"), "__name__", "unmatched")
+            method = scope["method"]
+            metrics.requests.inc(method, handler, str(status))
+            if status >= 500:
+                metrics.errors.inc(method, handler)
+            metrics.latency.observe(time.perf_counter() - start, method, handler)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = (f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+METRICS = Metrics(enabled=settings.metrics_enabled)
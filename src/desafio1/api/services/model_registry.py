@@ -0,0 +1,503 @@
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+# iris_<algoritmo>_v<versão>_<AAAAMMDD>.pkl, como gerado pelo IrisModelTrainer.
+MODEL_FILE_PATTERN = re.compile(r"^iris_(?P<algorithm>[a-z]+)_v\d+_(?P<date>\d{8})$")
+MANIFEST_FILE = "manifest.json"
+# Uma flor de cada espécie do dataset Íris e a classe correspondente: além de aquecer o
+# modelo, elas barram artefatos que não classificam nem exemplos triviais.
+WARMUP_ROWS = np.array(
+    [[5.1, 3.5, 1.4, 0.2], [5.9, 3.0, 4.2, 1.5], [6.5, 3.0, 5.8, 2.2]]
+)
+WARMUP_LABELS = np.array([0, 1, 2])
+
+
+class ModelNotFoundError(Exception):
+    def __init__(self, message="Nenhum modelo encontrado no diretório especificado."):
+        self.message = message
+        super().__init__(self.message)
+
+
+class ModelManifestEntry(BaseModel):
+    """Entrada do manifest de um artefato de modelo.
+
+    Attributes:
+        version (str): Identificador da versão (nome do arquivo sem extensão).
+        algorithm (str): Família do algoritmo (knn, dt, lr, nb...).
+        path (str): Caminho do arquivo `.pkl`.
+        created_at (str): Data de modificação do arquivo, em ISO 8601.
+        checksum (str): SHA-256 do arquivo `.pkl`.
+        size_bytes (int): Tamanho do arquivo `.pkl`.
+        metrics (Dict[str, Any]): Métricas do treino, lidas de `<versão>.metrics.json`.
+        profile (Dict[str, Any]): Custo de servir o modelo (latência, tamanho e tempo
+            de carga), lido de `<versão>.profile.json`.
+    """
+
+    version: str
+    algorithm: str
+    path: str
+    created_at: str
+    checksum: str
+    size_bytes: int
+    metrics: Dict[str, Any] = {}
+    profile: Dict[str, Any] = {}
+
+
+def metrics_path(model_path: str) -> str:
+    """
+    Retorna o caminho do arquivo de métricas que acompanha um modelo `.pkl`.
+
+    Args:
+        model_path (str): Caminho do modelo serializado com pickle.
+
+    Returns:
+        str: Caminho `<modelo>.metrics.json`.
+    """
+    return os.path.splitext(model_path)[0] + ".metrics.json"
+
+
+def profile_path(model_path: str) -> str:
+    """
+    Retorna o caminho do arquivo com o custo de servir um modelo `.pkl`.
+
+    Args:
+        model_path (str): Caminho do modelo serializado com pickle.
+
+    Returns:
+        str: Caminho `<modelo>.profile.json`.
+    """
+    return os.path.splitext(model_path)[0] + ".profile.json"
+
+
+def reference_path(model_path: str) -> str:
+    """
+    Retorna o caminho do perfil de referência (distribuição do treino) de um modelo
+    `.pkl`, usado no monitoramento de drift.
+
+    Args:
+        model_path (str): Caminho do modelo serializado com pickle.
+
+    Returns:
+        str: Caminho `<modelo>.reference.json`.
+    """
+    return os.path.splitext(model_path)[0] + ".reference.json"
+
+
+def serving_latency_ms(entry: ModelManifestEntry, scorer: str = "sklearn") -> float:
+    """
+    Retorna o p95 de uma predição unitária medido no treino, em milissegundos.
+
+    Com `scorer="numpy"`, usa a medição do NumpyKNNScorer quando o artefato a tiver,
+    pois é ele que a API carrega nesse modo.
+
+    Args:
+        entry (ModelManifestEntry): Versão do modelo.
+        scorer (str): Implementação usada para servir o KNN.
+
+    Returns:
+        float: Latência em milissegundos, ou infinito sem medição.
+    """
+    profile = entry.profile
+    if scorer == "numpy" and "numpy_scorer" in profile:
+        profile = profile["numpy_scorer"]
+    latency = profile.get("latency", {}).get("single_row_p95_us")
+    return float("inf") if latency is None else latency / 1e3
+
+
+def select_default_model(
+    entries: List[ModelManifestEntry],
+    latency_slo_ms: float,
+    fallback: str,
+    scorer: str = "sklearn",
+) -> str:
+    """
+    Escolhe o modelo padrão: o mais preciso entre os que atendem ao SLO de latência.
+
+    A latência considerada é a de `serving_latency_ms` e a precisão é a acurácia no
+    conjunto de teste (`metrics.accuracy`); empates ficam com o mais rápido. Se nenhum modelo
+    atender ao SLO, fica o mais rápido. Modelos sem medição de latência não entram na
+    escolha.
+
+    Args:
+        entries (List[ModelManifestEntry]): Versões em uso de cada família.
+        latency_slo_ms (float): Latência máxima, em milissegundos.
+        fallback (str): Modelo usado quando nenhuma entrada tem medição de latência.
+        scorer (str): Implementação usada para servir o KNN.
+
+    Returns:
+        str: Família escolhida.
+    """
+    latencies = [(serving_latency_ms(entry, scorer), entry) for entry in entries]
+    measured = [(latency, e) for latency, e in latencies if latency != float("inf")]
+    if not measured:
+        return fallback
+    within = [(latency, e) for latency, e in measured if latency <= latency_slo_ms]
+    if not within:
+        return min(measured, key=lambda m: m[0])[1].algorithm
+    best = max(within, key=lambda m: (m[1].metrics.get("accuracy", 0.0), -m[0]))
+    return best[1].algorithm
+
+
+def file_checksum(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Indexa os artefatos de um diretório em um manifest e controla qual versão de cada
+    família de algoritmo (knn, dt, lr, nb...) é servida.
+
+    Uma tarefa em segundo plano verifica o diretório periodicamente; quando surge uma
+    versão mais nova de uma família (e nenhuma versão dela está fixada), ela é carregada
+    e aquecida fora do event loop e só então publicada via `on_swap`. A troca é uma
+    atribuição de referência, então requisições em andamento terminam com o modelo que
+    já tinham.
+
+    Args:
+        model_glob (str): Padrão dos artefatos, por exemplo `./saved_models/iris_*_v1_*.pkl`.
+        loader (Callable[[str], Any]): Função que carrega um modelo a partir do `.pkl`.
+        on_swap (Callable[[Any, ModelManifestEntry], None]): Chamada com o novo modelo
+            já aquecido, para publicá-lo (por exemplo em `app.state.models`).
+        poll_interval_s (float): Intervalo entre verificações do diretório; 0 desliga.
+        algorithms (List[str], optional): Famílias a indexar; todas quando omitido.
+    """
+
+    def __init__(
+        self,
+        model_glob: str,
+        loader: Callable[[str], Any],
+        on_swap: Callable[[Any, ModelManifestEntry], None],
+        poll_interval_s: float = 10.0,
+        algorithms: Optional[List[str]] = None,
+    ) -> None:
+        self.model_glob = model_glob
+        self.models_dir = os.path.dirname(model_glob) or "."
+        self.loader = loader
+        self.on_swap = on_swap
+        self.poll_interval_s = poll_interval_s
+        self.allowed_algorithms = set(algorithms) if algorithms else None
+        self.entries: Dict[str, ModelManifestEntry] = {}
+        self.active_versions: Dict[str, str] = {}
+        self.pinned_versions: Dict[str, str] = {}
+        self.history: Dict[str, List[str]] = {}
+        self._checksums: Dict[str, Tuple[float, int, str]] = {}
+        self._failed: Dict[str, str] = {}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def algorithms(self) -> List[str]:
+        """Famílias de algoritmo com ao menos uma versão indexada."""
+        return sorted({entry.algorithm for entry in self.entries.values()})
+
+    def scan(self) -> List[ModelManifestEntry]:
+        """
+        Reindexa o diretório e regrava o manifest.
+
+        O checksum só é recalculado quando o tamanho ou a data de modificação mudam.
+
+        Returns:
+            List[ModelManifestEntry]: Entradas ordenadas da versão mais antiga à mais nova.
+        """
+        entries = {}
+        for path in glob.glob(self.model_glob):
+            version = os.path.splitext(os.path.basename(path))[0]
+            match = MODEL_FILE_PATTERN.match(version)
+            if match is None:
+                continue
+            if (
+                self.allowed_algorithms is not None
+                and match.group("algorithm") not in self.allowed_algorithms
+            ):
+                continue
+            stat = os.stat(path)
+            cached = self._checksums.get(path)
+            if cached is None or cached[:2] != (stat.st_mtime, stat.st_size):
+                cached = (stat.st_mtime, stat.st_size, file_checksum(path))
+                self._checksums[path] = cached
+            metrics: Dict[str, Any] = {}
+            if os.path.exists(metrics_path(path)):
+                with open(metrics_path(path)) as f:
+                    metrics = json.load(f)
+            profile: Dict[str, Any] = {}
+            if os.path.exists(profile_path(path)):
+                with open(profile_path(path)) as f:
+                    profile = json.load(f)
+            entries[version] = ModelManifestEntry(
+                version=version,
+                algorithm=match.group("algorithm"),
+                path=path,
+                created_at=datetime.fromtimestamp(
+                    stat.st_mtime, tz=timezone.utc
+                ).isoformat(),
+                checksum=cached[2],
+                size_bytes=stat.st_size,
+                metrics=metrics,
+                profile=profile,
+            )
+        self.entries = dict(sorted(entries.items(), key=lambda e: self._order(e[1])))
+        self._write_manifest()
+        return list(self.entries.values())
+
+    @staticmethod
+    def _order(entry: ModelManifestEntry) -> Tuple[str, str]:
+        date = MODEL_FILE_PATTERN.match(entry.version).group("date")
+        return date, entry.created_at
+
+    def _write_manifest(self) -> None:
+        path = os.path.join(self.models_dir, MANIFEST_FILE)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.describe(), f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # Diretório somente leitura (ex.: imagem imutável): o manifest fica só em memória.
+            print(f"Não foi possível gravar o manifest de modelos: {e}")
+
+    def latest(self, algorithm: str) -> ModelManifestEntry:
+        """
+        Retorna a versão mais nova indexada de uma família.
+
+        Args:
+            algorithm (str): Família do algoritmo.
+
+        Raises:
+            ModelNotFoundError: Se nenhum artefato da família estiver indexado.
+        """
+        entries = [e for e in self.entries.values() if e.algorithm == algorithm]
+        if not entries:
+            raise ModelNotFoundError(f"Nenhum modelo encontrado para '{algorithm}'.")
+        return entries[-1]
+
+    async def activate(self, version: str) -> ModelManifestEntry:
+        """
+        Carrega, aquece e publica a versão informada no lugar da versão ativa da mesma
+        família.
+
+        Args:
+            version (str): Versão a ser servida.
+
+        Returns:
+            ModelManifestEntry: Entrada da versão ativada.
+
+        Raises:
+            KeyError: Se a versão não estiver indexada.
+        """
+        async with self._lock:
+            return await self._activate_locked(self.entries[version])
+
+    async def _activate_unpinned(self, version: str) -> Optional[ModelManifestEntry]:
+        # Usado pela atualização automática: a fixação é conferida sob o lock, pois um
+        # `pin` pode ter sido registrado enquanto esta ativação aguardava o lock.
+        async with self._lock:
+            entry = self.entries[version]
+            if entry.algorithm in self.pinned_versions:
+                return None
+            return await self._activate_locked(entry)
+
+    async def _activate_locked(self, entry: ModelManifestEntry) -> ModelManifestEntry:
+        current = self.active_versions.get(entry.algorithm)
+        if entry.version == current:
+            return entry
+        model = await asyncio.to_thread(self._load_and_warm, entry.path)
+        if current is not None:
+            self.history.setdefault(entry.algorithm, []).append(current)
+        self.on_swap(model, entry)
+        self.active_versions[entry.algorithm] = entry.version
+        self._write_manifest()
+        print(f"Modelo ativo ({entry.algorithm}): {entry.version}")
+        return entry
+
+    def _load_and_warm(self, path: str) -> Any:
+        model = self.loader(path)
+        # A primeira predição paga inicializações preguiçosas; ela é feita aqui, fora
+        # do caminho das requisições.
+        probabilities = model.predict_proba(WARMUP_ROWS)
+        predicted = np.asarray(model.classes_)[probabilities.argmax(axis=1)]
+        if not np.array_equal(predicted, WARMUP_LABELS):
+            raise ValueError(
+                f"O modelo {os.path.basename(path)} classificou as linhas de "
+                f"aquecimento como {predicted.tolist()}, e não "
+                f"{WARMUP_LABELS.tolist()}."
+            )
+        return model
+
+    async def refresh(self) -> List[ModelManifestEntry]:
+        """
+        Reindexa o diretório e ativa a versão mais nova de cada família sem versão
+        fixada.
+
+        Returns:
+            List[ModelManifestEntry]: Entradas ativadas nesta verificação.
+
+        Raises:
+            Exception: A primeira falha de carga, depois de tentar todas as famílias.
+        """
+        await asyncio.to_thread(self.scan)
+        activated, errors = [], []
+        for algorithm in self.algorithms:
+            if algorithm in self.pinned_versions:
+                continue
+            latest = self.latest(algorithm)
+            if latest.version == self.active_versions.get(algorithm):
+                continue
+            if self._failed.get(latest.version) == latest.checksum:
+                # Mesmo artefato que já falhou ao carregar; só tenta de novo se ele mudar.
+                continue
+            try:
+                entry = await self._activate_unpinned(latest.version)
+            except Exception as e:
+                self._failed[latest.version] = latest.checksum
+                errors.append(e)
+                continue
+            if entry is not None:
+                activated.append(entry)
+        if errors:
+            raise errors[0]
+        return activated
+
+    async def pin(self, version: str) -> ModelManifestEntry:
+        """
+        Ativa a versão informada e desliga a atualização automática da sua família.
+
+        Args:
+            version (str): Versão a ser fixada.
+
+        Returns:
+            ModelManifestEntry: Entrada da versão fixada.
+
+        Raises:
+            KeyError: Se a versão não estiver indexada.
+        """
+        algorithm = self.entries[version].algorithm
+        # A fixação é registrada antes de aguardar o lock, para que um `refresh` já
+        # na fila não ative a versão mais nova por cima dela.
+        previous = self.pinned_versions.get(algorithm)
+        self.pinned_versions[algorithm] = version
+        try:
+            entry = await self.activate(version)
+        except BaseException:
+            if previous is None:
+                self.pinned_versions.pop(algorithm, None)
+            else:
+                self.pinned_versions[algorithm] = previous
+            raise
+        self._write_manifest()
+        return entry
+
+    async def unpin(self, algorithm: str) -> List[ModelManifestEntry]:
+        """
+        Religa a atualização automática de uma família e ativa a versão mais nova.
+
+        Args:
+            algorithm (str): Família do algoritmo.
+        """
+        self.pinned_versions.pop(algorithm, None)
+        return await self.refresh()
+
+    async def rollback(self, algorithm: str) -> ModelManifestEntry:
+        """
+        Volta para a versão da família servida antes da atual e a fixa, para que a
+        verificação periódica não reative a versão descartada.
+
+        Args:
+            algorithm (str): Família do algoritmo.
+
+        Returns:
+            ModelManifestEntry: Entrada da versão restaurada.
+
+        Raises:
+            ModelNotFoundError: Se não houver versão anterior disponível.
+            Exception: A falha de carga da versão anterior, que volta ao histórico.
+        """
+        # A versão anterior é escolhida sob o lock, para que uma ativação concorrente
+        # não altere o histórico entre a escolha e a troca.
+        async with self._lock:
+            history = self.history.get(algorithm, [])
+            while history:
+                previous = history.pop()
+                current = self.active_versions.get(algorithm)
+                if previous == current or previous not in self.entries:
+                    continue
+                pinned = self.pinned_versions.get(algorithm)
+                self.pinned_versions[algorithm] = previous
+                try:
+                    entry = await self._activate_locked(self.entries[previous])
+                except BaseException:
+                    history.append(previous)
+                    if pinned is None:
+                        self.pinned_versions.pop(algorithm, None)
+                    else:
+                        self.pinned_versions[algorithm] = pinned
+                    raise
+                if current is not None:
+                    # A versão descartada foi empilhada; ela não é alvo de novo rollback.
+                    history.pop()
+                self._write_manifest()
+                return entry
+        raise ModelNotFoundError("Nenhuma versão anterior disponível para rollback.")
+
+    async def start(self) -> List[ModelManifestEntry]:
+        """
+        Indexa o diretório, ativa a versão mais nova de cada família e inicia a
+        verificação periódica.
+
+        Returns:
+            List[ModelManifestEntry]: Entradas ativadas.
+
+        Raises:
+            ModelNotFoundError: Se nenhum artefato corresponder ao padrão.
+        """
+        await asyncio.to_thread(self.scan)
+        if not self.entries:
+            raise ModelNotFoundError()
+        activated = [
+            await self.activate(self.latest(algorithm).version)
+            for algorithm in self.algorithms
+        ]
+        if self.poll_interval_s > 0:
+            self._task = asyncio.create_task(self._watch())
+        return activated
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval_s)
+            try:
+                await self.refresh()
+            except Exception as e:
+                # Um artefato corrompido não pode derrubar a versão em produção.
+                print(f"Falha ao atualizar o modelo: {e}")
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        Retorna o estado do registry para o endpoint administrativo e o manifest.
+        """
+        return {
+            "active_versions": dict(self.active_versions),
+            "pinned_versions": dict(self.pinned_versions),
+            "history": {alg: list(versions) for alg, versions in self.history.items()},
+            "models": [entry.model_dump() for entry in self.entries.values()],
+        }
@@ -0,0 +1,177 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+# Custo aproximado, em bytes, de cada entrada na estrutura do OrderedDict (slot da
+# tabela hash e nó da lista de ordem), além dos objetos de chave e valor.
+ENTRY_OVERHEAD_BYTES = 104
+
+CacheKey = Tuple[str, Tuple[float, ...]]
+CacheValue = Tuple[int, float]
+
+
+class PredictionCache:
+    """
+    Cache LRU com TTL e limite de memória para o resultado de predições.
+
+    A chave é o nome do modelo e a tupla de características, opcionalmente arredondada
+    para `precision` casas decimais, de modo que medições repetidas ou quase iguais
+    reaproveitem a mesma predição. Qualquer troca de modelo deve chamar `invalidate`:
+    o cache é esvaziado e resultados calculados com o modelo anterior, que ainda
+    estejam em andamento, são descartados ao chegar (ver `generation`).
+
+    Args:
+        max_entries (int): Quantidade máxima de entradas.
+        max_bytes (int): Memória máxima estimada ocupada pelas entradas.
+        ttl_s (float): Tempo de vida de cada entrada, em segundos; 0 não expira.
+        precision (int, optional): Casas decimais usadas na chave; None usa o valor exato.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl_s: float = 300.0,
+        precision: Optional[int] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self.precision = precision
+        self.generation = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[CacheValue, float, int]]" = (
+            OrderedDict()
+        )
+        self._memory_bytes = 0
+        # O cache é usado no event loop, mas a troca de modelo pode vir de outra thread.
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def key(self, model_name: str, features: Sequence[float]) -> CacheKey:
+        """
+        Monta a chave de uma linha, quantizando as características se configurado.
+
+        Args:
+            model_name (str): Modelo que avalia a linha.
+            features (Sequence[float]): Características na ordem esperada pelo modelo.
+
+        Returns:
+            CacheKey: Chave da linha no cache.
+        """
+        if self.precision is None:
+            return model_name, tuple(float(v) for v in features)
+        return model_name, tuple(round(float(v), self.precision) for v in features)
+
+    def get(self, key: CacheKey) -> Optional[CacheValue]:
+        """
+        Busca uma predição, renovando sua posição na ordem LRU.
+
+        Args:
+            key (CacheKey): Chave obtida com `key`.
+
+        Returns:
+            Optional[CacheValue]: Classe e probabilidade, ou None se ausente ou expirada.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            value, expires_at, size = entry
+            if self.ttl_s and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._memory_bytes -= size
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return value
+
+    def put(self, key: CacheKey, value: CacheValue, generation: int) -> None:
+        """
+        Armazena uma predição, removendo as menos usadas se algum limite for excedido.
+
+        Args:
+            key (CacheKey): Chave obtida com `key`.
+            value (CacheValue): Classe e probabilidade preditas.
+            generation (int): Valor de `generation` lido antes da inferência; se o
+                modelo foi trocado desde então, o resultado é descartado.
+        """
+        size = entry_size(key, value)
+        with self._lock:
+            if generation != self.generation or size > self.max_bytes:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous[2]
+            self._entries[key] = (value, time.monotonic() + self.ttl_s, size)
+            self._memory_bytes += size
+            while (
+                len(self._entries) > self.max_entries
+                or self._memory_bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._memory_bytes -= evicted_size
+                self._counters["evictions"] += 1
+
+    def invalidate(self) -> None:
+        """Esvazia o cache e descarta resultados de inferências ainda em andamento."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._memory_bytes = 0
+            self._counters["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna os contadores acumulados e a ocupação atual do cache.
+
+        Returns:
+            Dict[str, Any]: Acertos, faltas, taxa de acerto, remoções e memória usada.
+        """
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_ratio": self._counters["hits"] / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "memory_bytes": self._memory_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_s": self.ttl_s,
+                "precision": self.precision,
+            }
+
+
+def entry_size(key: CacheKey, value: CacheValue) -> int:
+    """
+    Estima a memória ocupada por uma entrada do cache.
+
+    Args:
+        key (CacheKey): Chave da entrada.
+        value (CacheValue): Valor da entrada.
+
+    Returns:
+        int: Tamanho estimado em bytes.
+    """
+    _, features = key
+    return (
+        ENTRY_OVERHEAD_BYTES
+        + sys.getsizeof(key)
+        + sys.getsizeof(features)
+        + sum(sys.getsizeof(v) for v in features)
+        + sys.getsizeof(value)
+        + sum(sys.getsizeof(v) for v in value)
+        # Tupla interna (valor, expiração, tamanho).
+        + sys.getsizeof((None, None, None))
+        + sys.getsizeof(0.0)
+    )
@@ -0,0 +1,302 @@
+"""
+Registro assíncrono das predições servidas em arquivos Parquet locais.
+
+Os endpoints de predição só anexam um registro a uma fila em memória (uma `deque`,
+cujo `append` é atômico e não usa lock; o event loop e a tarefa de escrita rodam na
+mesma thread). Uma tarefa em segundo plano esvazia a fila a cada
+`flush_interval_s` segundos, ou quando ela acumula `flush_rows` linhas, monta uma
+tabela Arrow por dia e grava os arquivos em uma thread, fora do event loop:
+
+    <log_dir>/year=AAAA/month=MM/day=DD/part-<timestamp>-<seq>.parquet
+
+O particionamento por ano/mês/dia segue o das zonas Bronze/Silver do desafio 2, e as
+colunas das características têm os nomes do schema da API, como as partições lidas
+pelo treino fora da memória (depois de acrescentado o rótulo).
+
+A memória é limitada a `max_queue_rows` linhas na fila. Acima disso, a política
+`drop` descarta os novos registros (e os conta), sem afetar a latência; a política
+`block` faz o endpoint aguardar até a próxima escrita liberar espaço.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+from desafio1.models.schemas.iris_schema import FEATURE_NAMES
+
+# O pyarrow é importado só na primeira escrita, fora do boot da API.
+
+LOG_POLICIES = ("drop", "block")
+
+# (instante em s desde a época, endpoint, modelo, versão, linhas do lote (0 para uma
+# predição unitária), características, classes, probabilidades)
+LogRecord = Tuple[float, str, str, str, int, Any, Any, Any]
+
+
+class PredictionLogger:
+    """
+    Fila limitada de predições, gravada em lote em Parquet por uma tarefa de fundo.
+
+    Args:
+        log_dir (str): Diretório raiz das partições.
+        max_queue_rows (int): Linhas máximas aguardando escrita.
+        flush_rows (int): Linhas na fila que antecipam a próxima escrita.
+        flush_interval_s (float): Intervalo máximo entre escritas, em segundos.
+        policy (str): `drop` descarta registros com a fila cheia; `block` aguarda.
+    """
+
+    def __init__(
+        self,
+        log_dir: str,
+        max_queue_rows: int = 100_000,
+        flush_rows: int = 20_000,
+        flush_interval_s: float = 5.0,
+        policy: str = "drop",
+    ) -> None:
+        if policy not in LOG_POLICIES:
+            raise ValueError(
+                f"Política desconhecida: {policy}. Use {list(LOG_POLICIES)}."
+            )
+        self.log_dir = log_dir
+        self.max_queue_rows = max_queue_rows
+        self.flush_rows = min(flush_rows, max_queue_rows)
+        self.flush_interval_s = flush_interval_s
+        self.policy = policy
+        self._queue: Deque[LogRecord] = deque()
+        self._queued_rows = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._drained: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._sequence = 0
+        self._counters = {
+            "logged_rows": 0,
+            "dropped_rows": 0,
+            "blocked_requests": 0,
+            "files": 0,
+            "write_errors": 0,
+        }
+        self._write_latencies: Deque[float] = deque(maxlen=256)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Inicia a tarefa de escrita. Deve ser chamado dentro do event loop da API."""
+        self._wakeup = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Interrompe a tarefa de escrita e grava os registros que ainda estão na fila."""
+        if self._task is not None:
+            # Sem cancelar: uma escrita em andamento termina antes da última.
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self._write_pending()
+
+    async def log(
+        self,
+        endpoint: str,
+        model_name: str,
+        model_version: str,
+        features: Any,
+        predictions: Any,
+        probabilities: Any,
+    ) -> bool:
+        """
+        Enfileira as predições de uma requisição.
+
+        Args:
+            endpoint (str): Rota de origem (`single`, `batch` ou `stream`).
+            model_name (str): Modelo que respondeu.
+            model_version (str): Versão do modelo.
+            features (Any): Uma linha (predição unitária) ou matriz de características.
+            predictions (Any): Classe prevista (um inteiro ou um array por linha).
+            probabilities (Any): Probabilidade da classe (um float ou um array).
+
+        Returns:
+            bool: False se os registros foram descartados pela política `drop`.
+        """
+        batch_rows = 0 if np.ndim(predictions) == 0 else len(predictions)
+        n_rows = batch_rows or 1
+        while self._queued_rows + n_rows > self.max_queue_rows and self._queue:
+            if self.policy == "drop" or not self.running:
+                self._counters["dropped_rows"] += n_rows
+                return False
+            self._counters["blocked_requests"] += 1
+            self._wakeup.set()
+            self._drained.clear()
+            await self._drained.wait()
+        self._queue.append(
+            (
+                time.time(),
+                endpoint,
+                model_name,
+                model_version,
+                batch_rows,
+                features,
+                predictions,
+                probabilities,
+            )
+        )
+        self._queued_rows += n_rows
+        if self._queued_rows >= self.flush_rows and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._write_pending()
+
+    async def _write_pending(self) -> None:
+        records: List[LogRecord] = []
+        while self._queue:
+            records.append(self._queue.popleft())
+        self._queued_rows = 0
+        if self._drained is not None:
+            self._drained.set()
+        if not records:
+            return
+        start = time.perf_counter()
+        try:
+            n_rows, files = await asyncio.to_thread(self._write, records)
+        except Exception as e:
+            self._counters["write_errors"] += 1
+            print(f"Falha ao gravar o log de predições: {e}")
+            return
+        self._counters["logged_rows"] += n_rows
+        self._counters["files"] += files
+        self._write_latencies.append(time.perf_counter() - start)
+
+    def _write(self, records: List[LogRecord]) -> Tuple[int, int]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = records_to_table(records)
+        days = table["ts"].to_numpy().astype("datetime64[D]")
+        files = 0
+        for day in np.unique(days):
+            year, month, date = str(day).split("-")
+            partition = os.path.join(
+                self.log_dir, f"year={year}", f"month={month}", f"day={date}"
+            )
+            os.makedirs(partition, exist_ok=True)
+            self._sequence += 1
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+            path = os.path.join(partition, f"part-{stamp}-{self._sequence:06d}.parquet")
+            # Escreve em um arquivo temporário e renomeia: leitores nunca veem um
+            # Parquet incompleto.
+            pq.write_table(table.filter(pa.array(days == day)), path + ".tmp")
+            os.replace(path + ".tmp", path)
+            files += 1
+        return table.num_rows, files
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna os contadores do log de predições.
+
+        Returns:
+            Dict[str, Any]: Linhas gravadas, descartadas e na fila, requisições que
+                aguardaram espaço, arquivos gravados, falhas de escrita e latência
+                média de cada escrita.
+        """
+        latencies = list(self._write_latencies)
+        return {
+            **self._counters,
+            "queued_rows": self._queued_rows,
+            "max_queue_rows": self.max_queue_rows,
+            "policy": self.policy,
+            "mean_write_ms": (
+                sum(latencies) / len(latencies) * 1e3 if latencies else None
+            ),
+        }
+
+
+def records_to_table(records: List[LogRecord]) -> Any:
+    """
+    Converte os registros da fila em uma tabela Arrow com uma linha por predição,
+    em ordem de chegada.
+
+    As predições unitárias (a maior parte dos registros) são convertidas de uma vez;
+    os lotes já chegam como arrays.
+
+    Args:
+        records (List[LogRecord]): Registros enfileirados por `PredictionLogger.log`.
+
+    Returns:
+        pyarrow.Table: Colunas `ts`, `endpoint`, `model`, `model_version`, as
+            características, `prediction` e `probability`.
+    """
+    import pyarrow as pa
+
+    singles = [r for r in records if r[4] == 0]
+    batches = [r for r in records if r[4] > 0]
+    n_features = len(FEATURE_NAMES)
+    parts = []
+    if singles:
+        parts.append(
+            (
+                [r[0] for r in singles],
+                [r[1] for r in singles],
+                [r[2] for r in singles],
+                [r[3] for r in singles],
+                np.ones(len(singles), dtype=np.int64),
+                np.array([r[5] for r in singles], dtype=np.float64),
+                np.fromiter((r[6] for r in singles), np.int32, len(singles)),
+                np.fromiter((r[7] for r in singles), np.float32, len(singles)),
+            )
+        )
+    for r in batches:
+        parts.append(
+            (
+                [r[0]],
+                [r[1]],
+                [r[2]],
+                [r[3]],
+                np.array([r[4]]),
+                np.asarray(r[5], dtype=np.float64).reshape(-1, n_features),
+                np.asarray(r[6], dtype=np.int32),
+                np.asarray(r[7], dtype=np.float32),
+            )
+        )
+    # Índice do registro de origem de cada linha.
+    origin = np.repeat(
+        np.arange(len(singles) + len(batches)),
+        np.concatenate([part[4] for part in parts]),
+    )
+
+    def per_row(i: int) -> Any:
+        return pa.array([v for part in parts for v in part[i]]).take(origin)
+
+    features = np.concatenate([part[5] for part in parts])
+    timestamps = per_row(0).to_numpy() * 1e6
+    timestamps = timestamps.astype(np.int64).astype("datetime64[us]")
+    columns = {
+        "ts": pa.array(timestamps, type=pa.timestamp("us", tz="UTC")),
+        # Poucos valores distintos: dicionário reduz o arquivo e a memória.
+        "endpoint": per_row(1).dictionary_encode(),
+        "model": per_row(2).dictionary_encode(),
+        "model_version": per_row(3).dictionary_encode(),
+    }
+    for j, name in enumerate(FEATURE_NAMES):
+        columns[name] = pa.array(features[:, j])
+    columns["prediction"] = pa.array(np.concatenate([part[6] for part in parts]))
+    columns["probability"] = pa.array(np.concatenate([part[7] for part in parts]))
+    # Unitárias e lotes foram separados na conversão; a ordenação estável por
+    # instante restaura a ordem de chegada.
+    order = np.argsort(timestamps, kind="stable")
+    return pa.table(columns).take(pa.array(order))
@@ -1,16 +1,148 @@
-from typing import List
+import math
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
 import numpy as np
-from sklearn.pipeline import Pipeline
+from desafio1.api.services.metrics import METRICS
+from desafio1.models.schemas.iris_schema import FEATURE_NAMES
+from numpy import ndarray
 
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
 
-def predict(model: Pipeline, features: List[float]) -> int:
-    data = np.array(features).reshape(1, -1)
-    prediction = model.predict(data)[0]
-    return prediction
+
+def predict(model: "Pipeline", features: List[float]) -> int:
+    labels, _ = predict_with_proba(model, np.array(features).reshape(1, -1))
+    return labels[0]
 
 
-def predict_proba(model: Pipeline, features: List[float]) -> List[float]:
+def predict_proba(model: "Pipeline", features: List[float]) -> List[float]:
     data = np.array(features).reshape(1, -1)
     probabilities = model.predict_proba(data)[0]
     return probabilities.tolist()
+
+
+def predict_proba_batch(model: "Pipeline", features: ndarray) -> ndarray:
+    """
+    Calcula as probabilidades de um lote inteiro com uma única chamada ao modelo.
+
+    Args:
+        model (Pipeline): Modelo treinado.
+        features (ndarray): Matriz (n_amostras, n_atributos) com as características.
+
+    Returns:
+        ndarray: Matriz (n_amostras, n_classes) com as probabilidades de cada classe.
+    """
+    data = np.ascontiguousarray(features, dtype=np.float64)
+    if not METRICS.enabled:
+        return model.predict_proba(data)
+    return staged_predict_proba(model, data)
+
+
+def staged_predict_proba(model: Any, data: ndarray) -> ndarray:
+    """
+    Executa `predict_proba` etapa por etapa, medindo a padronização (`scale`) e a busca
+    de vizinhos (`neighbor_search`; `classify` nas famílias que não são KNN).
+
+    O resultado é o mesmo de `model.predict_proba(data)`. Modelos que não podem ser
+    separados em etapas (ex.: EnsembleModel) são medidos inteiros, como `classify`.
+
+    Args:
+        model (Any): Pipeline do scikit-learn, NumpyKNNScorer ou outro modelo.
+        data (ndarray): Matriz (n_amostras, n_atributos) com as características.
+
+    Returns:
+        ndarray: Matriz (n_amostras, n_classes) com as probabilidades de cada classe.
+    """
+    steps = getattr(model, "steps", None)
+    if steps is not None:
+        with METRICS.stage("scale"):
+            for _, step in steps[:-1]:
+                if step is not None and step != "passthrough":
+                    data = step.transform(data)
+        final = steps[-1][1]
+        stage = "neighbor_search" if hasattr(final, "kneighbors") else "classify"
+        with METRICS.stage(stage):
+            return final.predict_proba(data)
+    if hasattr(model, "predict_proba_scaled"):
+        with METRICS.stage("scale"):
+            scaled = model.transform(data)
+        with METRICS.stage("neighbor_search"):
+            return model.predict_proba_scaled(scaled)
+    with METRICS.stage("classify"):
+        return model.predict_proba(data)
+
+
+def predict_with_proba(model: "Pipeline", features: ndarray) -> Tuple[ndarray, ndarray]:
+    """
+    Obtém a classe predita e a sua probabilidade com uma única passada pelo modelo.
+
+    A classe é derivada do argmax de `predict_proba`, evitando chamar `predict` e
+    `predict_proba` separadamente (o que, no pipeline KNN, padroniza os dados e busca
+    os vizinhos duas vezes).
+
+    Args:
+        model (Pipeline): Modelo treinado.
+        features (ndarray): Matriz (n_amostras, n_atributos) com as características.
+
+    Returns:
+        Tuple[ndarray, ndarray]: Classes preditas e probabilidade da classe escolhida.
+    """
+    probabilities = predict_proba_batch(model, features)
+    best = probabilities.argmax(axis=1)
+    return model.classes_[best], probabilities[np.arange(len(best)), best]
+
+
+class EnsembleModel:
+    """
+    Combina vários modelos pela média das probabilidades de cada classe.
+
+    Args:
+        models (Dict[str, Any]): Modelos treinados, todos com as mesmas classes.
+    """
+
+    def __init__(self, models: Dict[str, Any]) -> None:
+        if not models:
+            raise ValueError("O ensemble precisa de ao menos um modelo.")
+        self.models = dict(models)
+        self.classes_ = next(iter(self.models.values())).classes_
+        for name, model in self.models.items():
+            if not np.array_equal(model.classes_, self.classes_):
+                raise ValueError(f"O modelo '{name}' tem classes diferentes.")
+
+    def predict_proba(self, X: Any) -> ndarray:
+        return np.mean([m.predict_proba(X) for m in self.models.values()], axis=0)
+
+    def predict(self, X: Any) -> ndarray:
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def parse_features(row: Any) -> List[float]:
+    """Extrai as quatro características de uma linha do lote.
+
+    Args:
+        row (Any): Objeto recebido na requisição.
+
+    Returns:
+        List[float]: Características na ordem esperada pelo modelo.
+
+    Raises:
+        ValueError: Se a linha não for um objeto, faltar algum campo ou algum valor
+            não for um número finito.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("a linha deve ser um objeto")
+    features = []
+    for name in FEATURE_NAMES:
+        if name not in row:
+            raise ValueError(f"campo obrigatório ausente: {name}")
+        value = row[name]
+        if isinstance(value, bool):
+            raise ValueError(f"valor inválido para {name}: {value!r}")
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"valor inválido para {name}: {value!r}") from None
+        if not math.isfinite(number):
+            raise ValueError(f"valor não finito para {name}: {value!r}")
+        features.append(number)
+    return features
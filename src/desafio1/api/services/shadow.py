@@ -0,0 +1,102 @@
+import asyncio
+from typing import Any, Awaitable, Dict, Set, Tuple
+
+import numpy as np
+from desafio1.api.services.executor import ExecutorSaturatedError
+from numpy import ndarray
+
+
+class ShadowComparator:
+    """
+    Avalia um modelo secundário (shadow) em segundo plano e compara com o primário.
+
+    O resultado do shadow nunca é devolvido ao chamador; só a concordância com o
+    modelo primário é acumulada, para comparar modelos com tráfego real.
+    """
+
+    def __init__(self) -> None:
+        self._pairs: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def submit(
+        self,
+        primary: str,
+        shadow: str,
+        primary_result: Tuple[ndarray, ndarray],
+        shadow_inference: Awaitable[Tuple[ndarray, ndarray]],
+    ) -> None:
+        """
+        Agenda a comparação sem aguardá-la.
+
+        Args:
+            primary (str): Nome do modelo primário.
+            shadow (str): Nome do modelo secundário.
+            primary_result (Tuple[ndarray, ndarray]): Classes e probabilidades do primário.
+            shadow_inference (Awaitable): Inferência do shadow sobre as mesmas linhas.
+        """
+        task = asyncio.ensure_future(
+            self._compare(primary, shadow, primary_result, shadow_inference)
+        )
+        # Mantém a referência até o fim, para a tarefa não ser coletada antes.
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _compare(
+        self,
+        primary: str,
+        shadow: str,
+        primary_result: Tuple[ndarray, ndarray],
+        shadow_inference: Awaitable[Tuple[ndarray, ndarray]],
+    ) -> None:
+        stats = self._pairs.setdefault(
+            (primary, shadow),
+            {
+                "rows": 0,
+                "agreements": 0,
+                "abs_prob_diff_sum": 0.0,
+                "skipped": 0,
+                "errors": 0,
+            },
+        )
+        try:
+            shadow_labels, shadow_probabilities = await shadow_inference
+        except ExecutorSaturatedError:
+            # O shadow nunca disputa capacidade com o tráfego primário.
+            stats["skipped"] += 1
+            return
+        except Exception:
+            stats["errors"] += 1
+            return
+        labels, probabilities = primary_result
+        stats["rows"] += len(labels)
+        stats["agreements"] += int(np.sum(labels == shadow_labels))
+        stats["abs_prob_diff_sum"] += float(
+            np.abs(probabilities - shadow_probabilities).sum()
+        )
+
+    async def drain(self) -> None:
+        """Aguarda as comparações pendentes (usado no shutdown e nos testes)."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna a concordância acumulada por par primário/shadow.
+
+        Returns:
+            Dict[str, Any]: Linhas comparadas, taxa de concordância de classe e diferença
+                média da probabilidade da classe escolhida, por par.
+        """
+        result = {}
+        for (primary, shadow), stats in self._pairs.items():
+            rows = stats["rows"]
+            result[f"{primary}->{shadow}"] = {
+                "rows": rows,
+                "agreement_rate": stats["agreements"] / rows if rows else None,
+                "mean_abs_prob_diff": (
+                    stats["abs_prob_diff_sum"] / rows if rows else None
+                ),
+                "skipped": stats["skipped"],
+                "errors": stats["errors"],
+            }
+        return result
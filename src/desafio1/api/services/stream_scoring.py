@@ -0,0 +1,422 @@
+"""
+Predição em massa sobre arquivos NDJSON ou CSV, lidos de forma incremental.
+
+A entrada é consumida em pedaços de bytes e agrupada em blocos de tamanho fixo; cada
+bloco é avaliado com uma única chamada vetorizada e seus resultados são emitidos antes
+de o próximo bloco ser lido. A memória usada depende do tamanho do bloco, e não do
+tamanho do arquivo. O mesmo código atende o endpoint `POST /v1/iris/predict/stream`
+e a linha de comando:
+
+    PYTHONPATH=src python -m desafio1.api.services.stream_scoring flores.csv \\
+        -o predicoes.csv
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+from desafio1.api.services.prediction_service import (
+    FEATURE_NAMES,
+    parse_features,
+    predict_with_proba,
+)
+from numpy import ndarray
+
+STREAM_FORMATS = ("ndjson", "csv")
+RESULT_FIELDS = ("index", "prediction", "class_name", "probability", "error")
+# Tamanho de cada leitura do arquivo na linha de comando.
+READ_SIZE = 1 << 20
+# Tamanho máximo de uma linha da entrada; uma flor ocupa menos de 200 bytes.
+MAX_LINE_BYTES = 64 * 1024
+
+# (posição da linha, características ou None, erro ou None)
+Row = Tuple[int, Optional[List[float]], Optional[str]]
+
+
+class LineTooLongError(ValueError):
+    """
+    Uma linha da entrada passou de `max_line_bytes`.
+
+    Args:
+        message (str): Descrição do erro.
+        chunks (List[List[Row]]): Blocos completados antes da linha longa.
+    """
+
+    def __init__(self, message: str, chunks: List[List[Row]]) -> None:
+        super().__init__(message)
+        self.chunks = chunks
+
+
+class ChunkedRowReader:
+    """
+    Converte bytes de NDJSON ou CSV em blocos de até `chunk_size` linhas validadas.
+
+    Só a última linha incompleta, limitada a `max_line_bytes`, e o bloco em formação
+    ficam em memória. No CSV, a primeira linha é tratada como cabeçalho quando contém
+    todos os nomes de `FEATURE_NAMES`; caso contrário, ela é a primeira linha de dados
+    e as colunas seguem a ordem de `FEATURE_NAMES`. Linhas em branco são ignoradas e
+    linhas inválidas seguem no bloco com a mensagem de erro.
+
+    Args:
+        fmt (str): Formato da entrada, "ndjson" ou "csv".
+        chunk_size (int): Quantidade de linhas de cada bloco.
+        max_line_bytes (int): Tamanho máximo de uma linha.
+    """
+
+    def __init__(
+        self, fmt: str, chunk_size: int = 1024, max_line_bytes: int = MAX_LINE_BYTES
+    ) -> None:
+        if fmt not in STREAM_FORMATS:
+            raise ValueError(f"Formato não suportado: {fmt}. Use {STREAM_FORMATS}.")
+        self.fmt = fmt
+        self.chunk_size = chunk_size
+        self.max_line_bytes = max_line_bytes
+        self.rows_read = 0
+        self._pending = b""
+        self._chunk: List[Row] = []
+        self._columns: Optional[List[str]] = None
+
+    def feed(self, data: bytes) -> List[List[Row]]:
+        """
+        Consome mais bytes da entrada.
+
+        Args:
+            data (bytes): Próximo pedaço da entrada, que pode terminar no meio de uma linha.
+
+        Returns:
+            List[List[Row]]: Blocos completados por este pedaço.
+
+        Raises:
+            LineTooLongError: Se uma linha passar de `max_line_bytes`. A leitura para
+                nela; `close` ainda devolve o bloco em formação.
+        """
+        lines = (self._pending + data).split(b"\n")
+        self._pending = lines.pop()
+        chunks: List[List[Row]] = []
+        for line in lines:
+            self._check_length(line, chunks)
+            if self._add_line(line):
+                chunks.append(self._take_chunk())
+        self._check_length(self._pending, chunks)
+        return chunks
+
+    def close(self) -> List[List[Row]]:
+        """
+        Processa a última linha, mesmo sem quebra de linha no final.
+
+        Returns:
+            List[List[Row]]: O último bloco, se houver linhas pendentes.
+        """
+        if self._pending:
+            self._add_line(self._pending)
+            self._pending = b""
+        return [self._take_chunk()] if self._chunk else []
+
+    def _check_length(self, line: bytes, chunks: List[List[Row]]) -> None:
+        if len(line) > self.max_line_bytes:
+            self._pending = b""
+            raise LineTooLongError(
+                f"Linha {self.rows_read} maior que {self.max_line_bytes} bytes.", chunks
+            )
+
+    def _take_chunk(self) -> List[Row]:
+        chunk, self._chunk = self._chunk, []
+        return chunk
+
+    def _add_line(self, raw: bytes) -> bool:
+        try:
+            text = raw.decode("utf-8").strip()
+        except UnicodeDecodeError:
+            return self._append(None, "linha com codificação inválida (esperado UTF-8)")
+        if not text:
+            return False
+        if self.fmt == "csv" and self._columns is None and self._is_header(text):
+            return False
+        try:
+            return self._append(self._parse(text), None)
+        except ValueError as e:
+            return self._append(None, str(e))
+
+    def _append(self, features: Optional[List[float]], error: Optional[str]) -> bool:
+        self._chunk.append((self.rows_read, features, error))
+        self.rows_read += 1
+        return len(self._chunk) >= self.chunk_size
+
+    def _is_header(self, text: str) -> bool:
+        fields = [field.strip() for field in next(csv.reader([text]))]
+        if set(FEATURE_NAMES) <= set(fields):
+            self._columns = fields
+            return True
+        self._columns = list(FEATURE_NAMES)
+        return False
+
+    def _parse(self, text: str) -> List[float]:
+        if self.fmt == "ndjson":
+            try:
+                row: Any = json.loads(text)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"JSON inválido: {e.msg}") from None
+        else:
+            fields = next(csv.reader([text]))
+            if len(fields) != len(self._columns):
+                raise ValueError(
+                    f"esperadas {len(self._columns)} colunas, recebidas {len(fields)}"
+                )
+            row = dict(zip(self._columns, fields))
+        return parse_features(row)
+
+
+def chunk_features(chunk: List[Row]) -> Optional[ndarray]:
+    """
+    Empilha as linhas válidas de um bloco em uma matriz contígua.
+
+    Args:
+        chunk (List[Row]): Bloco produzido pelo ChunkedRowReader.
+
+    Returns:
+        Optional[ndarray]: Matriz (n_válidas, n_atributos), ou None sem linhas válidas.
+    """
+    rows = [features for _, features, _ in chunk if features is not None]
+    return np.array(rows, dtype=np.float64) if rows else None
+
+
+def result_header(fmt: str) -> str:
+    """
+    Retorna o cabeçalho da saída, emitido antes do primeiro bloco.
+
+    Args:
+        fmt (str): Formato da saída.
+
+    Returns:
+        str: Linha de cabeçalho no CSV; vazio no NDJSON.
+    """
+    return ",".join(RESULT_FIELDS) + "\n" if fmt == "csv" else ""
+
+
+def encode_chunk(
+    chunk: List[Row],
+    labels: Optional[ndarray],
+    probabilities: Optional[ndarray],
+    fmt: str,
+    class_names: Dict[int, str],
+) -> str:
+    """
+    Serializa os resultados de um bloco, na mesma ordem das linhas de entrada.
+
+    Args:
+        chunk (List[Row]): Bloco avaliado.
+        labels (ndarray, optional): Classes preditas para as linhas válidas.
+        probabilities (ndarray, optional): Probabilidades da classe escolhida.
+        fmt (str): Formato da saída, "ndjson" ou "csv".
+        class_names (Dict[int, str]): Nome de cada classe.
+
+    Returns:
+        str: Uma linha de saída por linha de entrada.
+    """
+    predictions = iter(
+        zip(labels.tolist(), probabilities.tolist()) if labels is not None else ()
+    )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n") if fmt == "csv" else None
+    for index, features, error in chunk:
+        if features is None:
+            result: Dict[str, Any] = {"index": index, "error": error}
+        else:
+            label, probability = next(predictions)
+            result = {
+                "index": index,
+                "prediction": label,
+                "class_name": class_names[label],
+                "probability": probability,
+            }
+        if writer is not None:
+            writer.writerow([result.get(field, "") for field in RESULT_FIELDS])
+        else:
+            buffer.write(json.dumps(result, ensure_ascii=False) + "\n")
+    return buffer.getvalue()
+
+
+def score_stream(
+    data: Iterable[bytes],
+    model: Any,
+    fmt: str,
+    class_names: Dict[int, str],
+    chunk_size: int = 1024,
+    max_line_bytes: int = MAX_LINE_BYTES,
+) -> Iterator[str]:
+    """
+    Avalia uma entrada síncrona (ex.: arquivo) bloco a bloco.
+
+    Args:
+        data (Iterable[bytes]): Pedaços da entrada.
+        model (Any): Modelo com `classes_` e `predict_proba`.
+        fmt (str): Formato da entrada e da saída.
+        class_names (Dict[int, str]): Nome de cada classe.
+        chunk_size (int): Quantidade de linhas avaliadas por chamada ao modelo.
+        max_line_bytes (int): Tamanho máximo de uma linha da entrada.
+
+    Yields:
+        str: Resultados serializados de cada bloco, começando pelo cabeçalho.
+
+    Raises:
+        LineTooLongError: Se uma linha passar de `max_line_bytes`.
+    """
+    reader = ChunkedRowReader(fmt, chunk_size, max_line_bytes)
+    yield result_header(fmt)
+    for piece in _with_end(data):
+        chunks = reader.feed(piece) if piece is not None else reader.close()
+        for chunk in chunks:
+            features = chunk_features(chunk)
+            labels, probabilities = (
+                predict_with_proba(model, features)
+                if features is not None
+                else (None, None)
+            )
+            yield encode_chunk(chunk, labels, probabilities, fmt, class_names)
+
+
+async def score_async_stream(
+    data: AsyncIterator[bytes],
+    infer: Callable[[ndarray], Awaitable[Tuple[ndarray, ndarray]]],
+    fmt: str,
+    class_names: Dict[int, str],
+    chunk_size: int = 1024,
+    max_line_bytes: int = MAX_LINE_BYTES,
+) -> AsyncIterator[str]:
+    """
+    Avalia uma entrada assíncrona (ex.: corpo da requisição) bloco a bloco.
+
+    O cabeçalho sai junto com o primeiro bloco, e não antes da leitura da entrada: quem
+    consome o gerador pode aguardar o primeiro resultado para recusar a requisição
+    antes de enviar a resposta.
+
+    Args:
+        data (AsyncIterator[bytes]): Pedaços da entrada.
+        infer (Callable): Corrotina que avalia uma matriz de características e retorna
+            classes e probabilidades (ex.: o executor de inferência da API).
+        fmt (str): Formato da entrada e da saída.
+        class_names (Dict[int, str]): Nome de cada classe.
+        chunk_size (int): Quantidade de linhas avaliadas por chamada ao modelo.
+        max_line_bytes (int): Tamanho máximo de uma linha da entrada.
+
+    Yields:
+        str: Resultados serializados de cada bloco, começando pelo cabeçalho.
+
+    Raises:
+        LineTooLongError: Se uma linha passar de `max_line_bytes` antes do primeiro
+            bloco. Depois dele, o erro vira a última linha da saída.
+    """
+    reader = ChunkedRowReader(fmt, chunk_size, max_line_bytes)
+    header = result_header(fmt)
+
+    async def encode(chunk: List[Row]) -> str:
+        features = chunk_features(chunk)
+        if features is None:
+            return encode_chunk(chunk, None, None, fmt, class_names)
+        labels, probabilities = await infer(features)
+        return encode_chunk(chunk, labels, probabilities, fmt, class_names)
+
+    started = False
+    try:
+        async for piece in data:
+            for chunk in reader.feed(piece):
+                yield ("" if started else header) + await encode(chunk)
+                started = True
+        for chunk in reader.close():
+            yield ("" if started else header) + await encode(chunk)
+            started = True
+    except LineTooLongError as e:
+        if not started:
+            raise
+        # A resposta já começou: as linhas anteriores são avaliadas, o erro é a
+        # última linha da saída e a leitura termina aqui.
+        for chunk in e.chunks + reader.close():
+            yield await encode(chunk)
+        yield encode_chunk([(reader.rows_read, None, str(e))], None, None, fmt, {})
+        return
+    if not started and header:
+        yield header
+
+
+def _with_end(data: Iterable[bytes]) -> Iterator[Optional[bytes]]:
+    # Marca o fim da entrada com None, para o leitor processar a última linha.
+    yield from data
+    yield None
+
+
+def detect_format(path: str) -> str:
+    """Deduz o formato pela extensão do arquivo: `.csv` é CSV e o resto NDJSON."""
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def main() -> None:
+    from desafio1.api.config import settings
+    from desafio1.api.services.model_registry import ModelRegistry
+    from desafio1.api.v1.main import load_model
+    from desafio1.models.schemas.iris_schema import CLASS_MAPPING
+
+    parser = argparse.ArgumentParser(
+        description="Avalia um arquivo NDJSON ou CSV com o mesmo modelo servido pela API."
+    )
+    parser.add_argument("input", help="Arquivo de entrada ('-' para a entrada padrão).")
+    parser.add_argument("-o", "--output", help="Arquivo de saída (padrão: stdout).")
+    parser.add_argument("--format", choices=STREAM_FORMATS, help="Padrão: extensão.")
+    parser.add_argument(
+        "--model-path",
+        help="Artefato .pkl; padrão: versão mais nova de IRIS_DEFAULT_MODEL.",
+    )
+    parser.add_argument("--chunk-size", type=int, default=settings.stream_chunk_size)
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.input)
+    model_path = args.model_path
+    if model_path is None:
+        registry = ModelRegistry(
+            settings.model_path,
+            loader=load_model,
+            on_swap=lambda model, entry: None,
+            poll_interval_s=0,
+            algorithms=[settings.default_model],
+        )
+        registry.scan()
+        model_path = registry.latest(settings.default_model).path
+    model = load_model(model_path)
+
+    source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    target = open(args.output, "w", newline="") if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        pieces = iter(lambda: source.read(READ_SIZE), b"")
+        for text in score_stream(pieces, model, fmt, CLASS_MAPPING, args.chunk_size):
+            target.write(text)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    elapsed = time.perf_counter() - start
+    print(
+        f"Modelo: {os.path.basename(model_path)} | tempo: {elapsed:.2f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
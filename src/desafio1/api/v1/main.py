@@ -1,14 +1,40 @@
 import glob
 import os
 import pickle
+from typing import Any, List
 
-from desafio1.api.services.data_service import download_iris_dataset
+from desafio1.api.config import settings
+from desafio1.api.services.batcher import MicroBatcher
+from desafio1.api.services.drift_monitor import DriftMonitor, load_reference
+from desafio1.api.services.executor import InferenceExecutor
+from desafio1.api.services.metrics import METRICS, MetricsMiddleware
+from desafio1.api.services.model_registry import (
+    ModelManifestEntry,
+    ModelNotFoundError,
+    ModelRegistry,
+    select_default_model,
+)
+from desafio1.api.services.prediction_cache import PredictionCache
+from desafio1.api.services.prediction_log import PredictionLogger
+from desafio1.api.services.prediction_service import EnsembleModel
+from desafio1.api.services.shadow import ShadowComparator
+from desafio1.api.v1.routers.admin_router import app_admin_v1
 from desafio1.api.v1.routers.iris_router import app_iris_predict_v1
+from desafio1.models.ml.knn_scorer import NumpyKNNScorer, knn_artifact_path
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 app = FastAPI(title="Iris Classifier API")
+# Só passa a True depois que os modelos foram carregados e aquecidos no startup.
+app.state.ready = False
 
+# Repassa as requisições sem medi-las quando IRIS_METRICS_ENABLED=0.
+app.add_middleware(MetricsMiddleware)
 app.include_router(app_iris_predict_v1, prefix="/v1")
+app.include_router(app_admin_v1, prefix="/v1")
+
+# Nome reservado para o modelo que combina todas as famílias carregadas.
+ENSEMBLE_MODEL = "ensemble"
 
 
 def get_latest_model_path(models_dir: str) -> str:
@@ -30,10 +56,191 @@ def get_latest_model_path(models_dir: str) -> str:
     return latest_model
 
 
-class ModelNotFoundError(Exception):
-    def __init__(self, message="Nenhum modelo encontrado no diretório especificado."):
-        self.message = message
-        super().__init__(self.message)
+def load_model(model_path: str) -> Any:
+    """
+    Carrega o modelo a ser servido a partir do caminho do `.pkl`.
+
+    Com `settings.scorer == "numpy"`, abre o artefato `.knn` exportado ao lado do
+    `.pkl` em um NumpyKNNScorer, sem desserializar o Pipeline do scikit-learn. Famílias
+    sem esse artefato (dt, lr, nb) são sempre carregadas do `.pkl`.
+
+    Args:
+        model_path (str): Caminho do modelo serializado com pickle.
+
+    Returns:
+        Any: Modelo com `classes_` e `predict_proba`.
+    """
+    artifact_path = knn_artifact_path(model_path)
+    if settings.scorer == "numpy" and os.path.isdir(artifact_path):
+        return NumpyKNNScorer.load(artifact_path)
+    with open(model_path, "rb") as f:
+        return pickle.load(f)  # Use pickle para carregar o modelo
+
+
+def choose_default_model(entries: List[ModelManifestEntry]) -> str:
+    """
+    Escolhe o modelo usado quando a requisição não informa `?model=`.
+
+    Sem `settings.latency_slo_ms`, é sempre `settings.default_model`. Com o SLO, é o
+    mais preciso entre as famílias carregadas cuja latência medida no treino o atende
+    (ver `select_default_model`).
+
+    Args:
+        entries (List[ModelManifestEntry]): Versões em uso de cada família.
+
+    Returns:
+        str: Família do modelo padrão.
+    """
+    if settings.latency_slo_ms is None:
+        return settings.default_model
+    return select_default_model(
+        entries, settings.latency_slo_ms, settings.default_model, settings.scorer
+    )
+
+
+def publish_model(model: Any, entry: ModelManifestEntry) -> None:
+    """
+    Publica um modelo já carregado e aquecido como o modelo servido pela API.
+
+    A troca é uma atribuição de referência: requisições em andamento continuam com o
+    modelo que já obtiveram, e as seguintes passam a usar o novo. O dicionário de
+    modelos é recriado, e não alterado, pelo mesmo motivo. O ensemble é reconstruído
+    com as versões atuais de todas as famílias, e o modelo padrão é escolhido de novo,
+    pois a nova versão pode ter outra latência ou acurácia; o executor e o
+    micro-batcher passam a usar o novo padrão.
+
+    Args:
+        model (Any): Modelo carregado.
+        entry (ModelManifestEntry): Entrada do manifest correspondente.
+    """
+    models = {
+        name: m
+        for name, m in getattr(app.state, "models", {}).items()
+        if name != ENSEMBLE_MODEL
+    }
+    models[entry.algorithm] = model
+    if len(models) > 1:
+        try:
+            models[ENSEMBLE_MODEL] = EnsembleModel(models)
+        except ValueError as e:
+            print(f"Ensemble indisponível: {e}")
+    app.state.models = models
+    app.state.model_versions = {
+        **getattr(app.state, "model_versions", {}),
+        entry.algorithm: entry.version,
+    }
+    METRICS.set_model_version(entry.algorithm, entry.version)
+    entries = {**getattr(app.state, "model_entries", {}), entry.algorithm: entry}
+    app.state.model_entries = entries
+    default_model = choose_default_model(list(entries.values()))
+    if default_model != getattr(app.state, "default_model", None):
+        print(f"Modelo padrão: {default_model}")
+    app.state.default_model = default_model
+    if default_model in entries:
+        app.state.model = models[default_model]
+        app.state.model_version = entries[default_model].version
+    cache = getattr(app.state, "cache", None)
+    if cache is not None:
+        cache.invalidate()
+    drift = getattr(app.state, "drift", None)
+    if drift is not None:
+        drift.set_reference(entry.algorithm, load_reference(entry.path))
+    executor = getattr(app.state, "executor", None)
+    if executor is not None:
+        executor.default_model = default_model
+        executor.reload_model()
+    batcher = getattr(app.state, "batcher", None)
+    if batcher is not None:
+        batcher.default_model = default_model
+
+
+async def start_inference_services(app: FastAPI) -> None:
+    """
+    Cria o executor de inferência, o micro-batcher, o cache de predições, o monitor
+    de drift e o log de predições conforme as configurações.
+    Deve ser chamada depois que `app.state.model` estiver definido.
+
+    Args:
+        app (FastAPI): Aplicação cujo estado receberá os serviços.
+    """
+    app.state.executor = None
+    app.state.batcher = None
+    app.state.shadow = ShadowComparator()
+    app.state.cache = None
+    app.state.drift = None
+    if settings.drift_enabled:
+        app.state.drift = DriftMonitor(
+            buffer_rows=settings.drift_buffer_rows,
+            flush_interval_s=settings.drift_flush_interval_s,
+            window_flushes=settings.drift_window_flushes,
+        )
+        for entry in getattr(app.state, "model_entries", {}).values():
+            app.state.drift.set_reference(entry.algorithm, load_reference(entry.path))
+        await app.state.drift.start()
+    app.state.prediction_log = None
+    if settings.prediction_log_enabled:
+        app.state.prediction_log = PredictionLogger(
+            settings.prediction_log_dir,
+            max_queue_rows=settings.prediction_log_max_queue_rows,
+            flush_rows=settings.prediction_log_flush_rows,
+            flush_interval_s=settings.prediction_log_flush_interval_s,
+            policy=settings.prediction_log_policy,
+        )
+        await app.state.prediction_log.start()
+    if settings.cache_enabled:
+        app.state.cache = PredictionCache(
+            max_entries=settings.cache_max_entries,
+            max_bytes=settings.cache_max_bytes,
+            ttl_s=settings.cache_ttl_s,
+            precision=settings.cache_precision,
+        )
+    if settings.inference_executor != "none":
+        app.state.executor = InferenceExecutor(
+            lambda: app.state.models,
+            default_model=getattr(app.state, "default_model", settings.default_model),
+            kind=settings.inference_executor,
+            max_workers=settings.inference_workers,
+            max_in_flight=settings.inference_max_in_flight,
+        )
+    if settings.microbatch_enabled:
+        app.state.batcher = MicroBatcher(
+            lambda: app.state.models,
+            default_model=getattr(app.state, "default_model", settings.default_model),
+            max_batch_size=settings.microbatch_max_size,
+            max_wait_ms=settings.microbatch_max_wait_ms,
+            max_queue_depth=settings.microbatch_max_queue,
+            executor=app.state.executor,
+        )
+        await app.state.batcher.start()
+
+
+async def stop_inference_services(app: FastAPI) -> None:
+    """
+    Encerra o micro-batcher, avaliando as linhas pendentes, aguarda as comparações
+    shadow em andamento, fecha o intervalo do monitor de drift, grava o que restou
+    na fila do log de predições e depois encerra o executor.
+
+    Args:
+        app (FastAPI): Aplicação cujos serviços serão encerrados.
+    """
+    batcher = getattr(app.state, "batcher", None)
+    if batcher is not None:
+        await batcher.stop()
+        app.state.batcher = None
+    shadow = getattr(app.state, "shadow", None)
+    if shadow is not None:
+        await shadow.drain()
+    drift = getattr(app.state, "drift", None)
+    if drift is not None:
+        await drift.stop()
+    prediction_log = getattr(app.state, "prediction_log", None)
+    if prediction_log is not None:
+        await prediction_log.stop()
+        app.state.prediction_log = None
+    executor = getattr(app.state, "executor", None)
+    if executor is not None:
+        executor.shutdown()
+        app.state.executor = None
 
 
 @app.get("/")
@@ -47,23 +254,85 @@ async def read_root() -> dict:
     return {"message": "Welcome to the Iris Classifier API"}
 
 
+@app.get("/health")
+async def health() -> dict:
+    """
+    Endpoint de liveness: responde assim que o processo aceita conexões.
+
+    Returns:
+        dict: Status do processo.
+    """
+    return {"status": "alive"}
+
+
+@app.get("/ready")
+async def ready() -> JSONResponse:
+    """
+    Endpoint de readiness: responde 200 somente depois que os modelos foram carregados
+    e aquecidos, e 503 até lá.
+
+    Returns:
+        JSONResponse: Status de prontidão e versões dos modelos carregados.
+    """
+    if not getattr(app.state, "ready", False):
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return JSONResponse(
+        content={
+            "status": "ready",
+            "model_versions": getattr(app.state, "model_versions", {}),
+        }
+    )
+
+
+@app.get("/metrics")
+async def metrics() -> PlainTextResponse:
+    """
+    Endpoint de métricas no formato texto do Prometheus: requisições, erros e latência
+    por rota, duração de cada estágio da predição, tamanho dos lotes e versão dos
+    modelos em uso.
+
+    Returns:
+        PlainTextResponse: Métricas coletadas desde o início do processo.
+    """
+    if not METRICS.enabled:
+        raise HTTPException(status_code=404, detail="Métricas desabilitadas.")
+    return PlainTextResponse(
+        METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.on_event("startup")
 async def startup_event() -> None:
     """
     Ação a ser executada quando a aplicação iniciar.
-    Isso inclui a ingestão dos dados do dataset Íris e o carregamento do modelo.
+    Carrega e aquece apenas os artefatos servidos. O dataset Íris só é carregado se
+    `settings.load_dataset_on_startup` estiver ligado, pois nenhum endpoint o utiliza.
     """
+    app.state.ready = False
     try:
-        # Carrega o dataset Íris
-        iris_data = download_iris_dataset()
-        app.state.iris_data = iris_data
-
-        # Carrega o modelo treinado mais recente
-        model_dir = "./saved_models"
-        model_path = get_latest_model_path(model_dir)
-        with open(model_path, "rb") as f:
-            app.state.model = pickle.load(f)  # Use pickle para carregar o modelo
-        print(f"Modelo carregado com sucesso: {model_path}")
+        if settings.load_dataset_on_startup:
+            # Import tardio: pandas e sklearn.datasets ficam fora do boot por padrão.
+            from desafio1.api.services.data_service import download_iris_dataset
+
+            app.state.iris_data = download_iris_dataset()
+
+        # Indexa os artefatos e carrega a versão mais recente de cada família
+        app.state.registry = ModelRegistry(
+            settings.model_path,
+            loader=load_model,
+            on_swap=publish_model,
+            poll_interval_s=settings.model_watch_interval_s,
+            algorithms=settings.serve_models or None,
+        )
+        for entry in await app.state.registry.start():
+            print(f"Modelo carregado com sucesso: {entry.path}")
+        if app.state.default_model not in app.state.models:
+            raise ModelNotFoundError(
+                f"Modelo padrão '{app.state.default_model}' não encontrado."
+            )
+
+        await start_inference_services(app)
+        app.state.ready = True
     except ModelNotFoundError as e:
         print(str(e))
         raise HTTPException(
@@ -85,5 +354,12 @@ async def startup_event() -> None:
 async def shutdown_event() -> None:
     """
     Ação a ser executada quando a aplicação for desligada.
+    As linhas que ainda estiverem na fila do micro-batcher são avaliadas, e as
+    predições ainda na fila do log são gravadas em Parquet, antes de sair.
     """
     print("Aplicação está sendo desligada...")
+    app.state.ready = False
+    registry = getattr(app.state, "registry", None)
+    if registry is not None:
+        await registry.stop()
+    await stop_inference_services(app)
@@ -0,0 +1,154 @@
+from typing import Any, Dict
+
+from desafio1.api.config import settings
+from desafio1.api.services.model_registry import ModelNotFoundError, ModelRegistry
+from fastapi import APIRouter, HTTPException, Query, Request
+from pydantic import BaseModel
+
+app_admin_v1 = APIRouter()
+
+
+class PinModelRequest(BaseModel):
+    """Modelo para a requisição de fixação de versão.
+
+    Attributes:
+        version (str): Versão a ser servida, por exemplo `iris_knn_v1_20240626`.
+    """
+
+    version: str
+
+
+def get_registry(request: Request) -> ModelRegistry:
+    """Obtém o registry de modelos a partir do estado da aplicação.
+
+    Args:
+        request (Request): Requisição atual.
+
+    Returns:
+        ModelRegistry: O registry criado no startup.
+    """
+    registry = getattr(request.app.state, "registry", None)
+    if registry is None:
+        raise HTTPException(status_code=503, detail="Registry de modelos indisponível.")
+    return registry
+
+
+@app_admin_v1.get(
+    "/admin/models",
+    tags=["Admin"],
+    description="Lista as versões indexadas e a versão ativa de cada família",
+)
+async def list_model_versions(req: Request) -> Dict[str, Any]:
+    """Endpoint que retorna o manifest de modelos e as versões ativas e fixadas.
+
+    Args:
+        req (Request): A requisição atual para obter o registry.
+
+    Returns:
+        Dict[str, Any]: Estado do registry.
+    """
+    return get_registry(req).describe()
+
+
+@app_admin_v1.post(
+    "/admin/models/reload",
+    tags=["Admin"],
+    description="Reindexa o diretório e ativa a versão mais nova de cada família",
+)
+async def reload_models(req: Request) -> Dict[str, Any]:
+    """Endpoint que força a verificação de novos artefatos.
+
+    Args:
+        req (Request): A requisição atual para obter o registry.
+
+    Returns:
+        Dict[str, Any]: Estado do registry após a verificação.
+    """
+    registry = get_registry(req)
+    try:
+        await registry.refresh()
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Falha ao carregar o modelo: {e}"
+        ) from e
+    return registry.describe()
+
+
+@app_admin_v1.post(
+    "/admin/models/pin",
+    tags=["Admin"],
+    description="Fixa uma versão, desligando a atualização automática da sua família",
+)
+async def pin_model(request: PinModelRequest, req: Request) -> Dict[str, Any]:
+    """Endpoint que ativa e fixa a versão informada.
+
+    Args:
+        request (PinModelRequest): Objeto contendo a versão desejada.
+        req (Request): A requisição atual para obter o registry.
+
+    Returns:
+        Dict[str, Any]: Estado do registry após a troca.
+    """
+    registry = get_registry(req)
+    try:
+        await registry.pin(request.version)
+    except KeyError as e:
+        raise HTTPException(
+            status_code=404, detail=f"Versão não encontrada: {request.version}"
+        ) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=422, detail=f"Falha ao carregar o modelo: {e}"
+        ) from e
+    return registry.describe()
+
+
+@app_admin_v1.post(
+    "/admin/models/unpin",
+    tags=["Admin"],
+    description="Religa a atualização automática para a versão mais nova",
+)
+async def unpin_model(
+    req: Request, model: str = Query(settings.default_model)
+) -> Dict[str, Any]:
+    """Endpoint que remove a fixação de versão de uma família de modelos.
+
+    Args:
+        req (Request): A requisição atual para obter o registry.
+        model (str): Família do algoritmo (knn, dt, lr, nb).
+
+    Returns:
+        Dict[str, Any]: Estado do registry após a troca.
+    """
+    registry = get_registry(req)
+    await registry.unpin(model)
+    return registry.describe()
+
+
+@app_admin_v1.post(
+    "/admin/models/rollback",
+    tags=["Admin"],
+    description="Volta para a versão servida anteriormente",
+)
+async def rollback_model(
+    req: Request, model: str = Query(settings.default_model)
+) -> Dict[str, Any]:
+    """Endpoint que restaura e fixa a versão de uma família anterior à atual.
+
+    Args:
+        req (Request): A requisição atual para obter o registry.
+        model (str): Família do algoritmo (knn, dt, lr, nb).
+
+    Returns:
+        Dict[str, Any]: Estado do registry após a troca.
+    """
+    registry = get_registry(req)
+    try:
+        await registry.rollback(model)
+    except ModelNotFoundError as e:
+        raise HTTPException(status_code=409, detail=e.message) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=422, detail=f"Falha ao carregar o modelo: {e}"
+        ) from e
+    return registry.describe()
@@ -1,104 +1,796 @@
-from enum import Enum
-from typing import Dict
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type, TypeVar
 
-from fastapi import APIRouter, HTTPException, Request
-from pydantic import BaseModel
-from sklearn.pipeline import Pipeline
+import numpy as np
+from desafio1.api.config import settings
+from desafio1.api.services.batcher import MicroBatcher
+from desafio1.api.services.drift_monitor import DriftMonitor
+from desafio1.api.services.executor import ExecutorSaturatedError
+from desafio1.api.services.metrics import METRICS
+from desafio1.api.services.prediction_cache import PredictionCache
+from desafio1.api.services.prediction_log import PredictionLogger
+from desafio1.api.services.prediction_service import (
+    parse_features,
+    predict_with_proba,
+)
+from desafio1.api.services.stream_scoring import (
+    STREAM_FORMATS,
+    LineTooLongError,
+    score_async_stream,
+)
+from desafio1.models.schemas.iris_schema import (
+    BINARY_MEDIA_TYPE,
+    CLASS_MAPPING,
+    IrisBatchPredictionItem,
+    IrisBatchPredictionRequest,
+    IrisBatchPredictionResponse,
+    IrisPredictionRequest,
+    IrisPredictionResponse,
+    decode_binary_features,
+    encode_binary_predictions,
+)
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response, StreamingResponse
+from numpy import ndarray
+from pydantic import BaseModel, ValidationError
 
 app_iris_predict_v1 = APIRouter()
 
+MODEL_QUERY_DESCRIPTION = (
+    "Modelo que responde à requisição (knn, dt, lr, nb, ensemble)."
+)
+SHADOW_QUERY_DESCRIPTION = "Modelo avaliado em segundo plano apenas para comparação."
 
-class IrisClassNames(str, Enum):
-    """Enum para mapear classes numéricas para nomes de espécies de Íris."""
+RequestModel = TypeVar("RequestModel", bound=BaseModel)
 
-    setosa = "Iris-setosa"
-    versicolor = "Iris-versicolor"
-    virginica = "Iris-virginica"
 
+def request_body_openapi(schema: Type[BaseModel]) -> Dict[str, Any]:
+    """Documenta o corpo lido pelo próprio endpoint nos dois formatos aceitos.
 
-class IrisPredictionRequest(BaseModel):
-    """Modelo para a requisição de predição de Íris.
+    Args:
+        schema (Type[BaseModel]): Schema do corpo em JSON.
 
-    Attributes:
-        sepal_length (float): Comprimento da sépala.
-        sepal_width (float): Largura da sépala.
-        petal_length (float): Comprimento da pétala.
-        petal_width (float): Largura da pétala.
+    Returns:
+        Dict[str, Any]: Trecho `openapi_extra` da rota.
     """
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": schema.model_json_schema()},
+                BINARY_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    }
 
-    sepal_length: float
-    sepal_width: float
-    petal_length: float
-    petal_width: float
+
+BINARY_RESPONSE_OPENAPI: Dict[int, Dict[str, Any]] = {
+    200: {
+        "content": {
+            BINARY_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}}
+        }
+    }
+}
+
+
+def is_binary(req: Request) -> bool:
+    """Indica se a requisição usa o formato binário (`application/x-iris-f32`)."""
+    return req.headers.get("content-type", "").startswith(BINARY_MEDIA_TYPE)
 
 
-class IrisPredictionResponse(BaseModel):
-    """Modelo para a resposta da predição de Íris.
+async def read_json_body(req: Request, schema: Type[RequestModel]) -> RequestModel:
+    """Valida o corpo JSON direto dos bytes, sem o `json.loads` intermediário.
 
-    Attributes:
-        prediction (int): Classe predita como número.
-        class_name (str): Nome da classe predita.
-        probability (float): Probabilidade associada à predição.
+    Args:
+        req (Request): Requisição atual.
+        schema (Type[RequestModel]): Schema do corpo.
+
+    Returns:
+        RequestModel: Corpo validado.
+
+    Raises:
+        RequestValidationError: 422, no mesmo formato da validação do FastAPI.
     """
+    try:
+        return schema.model_validate_json(await req.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors()]
+        ) from e
+
+
+async def read_binary_body(req: Request) -> ndarray:
+    """Lê o corpo binário como matriz (n_linhas, 4) de float32.
+
+    Args:
+        req (Request): Requisição atual.
+
+    Returns:
+        ndarray: Características de cada linha.
+
+    Raises:
+        HTTPException: 400 se o corpo não tiver um número inteiro de linhas.
+    """
+    try:
+        return decode_binary_features(await req.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Erro de valor: {e}") from e
 
-    prediction: int
-    class_name: str
-    probability: float
 
+def prediction_response(prediction: int, probability: float, binary: bool) -> Response:
+    """Serializa a predição unitária no formato da requisição.
 
-def get_model(request: Request) -> Pipeline:
-    """Obtém o modelo treinado a partir do estado da aplicação.
+    Args:
+        prediction (int): Classe predita.
+        probability (float): Probabilidade da classe predita.
+        binary (bool): Se a resposta deve usar o formato binário.
+
+    Returns:
+        Response: Corpo já serializado (o FastAPI não o valida de novo).
+    """
+    if binary:
+        return Response(
+            encode_binary_predictions(np.array([prediction]), np.array([probability])),
+            media_type=BINARY_MEDIA_TYPE,
+        )
+    # model_construct: os valores vêm do modelo e dispensam validação.
+    body = IrisPredictionResponse.model_construct(
+        prediction=prediction,
+        class_name=CLASS_MAPPING[prediction],
+        probability=probability,
+    ).model_dump_json()
+    return Response(body, media_type="application/json")
+
+
+def get_model(request: Request) -> Any:
+    """Obtém o modelo padrão a partir do estado da aplicação.
 
     Args:
         request (Request): Requisição atual.
 
     Returns:
-        Pipeline: O modelo treinado.
+        Any: O modelo treinado (Pipeline do scikit-learn ou NumpyKNNScorer).
     """
     return request.app.state.model
 
 
+def get_models(request: Request) -> Dict[str, Any]:
+    """Obtém os modelos carregados, indexados pelo nome usado no roteamento.
+
+    Args:
+        request (Request): Requisição atual.
+
+    Returns:
+        Dict[str, Any]: Modelos disponíveis (ex.: knn, dt, lr, nb e ensemble).
+    """
+    return getattr(request.app.state, "models", None) or {}
+
+
+def resolve_model_name(request: Request, model: Optional[str]) -> str:
+    """Valida o modelo pedido pelo chamador, usando o modelo padrão quando omitido.
+
+    Args:
+        request (Request): Requisição atual.
+        model (str, optional): Nome do modelo informado na query string.
+
+    Returns:
+        str: Nome de um modelo carregado.
+
+    Raises:
+        HTTPException: 404 se o modelo não estiver carregado.
+    """
+    name = model or getattr(request.app.state, "default_model", settings.default_model)
+    models = get_models(request)
+    if name not in models:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Modelo não disponível: {name}. Disponíveis: {sorted(models)}.",
+        )
+    return name
+
+
+def start_shadow(
+    req: Request,
+    primary: str,
+    shadow: Optional[str],
+    data: ndarray,
+    result: Tuple[ndarray, ndarray],
+) -> None:
+    """Agenda a avaliação do modelo shadow sobre as mesmas linhas, sem aguardá-la.
+
+    Args:
+        req (Request): Requisição atual.
+        primary (str): Nome do modelo que respondeu ao chamador.
+        shadow (str, optional): Nome do modelo shadow; `settings.shadow_model` se omitido.
+        data (ndarray): Linhas avaliadas pelo modelo primário.
+        result (Tuple[ndarray, ndarray]): Classes e probabilidades do modelo primário.
+    """
+    shadow = shadow or settings.shadow_model
+    comparator = getattr(req.app.state, "shadow", None)
+    if not shadow or shadow == primary or comparator is None:
+        return
+    if shadow not in get_models(req):
+        return
+    comparator.submit(primary, shadow, result, run_inference(req, data, shadow))
+
+
+def get_batcher(request: Request) -> Optional[MicroBatcher]:
+    """Obtém o micro-batcher em execução, caso esteja habilitado.
+
+    Args:
+        request (Request): Requisição atual.
+
+    Returns:
+        Optional[MicroBatcher]: O micro-batcher, ou None para avaliar a linha diretamente.
+    """
+    batcher = getattr(request.app.state, "batcher", None)
+    if batcher is None or not batcher.running:
+        return None
+    return batcher
+
+
+def get_drift(request: Request) -> Optional[DriftMonitor]:
+    """Obtém o monitor de drift, caso esteja habilitado.
+
+    Args:
+        request (Request): Requisição atual.
+
+    Returns:
+        Optional[DriftMonitor]: O monitor, ou None para não registrar as linhas.
+    """
+    return getattr(request.app.state, "drift", None)
+
+
+def get_prediction_log(request: Request) -> Optional[PredictionLogger]:
+    """Obtém o log de predições, caso esteja habilitado.
+
+    Args:
+        request (Request): Requisição atual.
+
+    Returns:
+        Optional[PredictionLogger]: O log, ou None para não registrar as predições.
+    """
+    return getattr(request.app.state, "prediction_log", None)
+
+
+async def record_predictions(
+    req: Request,
+    endpoint: str,
+    model_name: str,
+    data: Any,
+    predictions: Any,
+    probabilities: Any,
+) -> None:
+    """Repassa as predições servidas ao monitor de drift e ao log de predições.
+
+    Args:
+        req (Request): Requisição atual.
+        endpoint (str): Rota de origem (`single`, `batch` ou `stream`).
+        model_name (str): Modelo que respondeu.
+        data (Any): Uma linha (predição unitária) ou matriz de características.
+        predictions (Any): Classe prevista (um inteiro ou um array por linha).
+        probabilities (Any): Probabilidade da classe (um float ou um array).
+    """
+    drift = get_drift(req)
+    if drift is not None:
+        drift.record(model_name, data, predictions)
+    prediction_log = get_prediction_log(req)
+    if prediction_log is not None:
+        version = getattr(req.app.state, "model_versions", {}).get(model_name, "")
+        await prediction_log.log(
+            endpoint, model_name, version, data, predictions, probabilities
+        )
+
+
+def get_cache(request: Request) -> Optional[PredictionCache]:
+    """Obtém o cache de predições, caso esteja habilitado.
+
+    Args:
+        request (Request): Requisição atual.
+
+    Returns:
+        Optional[PredictionCache]: O cache, ou None para sempre avaliar o modelo.
+    """
+    return getattr(request.app.state, "cache", None)
+
+
+async def run_inference(
+    req: Request, data: ndarray, model_name: str
+) -> Tuple[ndarray, ndarray]:
+    """Avalia um lote no executor de inferência, se houver, ou diretamente no loop.
+
+    Args:
+        req (Request): Requisição atual.
+        data (ndarray): Matriz (n_amostras, n_atributos) com as características.
+        model_name (str): Modelo a ser usado.
+
+    Returns:
+        Tuple[ndarray, ndarray]: Classes preditas e probabilidade da classe escolhida.
+    """
+    executor = getattr(req.app.state, "executor", None)
+    if executor is not None:
+        return await executor.predict(data, model_name)
+    return predict_with_proba(get_models(req)[model_name], data)
+
+
+def saturated_exception(e: ExecutorSaturatedError) -> HTTPException:
+    """Converte a saturação do executor em uma resposta 503 com Retry-After."""
+    return HTTPException(
+        status_code=503, detail=e.message, headers={"Retry-After": "1"}
+    )
+
+
 @app_iris_predict_v1.post(
     "/iris/predict",
     tags=["Predictions"],
     response_model=IrisPredictionResponse,
+    responses=BINARY_RESPONSE_OPENAPI,
+    openapi_extra=request_body_openapi(IrisPredictionRequest),
     description="Obtenha uma classificação para flores de Íris",
 )
 async def get_prediction(
-    request: IrisPredictionRequest, req: Request
-) -> IrisPredictionResponse:
+    req: Request,
+    model: Optional[str] = Query(None, description=MODEL_QUERY_DESCRIPTION),
+    shadow: Optional[str] = Query(None, description=SHADOW_QUERY_DESCRIPTION),
+) -> Response:
     """Endpoint para obter previsões das espécies de flores Íris a partir das características da flor.
 
+    O corpo é um IrisPredictionRequest em JSON ou, com `Content-Type:
+    application/x-iris-f32`, uma linha de quatro float32 little-endian; a resposta
+    usa o mesmo formato.
+
     Args:
-        request (IrisPredictionRequest): Objeto contendo características de uma flor Íris.
-        req (Request): A requisição atual para obter o modelo treinado.
+        req (Request): A requisição atual, com as características de uma flor Íris.
+        model (str, optional): Modelo que responde à requisição (knn, dt, lr, nb, ensemble).
+        shadow (str, optional): Modelo avaliado em segundo plano apenas para comparação.
 
     Returns:
-        IrisPredictionResponse: Um objeto contendo a previsão, o nome da classe e a probabilidade.
+        Response: A previsão, o nome da classe e a probabilidade (IrisPredictionResponse),
+            ou um registro binário com a classe e a probabilidade.
     """
-    model = get_model(req)
-    class_mapping: Dict[int, str] = {
-        0: IrisClassNames.setosa.value,
-        1: IrisClassNames.versicolor.value,
-        2: IrisClassNames.virginica.value,
-    }
+    binary = is_binary(req)
+    if binary:
+        data = await read_binary_body(req)
+        if len(data) != 1 or not np.isfinite(data).all():
+            raise HTTPException(
+                status_code=400,
+                detail="Erro de valor: o corpo binário deve ter uma linha de valores finitos.",
+            )
+        features = data[0].tolist()
+    else:
+        request = await read_json_body(req, IrisPredictionRequest)
+        features = [
+            request.sepal_length,
+            request.sepal_width,
+            request.petal_length,
+            request.petal_width,
+        ]
+        # O JSON aceita NaN e Infinity; a linha é recusada aqui, antes de entrar em um
+        # lote do micro-batcher compartilhado com outras requisições.
+        if not np.isfinite(features).all():
+            raise HTTPException(
+                status_code=400,
+                detail="Erro de valor: as características devem ser valores finitos.",
+            )
+    METRICS.handler_started(req.scope)
+    model_name = resolve_model_name(req, model)
+    cache = get_cache(req)
+    if cache is not None:
+        cache_key = cache.key(model_name, features)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            prediction, probability = cached
+            await record_predictions(
+                req, "single", model_name, features, prediction, probability
+            )
+            METRICS.handler_finishing(req.scope)
+            return prediction_response(prediction, probability, binary)
+        generation = cache.generation
+    batcher = get_batcher(req)
 
     try:
-        data = [
-            [
-                request.sepal_length,
-                request.sepal_width,
-                request.petal_length,
-                request.petal_width,
-            ]
-        ]
-        prediction = model.predict(data)[0]
-        class_name = class_mapping[prediction]
-        probability = max(model.predict_proba(data)[0])
-        return IrisPredictionResponse(
-            prediction=prediction, class_name=class_name, probability=probability
+        with METRICS.stage("inference"):
+            if batcher is not None:
+                prediction, probability = await batcher.submit(features, model_name)
+            else:
+                METRICS.observe_batch_size("single", 1)
+                predictions, probabilities = await run_inference(
+                    req, np.array([features]), model_name
+                )
+                prediction, probability = int(predictions[0]), float(probabilities[0])
+        if cache is not None:
+            cache.put(cache_key, (prediction, probability), generation)
+        await record_predictions(
+            req, "single", model_name, features, prediction, probability
+        )
+        start_shadow(
+            req,
+            model_name,
+            shadow,
+            np.array([features]),
+            (np.array([prediction]), np.array([probability])),
+        )
+        METRICS.handler_finishing(req.scope)
+        return prediction_response(prediction, probability, binary)
+    except ExecutorSaturatedError as e:
+        raise saturated_exception(e) from e
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Erro de valor: {e}") from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro do servidor: {e}") from e
+
+
+def check_batch_size(n_rows: int) -> None:
+    """Recusa lotes acima de `settings.max_batch_size` com 413."""
+    if n_rows > settings.max_batch_size:
+        raise HTTPException(
+            status_code=413,
+            detail=(
+                f"O lote possui {n_rows} linhas; "
+                f"o máximo permitido é {settings.max_batch_size}."
+            ),
         )
+
+
+async def infer_batch(
+    req: Request, data: ndarray, model_name: str
+) -> Tuple[ndarray, ndarray]:
+    """Avalia as linhas válidas de um lote, convertendo falhas em respostas HTTP."""
+    try:
+        METRICS.observe_batch_size("batch", len(data))
+        return await run_inference(req, data, model_name)
+    except ExecutorSaturatedError as e:
+        raise saturated_exception(e) from e
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Erro de valor: {e}") from e
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro do servidor: {e}") from e
+
+
+async def get_binary_batch_prediction(
+    req: Request, model_name: str, shadow: Optional[str]
+) -> Response:
+    """Avalia um lote binário sem criar objetos por linha.
+
+    Linhas com valores não finitos voltam com classe -1 e probabilidade NaN. O lote
+    binário não consulta o cache de predições, cuja chave é montada linha a linha.
+    """
+    data = await read_binary_body(req)
+    check_batch_size(len(data))
+    valid = np.isfinite(data).all(axis=1)
+    predictions = np.full(len(data), -1, dtype=np.int32)
+    probabilities = np.full(len(data), np.nan, dtype=np.float32)
+    if valid.any():
+        rows = data[valid]
+        result = await infer_batch(req, rows, model_name)
+        start_shadow(req, model_name, shadow, rows, result)
+        await record_predictions(req, "batch", model_name, rows, *result)
+        predictions[valid], probabilities[valid] = result
+    return Response(
+        encode_binary_predictions(predictions, probabilities),
+        media_type=BINARY_MEDIA_TYPE,
+    )
+
+
+@app_iris_predict_v1.post(
+    "/iris/predict/batch",
+    tags=["Predictions"],
+    response_model=IrisBatchPredictionResponse,
+    responses=BINARY_RESPONSE_OPENAPI,
+    openapi_extra=request_body_openapi(IrisBatchPredictionRequest),
+    description="Obtenha classificações para um lote de flores de Íris",
+)
+async def get_batch_prediction(
+    req: Request,
+    model: Optional[str] = Query(None, description=MODEL_QUERY_DESCRIPTION),
+    shadow: Optional[str] = Query(None, description=SHADOW_QUERY_DESCRIPTION),
+) -> Response:
+    """Endpoint para obter previsões de várias flores Íris em uma única chamada.
+
+    As linhas válidas são empilhadas em um único array NumPy contíguo e avaliadas com
+    uma só chamada a `predict_proba`. Linhas inválidas recebem o campo `error` e não
+    interrompem o processamento das demais. Com o cache habilitado, só as linhas
+    ausentes do cache são avaliadas. Com `Content-Type: application/x-iris-f32`, o
+    corpo e a resposta usam o formato binário (ver `iris_schema`).
+
+    Args:
+        req (Request): A requisição atual, com as linhas a serem avaliadas.
+        model (str, optional): Modelo que responde à requisição (knn, dt, lr, nb, ensemble).
+        shadow (str, optional): Modelo avaliado em segundo plano apenas para comparação.
+
+    Returns:
+        Response: Resultados por linha, na ordem da requisição
+            (IrisBatchPredictionResponse ou registros binários).
+    """
+    if is_binary(req):
+        return await get_binary_batch_prediction(
+            req, resolve_model_name(req, model), shadow
+        )
+    request = await read_json_body(req, IrisBatchPredictionRequest)
+    check_batch_size(len(request.instances))
+
+    model_name = resolve_model_name(req, model)
+    results: List[IrisBatchPredictionItem] = []
+    valid_rows: List[List[float]] = []
+    valid_items: List[IrisBatchPredictionItem] = []
+    for index, row in enumerate(request.instances):
+        item = IrisBatchPredictionItem(index=index)
+        try:
+            valid_rows.append(parse_features(row))
+            valid_items.append(item)
+        except ValueError as e:
+            item.error = str(e)
+        results.append(item)
+
+    cache = get_cache(req)
+    if cache is not None and valid_rows:
+        generation = cache.generation
+        cache_keys = []
+        pending_rows: List[List[float]] = []
+        pending_items: List[IrisBatchPredictionItem] = []
+        for item, row in zip(valid_items, valid_rows):
+            cache_key = cache.key(model_name, row)
+            cached = cache.get(cache_key)
+            if cached is None:
+                cache_keys.append(cache_key)
+                pending_rows.append(row)
+                pending_items.append(item)
+            else:
+                item.prediction, item.probability = cached
+                item.class_name = CLASS_MAPPING[item.prediction]
+    else:
+        pending_rows, pending_items = valid_rows, valid_items
+
+    if pending_rows:
+        data = np.array(pending_rows)
+        predictions, probabilities = await infer_batch(req, data, model_name)
+        start_shadow(req, model_name, shadow, data, (predictions, probabilities))
+        for item, prediction, probability in zip(
+            pending_items, predictions.tolist(), probabilities.tolist()
+        ):
+            item.prediction = prediction
+            item.class_name = CLASS_MAPPING[prediction]
+            item.probability = probability
+        if cache is not None:
+            for cache_key, item in zip(cache_keys, pending_items):
+                cache.put(cache_key, (item.prediction, item.probability), generation)
+    if valid_rows:
+        await record_predictions(
+            req,
+            "batch",
+            model_name,
+            valid_rows,
+            np.array([item.prediction for item in valid_items]),
+            np.array([item.probability for item in valid_items]),
+        )
+
+    body = IrisBatchPredictionResponse.model_construct(
+        predictions=results,
+        n_success=len(valid_items),
+        n_errors=len(results) - len(valid_items),
+    ).model_dump_json()
+    return Response(body, media_type="application/json")
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """Resposta em streaming produzida enquanto o corpo da requisição ainda é lido.
+
+    A StreamingResponse do Starlette pode escutar o canal `receive` em paralelo para
+    detectar a desconexão do cliente, competindo pelas mensagens com `request.stream()`.
+    Aqui o próprio gerador consome `receive`, e uma desconexão interrompe a leitura.
+    """
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+@app_iris_predict_v1.post(
+    "/iris/predict/stream",
+    tags=["Predictions"],
+    description=(
+        "Classifica um arquivo NDJSON ou CSV de qualquer tamanho, devolvendo os "
+        "resultados em streaming, no mesmo formato da entrada"
+    ),
+)
+async def get_stream_prediction(
+    req: Request,
+    model: Optional[str] = Query(None, description=MODEL_QUERY_DESCRIPTION),
+    format: Optional[str] = Query(
+        None, description="ndjson ou csv; padrão: deduzido do Content-Type."
+    ),
+) -> StreamingResponse:
+    """Endpoint para classificar arquivos grandes sem carregá-los inteiros em memória.
+
+    O corpo é lido de forma incremental e agrupado em blocos de
+    `settings.stream_chunk_size` linhas, cada um avaliado com uma única chamada ao
+    modelo. Cada linha de saída traz `index` (posição da linha na entrada) e a predição
+    ou o campo `error`. Como esta rota é usada para cargas em massa, quando o executor
+    de inferência está saturado o bloco aguarda, em vez de a resposta falhar com 503.
+
+    Uma linha maior que `settings.stream_max_line_bytes` é recusada com 413 se
+    aparecer antes do primeiro bloco; depois dele, ela encerra a saída com um erro.
+
+    Args:
+        req (Request): A requisição atual, cujo corpo contém as linhas.
+        model (str, optional): Modelo que responde à requisição (knn, dt, lr, nb, ensemble).
+        format (str, optional): Formato da entrada e da saída (ndjson ou csv).
+
+    Returns:
+        StreamingResponse: Resultados em NDJSON ou CSV, na ordem da entrada.
+    """
+    content_type = req.headers.get("content-type", "")
+    fmt = format or ("csv" if content_type.startswith("text/csv") else "ndjson")
+    if fmt not in STREAM_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Formato não suportado: {fmt}. Use {list(STREAM_FORMATS)}.",
+        )
+    model_name = resolve_model_name(req, model)
+
+    async def infer(data: ndarray) -> Tuple[ndarray, ndarray]:
+        METRICS.observe_batch_size("stream", len(data))
+        while True:
+            try:
+                result = await run_inference(req, data, model_name)
+            except ExecutorSaturatedError:
+                await asyncio.sleep(0.01)
+                continue
+            await record_predictions(req, "stream", model_name, data, *result)
+            return result
+
+    results = score_async_stream(
+        req.stream(),
+        infer,
+        fmt,
+        CLASS_MAPPING,
+        settings.stream_chunk_size,
+        settings.stream_max_line_bytes,
+    )
+    # O primeiro bloco é avaliado antes de a resposta começar, enquanto o status
+    # ainda pode ser alterado.
+    try:
+        first = await results.__anext__()
+    except LineTooLongError as e:
+        raise HTTPException(status_code=413, detail=str(e)) from e
+    except StopAsyncIteration:
+        first = ""
+
+    async def stream() -> AsyncIterator[str]:
+        yield first
+        async for text in results:
+            yield text
+
+    return RequestStreamingResponse(
+        stream(), media_type="text/csv" if fmt == "csv" else "application/x-ndjson"
+    )
+
+
+@app_iris_predict_v1.get(
+    "/iris/batcher/stats",
+    tags=["Monitoring"],
+    description="Estatísticas do micro-batching do endpoint de predição",
+)
+async def get_batcher_stats(req: Request) -> Dict[str, Any]:
+    """Endpoint que expõe a profundidade da fila, o histograma de tamanho dos lotes e a
+    latência de avaliação de cada lote do micro-batcher.
+
+    Args:
+        req (Request): A requisição atual para obter o micro-batcher.
+
+    Returns:
+        Dict[str, Any]: Estatísticas do micro-batcher.
+    """
+    batcher = get_batcher(req)
+    if batcher is None:
+        raise HTTPException(status_code=404, detail="Micro-batching desabilitado.")
+    return batcher.stats()
+
+
+@app_iris_predict_v1.get(
+    "/iris/cache/stats",
+    tags=["Monitoring"],
+    description="Estatísticas do cache de predições",
+)
+async def get_cache_stats(req: Request) -> Dict[str, Any]:
+    """Endpoint que expõe a taxa de acerto, as remoções e a memória usada pelo cache.
+
+    Args:
+        req (Request): A requisição atual para obter o cache.
+
+    Returns:
+        Dict[str, Any]: Estatísticas do cache de predições.
+    """
+    cache = get_cache(req)
+    if cache is None:
+        raise HTTPException(status_code=404, detail="Cache de predições desabilitado.")
+    return cache.stats()
+
+
+@app_iris_predict_v1.get(
+    "/iris/prediction-log/stats",
+    tags=["Monitoring"],
+    description="Estatísticas do log de predições em Parquet",
+)
+async def get_prediction_log_stats(req: Request) -> Dict[str, Any]:
+    """Endpoint que expõe as linhas gravadas, descartadas e na fila do log de predições.
+
+    Args:
+        req (Request): A requisição atual para obter o log de predições.
+
+    Returns:
+        Dict[str, Any]: Estatísticas do log de predições.
+    """
+    prediction_log = get_prediction_log(req)
+    if prediction_log is None:
+        raise HTTPException(status_code=404, detail="Log de predições desabilitado.")
+    return prediction_log.stats()
+
+
+@app_iris_predict_v1.get(
+    "/iris/drift",
+    tags=["Monitoring"],
+    description="Drift das entradas e das predições em relação ao perfil do treino",
+)
+async def get_drift_stats(req: Request) -> Dict[str, Any]:
+    """Endpoint que compara a distribuição recente das linhas avaliadas com o perfil de
+    referência gravado no treino de cada modelo.
+
+    Args:
+        req (Request): A requisição atual para obter o monitor de drift.
+
+    Returns:
+        Dict[str, Any]: Por modelo, PSI, KS e quantis de cada atributo, PSI e
+            frequência das classes previstas e o status (ok, warning ou drift).
+    """
+    drift = get_drift(req)
+    if drift is None:
+        raise HTTPException(
+            status_code=404, detail="Monitoramento de drift desabilitado."
+        )
+    return drift.stats()
+
+
+@app_iris_predict_v1.get(
+    "/iris/models",
+    tags=["Predictions"],
+    description="Lista os modelos disponíveis para roteamento",
+)
+async def list_models(req: Request) -> Dict[str, Any]:
+    """Endpoint que lista os modelos carregados e o modelo padrão.
+
+    Args:
+        req (Request): A requisição atual para obter os modelos.
+
+    Returns:
+        Dict[str, Any]: Nomes dos modelos, modelo padrão (escolhido pelo SLO de
+            latência, se configurado) e modelo shadow configurado.
+    """
+    return {
+        "models": sorted(get_models(req)),
+        "default_model": getattr(
+            req.app.state, "default_model", settings.default_model
+        ),
+        "shadow_model": settings.shadow_model,
+        "latency_slo_ms": settings.latency_slo_ms,
+    }
+
+
+@app_iris_predict_v1.get(
+    "/iris/shadow/stats",
+    tags=["Monitoring"],
+    description="Concordância entre o modelo primário e o modelo shadow",
+)
+async def get_shadow_stats(req: Request) -> Dict[str, Any]:
+    """Endpoint que expõe a concordância acumulada entre modelos primário e shadow.
+
+    Args:
+        req (Request): A requisição atual para obter o comparador.
+
+    Returns:
+        Dict[str, Any]: Estatísticas por par primário/shadow.
+    """
+    comparator = getattr(req.app.state, "shadow", None)
+    return comparator.stats() if comparator is not None else {}
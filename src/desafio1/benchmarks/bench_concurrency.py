@@ -0,0 +1,98 @@
+"""
+Teste de carga do endpoint `POST /v1/iris/predict` com clientes concorrentes.
+
+Compara a inferência inline no event loop (comportamento anterior) com a inferência
+nos executores de threads e de processos, com e sem micro-batching, para 1, 8 e 64
+clientes. A aplicação
+roda em processo, via transporte ASGI do httpx, com um modelo treinado em memória.
+
+Uso:
+    PYTHONPATH=src python -m desafio1.benchmarks.bench_concurrency --requests 2000
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+import httpx
+from desafio1.api.config import settings
+from desafio1.api.v1.main import app, start_inference_services, stop_inference_services
+from desafio1.benchmarks.common import latency_summary, train_reference_model
+
+PAYLOAD = {
+    "sepal_length": 6.3,
+    "sepal_width": 2.8,
+    "petal_length": 5.1,
+    "petal_width": 1.5,
+}
+
+SCENARIOS = {
+    "inline": {"inference_executor": "none", "microbatch_enabled": False},
+    "thread": {"inference_executor": "thread", "microbatch_enabled": False},
+    "thread+microbatch": {"inference_executor": "thread", "microbatch_enabled": True},
+    "process": {"inference_executor": "process", "microbatch_enabled": False},
+    "process+microbatch": {"inference_executor": "process", "microbatch_enabled": True},
+}
+
+
+async def run_load(concurrency: int, total_requests: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    per_client = max(1, total_requests // concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            for _ in range(per_client):
+                start = time.perf_counter()
+                response = await client.post("/v1/iris/predict", json=PAYLOAD)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    summary = latency_summary(latencies)
+    summary["throughput_rps"] = len(latencies) / elapsed
+    summary["errors"] = errors
+    return summary
+
+
+async def run_scenario(name: str, concurrency: int, total: int) -> Dict[str, float]:
+    for key, value in SCENARIOS[name].items():
+        setattr(settings, key, value)
+    await start_inference_services(app)
+    try:
+        await run_load(concurrency, min(total, 200))
+        return await run_load(concurrency, total)
+    finally:
+        await stop_inference_services(app)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 64])
+    args = parser.parse_args()
+
+    app.state.models = {"knn": train_reference_model()}
+    header = f"{'cenário':<20}{'clientes':>9}{'req/s':>10}{'p50 (ms)':>10}"
+    print(header + f"{'p99 (ms)':>10}{'erros':>7}")
+    for name in SCENARIOS:
+        for concurrency in args.concurrency:
+            summary = asyncio.run(run_scenario(name, concurrency, args.requests))
+            print(
+                f"{name:<20}{concurrency:>9}{summary['throughput_rps']:>10.0f}"
+                f"{summary['p50_us'] / 1000:>10.2f}{summary['p99_us'] / 1000:>10.2f}"
+                f"{summary['errors']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
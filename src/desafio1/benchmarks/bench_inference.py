@@ -0,0 +1,83 @@
+"""
+Microbenchmark da latência por requisição do caminho de inferência.
+
+Compara o caminho antigo (`predict` seguido de `predict_proba`) com o caminho atual
+(uma única chamada a `predict_proba` e argmax), servindo o Pipeline do scikit-learn e
+o NumpyKNNScorer exportado a partir dele.
+
+Uso:
+    PYTHONPATH=src python -m desafio1.benchmarks.bench_inference --iterations 2000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+from desafio1.api.services.prediction_service import predict_with_proba
+from desafio1.models.schemas.iris_schema import CLASS_MAPPING
+from desafio1.benchmarks.common import latency_summary, train_reference_model
+from desafio1.models.ml.knn_scorer import NumpyKNNScorer, export_knn_artifact
+from sklearn.pipeline import Pipeline
+
+ROW = [5.1, 3.5, 1.4, 0.2]
+
+
+def legacy_path(model: Pipeline) -> None:
+    class_mapping: Dict[int, str] = {0: "setosa", 1: "versicolor", 2: "virginica"}
+    data = [ROW]
+    prediction = model.predict(data)[0]
+    class_mapping[prediction]
+    max(model.predict_proba(data)[0])
+
+
+def single_pass_path(model: Pipeline) -> None:
+    predictions, probabilities = predict_with_proba(model, np.array([ROW]))
+    prediction = int(predictions[0])
+    CLASS_MAPPING[prediction]
+    float(probabilities[0])
+
+
+def measure(
+    fn: Callable[[Pipeline], None], model: Pipeline, iterations: int
+) -> List[float]:
+    for _ in range(50):
+        fn(model)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(model)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    model = train_reference_model()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        artifact_path = os.path.join(tmp_dir, "iris_knn.npz")
+        export_knn_artifact(model, artifact_path)
+        scorer = NumpyKNNScorer.load(artifact_path)
+    results = {
+        "predict+predict_proba": latency_summary(
+            measure(legacy_path, model, args.iterations)
+        ),
+        "predict_proba+argmax": latency_summary(
+            measure(single_pass_path, model, args.iterations)
+        ),
+        "numpy scorer": latency_summary(
+            measure(single_pass_path, scorer, args.iterations)
+        ),
+    }
+    print(f"{'caminho':<24}{'p50 (us)':>12}{'p99 (us)':>12}")
+    for name, summary in results.items():
+        print(f"{name:<24}{summary['p50_us']:>12.1f}{summary['p99_us']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Recall x latência dos índices de vizinhos do NumpyKNNScorer conforme o conjunto de
+referência cresce.
+
+Para cada tamanho, treina o pipeline StandardScaler + KNN em linhas sorteadas do Íris
+com ruído gaussiano, exporta um artefato `.knn` por índice (o tempo de exportação
+inclui a construção do índice) e mede, sobre o artefato carregado:
+
+- latência p50/p95 de uma consulta unitária;
+- custo por linha de um lote de consultas;
+- recall@k: fração dos k vizinhos exatos (força bruta) devolvidos pelo índice.
+
+Uso:
+    PYTHONPATH=src python -m desafio1.benchmarks.bench_neighbor_index
+    PYTHONPATH=src python -m desafio1.benchmarks.bench_neighbor_index \\
+        --sizes 100 1000 10000 --n-probe 1 4 16
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+from desafio1.benchmarks.common import latency_summary
+from desafio1.models.ml.knn_scorer import NumpyKNNScorer, export_knn_artifact
+from numpy import ndarray
+from sklearn import datasets
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+
+def reference_set(n_rows: int, seed: int = 0) -> Dict[str, ndarray]:
+    """
+    Gera um conjunto de referência com `n_rows` linhas do Íris com ruído.
+
+    Args:
+        n_rows (int): Linhas do conjunto de referência.
+        seed (int): Semente do sorteio.
+
+    Returns:
+        Dict[str, ndarray]: `X`/`y` de referência e `queries` (linhas novas, do
+            mesmo processo gerador).
+    """
+    X, y = datasets.load_iris(return_X_y=True)
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(y), n_rows + 1_000)
+    noisy = X[rows] + rng.normal(0, 0.1, (len(rows), X.shape[1]))
+    return {"X": noisy[:n_rows], "y": y[rows[:n_rows]], "queries": noisy[n_rows:]}
+
+
+def neighbor_distances(scorer: NumpyKNNScorer, Z: ndarray, found: ndarray) -> ndarray:
+    """
+    Calcula a distância de cada consulta a cada vizinho encontrado.
+
+    Args:
+        scorer (NumpyKNNScorer): Scorer que encontrou os vizinhos.
+        Z (ndarray): Consultas padronizadas.
+        found (ndarray): Vizinhos, (n_consultas, k), com índices de `scorer.fit_X`.
+
+    Returns:
+        ndarray: Distâncias, (n_consultas, k).
+    """
+    return np.linalg.norm(scorer.fit_X[found] - Z[:, None, :], axis=2)
+
+
+def recall(found_distances: ndarray, exact_distances: ndarray) -> float:
+    """
+    Calcula o recall@k: fração dos vizinhos encontrados que estão entre os k mais
+    próximos. Compara distâncias, e não índices, porque o `ivf` grava as linhas em
+    outra ordem.
+
+    Args:
+        found_distances (ndarray): Distâncias dos vizinhos do índice, (n_consultas, k).
+        exact_distances (ndarray): Distâncias dos vizinhos exatos, (n_consultas, k).
+
+    Returns:
+        float: Recall médio.
+    """
+    kth = exact_distances.max(axis=1, keepdims=True)
+    return float((found_distances <= kth + 1e-6).mean())
+
+
+def measure(scorer: NumpyKNNScorer, Z: ndarray, repeats: int) -> Dict[str, float]:
+    """
+    Mede a busca de vizinhos em consultas unitárias e em um lote.
+
+    Args:
+        scorer (NumpyKNNScorer): Scorer com o índice avaliado.
+        Z (ndarray): Consultas padronizadas.
+        repeats (int): Consultas unitárias medidas.
+
+    Returns:
+        Dict[str, float]: Percentis da consulta unitária e custo por linha do lote,
+            em microssegundos.
+    """
+    k = scorer.n_neighbors
+    scorer.index.search(Z[:1], k)
+    samples = []
+    for i in range(repeats):
+        row = Z[i % len(Z)].reshape(1, -1)
+        start = time.perf_counter()
+        scorer.index.search(row, k)
+        samples.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    scorer.index.search(Z, k)
+    batch_us = (time.perf_counter() - start) / len(Z) * 1e6
+    return {**latency_summary(samples), "batch_row_us": batch_us}
+
+
+def run(
+    sizes: List[int], n_probes: List[int], repeats: int, n_neighbors: int
+) -> List[Dict[str, float]]:
+    """
+    Executa o benchmark para cada tamanho de referência e índice.
+
+    Args:
+        sizes (List[int]): Tamanhos do conjunto de referência.
+        n_probes (List[int]): Listas visitadas por consulta nas variantes do `ivf`.
+        repeats (int): Consultas unitárias medidas por índice.
+        n_neighbors (int): k do KNN.
+
+    Returns:
+        List[Dict[str, float]]: Uma linha por tamanho e índice.
+    """
+    results = []
+    for n_rows in sizes:
+        data = reference_set(n_rows)
+        model = Pipeline(
+            [
+                ("scaler", StandardScaler()),
+                ("classifier", KNeighborsClassifier(n_neighbors=n_neighbors)),
+            ]
+        ).fit(data["X"], data["y"])
+        variants = [("brute", {}), ("kd_tree", {}), ("ball_tree", {})]
+        variants += [(f"ivf/{p}", {"n_probe": p}) for p in n_probes]
+
+        exact = None
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name, params in variants:
+                path = os.path.join(tmp_dir, f"{name.replace('/', '_')}.knn")
+                start = time.perf_counter()
+                export_knn_artifact(model, path, index=name.split("/")[0], **params)
+                build_s = time.perf_counter() - start
+                scorer = NumpyKNNScorer.load(path)
+                Z = scorer.transform(data["queries"])
+                found = scorer.index.search(Z, n_neighbors)
+                distances = neighbor_distances(scorer, Z, found)
+                if exact is None:
+                    exact = distances
+                results.append(
+                    {
+                        "rows": n_rows,
+                        "index": name,
+                        "build_s": build_s,
+                        "recall": recall(distances, exact),
+                        **measure(scorer, Z, repeats),
+                    }
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 1_000, 10_000, 100_000, 1_000_000],
+    )
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--n-neighbors", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'linhas':>9} {'índice':<10} {'build s':>8} {'recall':>7} {'p50 µs':>9} "
+        f"{'p95 µs':>9} {'lote µs/linha':>14}"
+    )
+    for row in run(args.sizes, args.n_probe, args.repeats, args.n_neighbors):
+        print(
+            f"{row['rows']:>9} {row['index']:<10} {row['build_s']:>8.2f} "
+            f"{row['recall']:>7.3f} {row['p50_us']:>9.1f} {row['p95_us']:>9.1f} "
+            f"{row['batch_row_us']:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
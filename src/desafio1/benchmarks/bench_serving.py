@@ -0,0 +1,490 @@
+"""
+Teste de carga reproduzível do caminho de serving: predição unitária, em lote e em
+streaming, com vários níveis de concorrência e nos dois formatos de transporte
+(`--encodings json binary`; o streaming só existe em JSON).
+
+A API é exercitada de duas formas: em processo, via transporte ASGI do httpx (mede o
+custo da aplicação sem rede), e por HTTP em um uvicorn local iniciado pelo próprio
+benchmark. Os modelos são treinados em memória e gravados em um diretório temporário
+(`IRIS_MODEL_PATH`); as demais configurações do servidor seguem as variáveis `IRIS_*`
+do ambiente. As cargas são sintéticas (semente fixa) ou repetem as linhas de um
+arquivo NDJSON (`--replay`). Além da vazão, cada nível reporta as requisições por
+segundo de CPU do processo servidor (`rps_per_core`; em processo, a CPU inclui o
+cliente httpx). O resultado é gravado em JSON, com o commit e o ambiente, e
+`--compare` mostra a variação em relação a uma execução anterior.
+
+Uso:
+    PYTHONPATH=src python -m desafio1.benchmarks.bench_serving --duration 5 \\
+        --output resultados/serving.json --compare resultados/serving-base.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+from desafio1.benchmarks.common import latency_summary
+from desafio1.models.schemas.iris_schema import (
+    BINARY_MEDIA_TYPE,
+    FEATURE_NAMES,
+    encode_binary_features,
+)
+
+SCENARIOS = ("single", "batch", "stream")
+ENCODINGS = ("json", "binary")
+TARGETS = ("inprocess", "uvicorn")
+# Faixa de valores das quatro características no dataset Íris, em cm.
+FEATURE_RANGES = ((4.3, 7.9), (2.0, 4.4), (1.0, 6.9), (0.1, 2.5))
+
+
+def synthetic_rows(n_rows: int, seed: int) -> List[Dict[str, float]]:
+    """
+    Gera linhas aleatórias dentro da faixa do dataset, com a precisão das medições.
+
+    Args:
+        n_rows (int): Quantidade de linhas.
+        seed (int): Semente do gerador, para que as cargas sejam reproduzíveis.
+
+    Returns:
+        List[Dict[str, float]]: Linhas no formato do corpo de `POST /v1/iris/predict`.
+    """
+    rng = np.random.default_rng(seed)
+    low, high = np.array(FEATURE_RANGES).T
+    values = rng.uniform(low, high, size=(n_rows, len(FEATURE_NAMES))).round(1)
+    return [dict(zip(FEATURE_NAMES, row)) for row in values.tolist()]
+
+
+def replay_rows(path: str) -> List[Dict[str, Any]]:
+    """
+    Lê as linhas de um arquivo NDJSON, ignorando as que não têm as quatro
+    características.
+
+    Args:
+        path (str): Arquivo NDJSON com um objeto por linha.
+
+    Returns:
+        List[Dict[str, Any]]: Linhas no formato do corpo de `POST /v1/iris/predict`.
+    """
+    rows = []
+    with open(path) as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(row, dict) and all(name in row for name in FEATURE_NAMES):
+                rows.append({name: row[name] for name in FEATURE_NAMES})
+    if not rows:
+        raise ValueError(f"Nenhuma linha com {FEATURE_NAMES} em {path}.")
+    return rows
+
+
+class Workload:
+    """
+    Requisições de cada cenário, montadas antes da medição para que a serialização das
+    cargas não entre na latência.
+
+    Args:
+        rows (List[Dict[str, Any]]): Linhas usadas em todas as requisições.
+        batch_size (int): Linhas por requisição do cenário `batch`.
+        stream_rows (int): Linhas por requisição do cenário `stream`.
+    """
+
+    def __init__(
+        self, rows: List[Dict[str, Any]], batch_size: int, stream_rows: int
+    ) -> None:
+        self.rows = rows
+        self.batch_size = batch_size
+        self.stream_rows = stream_rows
+        self.single = [json.dumps(row).encode() for row in rows]
+        self.batches = [
+            json.dumps({"instances": self._slice(start, batch_size)}).encode()
+            for start in range(0, len(rows), batch_size)
+        ]
+        self.stream = "".join(
+            json.dumps(row) + "\n" for row in self._slice(0, stream_rows)
+        ).encode()
+        self.single_binary = [
+            encode_binary_features([row[name] for name in FEATURE_NAMES])
+            for row in rows
+        ]
+        self.batches_binary = [
+            encode_binary_features(
+                [
+                    [row[name] for name in FEATURE_NAMES]
+                    for row in self._slice(start, batch_size)
+                ]
+            )
+            for start in range(0, len(rows), batch_size)
+        ]
+
+    def _slice(self, start: int, size: int) -> List[Dict[str, Any]]:
+        return [self.rows[(start + i) % len(self.rows)] for i in range(size)]
+
+    def request(
+        self, scenario: str, i: int, encoding: str = "json"
+    ) -> Tuple[str, bytes, str, int]:
+        """
+        Retorna o path, o corpo, o Content-Type e a quantidade de linhas da i-ésima
+        requisição do cenário.
+        """
+        if encoding == "binary":
+            if scenario == "single":
+                body = self.single_binary[i % len(self.single_binary)]
+                return "/v1/iris/predict", body, BINARY_MEDIA_TYPE, 1
+            body = self.batches_binary[i % len(self.batches_binary)]
+            return "/v1/iris/predict/batch", body, BINARY_MEDIA_TYPE, self.batch_size
+        if scenario == "single":
+            body = self.single[i % len(self.single)]
+            return "/v1/iris/predict", body, "application/json", 1
+        if scenario == "batch":
+            body = self.batches[i % len(self.batches)]
+            return "/v1/iris/predict/batch", body, "application/json", self.batch_size
+        return (
+            "/v1/iris/predict/stream",
+            self.stream,
+            "application/x-ndjson",
+            self.stream_rows,
+        )
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    workload: Workload,
+    scenario: str,
+    concurrency: int,
+    duration_s: float,
+    encoding: str = "json",
+    cpu_seconds: Optional[Callable[[], Optional[float]]] = None,
+) -> Dict[str, Any]:
+    """
+    Mantém `concurrency` clientes enviando requisições em sequência por `duration_s`
+    segundos e resume a latência, a vazão e, com `cpu_seconds`, as requisições por
+    segundo de CPU do servidor.
+    """
+    latencies: List[float] = []
+    rows = errors = 0
+    counter = iter(range(sys.maxsize))
+    deadline = time.perf_counter() + duration_s
+
+    async def worker() -> None:
+        nonlocal rows, errors
+        while time.perf_counter() < deadline:
+            path, body, content_type, n_rows = workload.request(
+                scenario, next(counter), encoding
+            )
+            start = time.perf_counter()
+            response = await client.post(
+                path, content=body, headers={"Content-Type": content_type}
+            )
+            await response.aread()
+            latencies.append(time.perf_counter() - start)
+            if response.status_code == 200:
+                rows += n_rows
+            else:
+                errors += 1
+
+    cpu_start = cpu_seconds() if cpu_seconds else None
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    cpu_end = cpu_seconds() if cpu_seconds else None
+    cpu_s = cpu_end - cpu_start if cpu_start is not None and cpu_end else None
+    return {
+        "scenario": scenario,
+        "encoding": encoding,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed,
+        "rows_per_s": rows / elapsed,
+        "rps_per_core": len(latencies) / cpu_s if cpu_s else None,
+        **latency_summary(latencies),
+    }
+
+
+async def run_target(
+    target: str,
+    client: httpx.AsyncClient,
+    workload: Workload,
+    args: argparse.Namespace,
+    cpu_seconds: Callable[[], Optional[float]],
+) -> List[Dict[str, Any]]:
+    results = []
+    for encoding in args.encodings:
+        for scenario in args.scenarios:
+            if encoding == "binary" and scenario == "stream":
+                continue
+            # Aquecimento: a primeira chamada paga inicializações preguiçosas.
+            await run_level(client, workload, scenario, 1, 0.2, encoding)
+            for concurrency in args.concurrency:
+                result = await run_level(
+                    client,
+                    workload,
+                    scenario,
+                    concurrency,
+                    args.duration,
+                    encoding,
+                    cpu_seconds,
+                )
+                result = {"target": target, **result}
+                print(format_result(result), flush=True)
+                results.append(result)
+    return results
+
+
+async def bench_inprocess(
+    workload: Workload, args: argparse.Namespace
+) -> List[Dict[str, Any]]:
+    # Import tardio: as configurações são lidas do ambiente já preparado em main().
+    from desafio1.api.v1.main import app, shutdown_event, startup_event
+
+    await startup_event()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=60
+        ) as client:
+            return await run_target(
+                "inprocess", client, workload, args, time.process_time
+            )
+    finally:
+        await shutdown_event()
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def bench_uvicorn(
+    workload: Workload, args: argparse.Namespace
+) -> List[Dict[str, Any]]:
+    port = free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "desafio1.api.v1.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        env={**os.environ, "PYTHONWARNINGS": "ignore"},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    try:
+        async with httpx.AsyncClient(
+            base_url=base_url, timeout=60, limits=limits
+        ) as client:
+            await wait_ready(client, server)
+            return await run_target(
+                "uvicorn",
+                client,
+                workload,
+                args,
+                lambda: process_cpu_seconds(server.pid),
+            )
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def process_cpu_seconds(pid: int) -> Optional[float]:
+    """
+    Retorna o tempo de CPU (usuário + sistema) de outro processo, lido do /proc.
+
+    Returns:
+        Optional[float]: Segundos de CPU, ou None fora do Linux.
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Os campos 14 e 15 (utime, stime) vêm depois do nome entre parênteses.
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+async def wait_ready(
+    client: httpx.AsyncClient, server: subprocess.Popen, timeout_s: float = 60
+) -> None:
+    deadline = time.perf_counter() + timeout_s
+    while time.perf_counter() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("O uvicorn encerrou antes de ficar pronto.")
+        try:
+            if (await client.get("/ready")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise TimeoutError("O uvicorn não ficou pronto a tempo.")
+
+
+def prepare_models(directory: str) -> None:
+    """
+    Treina e grava as quatro famílias de modelo (e o artefato `.knn`) no diretório.
+    """
+    import pickle
+
+    from desafio1.models.ml.knn_scorer import export_knn_artifact, knn_artifact_path
+    from sklearn import datasets
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.naive_bayes import GaussianNB
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.tree import DecisionTreeClassifier
+
+    X, y = datasets.load_iris(return_X_y=True)
+    classifiers = {
+        "knn": KNeighborsClassifier(n_neighbors=5),
+        "dt": DecisionTreeClassifier(random_state=42),
+        "lr": LogisticRegression(max_iter=200),
+        "nb": GaussianNB(),
+    }
+    for name, classifier in classifiers.items():
+        model = Pipeline([("scaler", StandardScaler()), ("classifier", classifier)])
+        model.fit(X, y)
+        path = os.path.join(directory, f"iris_{name}_v1_20240101.pkl")
+        with open(path, "wb") as f:
+            pickle.dump(model, f)
+        if name == "knn":
+            export_knn_artifact(model, knn_artifact_path(path))
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def result_key(result: Dict[str, Any]) -> Tuple[str, str, str, int]:
+    # Resultados anteriores ao formato binário não têm `encoding`.
+    return (
+        result["target"],
+        result["scenario"],
+        result.get("encoding", "json"),
+        result["concurrency"],
+    )
+
+
+def format_result(r: Dict[str, Any]) -> str:
+    per_core = r.get("rps_per_core")
+    per_core_text = f"{per_core:>7.0f} req/s/núcleo" if per_core else ""
+    return (
+        f"{r['target']:<10}{r['scenario']:<8}{r.get('encoding', 'json'):<7}"
+        f"c={r['concurrency']:<4}"
+        f"{r['throughput_rps']:>9.0f} req/s{r['rows_per_s']:>11.0f} linhas/s"
+        f"{per_core_text}"
+        f"  p50 {r['p50_us'] / 1000:>8.2f}ms  p95 {r['p95_us'] / 1000:>8.2f}ms"
+        f"  p99 {r['p99_us'] / 1000:>8.2f}ms  erros {r['errors']}"
+    )
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str) -> None:
+    """
+    Mostra a variação percentual da vazão e dos percentis em relação a outra execução.
+    """
+    with open(baseline_path) as f:
+        baseline = {result_key(r): r for r in json.load(f)["results"]}
+    print(f"\nComparação com {baseline_path} (variação %):")
+    for result in results:
+        base = baseline.get(result_key(result))
+        if base is None:
+            continue
+        deltas = "  ".join(
+            f"{metric} {100 * (result[metric] / base[metric] - 1):+6.1f}%"
+            for metric in ("throughput_rps", "p50_us", "p95_us", "p99_us")
+            if base[metric]
+        )
+        target, scenario, encoding, concurrency = result_key(result)
+        print(f"{target:<10}{scenario:<8}{encoding:<7}c={concurrency:<4}{deltas}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=TARGETS)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--encodings", nargs="+", choices=ENCODINGS, default=["json"])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 64])
+    parser.add_argument(
+        "--duration", type=float, default=5.0, help="Segundos por nível."
+    )
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--stream-rows", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=10000, help="Linhas sintéticas.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--replay", help="Arquivo NDJSON cujas linhas são repetidas.")
+    parser.add_argument("--model-path", help="Artefatos existentes (IRIS_MODEL_PATH).")
+    parser.add_argument("--output", help="Arquivo JSON com os resultados.")
+    parser.add_argument("--compare", help="Resultado anterior para comparação.")
+    args = parser.parse_args()
+
+    rows = (
+        replay_rows(args.replay)
+        if args.replay
+        else synthetic_rows(args.rows, args.seed)
+    )
+    workload = Workload(rows, args.batch_size, args.stream_rows)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.model_path is None:
+            prepare_models(tmp_dir)
+            os.environ["IRIS_MODEL_PATH"] = os.path.join(tmp_dir, "iris_*_v1_*.pkl")
+        else:
+            os.environ["IRIS_MODEL_PATH"] = args.model_path
+        os.environ.setdefault("IRIS_MODEL_WATCH_INTERVAL_S", "0")
+
+        results = []
+        for target in args.targets:
+            bench = bench_inprocess if target == "inprocess" else bench_uvicorn
+            results.extend(asyncio.run(bench(workload, args)))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "settings": {k: v for k, v in os.environ.items() if k.startswith("IRIS_")},
+            "args": {k: v for k, v in vars(args).items() if k not in ("output",)},
+            "payload_rows": len(rows),
+        },
+        "results": results,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResultados gravados em {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark de cold start da API: tempo de import e tempo até a primeira predição.
+
+Cada medição roda em um processo novo, que importa `desafio1.api.v1.main`, executa o
+`startup_event` e faz a primeira chamada a `POST /v1/iris/predict`. Os modos comparam
+o boot antigo (dataset carregado no startup, Pipeline via pickle) com o boot enxuto,
+com o Pipeline e com o NumpyKNNScorer. Os artefatos são gerados em um diretório
+temporário a partir de um modelo treinado em memória.
+
+Uso:
+    PYTHONPATH=src python -m desafio1.benchmarks.bench_startup --repeat 5 \\
+        --output startup.json
+"""
+
+import argparse
+import json
+import os
+import pickle
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+MODES = {
+    "dataset+sklearn": {"IRIS_LOAD_DATASET": "1", "IRIS_SCORER": "sklearn"},
+    "lazy+sklearn": {"IRIS_LOAD_DATASET": "0", "IRIS_SCORER": "sklearn"},
+    "lazy+numpy": {"IRIS_LOAD_DATASET": "0", "IRIS_SCORER": "numpy"},
+}
+
+HEAVY_MODULES = ("pandas", "sklearn", "scipy", "matplotlib")
+
+
+def child() -> None:
+    start = time.perf_counter()
+    import asyncio
+
+    import httpx
+    from desafio1.api.v1 import main as api
+
+    imported = time.perf_counter()
+
+    async def boot() -> Dict[str, float]:
+        await api.startup_event()
+        ready = time.perf_counter()
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://b") as c:
+            response = await c.post(
+                "/v1/iris/predict",
+                json={
+                    "sepal_length": 5.1,
+                    "sepal_width": 3.5,
+                    "petal_length": 1.4,
+                    "petal_width": 0.2,
+                },
+            )
+            response.raise_for_status()
+        first = time.perf_counter()
+        await api.shutdown_event()
+        return {"ready": ready, "first": first}
+
+    marks = asyncio.run(boot())
+    print(
+        json.dumps(
+            {
+                "import_s": imported - start,
+                "startup_s": marks["ready"] - imported,
+                "time_to_first_prediction_s": marks["first"] - start,
+                "heavy_modules": [m for m in HEAVY_MODULES if m in sys.modules],
+            }
+        )
+    )
+
+
+def build_artifacts(directory: str) -> None:
+    from desafio1.benchmarks.common import train_reference_model
+    from desafio1.models.ml.knn_scorer import export_knn_artifact, knn_artifact_path
+
+    path = os.path.join(directory, "iris_knn_v1_20240101.pkl")
+    model = train_reference_model()
+    with open(path, "wb") as f:
+        pickle.dump(model, f)
+    export_knn_artifact(model, knn_artifact_path(path))
+
+
+def run_mode(env_overrides: Dict[str, str], directory: str) -> Dict[str, float]:
+    env = {
+        **os.environ,
+        **env_overrides,
+        "IRIS_MODEL_PATH": os.path.join(directory, "iris_*_v1_*.pkl"),
+        "IRIS_MODEL_WATCH_INTERVAL_S": "0",
+        "PYTHONWARNINGS": "ignore",
+    }
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-m", "desafio1.benchmarks.bench_startup", "--child"],
+        env=env,
+        cwd=directory,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_wall_s"] = time.perf_counter() - start
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Arquivo JSON com os resultados.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    report: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        build_artifacts(tmp_dir)
+        for mode, env in MODES.items():
+            runs: List[Dict] = [run_mode(env, tmp_dir) for _ in range(args.repeat)]
+            report[mode] = {
+                key: statistics.median(run[key] for run in runs)
+                for key in (
+                    "import_s",
+                    "startup_s",
+                    "time_to_first_prediction_s",
+                    "process_wall_s",
+                )
+            }
+            report[mode]["heavy_modules"] = runs[-1]["heavy_modules"]
+
+    print(f"{'modo':<18}{'import':>10}{'startup':>10}{'1ª pred.':>10}{'processo':>10}")
+    for mode, r in report.items():
+        print(
+            f"{mode:<18}{r['import_s'] * 1000:>8.0f}ms{r['startup_s'] * 1000:>8.0f}ms"
+            f"{r['time_to_first_prediction_s'] * 1000:>8.0f}ms"
+            f"{r['process_wall_s'] * 1000:>8.0f}ms  {','.join(r['heavy_modules'])}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark de memória (RSS/PSS) e tempo de carga por worker, de 1 a 16 workers.
+
+Cada worker é um processo novo (como um worker do uvicorn) que carrega o modelo e faz a
+primeira predição. Compara o Pipeline desserializado com pickle, em que cada worker tem
+sua própria cópia dos arrays, com o artefato `.knn` aberto com mmap, em que os workers
+compartilham as mesmas páginas físicas. O PSS divide as páginas compartilhadas entre os
+processos que as usam, então a soma do PSS é a memória realmente ocupada.
+
+Como o Íris tem só 120 linhas de treino, o conjunto de referência é ampliado com
+amostras sintéticas (`--rows`). Requer Linux (/proc/self/smaps_rollup).
+
+Uso:
+    PYTHONPATH=src python -m desafio1.benchmarks.bench_workers --rows 500000
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import pickle
+import tempfile
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+def build_artifacts(rows: int, directory: str) -> Tuple[str, str]:
+    from desafio1.models.ml.knn_scorer import export_knn_artifact, knn_artifact_path
+    from sklearn import datasets
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    X, y = datasets.load_iris(return_X_y=True)
+    rng = np.random.default_rng(42)
+    idx = rng.integers(0, len(X), size=rows)
+    X_big = X[idx] + rng.normal(scale=0.05, size=(rows, X.shape[1]))
+    model = Pipeline(
+        [
+            ("scaler", StandardScaler()),
+            ("classifier", KNeighborsClassifier(n_neighbors=5)),
+        ]
+    ).fit(X_big, y[idx])
+
+    pickle_path = os.path.join(directory, "iris_knn_v1_bench.pkl")
+    with open(pickle_path, "wb") as f:
+        pickle.dump(model, f)
+    mmap_path = knn_artifact_path(pickle_path)
+    export_knn_artifact(model, mmap_path)
+    return pickle_path, mmap_path
+
+
+def read_memory_kb() -> Dict[str, int]:
+    memory = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                memory[key.lower()] = int(rest.split()[0])
+    return memory
+
+
+def worker(mode: str, path: str, barrier, results) -> None:
+    start = time.perf_counter()
+    if mode == "pickle":
+        with open(path, "rb") as f:
+            model = pickle.load(f)
+    else:
+        from desafio1.models.ml.knn_scorer import NumpyKNNScorer
+
+        model = NumpyKNNScorer.load(path)
+    model.predict_proba(np.array([[5.1, 3.5, 1.4, 0.2]]))
+    startup_s = time.perf_counter() - start
+
+    # Todos os workers precisam estar vivos ao medir o PSS, para que as páginas
+    # compartilhadas sejam divididas entre eles.
+    barrier.wait()
+    memory = read_memory_kb()
+    results.put({"startup_s": startup_s, **memory})
+    barrier.wait()
+
+
+def run(mode: str, path: str, workers: int) -> Dict[str, float]:
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=worker, args=(mode, path, barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return {
+        "startup_ms": 1000 * float(np.mean([s["startup_s"] for s in samples])),
+        "rss_mb": float(np.mean([s["rss"] for s in samples])) / 1024,
+        "pss_mb": float(np.mean([s["pss"] for s in samples])) / 1024,
+        "total_pss_mb": float(np.sum([s["pss"] for s in samples])) / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = dict(zip(("pickle", "mmap"), build_artifacts(args.rows, tmp_dir)))
+        print(
+            f"{'formato':<8}{'workers':>8}{'carga (ms)':>12}{'RSS/worker':>12}"
+            f"{'PSS/worker':>12}{'PSS total':>11}"
+        )
+        for mode, path in paths.items():
+            for workers in args.workers:
+                r = run(mode, path, workers)
+                print(
+                    f"{mode:<8}{workers:>8}{r['startup_ms']:>12.1f}"
+                    f"{r['rss_mb']:>10.1f}MB{r['pss_mb']:>10.1f}MB"
+                    f"{r['total_pss_mb']:>9.1f}MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+from typing import Dict, List
+
+import numpy as np
+from sklearn import datasets
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+
+def train_reference_model() -> Pipeline:
+    """
+    Treina em memória o mesmo pipeline construído pelo IrisModelTrainer, para que os
+    benchmarks não dependam de um artefato salvo em disco.
+
+    Returns:
+        Pipeline: Pipeline (StandardScaler + KNN) treinado com o dataset Íris.
+    """
+    X, y = datasets.load_iris(return_X_y=True)
+    model = Pipeline(
+        [
+            ("scaler", StandardScaler()),
+            ("classifier", KNeighborsClassifier(n_neighbors=5)),
+        ]
+    )
+    return model.fit(X, y)
+
+
+def latency_summary(samples_s: List[float]) -> Dict[str, float]:
+    """
+    Resume uma lista de latências (em segundos) em percentis, em microssegundos.
+
+    Args:
+        samples_s (List[float]): Latências medidas, em segundos.
+
+    Returns:
+        Dict[str, float]: Percentis p50, p95 e p99 e a média, em microssegundos.
+    """
+    samples_us = np.asarray(samples_s) * 1e6
+    return {
+        "p50_us": float(np.percentile(samples_us, 50)),
+        "p95_us": float(np.percentile(samples_us, 95)),
+        "p99_us": float(np.percentile(samples_us, 99)),
+        "mean_us": float(samples_us.mean()),
+    }
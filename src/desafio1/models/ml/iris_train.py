@@ -1,14 +1,32 @@
+import argparse
+import json
 import os
 import pickle
 from collections import Counter
-from datetime import datetime
-from typing import Tuple
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
-import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns
+from desafio1.api.data_ingestion import load_iris_arrays
+from desafio1.api.services.drift_monitor import build_reference, save_reference
+from desafio1.api.services.model_registry import metrics_path
+from desafio1.models.ml.knn_scorer import export_knn_artifact, knn_artifact_path
+from desafio1.models.ml.model_profile import save_profile
+from desafio1.models.ml.model_search import (
+    ALGORITHMS,
+    algorithm_name,
+    build_pipeline,
+    search_models,
+)
+from desafio1.models.ml.neighbor_index import NEIGHBOR_INDEXES, TREE_INDEXES
+from desafio1.models.ml.out_of_core import (
+    find_partitions,
+    fit_out_of_core,
+    iter_chunks,
+)
+from desafio1.models.ml.stage_graph import StageGraph
 from numpy import ndarray
-from sklearn import datasets
+from sklearn.base import clone
 from sklearn.metrics import (
     accuracy_score,
     auc,
@@ -17,6 +35,7 @@ from sklearn.metrics import (
     f1_score,
     precision_score,
     recall_score,
+    roc_auc_score,
     roc_curve,
 )
 from sklearn.model_selection import (
@@ -27,30 +46,48 @@ from sklearn.model_selection import (
 )
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import StandardScaler
-from tqdm import tqdm
 
 
 class IrisModelTrainer:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        search_space: Optional[Dict[str, Dict[str, List[Any]]]] = None,
+        algorithms: Optional[Sequence[str]] = None,
+        data_source: Optional[str] = None,
+        neighbor_index: str = "brute",
+    ) -> None:
         """
         Inicializa a classe IrisModelTrainer com um pipeline de padronização e KNN.
+
+        Args:
+            search_space (Dict, optional): Família -> hiperparâmetros avaliados quando
+                o treino usa a busca (padrão: `DEFAULT_SEARCH_SPACE`).
+            algorithms (Sequence[str], optional): Famílias consideradas na busca.
+            data_source (str, optional): Fonte do dataset (padrão:
+                `settings.dataset_source`), lida pelo cache de `data_ingestion`.
+            neighbor_index (str): Índice de vizinhos do KNN (brute, kd_tree,
+                ball_tree ou ivf), construído no treino e gravado no artefato `.knn`.
+                As árvores também são usadas pelo pipeline `.pkl`; o `ivf` é
+                aproximado e só vale para o NumpyKNNScorer.
         """
-        self.pipeline = Pipeline(
-            [
-                ("scaler", StandardScaler()),
-                ("classifier", KNeighborsClassifier(n_neighbors=5)),
-            ]
+        self.search_space = search_space
+        self.algorithms = algorithms
+        self.data_source = data_source
+        self.neighbor_index = neighbor_index
+        self.pipeline = self.apply_neighbor_index(
+            build_pipeline(KNeighborsClassifier(n_neighbors=5))
         )
 
     def load_data(self) -> Tuple[ndarray, ndarray]:
         """
         Carrega o dataset Íris e retorna os atributos e os alvos/targets.
+        A fonte é materializada no cache local na primeira vez; as cargas seguintes
+        mapeiam o arquivo em cache, sem acessar a fonte.
 
         Returns:
             Tuple[ndarray, ndarray]: Tupla contendo os atributos e os alvos do dataset.
         """
-        return datasets.load_iris(return_X_y=True)
+        return load_iris_arrays(self.data_source)
 
     def split_data(
         self, X: ndarray, y: ndarray
@@ -81,6 +118,7 @@ class IrisModelTrainer:
             y_test (ndarray): Alvos do conjunto de teste.
             plot_path (str): Caminho para salvar os gráficos.
         """
+        plt = _pyplot()
         fig, ax = plt.subplots(1, 2, figsize=(12, 5))
 
         train_counts = Counter(y_train)
@@ -108,6 +146,7 @@ class IrisModelTrainer:
             y_pred (ndarray): Predições do modelo.
             plot_path (str): Caminho para salvar os gráficos.
         """
+        plt = _pyplot()
         metrics = {
             "accuracy": accuracy_score(y_test, y_pred),
             "precision": precision_score(y_test, y_pred, average="macro"),
@@ -136,6 +175,9 @@ class IrisModelTrainer:
             y_pred (ndarray): Predições do modelo.
             plot_path (str): Caminho para salvar os gráficos.
         """
+        plt = _pyplot()
+        import seaborn as sns
+
         cm = confusion_matrix(y_test, y_pred)
         plt.figure(figsize=(8, 6))
         sns.heatmap(
@@ -161,6 +203,7 @@ class IrisModelTrainer:
             y_proba (ndarray): Probabilidades preditas pelo modelo.
             plot_path (str): Caminho para salvar os gráficos.
         """
+        plt = _pyplot()
         fpr = {}
         tpr = {}
         roc_auc = {}
@@ -194,6 +237,7 @@ class IrisModelTrainer:
             X (ndarray): Atributos do dataset.
             plot_path (str): Caminho para salvar os gráficos.
         """
+        plt = _pyplot()
         fig, ax = plt.subplots(2, 2, figsize=(12, 10))
 
         feature_names = [
@@ -212,6 +256,34 @@ class IrisModelTrainer:
         plt.savefig(os.path.join(plot_path, "dataset_info.png"))
         plt.close()
 
+    def compute_learning_curve(
+        self, model: Pipeline, X: ndarray, y: ndarray, n_jobs: int = -1
+    ) -> Dict[str, List[float]]:
+        """
+        Calcula a curva de aprendizado do modelo (validação cruzada em 5 partes para 10
+        tamanhos de treino).
+
+        Args:
+            model: O modelo a ser avaliado.
+            X (ndarray): Atributos do dataset.
+            y (ndarray): Alvos do dataset.
+            n_jobs (int): Processos da validação cruzada (-1 usa todos os núcleos).
+
+        Returns:
+            Dict[str, List[float]]: Tamanhos de treino e média/desvio das acurácias de
+                treino e de validação em cada tamanho.
+        """
+        train_sizes, train_scores, test_scores = learning_curve(
+            model, X, y, cv=5, n_jobs=n_jobs, train_sizes=np.linspace(0.1, 1.0, 10)
+        )
+        return {
+            "train_sizes": train_sizes.tolist(),
+            "train_scores_mean": np.mean(train_scores, axis=1).tolist(),
+            "train_scores_std": np.std(train_scores, axis=1).tolist(),
+            "test_scores_mean": np.mean(test_scores, axis=1).tolist(),
+            "test_scores_std": np.std(test_scores, axis=1).tolist(),
+        }
+
     def plot_learning_curve(
         self, model: Pipeline, X: ndarray, y: ndarray, plot_path: str
     ) -> None:
@@ -224,14 +296,26 @@ class IrisModelTrainer:
             y (ndarray): Alvos do dataset.
             plot_path (str): Caminho para salvar os gráficos.
         """
-        train_sizes, train_scores, test_scores = learning_curve(
-            model, X, y, cv=5, n_jobs=-1, train_sizes=np.linspace(0.1, 1.0, 10)
+        self.plot_learning_curve_scores(
+            self.compute_learning_curve(model, X, y), plot_path
         )
 
-        train_scores_mean = np.mean(train_scores, axis=1)
-        train_scores_std = np.std(train_scores, axis=1)
-        test_scores_mean = np.mean(test_scores, axis=1)
-        test_scores_std = np.std(test_scores, axis=1)
+    def plot_learning_curve_scores(
+        self, curve: Dict[str, List[float]], plot_path: str
+    ) -> None:
+        """
+        Plota uma curva de aprendizado já calculada.
+
+        Args:
+            curve (Dict[str, List[float]]): Retorno de `compute_learning_curve`.
+            plot_path (str): Caminho para salvar os gráficos.
+        """
+        plt = _pyplot()
+        train_sizes = np.array(curve["train_sizes"])
+        train_scores_mean = np.array(curve["train_scores_mean"])
+        train_scores_std = np.array(curve["train_scores_std"])
+        test_scores_mean = np.array(curve["test_scores_mean"])
+        test_scores_std = np.array(curve["test_scores_std"])
 
         plt.figure()
         plt.title("Learning Curve")
@@ -268,6 +352,126 @@ class IrisModelTrainer:
         plt.savefig(os.path.join(plot_path, "learning_curve.png"))
         plt.close()
 
+    def predict_test_set(
+        self, model: Pipeline, X_test: ndarray
+    ) -> Tuple[ndarray, ndarray]:
+        """
+        Calcula as probabilidades do conjunto de teste e deriva delas as classes
+        preditas, com uma única passada pelo modelo.
+
+        Args:
+            model (Pipeline): Modelo treinado.
+            X_test (ndarray): Atributos de teste.
+
+        Returns:
+            Tuple[ndarray, ndarray]: Classes preditas e probabilidades de cada classe.
+        """
+        y_proba = model.predict_proba(X_test)
+        y_pred = model.classes_[np.argmax(y_proba, axis=1)]
+        return y_pred, y_proba
+
+    def compute_metrics(
+        self, y_test: ndarray, y_pred: ndarray, y_proba: ndarray
+    ) -> Dict[str, Any]:
+        """
+        Calcula as métricas de avaliação no conjunto de teste.
+
+        Args:
+            y_test (ndarray): Alvos/Targets de teste.
+            y_pred (ndarray): Predições do modelo.
+            y_proba (ndarray): Probabilidades preditas pelo modelo.
+
+        Returns:
+            Dict[str, Any]: Acurácia, precisão, recall e f1-score (média macro), AUC
+                ROC de cada classe (um contra todos), matriz de confusão e relatório
+                de classificação por classe.
+        """
+        classes = np.unique(y_test)
+        return {
+            "accuracy": accuracy_score(y_test, y_pred),
+            "precision": precision_score(y_test, y_pred, average="macro"),
+            "recall": recall_score(y_test, y_pred, average="macro"),
+            "f1_score": f1_score(y_test, y_pred, average="macro"),
+            "roc_auc": {
+                str(c): roc_auc_score(y_test == c, y_proba[:, i])
+                for i, c in enumerate(classes)
+            },
+            "confusion_matrix": confusion_matrix(y_test, y_pred).tolist(),
+            "classification_report": classification_report(
+                y_test, y_pred, output_dict=True
+            ),
+        }
+
+    def save_metrics(
+        self,
+        metrics: Dict[str, Any],
+        cv_scores: Optional[ndarray],
+        learning_curve: Optional[Dict[str, List[float]]],
+        file_path: str,
+        model: Optional[Pipeline] = None,
+        search: Optional[Dict[str, Any]] = None,
+        out_of_core: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Salva as métricas do treino em `<modelo>.metrics.json`, ao lado do modelo.
+        O arquivo é lido pelo ModelRegistry sem carregar o modelo nem bibliotecas de
+        gráficos.
+
+        Args:
+            metrics (Dict[str, Any]): Métricas do conjunto de teste (`compute_metrics`).
+            cv_scores (ndarray, optional): Acurácia de cada parte da validação cruzada.
+            learning_curve (Dict[str, List[float]], optional): Curva de aprendizado.
+            file_path (str): Caminho do modelo treinado.
+            model (Pipeline, optional): Modelo treinado, para registrar a família e os
+                hiperparâmetros.
+            search (Dict[str, Any], optional): Relatório da busca, quando usada.
+            out_of_core (Dict[str, Any], optional): Relatório do treino fora da
+                memória (`fit_out_of_core`), quando usado.
+
+        Returns:
+            str: Caminho do arquivo de métricas.
+        """
+        document: Dict[str, Any] = {}
+        if model is not None:
+            classifier = model.named_steps["classifier"]
+            document["algorithm"] = algorithm_name(model)
+            document["params"] = {
+                k: v
+                for k, v in classifier.get_params().items()
+                if isinstance(v, (int, float, str, bool, type(None)))
+            }
+        document.update(metrics)
+        if cv_scores is not None:
+            document["cross_validation"] = {
+                "scores": cv_scores.tolist(),
+                "mean": float(cv_scores.mean()),
+                "std": float(cv_scores.std()),
+            }
+        if learning_curve is not None:
+            document["learning_curve"] = learning_curve
+        document["trained_at"] = datetime.now(timezone.utc).isoformat()
+        if search is not None:
+            document["search"] = search
+        if out_of_core is not None:
+            document["out_of_core"] = out_of_core
+        path = metrics_path(file_path)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(document, f, indent=2, default=float)
+        print(f"Métricas salvas como: {path}")
+        return path
+
+    def print_classification_report(self, y_test: ndarray, y_pred: ndarray) -> None:
+        """
+        Exibe o relatório de classificação (precisão, recall e f1-score por classe).
+
+        Args:
+            y_test (ndarray): Alvos/Targets de teste.
+            y_pred (ndarray): Predições do modelo.
+        """
+        report = classification_report(y_test, y_pred)
+        print("\nRelatório de Classificação:\n", report)
+
     def evaluate_model(
         self, model: Pipeline, X_test: ndarray, y_test: ndarray, plot_path: str
     ) -> None:
@@ -280,19 +484,78 @@ class IrisModelTrainer:
             y_test (ndarray): Alvos/Targets de teste.
             plot_path (str): Caminho para salvar os gráficos de métricas.
         """
-        y_pred = model.predict(X_test)
-        y_proba = model.predict_proba(X_test)
-
-        report = classification_report(y_test, y_pred)
-        print("\nRelatório de Classificação:\n", report)
+        y_pred, y_proba = self.predict_test_set(model, X_test)
+        self.print_classification_report(y_test, y_pred)
 
         self.plot_metrics(y_test, y_pred, plot_path)
         self.plot_confusion_matrix(y_test, y_pred, plot_path)
         self.plot_roc_curve(y_test, y_proba, plot_path)
 
+    def search_model(
+        self, X_train: ndarray, y_train: ndarray
+    ) -> Tuple[Pipeline, Dict[str, Any]]:
+        """
+        Escolhe o algoritmo e os hiperparâmetros com successive halving, usando todos
+        os núcleos, e adota o vencedor como `self.pipeline`.
+
+        Args:
+            X_train (ndarray): Atributos de treinamento.
+            y_train (ndarray): Alvos de treinamento.
+
+        Returns:
+            Tuple[Pipeline, Dict[str, Any]]: O pipeline vencedor, treinado com todo o
+                treino, e o relatório da busca (ver `search_models`).
+        """
+        result = search_models(
+            X_train, y_train, self.search_space, algorithms=self.algorithms
+        )
+        self.pipeline = result.pop("model")
+        if result["algorithm"] == "knn" and self.neighbor_index in TREE_INDEXES:
+            self.apply_neighbor_index(self.pipeline).fit(X_train, y_train)
+        print(
+            f"Busca: {result['algorithm']} {result['params']} | acurácia (CV): "
+            f"{result['cv_accuracy']:.4f} | latência p50: "
+            f"{result['latency']['single_row_p50_us']:.0f}µs"
+        )
+        return self.pipeline, result
+
+    def apply_neighbor_index(self, model: Pipeline) -> Pipeline:
+        """
+        Usa a árvore escolhida em `neighbor_index` na busca de vizinhos do pipeline,
+        quando ele é um KNN. Com `brute` e `ivf`, o pipeline fica como está (o `ivf`
+        só existe no artefato `.knn`).
+
+        Args:
+            model (Pipeline): Pipeline, treinado ou não (se treinado, precisa ser
+                treinado de novo).
+
+        Returns:
+            Pipeline: O mesmo pipeline.
+        """
+        classifier = model.named_steps["classifier"]
+        if self.neighbor_index in TREE_INDEXES and isinstance(
+            classifier, KNeighborsClassifier
+        ):
+            classifier.set_params(algorithm=self.neighbor_index)
+        return model
+
+    def resolve_model_path(self, model: Pipeline, file_path: str) -> str:
+        """
+        Preenche `{algorithm}` no caminho do modelo com a família do pipeline treinado
+        (ex.: `iris_{algorithm}_v1_20240101.pkl` -> `iris_dt_v1_20240101.pkl`).
+
+        Args:
+            model (Pipeline): Modelo treinado.
+            file_path (str): Caminho do modelo, com ou sem `{algorithm}`.
+
+        Returns:
+            str: Caminho final do modelo.
+        """
+        return file_path.replace("{algorithm}", algorithm_name(model))
+
     def train_model(self, X_train: ndarray, y_train: ndarray) -> Pipeline:
         """
-        Treina o modelo de classificação usando KNN.
+        Treina o pipeline de classificação (KNN, ou o vencedor da busca).
 
         Args:
             X_train (ndarray): Atributos de treinamento.
@@ -304,7 +567,27 @@ class IrisModelTrainer:
         self.pipeline.fit(X_train, y_train)
         return self.pipeline
 
-    def cross_validate_model(self, X: ndarray, y: ndarray, plot_path: str) -> None:
+    def cross_validation_scores(
+        self, X: ndarray, y: ndarray, model: Optional[Pipeline] = None
+    ) -> ndarray:
+        """
+        Calcula a acurácia de cada parte de uma validação cruzada estratificada em 5
+        partes, com o mesmo pipeline (padronização + classificador) que é salvo.
+
+        Args:
+            X (ndarray): Atributos do dataset.
+            y (ndarray): Alvos do dataset.
+            model (Pipeline, optional): Pipeline avaliado; padrão `self.pipeline`. Ele
+                não é alterado: cada parte treina uma cópia.
+
+        Returns:
+            ndarray: Acurácia de cada parte.
+        """
+        model = clone(model if model is not None else self.pipeline)
+        skf = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+        return cross_val_score(model, X, y, cv=skf)
+
+    def cross_validate_model(self, X: ndarray, y: ndarray, plot_path: str) -> ndarray:
         """
         Realiza a validação cruzada no modelo para avaliar o desempenho e plota os resultados.
 
@@ -312,14 +595,27 @@ class IrisModelTrainer:
             X (ndarray): Atributos do dataset.
             y (ndarray): Alvos do dataset.
             plot_path (str): Caminho para salvar os gráficos.
+
+        Returns:
+            ndarray: Acurácia de cada parte.
         """
-        model = KNeighborsClassifier(n_neighbors=5)
-        skf = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-        scores = cross_val_score(model, X, y, cv=skf)
+        scores = self.cross_validation_scores(X, y)
 
         print("Acurácia com validação cruzada:", scores.mean())
         print("Desvio padrão da acurácia:", scores.std())
 
+        self.plot_cross_validation_scores(scores, plot_path)
+        return scores
+
+    def plot_cross_validation_scores(self, scores: ndarray, plot_path: str) -> None:
+        """
+        Plota a acurácia de cada parte da validação cruzada.
+
+        Args:
+            scores (ndarray): Acurácia de cada parte.
+            plot_path (str): Caminho para salvar os gráficos.
+        """
+        plt = _pyplot()
         plt.figure(figsize=(10, 6))
         plt.plot(
             range(1, len(scores) + 1), scores, marker="o", linestyle="-", color="blue"
@@ -335,6 +631,9 @@ class IrisModelTrainer:
     def save_model(self, model: Pipeline, file_path: str) -> None:
         """
         Salva o modelo treinado em um arquivo.
+        Para o pipeline KNN, também exporta o artefato compacto usado pelo
+        NumpyKNNScorer ao lado do `.pkl`: um diretório `.knn` com os arrays em
+        arquivos `.npy` que podem ser abertos com mmap.
 
         Args:
             model (Pipeline): Modelo treinado.
@@ -345,50 +644,382 @@ class IrisModelTrainer:
             pickle.dump(model, f)
         print(f"Modelo salvo como: {file_path}")
 
-    def run(self, file_path: str, plot_path: str) -> None:
+        if isinstance(model.named_steps.get("classifier"), KNeighborsClassifier):
+            artifact_path = knn_artifact_path(file_path)
+            export_knn_artifact(model, artifact_path, index=self.neighbor_index)
+            print(f"Artefato NumPy salvo como: {artifact_path}")
+
+    def save_reference_profile(
+        self,
+        model: Pipeline,
+        chunks: Union[ndarray, Iterable[ndarray]],
+        model_path: str,
+    ) -> str:
+        """
+        Grava a distribuição dos dados de treino (histograma por atributo e frequência
+        das classes previstas) em `<modelo>.reference.json`, usada pela API para
+        medir o drift das entradas.
+
+        Args:
+            model (Pipeline): Modelo treinado.
+            chunks (ndarray | Iterable[ndarray]): Linhas de treino, em uma matriz ou
+                em blocos (treino fora da memória).
+            model_path (str): Caminho do modelo salvo.
+
+        Returns:
+            str: Caminho do perfil de referência.
+        """
+        if isinstance(chunks, ndarray):
+            chunks = [chunks]
+        os.makedirs(os.path.dirname(model_path) or ".", exist_ok=True)
+        path = save_reference(model_path, build_reference(model, chunks))
+        print(f"Perfil de referência salvo como: {path}")
+        return path
+
+    def profile_model(self, model_path: str, X: ndarray) -> Dict[str, Any]:
+        """
+        Mede o custo de servir o modelo salvo (latência unitária e em lote, tamanho e
+        tempo de carga) e grava o resultado em `<modelo>.profile.json`.
+
+        Args:
+            model_path (str): Caminho do modelo salvo.
+            X (ndarray): Linhas usadas na medição da latência.
+
+        Returns:
+            Dict[str, Any]: Medições gravadas.
+        """
+        profile = save_profile(model_path, X)
+        latency = profile["latency"]
+        print(
+            f"Custo de servir: {profile['size_bytes']} bytes | carga "
+            f"{profile['load_time_ms']:.2f}ms | p50 {latency['single_row_p50_us']:.0f}µs"
+            f" | p95 {latency['single_row_p95_us']:.0f}µs | lote "
+            f"{latency['batch_row_us']:.2f}µs/linha"
+        )
+        return profile
+
+    def build_graph(
+        self,
+        file_path: str,
+        plot_path: Optional[str],
+        search: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> StageGraph:
+        """
+        Monta o grafo de etapas do treinamento.
+
+        Os artefatos intermediários (dados, divisão treino/teste, modelo, predições,
+        probabilidades, validação cruzada e curva de aprendizado) são produzidos uma
+        única vez e compartilhados pelas etapas que os consomem. Gráficos, validação
+        cruzada e curva de aprendizado não dependem uns dos outros e rodam no pool de
+        processos, com uma cópia do pipeline treinado (o vencedor da busca, se
+        houver). Sem `plot_path`, as etapas de gráfico não são criadas.
+
+        Args:
+            file_path (str): Caminho para salvar o modelo treinado; `{algorithm}` é
+                substituído pela família do modelo.
+            plot_path (str, optional): Caminho para salvar os gráficos de métricas.
+            search (bool): Escolhe algoritmo e hiperparâmetros com `search_model`, em
+                vez de treinar o KNN padrão.
+            max_workers (int, optional): Processos do pool em que o grafo vai rodar.
+                Com o pool, a curva de aprendizado usa um só processo, pois os
+                núcleos já estão divididos entre as etapas paralelas; em série
+                (`max_workers=0`), ela usa todos os núcleos.
+
+        Returns:
+            StageGraph: Grafo pronto para execução.
+        """
+        graph = StageGraph()
+        graph.add("load_data", self.load_data, outputs=("X", "y"))
+        graph.add(
+            "split_data",
+            self.split_data,
+            inputs=("X", "y"),
+            outputs=("X_train", "X_test", "y_train", "y_test"),
+        )
+        if search:
+            graph.add(
+                "model_search",
+                self.search_model,
+                inputs=("X_train", "y_train"),
+                outputs=("model", "search"),
+            )
+        else:
+            graph.add(
+                "train_model",
+                self.train_model,
+                inputs=("X_train", "y_train"),
+                outputs=("model",),
+            )
+        graph.add(
+            "learning_curve",
+            self.compute_learning_curve,
+            inputs=("model", "X", "y"),
+            outputs=("learning_curve",),
+            parallel=True,
+            n_jobs=-1 if max_workers == 0 else 1,
+        )
+        graph.add(
+            "cross_validation",
+            self.cross_validation_scores,
+            inputs={"X": "X_train", "y": "y_train", "model": "model"},
+            outputs=("cv_scores",),
+            parallel=True,
+        )
+        graph.add(
+            "model_path",
+            self.resolve_model_path,
+            inputs=("model",),
+            outputs=("model_path",),
+            file_path=file_path,
+        )
+        graph.add(
+            "save_model",
+            self.save_model,
+            inputs={"model": "model", "file_path": "model_path"},
+        )
+        graph.add(
+            "reference_profile",
+            self.save_reference_profile,
+            inputs={"model": "model", "chunks": "X_train", "model_path": "model_path"},
+        )
+        graph.add(
+            "predict_test_set",
+            self.predict_test_set,
+            inputs=("model", "X_test"),
+            outputs=("y_pred", "y_proba"),
+        )
+        graph.add(
+            "classification_report",
+            self.print_classification_report,
+            inputs=("y_test", "y_pred"),
+        )
+        graph.add(
+            "evaluation_metrics",
+            self.compute_metrics,
+            inputs=("y_test", "y_pred", "y_proba"),
+            outputs=("metrics",),
+        )
+        metrics_inputs = {
+            "metrics": "metrics",
+            "cv_scores": "cv_scores",
+            "learning_curve": "learning_curve",
+            "file_path": "model_path",
+            "model": "model",
+        }
+        if search:
+            metrics_inputs["search"] = "search"
+        graph.add("save_metrics", self.save_metrics, inputs=metrics_inputs)
+        if plot_path is None:
+            return graph
+
+        plots = (
+            ("dataset_info", self.plot_dataset_info, ("X",)),
+            ("class_distribution", self.plot_distribution, ("y_train", "y_test")),
+            (
+                "learning_curve_plot",
+                self.plot_learning_curve_scores,
+                {"curve": "learning_curve"},
+            ),
+            (
+                "cross_validation_plot",
+                self.plot_cross_validation_scores,
+                {"scores": "cv_scores"},
+            ),
+            ("model_metrics", self.plot_metrics, ("y_test", "y_pred")),
+            ("confusion_matrix", self.plot_confusion_matrix, ("y_test", "y_pred")),
+            ("roc_curve", self.plot_roc_curve, ("y_test", "y_proba")),
+        )
+        for name, plot, inputs in plots:
+            graph.add(name, plot, inputs=inputs, parallel=True, plot_path=plot_path)
+        return graph
+
+    def run(
+        self,
+        file_path: str,
+        plot_path: Optional[str],
+        max_workers: Optional[int] = None,
+        search: bool = False,
+    ) -> List[Dict[str, Any]]:
         """
         Executa o processo completo de carregamento dos dados, divisão dos dados, treinamento,
-        avaliação e salvamento do modelo.
+        avaliação e salvamento do modelo e das métricas, mede o custo de servir o modelo
+        e exibe o tempo gasto em cada etapa.
 
         Args:
             file_path (str): Caminho para salvar o modelo treinado.
-            plot_path (str): Caminho para salvar os gráficos de métricas.
+            plot_path (str, optional): Caminho para salvar os gráficos de métricas. Com
+                None, nenhum gráfico é gerado e o matplotlib não é importado.
+            max_workers (int, optional): Processos usados pelas etapas paralelas
+                (padrão: um por CPU); 0 executa tudo em série.
+            search (bool): Escolhe algoritmo e hiperparâmetros antes de treinar.
+
+        Returns:
+            List[Dict[str, Any]]: Início e duração de cada etapa, em segundos.
+        """
+        if plot_path is not None:
+            os.makedirs(plot_path, exist_ok=True)
+        graph = self.build_graph(file_path, plot_path, search, max_workers)
+        artifacts = graph.run(max_workers=max_workers)
+        # Fora do grafo: as etapas do pool disputariam a CPU com a medição de latência.
+        self.profile_model(artifacts["model_path"], artifacts["X"])
+
+        cv_scores = artifacts["cv_scores"]
+        print("Treinamento concluído com sucesso!\n")
+        print(
+            f"Acurácia no teste: {artifacts['metrics']['accuracy']:.4f} | validação "
+            f"cruzada: {cv_scores.mean():.4f} ± {cv_scores.std():.4f}\n"
+        )
+        print(graph.report())
+        if plot_path is not None:
+            print(f"\nGráficos salvos em: {plot_path}")
+        print(f"Modelo salvo como: {artifacts['model_path']}")
+        return graph.timings
+
+    def run_out_of_core(
+        self,
+        partitions: Sequence[str],
+        file_path: str,
+        algorithm: str = "knn",
+        chunk_rows: int = 50_000,
+        reservoir_size: int = 2_000,
+        test_size: float = 0.2,
+    ) -> Dict[str, Any]:
+        """
+        Treina com bases maiores que a memória (ex.: logs rotulados de produção),
+        lendo as partições Parquet/CSV em blocos (ver `out_of_core`), e salva o
+        modelo, as métricas e o custo de servir, como `run`.
+
+        Args:
+            partitions (Sequence[str]): Arquivos, diretórios ou padrões glob.
+            file_path (str): Caminho para salvar o modelo treinado.
+            algorithm (str): Família do classificador.
+            chunk_rows (int): Linhas por bloco lido.
+            reservoir_size (int): Linhas por classe na amostra de treino do KNN.
+            test_size (float): Fração das linhas separada para teste; com 0, a
+                acurácia fica sem valor.
+
+        Returns:
+            Dict[str, Any]: Relatório do treino, com a acurácia e o pico de memória.
         """
+        model, report = fit_out_of_core(
+            partitions, algorithm, chunk_rows, reservoir_size, test_size
+        )
+        model_path = self.resolve_model_path(model, file_path)
+        self.save_model(model, model_path)
+        self.save_metrics(
+            {"accuracy": report["accuracy"]},
+            None,
+            None,
+            model_path,
+            model=model,
+            out_of_core=report,
+        )
+        files = find_partitions(partitions)
+        self.save_reference_profile(
+            model, (X for X, _ in iter_chunks(files, chunk_rows)), model_path
+        )
+        X, _ = next(iter_chunks(files, 1_000))
+        self.profile_model(model_path, X)
 
-        steps = 10
-        with tqdm(total=100, desc="Treinamento do Modelo", unit="step") as pbar:
-            X, y = self.load_data()
-            pbar.update(steps)
-            self.plot_dataset_info(X, plot_path)
-            pbar.update(steps)
+        peak = report["peak_memory"]
+        # Sem linhas de teste (test_size=0 ou base muito pequena) não há acurácia.
+        accuracy = "n/d" if report["accuracy"] is None else f"{report['accuracy']:.4f}"
+        print(
+            f"Treino fora da memória: {report['rows']} linhas em {report['chunks']} "
+            f"blocos | acurácia no teste: {accuracy} | pico de memória: "
+            f"{peak['python_numpy_bytes'] / 2**20:.1f} MiB (Python/NumPy), "
+            f"{peak['arrow_bytes'] / 2**20:.1f} MiB (Arrow)"
+        )
+        return report
 
-            X_train, X_test, y_train, y_test = self.split_data(X, y)
-            pbar.update(steps)
 
-            self.plot_distribution(y_train, y_test, plot_path)
-            pbar.update(steps)
+def _pyplot() -> Any:
+    # Importado só ao gerar um gráfico: o treino sem gráficos não carrega o matplotlib.
+    import matplotlib.pyplot as plt
 
-            self.cross_validate_model(X_train, y_train, plot_path)
-            model = self.train_model(X_train, y_train)
-            pbar.update(steps)
-            
-            self.evaluate_model(model, X_test, y_test, plot_path)
-            pbar.update(steps)
+    return plt
 
-            self.plot_learning_curve(model, X, y, plot_path)
-            pbar.update(steps)
 
-            self.save_model(model, file_path)
-            pbar.update(steps)
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Treina o modelo KNN do dataset Íris.")
+    parser.add_argument(
+        "--model-path",
+        default="./saved_models/iris_{algorithm}_v1_"
+        f"{datetime.now().strftime('%Y%m%d')}.pkl",
+        help="Arquivo do modelo ({algorithm} vira a família treinada); as métricas "
+        "vão para <modelo>.metrics.json.",
+    )
+    parser.add_argument("--plot-path", default="./data", help="Pasta dos gráficos.")
+    parser.add_argument(
+        "--no-plots",
+        action="store_true",
+        help="Não gera gráficos (nem importa o matplotlib); só modelo e métricas.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processos das etapas paralelas (padrão: um por CPU; 0 = em série).",
+    )
+    parser.add_argument(
+        "--search",
+        action="store_true",
+        help="Escolhe algoritmo e hiperparâmetros (successive halving) antes de treinar.",
+    )
+    parser.add_argument(
+        "--algorithms",
+        default=",".join(ALGORITHMS),
+        help="Famílias avaliadas na busca, separadas por vírgula.",
+    )
+    parser.add_argument(
+        "--data-source",
+        default=None,
+        help="Fonte do dataset: sklearn, uma URL ou um CSV no formato do UCI "
+        "(padrão: IRIS_DATASET_SOURCE).",
+    )
+    parser.add_argument(
+        "--partitions",
+        nargs="+",
+        default=None,
+        help="Treina fora da memória com estas partições Parquet/CSV (arquivos, "
+        "diretórios ou globs), com a família --algorithms (padrão: knn).",
+    )
+    parser.add_argument(
+        "--chunk-rows", type=int, default=50_000, help="Linhas por bloco lido."
+    )
+    parser.add_argument(
+        "--reservoir-size",
+        type=int,
+        default=2_000,
+        help="Linhas por classe na amostra de treino do KNN fora da memória.",
+    )
+    parser.add_argument(
+        "--neighbor-index",
+        choices=NEIGHBOR_INDEXES,
+        default="brute",
+        help="Índice de vizinhos do KNN gravado com o modelo (ivf é aproximado).",
+    )
+    args = parser.parse_args()
 
-        print("Treinamento concluído com sucesso!\n")
-        print(f"Gráficos salvos em: {plot_path}")
-        print(f"Modelo salvo como: {file_path}")
+    if args.partitions:
+        IrisModelTrainer(neighbor_index=args.neighbor_index).run_out_of_core(
+            args.partitions,
+            args.model_path,
+            algorithm=args.algorithms.split(",")[0],
+            chunk_rows=args.chunk_rows,
+            reservoir_size=args.reservoir_size,
+        )
+        return
+
+    trainer = IrisModelTrainer(
+        algorithms=args.algorithms.split(","),
+        data_source=args.data_source,
+        neighbor_index=args.neighbor_index,
+    )
+    plot_path = None if args.no_plots else args.plot_path
+    trainer.run(args.model_path, plot_path, args.workers, search=args.search)
 
 
 if __name__ == "__main__":
-    trainer = IrisModelTrainer()
-    timestamp = datetime.now().strftime("%Y%m%d")
-    model_file_path = f"./saved_models/iris_knn_v1_{timestamp}.pkl"
-    plot_path = "./data"
-    trainer.run(model_file_path, plot_path)
+    main()
@@ -0,0 +1,332 @@
+import json
+import os
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+
+import numpy as np
+from desafio1.models.ml.neighbor_index import (
+    NEIGHBOR_INDEXES,
+    BruteForceIndex,
+    IVFIndex,
+    TreeIndex,
+    load_neighbor_index,
+)
+from numpy import ndarray
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+# Versão 2: índice de vizinhos em `meta.json["index"]`. Artefatos da versão 1 usam a
+# força bruta.
+ARTIFACT_FORMAT_VERSION = 2
+SUPPORTED_FORMAT_VERSIONS = (1, 2)
+
+
+def knn_artifact_path(model_path: str) -> str:
+    """
+    Retorna o caminho do artefato mapeável em memória correspondente a um modelo `.pkl`.
+
+    Args:
+        model_path (str): Caminho do modelo serializado com pickle.
+
+    Returns:
+        str: Mesmo caminho, com a extensão `.knn` (um diretório de arquivos `.npy`).
+    """
+    return os.path.splitext(model_path)[0] + ".knn"
+
+
+def export_knn_artifact(
+    model: "Pipeline",
+    file_path: str,
+    index: str = "brute",
+    n_lists: Optional[int] = None,
+    n_probe: int = 8,
+) -> None:
+    """
+    Exporta um pipeline StandardScaler + KNN para um artefato NumPy compacto.
+
+    O artefato guarda a média e a escala do scaler, a matriz de treino já padronizada e
+    os rótulos, em float32/int32, além dos parâmetros necessários para a votação.
+
+    Se `file_path` terminar em `.npz`, tudo é gravado em um único arquivo compactado.
+    Caso contrário, `file_path` é um diretório com um `.npy` por array e um
+    `meta.json`; nesse formato os arrays podem ser abertos com `mmap`, de modo que
+    vários workers compartilham as mesmas páginas físicas, e o índice de vizinhos
+    (ver `neighbor_index`) é construído e gravado junto.
+
+    Args:
+        model (Pipeline): Pipeline treinado com os passos "scaler" e "classifier".
+        file_path (str): Caminho do arquivo `.npz` ou do diretório a ser gerado.
+        index (str): Índice de vizinhos: brute, kd_tree, ball_tree ou ivf.
+        n_lists (int, optional): Listas do índice `ivf` (padrão: √n_linhas).
+        n_probe (int): Listas visitadas por consulta no índice `ivf`.
+
+    Raises:
+        ValueError: Se o pipeline não for um StandardScaler seguido de um KNN com pesos
+            uniformes e distância euclidiana, ou se o índice for desconhecido ou
+            pedido no formato `.npz`.
+    """
+    # Import tardio: quem só carrega o artefato para servir não precisa do scikit-learn.
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = model.named_steps.get("scaler")
+    classifier = model.named_steps.get("classifier")
+    if not isinstance(scaler, StandardScaler) or not isinstance(
+        classifier, KNeighborsClassifier
+    ):
+        raise ValueError(
+            "O pipeline precisa ser StandardScaler + KNeighborsClassifier."
+        )
+    if classifier.weights != "uniform" or classifier.effective_metric_ != "euclidean":
+        raise ValueError("Apenas KNN com pesos uniformes e distância euclidiana.")
+    if index not in NEIGHBOR_INDEXES:
+        raise ValueError(f"Índice desconhecido: {index}. Use {list(NEIGHBOR_INDEXES)}.")
+    if index != "brute" and file_path.endswith(".npz"):
+        raise ValueError("O formato .npz só suporta o índice brute.")
+
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(scaler.n_features_in_)
+    scale = scaler.scale_ if scaler.with_std else np.ones(scaler.n_features_in_)
+    arrays = {
+        "mean": mean.astype(np.float32),
+        "scale": scale.astype(np.float32),
+        "fit_X": classifier._fit_X.astype(np.float32),
+        "labels": classifier._y.astype(np.int32),
+        "classes": classifier.classes_,
+    }
+    if file_path.endswith(".npz"):
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        np.savez(file_path, n_neighbors=np.int32(classifier.n_neighbors), **arrays)
+        return
+
+    if index == "ivf":
+        # O IVF guarda as linhas de cada lista contíguas: a matriz de treino e os
+        # rótulos são gravados em ordem de lista.
+        order, centroids, offsets = IVFIndex.partition(arrays["fit_X"], n_lists)
+        arrays["fit_X"] = arrays["fit_X"][order]
+        arrays["labels"] = arrays["labels"][order]
+
+    # Arrays derivados também são persistidos, para não serem recalculados (e
+    # duplicados na memória) em cada worker.
+    arrays["fit_sq_norms"], arrays["votes"] = _derived_arrays(
+        arrays["fit_X"], arrays["labels"], len(arrays["classes"])
+    )
+    if index == "ivf":
+        neighbor_index: Any = IVFIndex(
+            arrays["fit_X"], arrays["fit_sq_norms"], centroids, offsets, n_probe
+        )
+    elif index == "brute":
+        neighbor_index = BruteForceIndex(arrays["fit_X"], arrays["fit_sq_norms"])
+    else:
+        neighbor_index = TreeIndex.build(arrays["fit_X"], index)
+
+    os.makedirs(file_path, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(file_path, f"{name}.npy"), np.ascontiguousarray(array))
+    neighbor_index.save(file_path)
+    with open(os.path.join(file_path, "meta.json"), "w") as f:
+        json.dump(
+            {
+                "format_version": ARTIFACT_FORMAT_VERSION,
+                "n_neighbors": int(classifier.n_neighbors),
+                "n_samples": int(len(arrays["fit_X"])),
+                "n_features": int(arrays["fit_X"].shape[1]),
+                "index": neighbor_index.params(),
+            },
+            f,
+            indent=2,
+        )
+
+
+def _derived_arrays(
+    fit_X: ndarray, labels: ndarray, n_classes: int
+) -> Tuple[ndarray, ndarray]:
+    fit_sq_norms = np.einsum("ij,ij->i", fit_X, fit_X)
+    votes = np.eye(n_classes, dtype=np.float32)[labels]
+    return fit_sq_norms, votes
+
+
+class NumpyKNNScorer:
+    """
+    Classificador KNN em NumPy puro, equivalente ao pipeline StandardScaler + KNN.
+
+    Faz a padronização, o cálculo vetorizado das distâncias e a votação entre os k
+    vizinhos sem passar pelas camadas de validação do scikit-learn. Expõe `classes_`,
+    `predict` e `predict_proba`, podendo ser servido no lugar do pipeline.
+
+    Args:
+        mean (ndarray): Média de cada atributo usada na padronização.
+        scale (ndarray): Desvio padrão de cada atributo usado na padronização.
+        fit_X (ndarray): Matriz de treino já padronizada.
+        labels (ndarray): Índice da classe de cada linha de treino.
+        classes (ndarray): Classes originais, na ordem das colunas de `predict_proba`.
+        n_neighbors (int): Quantidade de vizinhos na votação.
+        fit_sq_norms (ndarray, optional): Norma ao quadrado de cada linha de `fit_X`.
+        votes (ndarray, optional): Codificação one-hot de `labels`.
+        index (Any, optional): Índice de vizinhos (ver `neighbor_index`); padrão
+            força bruta sobre `fit_X`.
+    """
+
+    def __init__(
+        self,
+        mean: ndarray,
+        scale: ndarray,
+        fit_X: ndarray,
+        labels: ndarray,
+        classes: ndarray,
+        n_neighbors: int,
+        fit_sq_norms: Optional[ndarray] = None,
+        votes: Optional[ndarray] = None,
+        index: Optional[Any] = None,
+    ) -> None:
+        # np.asarray não copia arrays que já têm o dtype certo, preservando o mmap.
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+        self.fit_X = np.asarray(fit_X, dtype=np.float32)
+        self.labels = np.asarray(labels)
+        self.classes_ = np.asarray(classes)
+        self.n_neighbors = int(n_neighbors)
+        if fit_sq_norms is None or votes is None:
+            fit_sq_norms, votes = _derived_arrays(
+                self.fit_X, self.labels, len(self.classes_)
+            )
+        self._fit_sq_norms = fit_sq_norms
+        self._votes = votes
+        self.index = index or BruteForceIndex(self.fit_X, self._fit_sq_norms)
+        self._source_path: Optional[str] = None
+
+    def __reduce__(self) -> Any:
+        # Um scorer mapeado em memória é enviado a outros processos pelo caminho do
+        # artefato, para que o destino também o abra com mmap em vez de copiar os arrays.
+        if self._source_path is not None:
+            return (type(self).load, (self._source_path,))
+        return super().__reduce__()
+
+    @classmethod
+    def load(cls, file_path: str, mmap: bool = True) -> "NumpyKNNScorer":
+        """
+        Carrega um artefato gerado por `export_knn_artifact`.
+
+        Args:
+            file_path (str): Caminho do arquivo `.npz` ou do diretório de `.npy`.
+            mmap (bool): Se os `.npy` devem ser abertos com `mmap` (somente leitura)
+                em vez de lidos para a memória do processo.
+
+        Returns:
+            NumpyKNNScorer: Scorer pronto para uso.
+        """
+        if os.path.isdir(file_path):
+            with open(os.path.join(file_path, "meta.json")) as f:
+                meta = json.load(f)
+            if meta["format_version"] not in SUPPORTED_FORMAT_VERSIONS:
+                raise ValueError(
+                    f"Versão de artefato não suportada: {meta['format_version']}"
+                )
+            mmap_mode = "r" if mmap else None
+            arrays = {
+                name: np.load(
+                    os.path.join(file_path, f"{name}.npy"),
+                    mmap_mode=mmap_mode if name != "classes" else None,
+                )
+                for name in (
+                    "mean",
+                    "scale",
+                    "fit_X",
+                    "labels",
+                    "classes",
+                    "fit_sq_norms",
+                    "votes",
+                )
+            }
+            index = load_neighbor_index(
+                file_path,
+                meta.get("index", {"type": "brute"}),
+                arrays["fit_X"],
+                arrays["fit_sq_norms"],
+                mmap_mode,
+            )
+            scorer = cls(n_neighbors=meta["n_neighbors"], index=index, **arrays)
+            if mmap:
+                scorer._source_path = file_path
+            return scorer
+
+        with np.load(file_path) as artifact:
+            return cls(
+                mean=artifact["mean"],
+                scale=artifact["scale"],
+                fit_X=artifact["fit_X"],
+                labels=artifact["labels"],
+                classes=artifact["classes"],
+                n_neighbors=int(artifact["n_neighbors"]),
+            )
+
+    def kneighbors(self, X: Any) -> ndarray:
+        """
+        Retorna os índices dos k vizinhos mais próximos de cada linha de X.
+
+        Args:
+            X (Any): Matriz (n_amostras, n_atributos) na escala original.
+
+        Returns:
+            ndarray: Matriz (n_amostras, n_neighbors) com índices da matriz de treino.
+        """
+        return self.kneighbors_scaled(self.transform(X))
+
+    def transform(self, X: Any) -> ndarray:
+        """
+        Padroniza X com a média e a escala do StandardScaler exportado.
+
+        Args:
+            X (Any): Matriz (n_amostras, n_atributos) na escala original.
+
+        Returns:
+            ndarray: Matriz padronizada, em float32.
+        """
+        return (np.asarray(X, dtype=np.float32) - self.mean) / self.scale
+
+    def kneighbors_scaled(self, Z: ndarray) -> ndarray:
+        """
+        Retorna os índices dos k vizinhos mais próximos de linhas já padronizadas.
+
+        Args:
+            Z (ndarray): Matriz retornada por `transform`.
+
+        Returns:
+            ndarray: Matriz (n_amostras, n_neighbors) com índices da matriz de treino.
+        """
+        return self.index.search(Z, self.n_neighbors)
+
+    def predict_proba(self, X: Any) -> ndarray:
+        """
+        Calcula a fração de votos de cada classe entre os k vizinhos.
+
+        Args:
+            X (Any): Matriz (n_amostras, n_atributos) na escala original.
+
+        Returns:
+            ndarray: Matriz (n_amostras, n_classes) com as probabilidades.
+        """
+        return self.predict_proba_scaled(self.transform(X))
+
+    def predict_proba_scaled(self, Z: ndarray) -> ndarray:
+        """
+        Calcula a fração de votos de cada classe para linhas já padronizadas.
+
+        Args:
+            Z (ndarray): Matriz retornada por `transform`.
+
+        Returns:
+            ndarray: Matriz (n_amostras, n_classes) com as probabilidades.
+        """
+        return self._votes[self.kneighbors_scaled(Z)].mean(axis=1, dtype=np.float64)
+
+    def predict(self, X: Any) -> ndarray:
+        """
+        Retorna a classe mais votada para cada linha de X.
+
+        Args:
+            X (Any): Matriz (n_amostras, n_atributos) na escala original.
+
+        Returns:
+            ndarray: Classes preditas.
+        """
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
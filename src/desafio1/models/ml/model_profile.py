@@ -0,0 +1,181 @@
+"""
+Custo de servir um modelo: latência de inferência, tamanho serializado e tempo de
+carga, medidos na máquina do treino.
+
+O resultado é gravado em `<modelo>.profile.json`, ao lado do artefato, e lido pelo
+ModelRegistry; com `IRIS_LATENCY_SLO_MS`, a API usa esses números para escolher o
+modelo padrão. Para medir de novo artefatos já salvos (ex.: na máquina que serve a
+API):
+
+    PYTHONPATH=src python -m desafio1.models.ml.model_profile saved_models/iris_*_v1_*.pkl
+"""
+
+import argparse
+import json
+import os
+import pickle
+import platform
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict
+
+import numpy as np
+from desafio1.api.services.model_registry import profile_path
+from desafio1.models.ml.knn_scorer import NumpyKNNScorer, knn_artifact_path
+from numpy import ndarray
+
+
+def measure_latency(
+    model: Any, X: ndarray, repeats: int = 200, batch_size: int = 1000
+) -> Dict[str, float]:
+    """
+    Mede o custo de servir um modelo com `predict_proba`, como faz a API.
+
+    Args:
+        model (Any): Modelo treinado.
+        X (ndarray): Linhas usadas nas medições.
+        repeats (int): Quantidade de predições unitárias medidas.
+        batch_size (int): Tamanho do lote medido.
+
+    Returns:
+        Dict[str, float]: Latência p50/p95 de uma predição unitária e custo por linha
+            em um lote, em microssegundos.
+    """
+    rows = [X[i % len(X)].reshape(1, -1) for i in range(repeats)]
+    model.predict_proba(rows[0])
+    samples = []
+    for row in rows:
+        start = time.perf_counter()
+        model.predict_proba(row)
+        samples.append(time.perf_counter() - start)
+    batch = np.resize(X, (batch_size, X.shape[1]))
+    start = time.perf_counter()
+    model.predict_proba(batch)
+    batch_s = time.perf_counter() - start
+    return {
+        "single_row_p50_us": float(np.percentile(samples, 50) * 1e6),
+        "single_row_p95_us": float(np.percentile(samples, 95) * 1e6),
+        "batch_row_us": batch_s / batch_size * 1e6,
+    }
+
+
+def measure_load_time(load: Callable[[], Any], repeats: int = 5) -> float:
+    """
+    Mede o tempo de carga de um modelo.
+
+    Args:
+        load (Callable[[], Any]): Função que carrega o modelo.
+        repeats (int): Quantidade de cargas medidas.
+
+    Returns:
+        float: Mediana do tempo de carga, em milissegundos.
+    """
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        load()
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples) * 1e3)
+
+
+def measure_serialization(model: Any) -> Dict[str, float]:
+    """
+    Mede o tamanho e o tempo de carga do modelo serializado com pickle, sem gravá-lo
+    em disco (usado para comparar candidatos da busca).
+
+    Args:
+        model (Any): Modelo treinado.
+
+    Returns:
+        Dict[str, float]: `serialized_bytes` e `load_time_ms`.
+    """
+    data = pickle.dumps(model)
+    return {
+        "serialized_bytes": len(data),
+        "load_time_ms": measure_load_time(lambda: pickle.loads(data)),
+    }
+
+
+def profile_artifact(model_path: str, X: ndarray) -> Dict[str, Any]:
+    """
+    Mede o custo de servir um artefato salvo: tamanho em disco, tempo de carga e
+    latência, com o `.pkl` e, para o KNN, também com o artefato `.knn` do
+    NumpyKNNScorer (`IRIS_SCORER=numpy`).
+
+    Args:
+        model_path (str): Caminho do modelo `.pkl`.
+        X (ndarray): Linhas usadas na medição da latência.
+
+    Returns:
+        Dict[str, Any]: Medições e a descrição da máquina em que foram feitas.
+    """
+
+    def load_pickle() -> Any:
+        with open(model_path, "rb") as f:
+            return pickle.load(f)
+
+    profile: Dict[str, Any] = {
+        "size_bytes": os.path.getsize(model_path),
+        "load_time_ms": measure_load_time(load_pickle),
+        "latency": measure_latency(load_pickle(), X),
+    }
+    artifact_path = knn_artifact_path(model_path)
+    if os.path.isdir(artifact_path):
+        profile["numpy_scorer"] = {
+            "size_bytes": sum(
+                entry.stat().st_size for entry in os.scandir(artifact_path)
+            ),
+            "load_time_ms": measure_load_time(
+                lambda: NumpyKNNScorer.load(artifact_path)
+            ),
+            "latency": measure_latency(NumpyKNNScorer.load(artifact_path), X),
+        }
+    profile["host"] = {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+    }
+    profile["measured_at"] = datetime.now(timezone.utc).isoformat()
+    return profile
+
+
+def save_profile(model_path: str, X: ndarray) -> Dict[str, Any]:
+    """
+    Mede um artefato e grava o resultado em `<modelo>.profile.json`.
+
+    Args:
+        model_path (str): Caminho do modelo `.pkl`.
+        X (ndarray): Linhas usadas na medição da latência.
+
+    Returns:
+        Dict[str, Any]: Medições gravadas.
+    """
+    profile = profile_artifact(model_path, X)
+    with open(profile_path(model_path), "w") as f:
+        json.dump(profile, f, indent=2)
+    return profile
+
+
+def main() -> None:
+    from sklearn import datasets
+
+    parser = argparse.ArgumentParser(
+        description="Mede latência, tamanho e tempo de carga de modelos salvos."
+    )
+    parser.add_argument("models", nargs="+", help="Arquivos .pkl.")
+    args = parser.parse_args()
+
+    X, _ = datasets.load_iris(return_X_y=True)
+    for model_path in args.models:
+        profile = save_profile(model_path, X)
+        latency = profile["latency"]
+        print(
+            f"{os.path.basename(model_path)}: {profile['size_bytes']} bytes | carga "
+            f"{profile['load_time_ms']:.2f}ms | p50 {latency['single_row_p50_us']:.0f}µs"
+            f" | p95 {latency['single_row_p95_us']:.0f}µs | lote "
+            f"{latency['batch_row_us']:.2f}µs/linha"
+        )
+
+
+if __name__ == "__main__":
+    main()
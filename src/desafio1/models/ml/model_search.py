@@ -0,0 +1,187 @@
+"""
+Busca de algoritmo e hiperparâmetros para o pipeline do Íris.
+
+Todos os candidatos são o mesmo pipeline (padronização + classificador) servido pela
+API, trocando apenas o passo `classifier`. A busca usa successive halving: todos os
+candidatos começam avaliados com poucas amostras e só o terço melhor avança para a
+rodada seguinte, com o triplo de amostras. As avaliações rodam em todos os núcleos
+(joblib/loky); matrizes acima de `max_nbytes` são compartilhadas com os workers por
+memory map, sem uma cópia por processo.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from desafio1.models.ml.model_profile import measure_latency, measure_serialization
+from numpy import ndarray
+from sklearn.base import BaseEstimator
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import HalvingGridSearchCV, StratifiedKFold
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+# Família -> construtor do classificador. Os nomes seguem os artefatos
+# iris_<família>_v<versão>_<data>.pkl lidos pelo ModelRegistry.
+ALGORITHMS: Dict[str, Callable[[], BaseEstimator]] = {
+    "knn": lambda: KNeighborsClassifier(n_neighbors=5),
+    "dt": lambda: DecisionTreeClassifier(random_state=42),
+    "lr": lambda: LogisticRegression(max_iter=1000),
+    "nb": lambda: GaussianNB(),
+}
+
+# Família -> hiperparâmetros do classificador avaliados na busca.
+DEFAULT_SEARCH_SPACE: Dict[str, Dict[str, List[Any]]] = {
+    "knn": {"n_neighbors": [1, 3, 5, 7, 9, 11, 15], "weights": ["uniform", "distance"]},
+    "dt": {"max_depth": [2, 3, 4, 5, None], "min_samples_leaf": [1, 2, 5]},
+    "lr": {"C": [0.01, 0.1, 1.0, 10.0, 100.0]},
+    "nb": {"var_smoothing": [1e-9, 1e-7, 1e-5]},
+}
+
+
+def build_pipeline(classifier: BaseEstimator) -> Pipeline:
+    """
+    Monta o pipeline servido pela API em torno de um classificador.
+
+    Args:
+        classifier (BaseEstimator): Classificador do scikit-learn.
+
+    Returns:
+        Pipeline: Padronização seguida do classificador.
+    """
+    return Pipeline([("scaler", StandardScaler()), ("classifier", classifier)])
+
+
+def algorithm_name(model: Pipeline) -> str:
+    """
+    Retorna a família do classificador de um pipeline (knn, dt, lr ou nb).
+
+    Raises:
+        ValueError: Se o classificador não pertencer a nenhuma família conhecida.
+    """
+    classifier = model.named_steps["classifier"]
+    for name, factory in ALGORITHMS.items():
+        if type(classifier) is type(factory()):
+            return name
+    raise ValueError(f"Classificador sem família conhecida: {classifier!r}")
+
+
+def param_grid(
+    search_space: Dict[str, Dict[str, List[Any]]],
+) -> List[Dict[str, List[Any]]]:
+    """
+    Converte o espaço de busca por família na grade do pipeline, em que o próprio
+    passo `classifier` é um dos parâmetros.
+
+    Args:
+        search_space (Dict[str, Dict[str, List[Any]]]): Família -> hiperparâmetros.
+
+    Returns:
+        List[Dict[str, List[Any]]]: Uma grade por família, no formato do scikit-learn.
+
+    Raises:
+        ValueError: Se alguma família não existir em `ALGORITHMS`.
+    """
+    grid = []
+    for name, params in search_space.items():
+        if name not in ALGORITHMS:
+            raise ValueError(f"Algoritmo desconhecido: {name}. Use {list(ALGORITHMS)}.")
+        family: Dict[str, List[Any]] = {"classifier": [ALGORITHMS[name]()]}
+        for param, values in params.items():
+            family[f"classifier__{param}"] = list(values)
+        grid.append(family)
+    return grid
+
+
+def search_models(
+    X: ndarray,
+    y: ndarray,
+    search_space: Optional[Dict[str, Dict[str, List[Any]]]] = None,
+    algorithms: Optional[Sequence[str]] = None,
+    n_jobs: int = -1,
+    min_resources: int = 30,
+    factor: int = 3,
+) -> Dict[str, Any]:
+    """
+    Busca o melhor pipeline entre as famílias e hiperparâmetros do espaço de busca.
+
+    Args:
+        X (ndarray): Atributos de treino.
+        y (ndarray): Alvos de treino.
+        search_space (Dict, optional): Família -> hiperparâmetros; padrão
+            `DEFAULT_SEARCH_SPACE`.
+        algorithms (Sequence[str], optional): Restringe a busca a essas famílias.
+        n_jobs (int): Processos da busca (-1 usa todos os núcleos).
+        min_resources (int): Amostras usadas na primeira rodada.
+        factor (int): A cada rodada, mantém 1/`factor` dos candidatos e multiplica
+            as amostras por `factor`.
+
+    Returns:
+        Dict[str, Any]: `model` (melhor pipeline, treinado em todo o treino),
+            `algorithm`, `params`, `cv_accuracy` e `latency` do vencedor, `rounds`
+            (candidatos e amostras por rodada) e `candidates` (melhor configuração de
+            cada família, com a acurácia na última rodada que alcançou e, depois de
+            treinada com todo o treino, a latência, o tamanho serializado e o tempo de
+            carga).
+    """
+    space = dict(search_space or DEFAULT_SEARCH_SPACE)
+    if algorithms is not None:
+        space = {name: space[name] for name in algorithms}
+    search = HalvingGridSearchCV(
+        build_pipeline(ALGORITHMS["knn"]()),
+        param_grid(space),
+        factor=factor,
+        min_resources=min_resources,
+        cv=StratifiedKFold(n_splits=5, shuffle=True, random_state=42),
+        n_jobs=n_jobs,
+        random_state=42,
+    )
+    search.fit(X, y)
+
+    results = search.cv_results_
+    candidates: Dict[str, Dict[str, Any]] = {}
+    # Para cada família, a configuração que chegou mais longe e, nessa rodada, teve
+    # a maior acurácia.
+    for i, params in enumerate(results["params"]):
+        name = algorithm_name(build_pipeline(params["classifier"]))
+        key = (results["iter"][i], results["mean_test_score"][i])
+        best = candidates.get(name)
+        if best is None or key > (best["round"], best["cv_accuracy"]):
+            candidates[name] = {
+                "algorithm": name,
+                "params": _classifier_params(params),
+                "round": int(results["iter"][i]),
+                "n_samples": int(results["n_resources"][i]),
+                "cv_accuracy": float(results["mean_test_score"][i]),
+            }
+    for candidate in candidates.values():
+        classifier = ALGORITHMS[candidate["algorithm"]]().set_params(
+            **candidate["params"]
+        )
+        model = build_pipeline(classifier).fit(X, y)
+        candidate["latency"] = measure_latency(model, X)
+        candidate.update(measure_serialization(model))
+    return {
+        "model": search.best_estimator_,
+        "algorithm": algorithm_name(search.best_estimator_),
+        "params": _classifier_params(search.best_params_),
+        "cv_accuracy": float(search.best_score_),
+        "latency": measure_latency(search.best_estimator_, X),
+        "rounds": [
+            {"candidates": int(c), "n_samples": int(n)}
+            for c, n in zip(search.n_candidates_, search.n_resources_)
+        ],
+        "candidates": sorted(
+            candidates.values(), key=lambda c: (-c["round"], -c["cv_accuracy"])
+        ),
+    }
+
+
+def _classifier_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        k.split("__", 1)[1]: v
+        for k, v in params.items()
+        if k.startswith("classifier__")
+    }
@@ -0,0 +1,321 @@
+"""
+Índices de vizinhos para o NumpyKNNScorer.
+
+A busca exata por força bruta compara cada consulta com todas as linhas de treino e
+cresce linearmente com o conjunto de referência. Os índices abaixo são construídos no
+treino, gravados no artefato `.knn` e escolhidos por modelo (`--neighbor-index`):
+
+- `brute`: força bruta vetorizada (padrão; exata).
+- `kd_tree` / `ball_tree`: árvores do scikit-learn (exatas); o pipeline `.pkl` usa a
+  mesma árvore (`KNeighborsClassifier(algorithm=...)`).
+- `ivf`: índice invertido aproximado. As linhas são agrupadas por k-means em
+  `n_lists` listas, gravadas em ordem de lista; cada consulta só compara as linhas das
+  `n_probe` listas de centróide mais próximo. Só usa NumPy para servir.
+
+Todos expõem `search(Z, k)`, que retorna os índices dos k vizinhos de cada linha já
+padronizada de Z.
+"""
+
+import os
+import pickle
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from numpy import ndarray
+
+NEIGHBOR_INDEXES = ("brute", "kd_tree", "ball_tree", "ivf")
+TREE_INDEXES = ("kd_tree", "ball_tree")
+
+
+class BruteForceIndex:
+    """
+    Busca exata comparando cada consulta com todas as linhas de treino.
+
+    Args:
+        fit_X (ndarray): Matriz de treino padronizada.
+        fit_sq_norms (ndarray, optional): Norma ao quadrado de cada linha de `fit_X`.
+    """
+
+    kind = "brute"
+
+    def __init__(self, fit_X: ndarray, fit_sq_norms: Optional[ndarray] = None) -> None:
+        self.fit_X = fit_X
+        if fit_sq_norms is None:
+            fit_sq_norms = np.einsum("ij,ij->i", fit_X, fit_X)
+        self.fit_sq_norms = fit_sq_norms
+
+    def params(self) -> Dict[str, Any]:
+        """Retorna os parâmetros gravados no `meta.json` do artefato."""
+        return {"type": self.kind}
+
+    def save(self, path: str) -> None:
+        """Nada a gravar: a força bruta só usa os arrays do artefato."""
+
+    def search(self, Z: ndarray, k: int) -> ndarray:
+        """
+        Retorna os índices dos k vizinhos mais próximos de cada linha de Z.
+
+        Args:
+            Z (ndarray): Consultas padronizadas.
+            k (int): Quantidade de vizinhos.
+
+        Returns:
+            ndarray: Matriz (n_consultas, k) com índices da matriz de treino.
+        """
+        k = min(k, len(self.fit_X))
+        # Lotes grandes são divididos para que a matriz de distâncias não passe de
+        # ~4M elementos com referências grandes.
+        block = max(1, 2**22 // len(self.fit_X))
+        if len(Z) > block:
+            return np.concatenate(
+                [
+                    self.search(part, k)
+                    for part in np.array_split(Z, -(-len(Z) // block))
+                ]
+            )
+        # ||z - x||² = ||z||² - 2 z·x + ||x||²; ||z||² não altera a ordem dos vizinhos.
+        distances = self.fit_sq_norms - 2 * (Z @ self.fit_X.T)
+        # Cópia: a fatia manteria viva a matriz inteira de argpartition.
+        return np.argpartition(distances, k - 1, axis=1)[:, :k].copy()
+
+
+class TreeIndex:
+    """
+    Busca exata com KDTree ou BallTree do scikit-learn, construída no treino e gravada
+    com pickle em `tree.pkl`. Carregar o índice importa o scikit-learn.
+
+    Args:
+        tree (Any): `KDTree` ou `BallTree` construída sobre a matriz de treino.
+        kind (str): `kd_tree` ou `ball_tree`.
+    """
+
+    def __init__(self, tree: Any, kind: str) -> None:
+        self.tree = tree
+        self.kind = kind
+
+    @classmethod
+    def build(cls, fit_X: ndarray, kind: str, leaf_size: int = 30) -> "TreeIndex":
+        """
+        Constrói a árvore sobre a matriz de treino.
+
+        Args:
+            fit_X (ndarray): Matriz de treino padronizada.
+            kind (str): `kd_tree` ou `ball_tree`.
+            leaf_size (int): Linhas por folha.
+
+        Returns:
+            TreeIndex: Índice construído.
+        """
+        from sklearn.neighbors import BallTree, KDTree
+
+        tree_class = KDTree if kind == "kd_tree" else BallTree
+        return cls(tree_class(fit_X, leaf_size=leaf_size), kind)
+
+    def params(self) -> Dict[str, Any]:
+        """Retorna os parâmetros gravados no `meta.json` do artefato."""
+        return {"type": self.kind}
+
+    def save(self, path: str) -> None:
+        """Grava a árvore em `<path>/tree.pkl`."""
+        with open(os.path.join(path, "tree.pkl"), "wb") as f:
+            pickle.dump(self.tree, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str, kind: str) -> "TreeIndex":
+        """Carrega a árvore gravada por `save`."""
+        with open(os.path.join(path, "tree.pkl"), "rb") as f:
+            return cls(pickle.load(f), kind)
+
+    def search(self, Z: ndarray, k: int) -> ndarray:
+        """
+        Retorna os índices dos k vizinhos mais próximos de cada linha de Z.
+
+        Args:
+            Z (ndarray): Consultas padronizadas.
+            k (int): Quantidade de vizinhos.
+
+        Returns:
+            ndarray: Matriz (n_consultas, k) com índices da matriz de treino.
+        """
+        k = min(k, self.tree.data.shape[0])
+        return self.tree.query(Z, k=k, return_distance=False)
+
+
+class IVFIndex:
+    """
+    Índice invertido aproximado. A matriz de treino fica ordenada por lista, de modo
+    que a lista `i` ocupa as linhas `offsets[i]:offsets[i + 1]`.
+
+    Args:
+        fit_X (ndarray): Matriz de treino padronizada, em ordem de lista.
+        fit_sq_norms (ndarray): Norma ao quadrado de cada linha de `fit_X`.
+        centroids (ndarray): Centróide de cada lista.
+        offsets (ndarray): Início de cada lista em `fit_X` (e o fim da última).
+        n_probe (int): Listas visitadas por consulta; mais listas aumentam o recall
+            e a latência.
+    """
+
+    kind = "ivf"
+
+    def __init__(
+        self,
+        fit_X: ndarray,
+        fit_sq_norms: ndarray,
+        centroids: ndarray,
+        offsets: ndarray,
+        n_probe: int,
+    ) -> None:
+        self.fit_X = fit_X
+        self.fit_sq_norms = fit_sq_norms
+        self.centroids = centroids
+        self.offsets = offsets
+        self.n_probe = min(int(n_probe), len(centroids))
+        self._centroid_sq_norms = np.einsum("ij,ij->i", centroids, centroids)
+
+    @staticmethod
+    def partition(
+        fit_X: ndarray,
+        n_lists: Optional[int] = None,
+        random_state: int = 42,
+    ) -> Tuple[ndarray, ndarray, ndarray]:
+        """
+        Agrupa as linhas de treino em listas com k-means.
+
+        Os centróides são ajustados em uma amostra de até 256 linhas por lista
+        (MiniBatchKMeans) e todas as linhas são atribuídas em blocos, sem montar a
+        matriz completa de distâncias.
+
+        Args:
+            fit_X (ndarray): Matriz de treino padronizada.
+            n_lists (int, optional): Quantidade de listas (padrão: √n_linhas).
+            random_state (int): Semente do k-means e da amostra.
+
+        Returns:
+            Tuple[ndarray, ndarray, ndarray]: `order` (permutação que ordena as linhas
+                por lista), `centroids` e `offsets`.
+        """
+        from sklearn.cluster import MiniBatchKMeans
+
+        n_samples = len(fit_X)
+        n_lists = int(n_lists or max(1, round(np.sqrt(n_samples))))
+        n_lists = min(n_lists, n_samples)
+        rng = np.random.default_rng(random_state)
+        sample_size = min(n_samples, 256 * n_lists)
+        sample = fit_X[rng.choice(n_samples, sample_size, replace=False)]
+        kmeans = MiniBatchKMeans(
+            n_clusters=n_lists,
+            batch_size=min(sample_size, 4096),
+            n_init=1,
+            random_state=random_state,
+        ).fit(sample)
+        centroids = kmeans.cluster_centers_.astype(fit_X.dtype)
+
+        centroid_sq_norms = np.einsum("ij,ij->i", centroids, centroids)
+        assignments = np.empty(n_samples, dtype=np.int64)
+        block = max(1, 2**22 // n_lists)
+        for start in range(0, n_samples, block):
+            end = start + block
+            assignments[start:end] = np.argmin(
+                centroid_sq_norms - 2 * (fit_X[start:end] @ centroids.T), axis=1
+            )
+        order = np.argsort(assignments, kind="stable")
+        offsets = np.searchsorted(assignments[order], np.arange(n_lists + 1))
+        return order, centroids, offsets
+
+    def params(self) -> Dict[str, Any]:
+        """Retorna os parâmetros gravados no `meta.json` do artefato."""
+        return {
+            "type": self.kind,
+            "n_lists": len(self.centroids),
+            "n_probe": self.n_probe,
+        }
+
+    def save(self, path: str) -> None:
+        """Grava centróides e limites das listas em `<path>/ivf_*.npy`."""
+        np.save(os.path.join(path, "ivf_centroids.npy"), self.centroids)
+        np.save(os.path.join(path, "ivf_offsets.npy"), self.offsets)
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        fit_X: ndarray,
+        fit_sq_norms: ndarray,
+        n_probe: int,
+        mmap_mode: Optional[str] = "r",
+    ) -> "IVFIndex":
+        """Carrega o índice gravado por `save`."""
+        return cls(
+            fit_X,
+            fit_sq_norms,
+            np.load(os.path.join(path, "ivf_centroids.npy"), mmap_mode=mmap_mode),
+            np.load(os.path.join(path, "ivf_offsets.npy")),
+            n_probe,
+        )
+
+    def search(self, Z: ndarray, k: int) -> ndarray:
+        """
+        Retorna os índices dos k vizinhos aproximados de cada linha de Z.
+
+        Cada consulta visita as `n_probe` listas mais próximas (ou mais, se elas
+        tiverem menos de k linhas) e compara apenas as linhas dessas listas.
+
+        Args:
+            Z (ndarray): Consultas padronizadas.
+            k (int): Quantidade de vizinhos.
+
+        Returns:
+            ndarray: Matriz (n_consultas, k) com índices da matriz de treino.
+        """
+        k = min(k, len(self.fit_X))
+        sizes = np.diff(self.offsets)
+        centroid_distances = self._centroid_sq_norms - 2 * (Z @ self.centroids.T)
+        probes = np.argsort(centroid_distances, axis=1)
+        neighbors = np.empty((len(Z), k), dtype=np.int64)
+        for i, z in enumerate(Z):
+            n_probe = self.n_probe
+            while sizes[probes[i, :n_probe]].sum() < k:
+                n_probe += 1
+            candidates = np.concatenate(
+                [
+                    np.arange(self.offsets[p], self.offsets[p + 1])
+                    for p in probes[i, :n_probe]
+                ]
+            )
+            distances = self.fit_sq_norms[candidates] - 2 * (self.fit_X[candidates] @ z)
+            nearest = np.argpartition(distances, k - 1)[:k]
+            neighbors[i] = candidates[nearest]
+        return neighbors
+
+
+def load_neighbor_index(
+    path: str,
+    params: Dict[str, Any],
+    fit_X: ndarray,
+    fit_sq_norms: ndarray,
+    mmap_mode: Optional[str] = "r",
+) -> Any:
+    """
+    Carrega o índice descrito em `meta.json["index"]` de um artefato `.knn`.
+
+    Args:
+        path (str): Diretório do artefato.
+        params (Dict[str, Any]): Tipo e parâmetros do índice.
+        fit_X (ndarray): Matriz de treino do artefato.
+        fit_sq_norms (ndarray): Norma ao quadrado de cada linha de `fit_X`.
+        mmap_mode (str, optional): Modo de abertura dos `.npy` do índice.
+
+    Returns:
+        Any: BruteForceIndex, TreeIndex ou IVFIndex.
+
+    Raises:
+        ValueError: Se o tipo de índice for desconhecido.
+    """
+    kind = params["type"]
+    if kind == "brute":
+        return BruteForceIndex(fit_X, fit_sq_norms)
+    if kind in TREE_INDEXES:
+        return TreeIndex.load(path, kind)
+    if kind == "ivf":
+        return IVFIndex.load(path, fit_X, fit_sq_norms, params["n_probe"], mmap_mode)
+    raise ValueError(f"Índice de vizinhos desconhecido: {kind}")
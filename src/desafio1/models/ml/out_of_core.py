@@ -0,0 +1,318 @@
+"""
+Treino fora da memória para bases maiores que a RAM, como os logs rotulados de
+produção.
+
+As partições (Parquet ou CSV, com as colunas do schema `Iris` e o rótulo em
+`species` ou `target`) são lidas em blocos de `chunk_rows` linhas, e nenhuma etapa
+guarda a base inteira:
+
+1. O StandardScaler é ajustado com `partial_fit`, bloco a bloco.
+2. Para o KNN (e para as famílias sem `partial_fit`), o conjunto de treino é reduzido
+   a uma amostra de reservatório de até `reservoir_size` linhas por classe, uniforme
+   sobre toda a base, sem conhecer o total de linhas. Para o GaussianNB, uma
+   segunda passada ajusta o classificador com `partial_fit`.
+3. Uma última passada avalia o modelo nas linhas separadas para teste, sorteadas
+   por bloco de forma determinística.
+
+O modelo final é o mesmo pipeline (padronização + classificador) servido pela API.
+O pico de memória (Python/NumPy via tracemalloc e Arrow) é medido e gravado nas
+métricas do modelo.
+"""
+
+import glob
+import os
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from desafio1.api.data_ingestion import SPECIES
+from desafio1.models.ml.model_search import ALGORITHMS, build_pipeline
+from desafio1.models.schemas.iris_schema import Iris
+from numpy import ndarray
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+# Atributos do schema de entrada da API, na ordem usada pelo modelo.
+FEATURES = tuple(name for name in Iris.model_fields if name != "species")
+PARTITION_SUFFIXES = (".parquet", ".csv")
+
+
+def find_partitions(paths: Sequence[str]) -> List[str]:
+    """
+    Expande arquivos, diretórios (recursivamente) e padrões glob em partições.
+
+    Args:
+        paths (Sequence[str]): Caminhos ou padrões.
+
+    Returns:
+        List[str]: Arquivos `.parquet`/`.csv`, em ordem.
+
+    Raises:
+        FileNotFoundError: Se nenhuma partição for encontrada.
+    """
+    found = []
+    for path in paths:
+        for match in sorted(glob.glob(path)) or [path]:
+            if os.path.isdir(match):
+                for root, _, files in sorted(os.walk(match)):
+                    found += [
+                        os.path.join(root, name)
+                        for name in sorted(files)
+                        if name.endswith(PARTITION_SUFFIXES)
+                    ]
+            elif match.endswith(PARTITION_SUFFIXES) and os.path.exists(match):
+                found.append(match)
+    if not found:
+        raise FileNotFoundError(f"Nenhuma partição Parquet/CSV em: {list(paths)}")
+    return found
+
+
+def iter_chunks(
+    partitions: Sequence[str], chunk_rows: int = 50_000
+) -> Iterator[Tuple[ndarray, ndarray]]:
+    """
+    Lê as partições em blocos, sem carregar nenhuma delas inteira.
+
+    Args:
+        partitions (Sequence[str]): Arquivos `.parquet`/`.csv`.
+        chunk_rows (int): Linhas por bloco (no CSV, aproximado: os blocos são
+            lidos por tamanho em bytes).
+
+    Yields:
+        Tuple[ndarray, ndarray]: Atributos (float64) e alvos (0, 1 ou 2) do bloco.
+    """
+    for path in partitions:
+        for batch in _iter_batches(path, chunk_rows):
+            if batch.num_rows:
+                yield _to_arrays(batch)
+
+
+def _iter_batches(path: str, chunk_rows: int) -> Iterator[pa.RecordBatch]:
+    if path.endswith(".parquet"):
+        parquet = pq.ParquetFile(path)
+        names = parquet.schema_arrow.names
+        label = "species" if "species" in names else "target"
+        yield from parquet.iter_batches(
+            batch_size=chunk_rows, columns=[*FEATURES, label]
+        )
+        return
+    # ~40 bytes por linha de CSV do Íris.
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=max(chunk_rows * 40, 1 << 16)),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.float64() for name in FEATURES}
+        ),
+    )
+    yield from reader
+
+
+def _to_arrays(batch: pa.RecordBatch) -> Tuple[ndarray, ndarray]:
+    X = np.column_stack(
+        [
+            batch.column(name).to_numpy(zero_copy_only=False).astype(np.float64)
+            for name in FEATURES
+        ]
+    )
+    if "species" in batch.schema.names:
+        species = pc.replace_substring_regex(batch.column("species"), "^Iris-", "")
+        codes = pc.index_in(species, value_set=pa.array(SPECIES))
+        if codes.null_count:
+            unknown = pc.unique(pc.filter(species, pc.is_null(codes))).to_pylist()
+            raise ValueError(f"Espécies desconhecidas no dataset: {sorted(unknown)}")
+        y = codes.to_numpy(zero_copy_only=False)
+    else:
+        y = batch.column("target").to_numpy(zero_copy_only=False)
+    return X, y.astype(np.int64)
+
+
+class ReservoirSampler:
+    """
+    Amostra uniforme de tamanho fixo por classe sobre um fluxo de blocos
+    (algoritmo R), usada como conjunto de protótipos do KNN.
+
+    Args:
+        size (int): Linhas mantidas por classe.
+        n_features (int): Atributos por linha.
+        random_state (int): Semente do sorteio.
+    """
+
+    def __init__(self, size: int, n_features: int, random_state: int = 42) -> None:
+        self.size = size
+        self.n_features = n_features
+        self.rng = np.random.default_rng(random_state)
+        self.samples: Dict[int, ndarray] = {}
+        self.seen: Dict[int, int] = {}
+
+    def update(self, X: ndarray, y: ndarray) -> None:
+        """
+        Considera as linhas de um bloco para a amostra.
+
+        Args:
+            X (ndarray): Atributos do bloco.
+            y (ndarray): Alvos do bloco.
+        """
+        for label in np.unique(y):
+            rows = X[y == label]
+            label = int(label)
+            if label not in self.samples:
+                self.samples[label] = np.empty((self.size, self.n_features))
+                self.seen[label] = 0
+            sample, seen = self.samples[label], self.seen[label]
+            # Posição global de cada linha no fluxo da classe.
+            positions = np.arange(seen, seen + len(rows))
+            filling = positions < self.size
+            sample[positions[filling]] = rows[filling]
+            # Depois de cheia, a linha t substitui uma posição sorteada em [0, t] se
+            # ela cair na amostra. Índices repetidos ficam com a última linha, como na
+            # versão sequencial do algoritmo.
+            slots = self.rng.integers(0, positions[~filling] + 1)
+            keep = slots < self.size
+            sample[slots[keep]] = rows[~filling][keep]
+            self.seen[label] = seen + len(rows)
+
+    def arrays(self) -> Tuple[ndarray, ndarray]:
+        """
+        Retorna a amostra atual.
+
+        Returns:
+            Tuple[ndarray, ndarray]: Atributos e alvos das linhas amostradas.
+        """
+        labels = sorted(self.samples)
+        counts = [min(self.seen[label], self.size) for label in labels]
+        X = np.concatenate(
+            [self.samples[label][:n] for label, n in zip(labels, counts)]
+        )
+        y = np.repeat(labels, counts)
+        return X, y
+
+
+def _holdout_mask(
+    chunk_index: int, n_rows: int, test_size: float, random_state: int
+) -> ndarray:
+    # Mesmo sorteio em todas as passadas: depende só da semente e do bloco.
+    rng = np.random.default_rng([random_state, chunk_index])
+    return rng.random(n_rows) < test_size
+
+
+def fit_out_of_core(
+    partitions: Sequence[str],
+    algorithm: str = "knn",
+    chunk_rows: int = 50_000,
+    reservoir_size: int = 2_000,
+    test_size: float = 0.2,
+    random_state: int = 42,
+) -> Tuple[Pipeline, Dict[str, Any]]:
+    """
+    Treina o pipeline da API lendo as partições em blocos.
+
+    Args:
+        partitions (Sequence[str]): Arquivos, diretórios ou padrões glob.
+        algorithm (str): Família do classificador (ver `ALGORITHMS`).
+        chunk_rows (int): Linhas por bloco lido.
+        reservoir_size (int): Linhas por classe na amostra de treino das famílias
+            sem `partial_fit` (KNN, árvore, regressão logística).
+        test_size (float): Fração das linhas separada para teste.
+        random_state (int): Semente da divisão treino/teste e da amostragem.
+
+    Returns:
+        Tuple[Pipeline, Dict[str, Any]]: Modelo treinado e relatório (linhas, blocos,
+            acurácia no teste, duração e pico de memória).
+
+    Raises:
+        ValueError: Se o algoritmo for desconhecido.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(
+            f"Algoritmo desconhecido: {algorithm}. Use {list(ALGORITHMS)}."
+        )
+    files = find_partitions(partitions)
+    classifier = ALGORITHMS[algorithm]()
+    incremental = algorithm != "knn" and hasattr(classifier, "partial_fit")
+
+    def chunks() -> Iterator[Tuple[ndarray, ndarray, ndarray]]:
+        for i, (X, y) in enumerate(iter_chunks(files, chunk_rows)):
+            yield X, y, _holdout_mask(i, len(y), test_size, random_state)
+
+    start = time.perf_counter()
+    pool = pa.default_memory_pool()
+    tracemalloc.start()
+    try:
+        # 1ª passada: estatísticas do scaler e amostra de treino.
+        scaler = StandardScaler()
+        sampler = ReservoirSampler(reservoir_size, len(FEATURES), random_state)
+        n_rows = n_chunks = n_test = 0
+        for X, y, test in chunks():
+            n_rows += len(y)
+            n_chunks += 1
+            n_test += int(test.sum())
+            if not (~test).any():
+                # Bloco inteiro sorteado para teste (ex.: partições pequenas).
+                continue
+            scaler.partial_fit(X[~test])
+            if not incremental:
+                sampler.update(X[~test], y[~test])
+
+        if n_rows == n_test:
+            raise ValueError("Nenhuma linha de treino nas partições.")
+        if incremental:
+            # 2ª passada: o classificador aprende bloco a bloco.
+            for X, y, test in chunks():
+                if (~test).any():
+                    classifier.partial_fit(
+                        scaler.transform(X[~test]),
+                        y[~test],
+                        classes=np.arange(len(SPECIES)),
+                    )
+            n_fit = n_rows - n_test
+        else:
+            X_sample, y_sample = sampler.arrays()
+            classifier.fit(scaler.transform(X_sample), y_sample)
+            n_fit = len(y_sample)
+
+        model = build_pipeline(classifier)
+        # Os passos já estão ajustados: o pipeline só os encadeia.
+        model.steps[0] = ("scaler", scaler)
+
+        # Última passada: avaliação nas linhas separadas para teste.
+        correct = 0
+        for X, y, test in chunks():
+            if test.any():
+                correct += int((model.predict(X[test]) == y[test]).sum())
+        _, peak_traced = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    report = {
+        "algorithm": algorithm,
+        "partitions": len(files),
+        "chunks": n_chunks,
+        "chunk_rows": chunk_rows,
+        "rows": n_rows,
+        "train_rows": n_rows - n_test,
+        "test_rows": n_test,
+        "fit_rows": n_fit,
+        "accuracy": correct / n_test if n_test else None,
+        "duration_s": time.perf_counter() - start,
+        "peak_memory": {
+            "python_numpy_bytes": peak_traced,
+            # Pico do pool do Arrow desde o início do processo.
+            "arrow_bytes": pool.max_memory(),
+            "max_rss_bytes": _max_rss_bytes(),
+        },
+    }
+    return model, report
+
+
+def _max_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # Em KiB no Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
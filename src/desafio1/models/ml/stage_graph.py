@@ -0,0 +1,267 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from tqdm import tqdm
+
+
+class Stage:
+    """
+    Etapa de um pipeline: uma função que consome e produz artefatos nomeados.
+
+    Args:
+        name (str): Nome único da etapa.
+        func (Callable): Função da etapa. Recebe os artefatos de entrada como
+            argumentos nomeados, mais `kwargs`. Etapas paralelas precisam de uma função
+            serializável com pickle (ex.: método de uma instância serializável).
+        inputs (Sequence[str] | Dict[str, str]): Artefatos consumidos. Uma sequência
+            usa o nome do artefato como nome do parâmetro; um dicionário mapeia
+            parâmetro -> artefato.
+        outputs (Sequence[str]): Nomes dos artefatos produzidos. Com mais de um, a
+            função deve retornar uma tupla na mesma ordem.
+        parallel (bool): Executa a etapa no pool de processos, em vez do processo
+            principal (ex.: geração de gráficos).
+        kwargs (Dict[str, Any], optional): Argumentos fixos da função.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        inputs: Union[Sequence[str], Dict[str, str]] = (),
+        outputs: Sequence[str] = (),
+        parallel: bool = False,
+        kwargs: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.inputs = (
+            dict(inputs) if isinstance(inputs, dict) else {i: i for i in inputs}
+        )
+        self.outputs = tuple(outputs)
+        self.parallel = parallel
+        self.kwargs = kwargs or {}
+
+    def arguments(self, artifacts: Dict[str, Any]) -> Dict[str, Any]:
+        """Monta os argumentos da função a partir dos artefatos já produzidos."""
+        arguments = dict(self.kwargs)
+        for param, artifact in self.inputs.items():
+            arguments[param] = artifacts[artifact]
+        return arguments
+
+    def unpack(self, result: Any) -> Dict[str, Any]:
+        """Associa o retorno da função aos nomes declarados em `outputs`."""
+        if len(self.outputs) == 1:
+            return {self.outputs[0]: result}
+        if not self.outputs:
+            return {}
+        if not isinstance(result, tuple) or len(result) != len(self.outputs):
+            raise ValueError(
+                f"A etapa '{self.name}' deveria retornar {len(self.outputs)} valores."
+            )
+        return dict(zip(self.outputs, result))
+
+
+class StageGraph:
+    """
+    Grafo de etapas, executado à medida que os artefatos de cada etapa ficam prontos.
+
+    Cada artefato (divisão treino/teste, modelo, predições, probabilidades...) é
+    calculado por uma única etapa e repassado a todas as que o consomem, sem
+    recálculo. Etapas paralelas rodam em um pool de processos enquanto o processo
+    principal executa as demais. Com `max_workers=0`, tudo roda em série no processo
+    principal, na ordem de inserção.
+    """
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, Stage] = {}
+        self.timings: List[Dict[str, Any]] = []
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        inputs: Union[Sequence[str], Dict[str, str]] = (),
+        outputs: Sequence[str] = (),
+        parallel: bool = False,
+        **kwargs: Any,
+    ) -> "StageGraph":
+        """
+        Adiciona uma etapa ao grafo. Argumentos extras são repassados à função.
+
+        Args:
+            name (str): Nome único da etapa.
+            func (Callable): Função da etapa.
+            inputs (Sequence[str] | Dict[str, str]): Artefatos consumidos.
+            outputs (Sequence[str]): Artefatos produzidos.
+            parallel (bool): Executa a etapa no pool de processos.
+
+        Returns:
+            StageGraph: O próprio grafo, para encadear chamadas.
+
+        Raises:
+            ValueError: Se a etapa já existir ou algum artefato já tiver produtor.
+        """
+        if name in self.stages:
+            raise ValueError(f"Etapa duplicada: {name}")
+        produced = self.producers()
+        for output in outputs:
+            if output in produced:
+                raise ValueError(
+                    f"O artefato '{output}' já é produzido por '{produced[output]}'."
+                )
+        self.stages[name] = Stage(name, func, inputs, outputs, parallel, kwargs)
+        return self
+
+    def producers(self) -> Dict[str, str]:
+        """Retorna a etapa que produz cada artefato."""
+        return {
+            output: stage.name
+            for stage in self.stages.values()
+            for output in stage.outputs
+        }
+
+    def validate(self) -> None:
+        """
+        Verifica se todo artefato consumido tem produtor e se não há ciclos.
+
+        Raises:
+            ValueError: Se o grafo for inválido.
+        """
+        produced = self.producers()
+        state: Dict[str, str] = {}
+
+        def visit(name: str) -> None:
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Ciclo de dependências envolvendo '{name}'.")
+            state[name] = "visiting"
+            for artifact in self.stages[name].inputs.values():
+                if artifact not in produced:
+                    raise ValueError(
+                        f"A etapa '{name}' consome '{artifact}', que nenhuma etapa produz."
+                    )
+                visit(produced[artifact])
+            state[name] = "done"
+
+        for name in self.stages:
+            visit(name)
+
+    def run(
+        self, max_workers: Optional[int] = None, progress: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Executa todas as etapas e registra a duração de cada uma em `timings`.
+
+        Args:
+            max_workers (int, optional): Processos do pool; `os.cpu_count()` quando
+                omitido e 0 para executar tudo em série.
+            progress (bool): Exibe uma barra de progresso por etapa concluída.
+
+        Returns:
+            Dict[str, Any]: Todos os artefatos produzidos, indexados pelo nome.
+
+        Raises:
+            RuntimeError: Se alguma etapa falhar; as etapas pendentes são canceladas.
+        """
+        self.validate()
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        self.timings = []
+        self._started = time.time()
+        artifacts: Dict[str, Any] = {}
+        pending = list(self.stages.values())
+        running: Dict[Future, Stage] = {}
+        pool = ProcessPoolExecutor(max_workers) if max_workers > 0 else None
+        bar = tqdm(
+            total=len(pending), desc="Treinamento do Modelo", disable=not progress
+        )
+        try:
+            while pending or running:
+                ready = [
+                    stage
+                    for stage in pending
+                    if all(a in artifacts for a in stage.inputs.values())
+                ]
+                # Etapas paralelas prontas vão para o pool antes de o processo principal
+                # se ocupar com a próxima etapa local.
+                inline = []
+                for stage in ready:
+                    if pool is not None and stage.parallel:
+                        pending.remove(stage)
+                        future = pool.submit(
+                            _timed_call, stage.func, stage.arguments(artifacts)
+                        )
+                        running[future] = stage
+                    else:
+                        inline.append(stage)
+                if inline:
+                    stage = inline[0]
+                    pending.remove(stage)
+                    arguments = stage.arguments(artifacts)
+                    artifacts.update(
+                        self._complete(
+                            stage, lambda: _timed_call(stage.func, arguments), "main"
+                        )
+                    )
+                    bar.update(1)
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    artifacts.update(self._complete(stage, future.result, "pool"))
+                    bar.update(1)
+        finally:
+            bar.close()
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+        return artifacts
+
+    def _complete(
+        self, stage: Stage, call: Callable[[], Tuple[Any, float, float]], where: str
+    ) -> Dict[str, Any]:
+        try:
+            result, start, end = call()
+            outputs = stage.unpack(result)
+        except Exception as e:
+            raise RuntimeError(f"A etapa '{stage.name}' falhou: {e}") from e
+        self.timings.append(
+            {
+                "stage": stage.name,
+                "where": where,
+                "start_s": start - self._started,
+                "duration_s": end - start,
+            }
+        )
+        return outputs
+
+    def report(self) -> str:
+        """
+        Formata a duração de cada etapa, o tempo total e a soma das durações (o tempo
+        aproximado de uma execução em série).
+
+        Returns:
+            str: Tabela com uma linha por etapa, na ordem em que terminaram.
+        """
+        lines = [f"{'etapa':<24}{'onde':<6}{'início':>10}{'duração':>10}"]
+        for timing in self.timings:
+            lines.append(
+                f"{timing['stage']:<24}{timing['where']:<6}"
+                f"{timing['start_s']:>9.2f}s{timing['duration_s']:>9.2f}s"
+            )
+        if self.timings:
+            wall = max(t["start_s"] + t["duration_s"] for t in self.timings)
+            total = sum(t["duration_s"] for t in self.timings)
+            lines.append(f"total: {wall:.2f}s (soma das etapas: {total:.2f}s)")
+        return "\n".join(lines)
+
+
+def _timed_call(
+    func: Callable[..., Any], arguments: Dict[str, Any]
+) -> Tuple[Any, float, float]:
+    # time.time() (e não perf_counter) para comparar instantes entre processos.
+    start = time.time()
+    result = func(**arguments)
+    return result, start, time.time()
@@ -1,36 +1,200 @@
-from typing import Optional
+"""
+Schemas da API do Íris e formatos de transporte das predições.
 
+Dois formatos são aceitos pelos endpoints de predição, escolhidos pelo Content-Type
+da requisição; a resposta usa o mesmo formato:
+
+- JSON (`application/json`): os modelos pydantic abaixo, validados direto dos bytes
+  do corpo (`model_validate_json`) e serializados com `model_dump_json`.
+- Binário (`application/x-iris-f32`): o corpo é uma sequência de linhas de quatro
+  float32 little-endian (16 bytes por linha, na ordem de `FEATURE_NAMES`), lida com
+  `np.frombuffer` sem criar objetos por linha. A resposta traz um registro de 8
+  bytes por linha (`BINARY_RESULT_DTYPE`): classe em int32 e probabilidade em
+  float32; linhas rejeitadas (valores não finitos) voltam com classe -1 e
+  probabilidade NaN.
+"""
+
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from numpy import ndarray
 from pydantic import BaseModel
 
+# Ordem das características esperada pelos modelos e pelo formato binário.
+FEATURE_NAMES = ("sepal_length", "sepal_width", "petal_length", "petal_width")
+
+BINARY_MEDIA_TYPE = "application/x-iris-f32"
+BINARY_FEATURE_DTYPE = np.dtype("<f4")
+BINARY_ROW_BYTES = BINARY_FEATURE_DTYPE.itemsize * len(FEATURE_NAMES)
+BINARY_RESULT_DTYPE = np.dtype([("prediction", "<i4"), ("probability", "<f4")])
+
+
+class IrisClassNames(str, Enum):
+    """Enum para mapear classes numéricas para nomes de espécies de Íris."""
+
+    setosa = "Iris-setosa"
+    versicolor = "Iris-versicolor"
+    virginica = "Iris-virginica"
+
+
+# Mapeamento construído uma única vez no import, e não a cada requisição.
+CLASS_MAPPING: Dict[int, str] = {
+    0: IrisClassNames.setosa.value,
+    1: IrisClassNames.versicolor.value,
+    2: IrisClassNames.virginica.value,
+}
 
-class Iris(BaseModel):
-    """Schema para os dados de entrada do Iris.
+
+class IrisPredictionRequest(BaseModel):
+    """Modelo para a requisição de predição de Íris.
 
     Attributes:
         sepal_length (float): Comprimento da sépala.
         sepal_width (float): Largura da sépala.
         petal_length (float): Comprimento da pétala.
         petal_width (float): Largura da pétala.
-        species (str, optional): Espécie da flor. Pode ser uma de três possíveis:
-                                Iris-setosa, Iris-versicolor, Iris-virginica.
     """
 
     sepal_length: float
     sepal_width: float
     petal_length: float
     petal_width: float
+
+
+class Iris(IrisPredictionRequest):
+    """Schema de uma linha rotulada do Iris (ex.: logs de treino).
+
+    Attributes:
+        species (str, optional): Espécie da flor. Pode ser uma de três possíveis:
+                                Iris-setosa, Iris-versicolor, Iris-virginica.
+    """
+
     species: Optional[str] = (
         None  # Param opcional, pois pode não ser necessário para previsão
     )
 
 
 class IrisPredictionResponse(BaseModel):
-    """Schema para a resposta da previsão.
+    """Modelo para a resposta da predição de Íris.
 
     Attributes:
-        prediction (str): Previsão de classe para cada instância de entrada.
-        probability (float): Probabilidade associada à classe prevista.
+        prediction (int): Classe predita como número.
+        class_name (str): Nome da classe predita.
+        probability (float): Probabilidade associada à predição.
     """
 
-    prediction: str
+    prediction: int
+    class_name: str
     probability: float
+
+
+class IrisBatchPredictionRequest(BaseModel):
+    """Modelo para a requisição de predição em lote.
+
+    As linhas não são validadas individualmente pelo pydantic, para que uma linha
+    inválida seja reportada no resultado sem invalidar o lote inteiro.
+
+    Attributes:
+        instances (List[Any]): Lista de objetos com as quatro características de cada flor.
+    """
+
+    instances: List[Any]
+
+
+class IrisBatchPredictionItem(BaseModel):
+    """Resultado da predição de uma linha do lote.
+
+    Attributes:
+        index (int): Posição da linha na requisição.
+        prediction (int, optional): Classe predita como número.
+        class_name (str, optional): Nome da classe predita.
+        probability (float, optional): Probabilidade associada à predição.
+        error (str, optional): Motivo pelo qual a linha não pôde ser avaliada.
+    """
+
+    index: int
+    prediction: Optional[int] = None
+    class_name: Optional[str] = None
+    probability: Optional[float] = None
+    error: Optional[str] = None
+
+
+class IrisBatchPredictionResponse(BaseModel):
+    """Modelo para a resposta da predição em lote.
+
+    Attributes:
+        predictions (List[IrisBatchPredictionItem]): Resultados na mesma ordem da requisição.
+        n_success (int): Quantidade de linhas avaliadas com sucesso.
+        n_errors (int): Quantidade de linhas rejeitadas.
+    """
+
+    predictions: List[IrisBatchPredictionItem]
+    n_success: int
+    n_errors: int
+
+
+def decode_binary_features(body: bytes) -> ndarray:
+    """
+    Lê um corpo no formato binário como matriz de características.
+
+    Args:
+        body (bytes): Linhas de quatro float32 little-endian.
+
+    Returns:
+        ndarray: Matriz (n_linhas, 4) em float32, apontando para os bytes do corpo.
+
+    Raises:
+        ValueError: Se o corpo estiver vazio ou não tiver um número inteiro de linhas.
+    """
+    if not body or len(body) % BINARY_ROW_BYTES:
+        raise ValueError(
+            f"o corpo binário deve ter um múltiplo de {BINARY_ROW_BYTES} bytes "
+            f"(quatro float32 por linha); recebidos {len(body)}"
+        )
+    return np.frombuffer(body, dtype=BINARY_FEATURE_DTYPE).reshape(
+        -1, len(FEATURE_NAMES)
+    )
+
+
+def encode_binary_features(features: Any) -> bytes:
+    """
+    Codifica linhas de características no formato binário (usado pelos clientes).
+
+    Args:
+        features (Any): Matriz (n_linhas, 4) ou uma única linha.
+
+    Returns:
+        bytes: Corpo da requisição.
+    """
+    return np.asarray(features, dtype=BINARY_FEATURE_DTYPE).tobytes()
+
+
+def encode_binary_predictions(predictions: ndarray, probabilities: ndarray) -> bytes:
+    """
+    Codifica as predições no formato binário da resposta.
+
+    Args:
+        predictions (ndarray): Classe de cada linha (-1 para linhas rejeitadas).
+        probabilities (ndarray): Probabilidade da classe de cada linha.
+
+    Returns:
+        bytes: Um registro `BINARY_RESULT_DTYPE` por linha.
+    """
+    records = np.empty(len(predictions), dtype=BINARY_RESULT_DTYPE)
+    records["prediction"] = predictions
+    records["probability"] = probabilities
+    return records.tobytes()
+
+
+def decode_binary_predictions(body: bytes) -> ndarray:
+    """
+    Lê uma resposta binária (usado pelos clientes).
+
+    Args:
+        body (bytes): Corpo da resposta.
+
+    Returns:
+        ndarray: Registros com os campos `prediction` e `probability`.
+    """
+    return np.frombuffer(body, dtype=BINARY_RESULT_DTYPE)
@@ -0,0 +1,37 @@
+import pytest
+from desafio1.api.services.metrics import METRICS
+from desafio1.api.v1.main import app
+from sklearn import datasets
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+
+@pytest.fixture(scope="session")
+def iris_model() -> Pipeline:
+    """
+    Treina, em memória, o mesmo pipeline construído pelo IrisModelTrainer.
+    """
+    X, y = datasets.load_iris(return_X_y=True)
+    model = Pipeline(
+        [
+            ("scaler", StandardScaler()),
+            ("classifier", KNeighborsClassifier(n_neighbors=5)),
+        ]
+    )
+    return model.fit(X, y)
+
+
+@pytest.fixture
+def app_state():
+    """
+    Restaura, ao final do teste, o estado da API e as versões de modelo registradas
+    nas métricas globais.
+    """
+    state = dict(app.state._state)
+    model_versions = dict(METRICS.model_versions)
+    yield app.state
+    app.state._state.clear()
+    app.state._state.update(state)
+    METRICS.model_versions.clear()
+    METRICS.model_versions.update(model_versions)
@@ -0,0 +1,113 @@
+import asyncio
+
+import numpy as np
+import pytest
+from desafio1.api.services.batcher import MicroBatcher
+from sklearn import datasets
+
+
+def test_batcher_groups_concurrent_requests(iris_model):
+    """
+    Testa se requisições concorrentes são agrupadas e recebem o resultado da sua linha.
+    """
+    X, _ = datasets.load_iris(return_X_y=True)
+    rows = X[::5]
+
+    async def scenario():
+        batcher = MicroBatcher(
+            lambda: {"knn": iris_model}, max_batch_size=8, max_wait_ms=50
+        )
+        await batcher.start()
+        results = await asyncio.gather(*(batcher.submit(list(r)) for r in rows))
+        stats = batcher.stats()
+        await batcher.stop()
+        return results, stats
+
+    results, stats = asyncio.run(scenario())
+
+    labels = [label for label, _ in results]
+    probabilities = [probability for _, probability in results]
+    np.testing.assert_array_equal(labels, iris_model.predict(rows))
+    np.testing.assert_allclose(probabilities, iris_model.predict_proba(rows).max(1))
+    assert stats["rows"] == len(rows)
+    assert stats["batches"] < len(rows)
+    assert stats["batch_size_histogram"]["<=8"] >= 1
+    assert stats["queue_depth"] == 0
+
+
+def test_batcher_propagates_model_errors():
+    """
+    Testa se um erro do modelo é repassado para cada chamador do lote.
+    """
+
+    class BrokenModel:
+        def predict_proba(self, data):
+            raise ValueError("entrada inválida")
+
+    async def scenario():
+        batcher = MicroBatcher(lambda: {"knn": BrokenModel()}, max_wait_ms=1)
+        await batcher.start()
+        try:
+            await batcher.submit([1.0, 2.0, 3.0, 4.0])
+        finally:
+            await batcher.stop()
+
+    with pytest.raises(ValueError, match="entrada inválida"):
+        asyncio.run(scenario())
+
+
+def test_batcher_stop_flushes_batch_being_built(iris_model):
+    """
+    Testa se `stop` responde as linhas do lote em montagem sem esperar `max_wait_ms`.
+    """
+    X, _ = datasets.load_iris(return_X_y=True)
+    rows = X[:3]
+
+    async def scenario():
+        batcher = MicroBatcher(lambda: {"knn": iris_model}, max_wait_ms=500)
+        await batcher.start()
+        calls = [asyncio.ensure_future(batcher.submit(list(r))) for r in rows]
+        await asyncio.sleep(0.05)
+        await batcher.stop()
+        done = [call.done() for call in calls]
+        with pytest.raises(RuntimeError):
+            await batcher.submit(list(rows[0]))
+        return done, [call.result() for call in calls], batcher.stats()
+
+    done, results, stats = asyncio.run(asyncio.wait_for(scenario(), 0.4))
+
+    assert all(done)
+    np.testing.assert_array_equal(
+        [label for label, _ in results], iris_model.predict(rows)
+    )
+    assert stats["batches"] == 1 and stats["rows"] == len(rows)
+
+
+def test_batcher_isolates_invalid_row(iris_model):
+    """
+    Testa se uma linha inválida (NaN) recebe o erro sozinha, sem derrubar as linhas
+    válidas do mesmo lote.
+    """
+    X, _ = datasets.load_iris(return_X_y=True)
+    rows = [list(r) for r in X[:9]]
+    rows.insert(4, [float("nan"), 3.0, 1.4, 0.2])
+
+    async def scenario():
+        batcher = MicroBatcher(
+            lambda: {"knn": iris_model}, max_batch_size=16, max_wait_ms=50
+        )
+        await batcher.start()
+        results = await asyncio.gather(
+            *(batcher.submit(r) for r in rows), return_exceptions=True
+        )
+        stats = batcher.stats()
+        await batcher.stop()
+        return results, stats
+
+    results, stats = asyncio.run(scenario())
+
+    assert isinstance(results.pop(4), ValueError)
+    np.testing.assert_array_equal(
+        [label for label, _ in results], iris_model.predict(X[:9])
+    )
+    assert stats["batches"] == 1
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pyarrow as pa
+import pytest
+from desafio1.api.data_ingestion import (
+    DatasetCache,
+    load_iris_arrays,
+    load_iris_frame,
+    load_iris_table,
+)
+from sklearn import datasets
+
+UCI_ROWS = (
+    "5.1,3.5,1.4,0.2,Iris-setosa\n"
+    "7.0,3.2,4.7,1.4,Iris-versicolor\n"
+    "6.3,3.3,6.0,2.5,Iris-virginica\n"
+)
+
+
+def test_source_is_materialized_once_and_served_offline(tmp_path):
+    """
+    Testa se um CSV no formato do UCI é lido uma única vez: depois de materializado,
+    o dataset continua disponível mesmo sem a fonte.
+    """
+    source = tmp_path / "iris.data"
+    source.write_text(UCI_ROWS)
+    cache_dir = str(tmp_path / "cache")
+
+    first = load_iris_frame(str(source), cache_dir)
+    source.unlink()
+    X, y = load_iris_arrays(str(source), cache_dir)
+
+    assert list(first["species"]) == ["setosa", "versicolor", "virginica"]
+    assert X.tolist() == [
+        [5.1, 3.5, 1.4, 0.2],
+        [7.0, 3.2, 4.7, 1.4],
+        [6.3, 3.3, 6.0, 2.5],
+    ]
+    assert y.tolist() == [0, 1, 2]
+    with pytest.raises(ConnectionError):
+        load_iris_table(str(source), cache_dir, refresh=True)
+
+
+def test_refresh_keeps_previous_versions(tmp_path):
+    """
+    Testa se uma fonte com conteúdo novo gera outra versão, nomeada pelo hash, sem
+    apagar a anterior.
+    """
+    source = tmp_path / "iris.data"
+    source.write_text(UCI_ROWS)
+    cache = DatasetCache(str(tmp_path / "cache"))
+
+    load_iris_table(str(source), cache.cache_dir)
+    old = cache.lookup(str(source))
+    load_iris_table(str(source), cache.cache_dir, refresh=True)
+    assert cache.lookup(str(source)) == old
+
+    source.write_text(UCI_ROWS + "5.9,3.0,5.1,1.8,Iris-virginica\n")
+    table = load_iris_table(str(source), cache.cache_dir, refresh=True)
+
+    assert table.num_rows == 4
+    assert cache.lookup(str(source)) != old
+    assert os.path.exists(old)
+    assert cache.index()[str(source)]["rows"] == 4
+
+
+def test_sklearn_source_matches_load_iris_without_copies(tmp_path):
+    """
+    Testa se a fonte do scikit-learn reproduz `load_iris` e se as cargas do cache
+    não alocam memória do Arrow (as colunas apontam para o arquivo mapeado).
+    """
+    cache_dir = str(tmp_path / "cache")
+    X_expected, y_expected = datasets.load_iris(return_X_y=True)
+    load_iris_table("sklearn", cache_dir)
+
+    allocated = pa.total_allocated_bytes()
+    table = load_iris_table("sklearn", cache_dir)
+    X, y = load_iris_arrays("sklearn", cache_dir)
+
+    assert pa.total_allocated_bytes() == allocated
+    assert table.num_rows == 150
+    np.testing.assert_array_equal(X, X_expected)
+    np.testing.assert_array_equal(y, y_expected)
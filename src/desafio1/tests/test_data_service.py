@@ -1,14 +1,14 @@
 import pandas as pd
-from api.services.data_service import load_iris_data
+from desafio1.api.services.data_service import load_iris_data
 from pandas.testing import assert_frame_equal
 
 
-def test_load_iris_data():
+def test_load_iris_data(tmp_path):
     """
     Testa se a função load_iris_data carrega corretamente os dados do dataset Íris.
     """
-    # Caminho simulado para um arquivo CSV de teste
-    test_csv_path = "desafio1/data/iris_test.csv"
+    # Arquivo CSV de teste, gerado no diretório temporário do teste
+    test_csv_path = tmp_path / "iris_test.csv"
     # Criando um DataFrame de teste para comparar com o carregado pela função
     expected_data = pd.DataFrame(
         {
@@ -20,6 +20,8 @@ def test_load_iris_data():
         }
     )
 
-    loaded_data = load_iris_data(test_csv_path)
+    expected_data.to_csv(test_csv_path, index=False)
+
+    loaded_data = load_iris_data(str(test_csv_path))
 
     assert_frame_equal(loaded_data, expected_data)
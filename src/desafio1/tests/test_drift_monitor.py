@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+from desafio1.api.services.drift_monitor import (
+    DriftMonitor,
+    build_reference,
+    histogram_quantiles,
+    psi,
+)
+from desafio1.api.v1.main import app
+from fastapi.testclient import TestClient
+from sklearn import datasets
+
+
+@pytest.fixture(scope="module")
+def iris_X():
+    X, _ = datasets.load_iris(return_X_y=True)
+    return X
+
+
+@pytest.fixture
+def monitor(iris_model, iris_X):
+    monitor = DriftMonitor(buffer_rows=32, window_flushes=2)
+    monitor.set_reference("knn", build_reference(iris_model, [iris_X]))
+    return monitor
+
+
+def test_reference_matches_training_distribution(iris_model, iris_X):
+    """
+    Testa se o perfil de referência divide o treino em bins de mesma frequência e se
+    os quantis estimados do histograma ficam próximos dos exatos.
+    """
+    shuffled = np.random.default_rng(0).permutation(iris_X)
+    reference = build_reference(iris_model, np.array_split(shuffled, 3), n_bins=10)
+
+    counts = np.array(reference["counts"])
+    assert reference["rows"] == len(iris_X) == sum(reference["class_counts"])
+    assert counts.shape == (4, 10)
+    assert (counts.sum(axis=1) == len(iris_X)).all()
+    estimated = histogram_quantiles(
+        counts[2],
+        np.array(reference["edges"][2]),
+        reference["min"][2],
+        reference["max"][2],
+    )
+    exact = np.quantile(iris_X[:, 2], [0.05, 0.5, 0.95])
+    np.testing.assert_allclose(estimated, exact, atol=0.5)
+
+
+def test_same_distribution_is_stable_and_shift_is_drift(monitor, iris_model, iris_X):
+    """
+    Testa se linhas da mesma distribuição do treino têm PSI baixo e se um
+    deslocamento nas pétalas é reportado como drift.
+    """
+    for row, label in zip(iris_X, iris_model.predict(iris_X)):
+        monitor.record("knn", row, int(label))
+
+    stable = monitor.stats()["knn"]
+    assert stable["window_rows"] == len(iris_X)
+    assert stable["status"] == "ok"
+    assert all(f["psi"] < 0.1 for f in stable["features"].values())
+    assert stable["predictions"]["psi"] < 0.01
+
+    monitor.set_reference("knn", monitor._sketches["knn"].reference)
+    shifted = iris_X + np.array([0.0, 0.0, 2.0, 1.0])
+    monitor.record("knn", shifted, iris_model.predict(shifted))
+
+    report = monitor.stats()["knn"]
+    assert report["status"] == "drift"
+    assert report["features"]["petal_length"]["psi"] > 0.25
+    assert report["features"]["petal_length"]["ks"] > 0.3
+    assert report["features"]["sepal_length"]["psi"] < 0.1
+
+
+def test_window_keeps_only_recent_intervals(monitor, iris_X):
+    """
+    Testa se a janela descarta os intervalos mais antigos e se modelos sem perfil de
+    referência são ignorados.
+    """
+    for n_rows in (10, 20, 40):
+        monitor.record("knn", iris_X[:n_rows], np.zeros(n_rows, dtype=int))
+        monitor.flush()
+    monitor.record("knn", iris_X[:5], np.zeros(5, dtype=int))
+    monitor.record("ensemble", iris_X[:5], np.zeros(5, dtype=int))
+
+    stats = monitor.stats()
+    assert set(stats) == {"knn"}
+    # 2 intervalos fechados na janela + o intervalo atual: o primeiro saiu.
+    assert stats["knn"]["window_rows"] == 20 + 40 + 5
+    assert stats["knn"]["total_rows"] == 10 + 20 + 40 + 5
+
+
+def test_psi_is_zero_for_identical_counts():
+    """
+    Testa o PSI de distribuições iguais e com bins vazios.
+    """
+    counts = np.array([10, 0, 30, 60])
+    assert psi(counts, counts * 3) == pytest.approx(0.0)
+    assert psi(counts, np.array([60, 30, 0, 10])) > 1.0
+
+
+def test_drift_endpoint_reports_predicted_rows(monitor, iris_model, app_state):
+    """
+    Testa se as predições da API alimentam o monitor exposto em /v1/iris/drift.
+    """
+    app.state.models = {"knn": iris_model}
+    app.state.drift = monitor
+    client = TestClient(app)
+    try:
+        row = {
+            "sepal_length": 5.1,
+            "sepal_width": 3.5,
+            "petal_length": 1.4,
+            "petal_width": 0.2,
+        }
+        client.post("/v1/iris/predict", json=row)
+        client.post("/v1/iris/predict/batch", json={"instances": [row, row]})
+
+        response = client.get("/v1/iris/drift")
+    finally:
+        app.state.drift = None
+
+    assert response.status_code == 200
+    report = response.json()["knn"]
+    assert report["window_rows"] == 3
+    assert report["predictions"]["frequencies"]["Iris-setosa"] == 1.0
+    assert client.get("/v1/iris/drift").status_code == 404
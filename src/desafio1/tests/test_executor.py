@@ -0,0 +1,85 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+from desafio1.api.services.executor import ExecutorSaturatedError, InferenceExecutor
+from desafio1.api.v1.main import app
+from fastapi.testclient import TestClient
+from sklearn import datasets
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_executor_matches_model(iris_model, kind):
+    """
+    Testa se a inferência no pool retorna o mesmo resultado do modelo.
+    """
+    X, _ = datasets.load_iris(return_X_y=True)
+    executor = InferenceExecutor(lambda: {"knn": iris_model}, kind=kind, max_workers=2)
+    try:
+        labels, probabilities = asyncio.run(executor.predict(X))
+    finally:
+        executor.shutdown()
+
+    np.testing.assert_array_equal(labels, iris_model.predict(X))
+    np.testing.assert_allclose(probabilities, iris_model.predict_proba(X).max(axis=1))
+
+
+class BlockingModel:
+    """Modelo que segura a inferência até o evento ser liberado."""
+
+    classes_ = np.array([0, 1, 2])
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def predict_proba(self, data):
+        self.release.wait(timeout=5)
+        return np.tile([1.0, 0.0, 0.0], (len(data), 1))
+
+
+def test_executor_rejects_when_saturated():
+    """
+    Testa se chamadas acima do limite de inferências simultâneas falham imediatamente.
+    """
+    model = BlockingModel()
+    executor = InferenceExecutor(lambda: {"knn": model}, max_workers=1, max_in_flight=1)
+
+    async def scenario():
+        first = asyncio.create_task(executor.predict(np.zeros((1, 4))))
+        await asyncio.sleep(0)
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.predict(np.zeros((1, 4)))
+        model.release.set()
+        return await first
+
+    labels, _ = asyncio.run(scenario())
+    executor.shutdown()
+
+    assert labels.tolist() == [0]
+    assert executor.rejected == 1
+
+
+def test_prediction_returns_503_when_saturated(iris_model, app_state):
+    """
+    Testa se o endpoint de predição responde 503 quando o executor está saturado.
+    """
+    executor = InferenceExecutor(lambda: {"knn": iris_model}, max_in_flight=0)
+    app.state.models = {"knn": iris_model}
+    app.state.executor = executor
+    try:
+        response = TestClient(app).post(
+            "/v1/iris/predict",
+            json={
+                "sepal_length": 5.1,
+                "sepal_width": 3.5,
+                "petal_length": 1.4,
+                "petal_width": 0.2,
+            },
+        )
+    finally:
+        app.state.executor = None
+        executor.shutdown()
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
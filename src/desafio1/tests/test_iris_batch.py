@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+from desafio1.api.config import settings
+from desafio1.api.v1.main import app
+from desafio1.models.schemas.iris_schema import (
+    BINARY_MEDIA_TYPE,
+    decode_binary_predictions,
+    encode_binary_features,
+)
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client(iris_model, app_state):
+    app.state.models = {"knn": iris_model}
+    return TestClient(app)
+
+
+def test_batch_prediction_matches_model(client, iris_model):
+    """
+    Testa se o lote retorna, para cada linha, a mesma classe e probabilidade do modelo.
+    """
+    rows = [
+        [5.1, 3.5, 1.4, 0.2],
+        [6.3, 2.8, 5.1, 1.5],
+        [7.2, 3.6, 6.1, 2.5],
+    ]
+    instances = [
+        dict(zip(["sepal_length", "sepal_width", "petal_length", "petal_width"], r))
+        for r in rows
+    ]
+
+    response = client.post("/v1/iris/predict/batch", json={"instances": instances})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["n_success"] == 3
+    assert body["n_errors"] == 0
+    expected = iris_model.predict(rows)
+    expected_proba = iris_model.predict_proba(rows).max(axis=1)
+    for item, pred, proba in zip(body["predictions"], expected, expected_proba):
+        assert item["prediction"] == pred
+        assert item["probability"] == pytest.approx(proba)
+        assert item["class_name"].startswith("Iris-")
+
+
+def test_batch_prediction_reports_bad_rows(client):
+    """
+    Testa se linhas inválidas são reportadas sem derrubar o lote inteiro.
+    """
+    instances = [
+        {"sepal_length": 5.1, "sepal_width": 3.5, "petal_length": 1.4},
+        {
+            "sepal_length": 5.1,
+            "sepal_width": 3.5,
+            "petal_length": 1.4,
+            "petal_width": 0.2,
+        },
+        {
+            "sepal_length": "abc",
+            "sepal_width": 3.5,
+            "petal_length": 1.4,
+            "petal_width": 0.2,
+        },
+        "not-a-row",
+    ]
+
+    response = client.post("/v1/iris/predict/batch", json={"instances": instances})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["n_success"] == 1
+    assert body["n_errors"] == 3
+    assert [item["index"] for item in body["predictions"]] == [0, 1, 2, 3]
+    assert "petal_width" in body["predictions"][0]["error"]
+    assert body["predictions"][1]["error"] is None
+    assert body["predictions"][1]["prediction"] == 0
+    assert body["predictions"][2]["error"] is not None
+    assert body["predictions"][3]["error"] is not None
+
+
+def test_batch_prediction_rejects_oversized_batch(client, monkeypatch):
+    """
+    Testa se lotes acima do limite configurado são rejeitados com 413.
+    """
+    monkeypatch.setattr(settings, "max_batch_size", 2)
+    row = {
+        "sepal_length": 5.1,
+        "sepal_width": 3.5,
+        "petal_length": 1.4,
+        "petal_width": 0.2,
+    }
+
+    response = client.post("/v1/iris/predict/batch", json={"instances": [row] * 3})
+
+    assert response.status_code == 413
+
+
+def test_binary_batch_prediction_matches_model(client, iris_model):
+    """
+    Testa se o lote binário retorna a mesma classe e probabilidade do modelo e marca
+    linhas não finitas com classe -1.
+    """
+    rows = np.array(
+        [
+            [5.1, 3.5, 1.4, 0.2],
+            [np.nan, 3.5, 1.4, 0.2],
+            [7.2, 3.6, 6.1, 2.5],
+        ],
+        dtype=np.float32,
+    )
+
+    response = client.post(
+        "/v1/iris/predict/batch",
+        content=encode_binary_features(rows),
+        headers={"Content-Type": BINARY_MEDIA_TYPE},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == BINARY_MEDIA_TYPE
+    result = decode_binary_predictions(response.content)
+    valid = rows[[0, 2]]
+    expected = iris_model.predict(valid)
+    assert list(result["prediction"]) == [expected[0], -1, expected[1]]
+    assert np.isnan(result["probability"][1])
+    assert result["probability"][[0, 2]] == pytest.approx(
+        iris_model.predict_proba(valid).max(axis=1), abs=1e-6
+    )
+
+
+def test_binary_batch_prediction_rejects_truncated_body(client):
+    """
+    Testa se um corpo binário que não tem um número inteiro de linhas retorna 400.
+    """
+    body = encode_binary_features([[5.1, 3.5, 1.4, 0.2]])[:-2]
+
+    response = client.post(
+        "/v1/iris/predict/batch",
+        content=body,
+        headers={"Content-Type": BINARY_MEDIA_TYPE},
+    )
+
+    assert response.status_code == 400
@@ -1,15 +1,24 @@
-from src.desafio1.api.v1.main import app
+import pytest
+from desafio1.api.v1.main import app
+from desafio1.models.schemas.iris_schema import (
+    BINARY_MEDIA_TYPE,
+    decode_binary_predictions,
+    encode_binary_features,
+)
 from fastapi.testclient import TestClient
 
 client = TestClient(app)
 
 
-def test_iris_prediction():
+def test_iris_prediction(iris_model, app_state):
     """
     Testa o endpoint de previsão do Íris para garantir que ele retorna o status correto e o formato dos dados.
     """
+    # O TestClient não executa o startup aqui; o modelo é publicado diretamente e o
+    # estado anterior é restaurado pelo fixture `app_state`.
+    app.state.models = {"knn": iris_model}
     response = client.post(
-        "/iris/predict",
+        "/v1/iris/predict",
         json={
             "sepal_length": 5.1,
             "sepal_width": 3.5,
@@ -20,3 +29,60 @@ def test_iris_prediction():
     assert response.status_code == 200
     assert "prediction" in response.json()
     assert "probability" in response.json()
+
+
+def test_iris_binary_prediction(iris_model, app_state):
+    """
+    Testa se o formato binário retorna a mesma predição do JSON, também em binário.
+    """
+    app.state.models = {"knn": iris_model}
+    row = [6.3, 2.8, 5.1, 1.5]
+    json_response = client.post(
+        "/v1/iris/predict",
+        json=dict(
+            zip(["sepal_length", "sepal_width", "petal_length", "petal_width"], row)
+        ),
+    )
+
+    response = client.post(
+        "/v1/iris/predict",
+        content=encode_binary_features([row]),
+        headers={"Content-Type": BINARY_MEDIA_TYPE},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == BINARY_MEDIA_TYPE
+    (result,) = decode_binary_predictions(response.content)
+    assert result["prediction"] == json_response.json()["prediction"]
+    assert result["probability"] == pytest.approx(
+        json_response.json()["probability"], abs=1e-6
+    )
+
+
+def test_iris_prediction_rejects_invalid_json(iris_model, app_state):
+    """
+    Testa se um corpo JSON inválido continua retornando 422 com o local do erro.
+    """
+    app.state.models = {"knn": iris_model}
+
+    response = client.post("/v1/iris/predict", json={"sepal_length": 5.1})
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][0] == "body"
+
+
+def test_iris_prediction_rejects_non_finite_json(iris_model, app_state):
+    """
+    Testa se NaN no corpo JSON é recusado com 400 antes de chegar ao modelo.
+    """
+    app.state.models = {"knn": iris_model}
+    body = '{"sepal_length": NaN, "sepal_width": 3.5, "petal_length": 1.4, "petal_width": 0.2}'
+
+    response = client.post(
+        "/v1/iris/predict",
+        content=body,
+        headers={"Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 400
+    assert "finitos" in response.json()["detail"]
@@ -0,0 +1,202 @@
+import json
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+from desafio1.api.services.model_registry import (
+    ModelRegistry,
+    metrics_path,
+    reference_path,
+)
+from desafio1.models.ml.iris_train import IrisModelTrainer
+from desafio1.models.ml.knn_scorer import knn_artifact_path
+from desafio1.models.ml.model_search import algorithm_name, search_models
+from desafio1.models.ml.stage_graph import StageGraph
+
+PLOTS = {
+    "class_distribution.png",
+    "confusion_matrix.png",
+    "cross_validation_scores.png",
+    "dataset_info.png",
+    "learning_curve.png",
+    "model_metrics.png",
+    "roc_curve.png",
+}
+
+
+def _double(x: int) -> int:
+    return 2 * x
+
+
+def test_stage_graph_shares_artifacts():
+    """
+    Testa se cada artefato é calculado uma vez e entregue a todas as etapas que o
+    consomem, inclusive às executadas no pool de processos.
+    """
+    calls = []
+
+    def source() -> tuple:
+        calls.append("source")
+        return 3, 4
+
+    graph = StageGraph()
+    graph.add("source", source, outputs=("a", "b"))
+    graph.add("double", _double, inputs={"x": "a"}, outputs=("c",), parallel=True)
+    graph.add("sum", lambda a, b, c: a + b + c, inputs=("a", "b", "c"), outputs=("d",))
+
+    artifacts = graph.run(max_workers=1, progress=False)
+
+    assert artifacts == {"a": 3, "b": 4, "c": 6, "d": 13}
+    assert calls == ["source"]
+    assert {t["stage"]: t["where"] for t in graph.timings} == {
+        "source": "main",
+        "double": "pool",
+        "sum": "main",
+    }
+    assert "total:" in graph.report()
+
+
+def test_stage_graph_rejects_invalid_graphs():
+    """
+    Testa se artefatos sem produtor e etapas com erro são reportados pelo nome.
+    """
+    graph = StageGraph().add("orphan", _double, inputs=("x",))
+    with pytest.raises(ValueError, match="nenhuma etapa produz"):
+        graph.run(max_workers=0, progress=False)
+
+    graph = StageGraph().add("fail", lambda: 1 / 0)
+    with pytest.raises(RuntimeError, match="fail"):
+        graph.run(max_workers=0, progress=False)
+
+
+@pytest.mark.parametrize("max_workers", [0, 2])
+def test_run_produces_model_plots_and_timings(tmp_path, max_workers):
+    """
+    Testa se o treinamento, em série ou com etapas paralelas, salva o modelo e todos
+    os gráficos e retorna o tempo de cada etapa.
+    """
+    model_path = str(tmp_path / "saved_models" / "iris_knn_v1_20240101.pkl")
+
+    timings = IrisModelTrainer().run(model_path, str(tmp_path), max_workers)
+
+    assert os.path.exists(model_path)
+    assert os.path.exists(metrics_path(model_path))
+    assert PLOTS <= set(os.listdir(tmp_path))
+    stages = {t["stage"] for t in timings}
+    assert {"train_model", "predict_test_set", "learning_curve"} <= stages
+    assert all(t["duration_s"] >= 0 for t in timings)
+
+
+@pytest.mark.parametrize("max_workers, n_jobs", [(None, 1), (2, 1), (0, -1)])
+def test_learning_curve_jobs_follow_worker_budget(tmp_path, max_workers, n_jobs):
+    """
+    Testa se a curva de aprendizado usa um só processo quando roda no pool de
+    etapas e todos os núcleos quando o grafo roda em série.
+    """
+    graph = IrisModelTrainer().build_graph(
+        str(tmp_path / "iris_knn_v1_20240101.pkl"), None, max_workers=max_workers
+    )
+
+    assert graph.stages["learning_curve"].kwargs["n_jobs"] == n_jobs
+
+
+def test_headless_run_writes_metrics_without_matplotlib(tmp_path):
+    """
+    Testa se o treino sem gráficos não importa o matplotlib e grava as métricas e o
+    custo de servir o modelo (`<modelo>.metrics.json` e `.profile.json`), lidos pelo
+    registry.
+    """
+    model_path = str(tmp_path / "iris_knn_v1_20240101.pkl")
+    code = (
+        "import sys; from desafio1.models.ml.iris_train import IrisModelTrainer; "
+        f"IrisModelTrainer().run({model_path!r}, None, 0); "
+        "print('matplotlib' in sys.modules)"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    assert output.strip().splitlines()[-1] == "False"
+    assert not any(name.endswith(".png") for name in os.listdir(tmp_path))
+    with open(metrics_path(model_path)) as f:
+        metrics = json.load(f)
+    assert 0.8 <= metrics["accuracy"] <= 1.0
+    assert len(metrics["cross_validation"]["scores"]) == 5
+    assert len(metrics["learning_curve"]["test_scores_mean"]) == 10
+    assert set(metrics["roc_auc"]) == {"0", "1", "2"}
+
+    registry = ModelRegistry(
+        str(tmp_path / "*.pkl"),
+        loader=lambda path: None,
+        on_swap=lambda model, entry: None,
+        poll_interval_s=0,
+    )
+    entry = registry.scan()[0]
+    assert entry.metrics["accuracy"] == metrics["accuracy"]
+    assert entry.profile["size_bytes"] == os.path.getsize(model_path)
+    assert entry.profile["latency"]["single_row_p95_us"] > 0
+    assert entry.profile["numpy_scorer"]["load_time_ms"] > 0
+
+    with open(reference_path(model_path)) as f:
+        reference = json.load(f)
+    assert reference["rows"] == sum(reference["class_counts"]) > 0
+    assert len(reference["edges"]) == len(reference["counts"]) == 4
+
+
+def test_search_halves_candidates_and_records_latency():
+    """
+    Testa se a busca descarta candidatos a cada rodada e registra, por família, a
+    melhor configuração com a sua latência.
+    """
+    X, y = IrisModelTrainer().load_data()
+    space = {
+        "knn": {"n_neighbors": [1, 3, 5, 7, 9, 11]},
+        "nb": {"var_smoothing": [1e-9, 1e-5, 1e-3]},
+    }
+
+    result = search_models(X, y, space, n_jobs=1)
+
+    assert [r["candidates"] for r in result["rounds"]] == [9, 3]
+    assert {c["algorithm"] for c in result["candidates"]} == {"knn", "nb"}
+    assert result["algorithm"] == algorithm_name(result["model"])
+    assert result["latency"]["single_row_p50_us"] > 0
+    assert result["model"].predict(X[:2]).shape == (2,)
+
+
+def test_run_with_search_names_artifact_after_winner(tmp_path):
+    """
+    Testa se o treino com busca salva o modelo com o nome da família vencedora e o
+    relatório da busca nas métricas.
+    """
+    trainer = IrisModelTrainer(algorithms=["nb"])
+
+    trainer.run(str(tmp_path / "iris_{algorithm}_v1_20240101.pkl"), None, 0, True)
+
+    model_path = str(tmp_path / "iris_nb_v1_20240101.pkl")
+    assert os.path.exists(model_path)
+    with open(metrics_path(model_path)) as f:
+        metrics = json.load(f)
+    assert metrics["algorithm"] == "nb"
+    assert metrics["search"]["candidates"][0]["algorithm"] == "nb"
+
+
+def test_neighbor_index_is_saved_with_model(tmp_path):
+    """
+    Testa se o índice escolhido é usado pelo pipeline `.pkl` e gravado no artefato
+    `.knn` ao lado dele.
+    """
+    model_path = str(tmp_path / "iris_knn_v1_20240101.pkl")
+
+    IrisModelTrainer(neighbor_index="kd_tree").run(model_path, None, 0)
+
+    with open(model_path, "rb") as f:
+        assert pickle.load(f).named_steps["classifier"].algorithm == "kd_tree"
+    with open(os.path.join(knn_artifact_path(model_path), "meta.json")) as f:
+        assert json.load(f)["index"] == {"type": "kd_tree"}
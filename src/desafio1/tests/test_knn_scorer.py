@@ -0,0 +1,141 @@
+import json
+import os
+import pickle
+
+import numpy as np
+import pytest
+from desafio1.models.ml.knn_scorer import (
+    NumpyKNNScorer,
+    export_knn_artifact,
+    knn_artifact_path,
+)
+from sklearn import datasets
+from sklearn.naive_bayes import GaussianNB
+from sklearn.pipeline import Pipeline
+
+
+def is_memory_mapped(array) -> bool:
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+@pytest.fixture
+def scorer(iris_model, tmp_path):
+    path = str(tmp_path / "iris_knn_v1_test.npz")
+    export_knn_artifact(iris_model, path)
+    return NumpyKNNScorer.load(path)
+
+
+def test_scorer_matches_pipeline(iris_model, scorer):
+    """
+    Testa se o scorer NumPy reproduz o predict_proba do pipeline dentro da tolerância.
+    """
+    X, _ = datasets.load_iris(return_X_y=True)
+    rng = np.random.default_rng(42)
+    samples = np.vstack([X, rng.uniform(X.min(0), X.max(0), size=(2000, 4))])
+
+    np.testing.assert_allclose(
+        scorer.predict_proba(samples), iris_model.predict_proba(samples), atol=1e-6
+    )
+    np.testing.assert_array_equal(scorer.predict(samples), iris_model.predict(samples))
+
+
+def test_artifact_uses_float32(scorer):
+    """
+    Testa se a matriz de treino e os parâmetros do scaler são guardados em float32.
+    """
+    assert scorer.fit_X.dtype == np.float32
+    assert scorer.mean.dtype == np.float32
+    assert scorer.scale.dtype == np.float32
+
+
+def test_export_rejects_non_knn_pipeline(tmp_path):
+    """
+    Testa se a exportação recusa pipelines que não sejam StandardScaler + KNN.
+    """
+    X, y = datasets.load_iris(return_X_y=True)
+    model = Pipeline([("classifier", GaussianNB())]).fit(X, y)
+
+    with pytest.raises(ValueError):
+        export_knn_artifact(model, str(tmp_path / "model.npz"))
+
+
+def test_knn_artifact_path():
+    assert knn_artifact_path("./saved_models/iris_knn_v1_1.pkl") == (
+        "./saved_models/iris_knn_v1_1.knn"
+    )
+
+
+def test_mmap_artifact_matches_npz(iris_model, scorer, tmp_path):
+    """
+    Testa se o artefato em diretório é aberto com mmap e produz o mesmo resultado.
+    """
+    path = knn_artifact_path(str(tmp_path / "iris_knn_v1_test.pkl"))
+    export_knn_artifact(iris_model, path)
+    mapped = NumpyKNNScorer.load(path)
+    X, _ = datasets.load_iris(return_X_y=True)
+
+    assert is_memory_mapped(mapped.fit_X)
+    assert is_memory_mapped(mapped._votes)
+    np.testing.assert_allclose(mapped.predict_proba(X), scorer.predict_proba(X))
+
+
+def test_mmap_scorer_pickles_by_path(iris_model, tmp_path):
+    """
+    Testa se o scorer mapeado é serializado pelo caminho, reabrindo o mmap no destino.
+    """
+    path = str(tmp_path / "iris_knn_v1_test.knn")
+    export_knn_artifact(iris_model, path)
+
+    payload = pickle.dumps(NumpyKNNScorer.load(path))
+    restored = pickle.loads(payload)
+
+    assert len(payload) < 1024
+    assert is_memory_mapped(restored.fit_X)
+
+
+@pytest.mark.parametrize("index", ["kd_tree", "ball_tree", "ivf"])
+def test_neighbor_index_is_persisted_with_artifact(iris_model, tmp_path, index):
+    """
+    Testa se o índice de vizinhos é construído na exportação, reaberto com o artefato
+    e, visitando todas as listas no caso do `ivf`, reproduz o pipeline.
+    """
+    path = str(tmp_path / "iris_knn_v1_test.knn")
+    export_knn_artifact(iris_model, path, index=index, n_lists=10, n_probe=10)
+    scorer = NumpyKNNScorer.load(path)
+    X, _ = datasets.load_iris(return_X_y=True)
+
+    with open(os.path.join(path, "meta.json")) as f:
+        assert json.load(f)["index"]["type"] == index
+    assert type(scorer.index).__name__ != "BruteForceIndex"
+    np.testing.assert_allclose(
+        scorer.predict_proba(X), iris_model.predict_proba(X), atol=1e-6
+    )
+
+
+def test_ivf_trades_recall_for_fewer_candidates(iris_model, tmp_path):
+    """
+    Testa se o `ivf` com poucas listas visitadas ainda acerta quase todos os
+    vizinhos e se artefatos da versão 1 (sem índice) usam a força bruta.
+    """
+    path = str(tmp_path / "iris_knn_v1_test.knn")
+    export_knn_artifact(iris_model, path, index="ivf", n_lists=12, n_probe=3)
+    scorer = NumpyKNNScorer.load(path)
+    X, _ = datasets.load_iris(return_X_y=True)
+
+    assert (scorer.predict(X) == iris_model.predict(X)).mean() > 0.95
+
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    meta["format_version"] = 1
+    del meta["index"]
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump(meta, f)
+    exact = NumpyKNNScorer.load(path)
+    assert type(exact.index).__name__ == "BruteForceIndex"
+    np.testing.assert_allclose(
+        exact.predict_proba(X), iris_model.predict_proba(X), atol=1e-6
+    )
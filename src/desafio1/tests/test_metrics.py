@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+from desafio1.api.services.metrics import METRICS, Histogram, Metrics
+from desafio1.api.services.prediction_service import staged_predict_proba
+from desafio1.api.v1.main import app
+from desafio1.models.ml.knn_scorer import NumpyKNNScorer, export_knn_artifact
+from fastapi.testclient import TestClient
+from sklearn import datasets
+
+ROW = {"sepal_length": 6.0, "sepal_width": 2.9, "petal_length": 4.5, "petal_width": 1.5}
+
+
+@pytest.fixture
+def client(iris_model, app_state):
+    app.state.models = {"knn": iris_model}
+    enabled = METRICS.enabled
+    METRICS.enabled = True
+    yield TestClient(app)
+    METRICS.enabled = enabled
+
+
+def test_histogram_renders_cumulative_buckets():
+    metrics = Metrics()
+    metrics.stages.observe(0.00003, "scale")
+    metrics.stages.observe(2.0, "scale")
+    metrics.set_model_version("knn", "iris_knn_v1_20240101")
+
+    text = metrics.render()
+
+    assert (
+        'iris_prediction_stage_duration_seconds_bucket{stage="scale",le="5e-05"} 1'
+        in text
+    )
+    assert (
+        'iris_prediction_stage_duration_seconds_bucket{stage="scale",le="+Inf"} 2'
+        in text
+    )
+    assert 'iris_prediction_stage_duration_seconds_count{stage="scale"} 2' in text
+    assert 'iris_model_info{model="knn",version="iris_knn_v1_20240101"} 1' in text
+    assert "# TYPE iris_http_requests_total counter" in text
+
+
+def test_histogram_bucket_bounds_are_inclusive():
+    histogram = Histogram("h", "", (), (1, 2))
+    histogram.observe(1)
+    histogram.observe(2.5)
+
+    samples = {labels[-1]: value for name, labels, value in histogram.samples()[:3]}
+
+    assert samples == {"1": 1, "2": 1, "+Inf": 2}
+
+
+def test_metrics_endpoint_reports_routes_and_stages(client):
+    """
+    Testa se uma predição registra a contagem e a latência por rota e a duração de
+    cada estágio (parse, inference, scale, neighbor_search e response_build).
+    """
+    client.post("/v1/iris/predict", json=ROW)
+    client.post("/v1/iris/predict", json={"sepal_length": 1})
+
+    text = client.get("/metrics").text
+
+    assert (
+        'iris_http_requests_total{method="POST",handler="get_prediction",status="200"}'
+        in text
+    )
+    assert 'handler="get_prediction",status="422"' in text
+    assert 'iris_http_request_duration_seconds_count{method="POST"' in text
+    for stage in ("parse", "inference", "scale", "neighbor_search", "response_build"):
+        assert (
+            f'iris_prediction_stage_duration_seconds_count{{stage="{stage}"}}' in text
+        )
+    assert 'iris_prediction_batch_size_count{source="single"}' in text
+
+
+def test_handler_label_is_unique_per_route(client, monkeypatch):
+    """
+    Testa se rotas diferentes que listam modelos não somam suas requisições no
+    mesmo rótulo `handler`.
+    """
+    monkeypatch.setattr(app.state, "registry", None, raising=False)
+    client.get("/v1/iris/models")
+    client.get("/v1/admin/models")
+
+    text = client.get("/metrics").text
+
+    assert 'handler="list_models",status="200"' in text
+    assert 'handler="list_model_versions",status="503"' in text
+    assert 'handler="list_models",status="503"' not in text
+
+
+def test_disabled_metrics_skip_collection(client):
+    METRICS.enabled = False
+    before = METRICS.render()
+
+    client.post("/v1/iris/predict", json=ROW)
+
+    assert client.get("/metrics").status_code == 404
+    assert METRICS.render() == before
+
+
+def test_staged_predict_proba_matches_model(iris_model, tmp_path):
+    X, _ = datasets.load_iris(return_X_y=True)
+    export_knn_artifact(iris_model, str(tmp_path / "knn"))
+    scorer = NumpyKNNScorer.load(str(tmp_path / "knn"))
+
+    np.testing.assert_allclose(
+        staged_predict_proba(iris_model, X), iris_model.predict_proba(X)
+    )
+    np.testing.assert_allclose(staged_predict_proba(scorer, X), scorer.predict_proba(X))
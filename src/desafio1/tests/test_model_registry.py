@@ -0,0 +1,319 @@
+import asyncio
+import json
+import os
+import pickle
+
+import pytest
+from desafio1.api.services.model_registry import (
+    ModelManifestEntry,
+    ModelNotFoundError,
+    ModelRegistry,
+    metrics_path,
+    profile_path,
+    select_default_model,
+)
+from sklearn import datasets
+from sklearn.naive_bayes import GaussianNB
+from sklearn.preprocessing import StandardScaler
+
+
+def save(model, directory, version):
+    path = os.path.join(directory, f"{version}.pkl")
+    with open(path, "wb") as f:
+        pickle.dump(model, f)
+    return path
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+@pytest.fixture
+def published():
+    return {}
+
+
+@pytest.fixture
+def registry(tmp_path, published):
+    def on_swap(model, entry):
+        published["model"] = model
+        published["version"] = entry.version
+
+    return ModelRegistry(
+        str(tmp_path / "iris_knn_v1_*.pkl"), load, on_swap, poll_interval_s=0
+    )
+
+
+def test_scan_writes_manifest(iris_model, tmp_path, registry):
+    """
+    Testa se o registry indexa os artefatos com algoritmo, checksum e métricas.
+    """
+    path = save(iris_model, tmp_path, "iris_knn_v1_20240101")
+    with open(metrics_path(path), "w") as f:
+        json.dump({"accuracy": 0.97}, f)
+    with open(profile_path(path), "w") as f:
+        json.dump({"latency": {"single_row_p95_us": 800.0}}, f)
+    save(iris_model, tmp_path, "iris_knn_v1_20240102")
+
+    entries = registry.scan()
+
+    assert [e.version for e in entries] == [
+        "iris_knn_v1_20240101",
+        "iris_knn_v1_20240102",
+    ]
+    assert entries[0].algorithm == "knn"
+    assert entries[0].metrics == {"accuracy": 0.97}
+    assert entries[0].profile["latency"]["single_row_p95_us"] == 800.0
+    assert entries[1].profile == {}
+    assert len(entries[0].checksum) == 64
+    with open(tmp_path / "manifest.json") as f:
+        manifest = json.load(f)
+    assert len(manifest["models"]) == 2
+
+
+def test_hot_reload_pin_and_rollback(iris_model, tmp_path, registry, published):
+    """
+    Testa a troca para uma versão nova, a fixação e o rollback.
+    """
+    save(iris_model, tmp_path, "iris_knn_v1_20240101")
+
+    async def scenario():
+        await registry.start()
+        assert published["version"] == "iris_knn_v1_20240101"
+
+        save(iris_model, tmp_path, "iris_knn_v1_20240102")
+        await registry.refresh()
+        assert published["version"] == "iris_knn_v1_20240102"
+
+        await registry.rollback("knn")
+        assert published["version"] == "iris_knn_v1_20240101"
+        assert registry.pinned_versions == {"knn": "iris_knn_v1_20240101"}
+
+        # Com uma versão fixada, novos artefatos não são ativados automaticamente.
+        save(iris_model, tmp_path, "iris_knn_v1_20240103")
+        await registry.refresh()
+        assert published["version"] == "iris_knn_v1_20240101"
+
+        await registry.unpin("knn")
+        assert published["version"] == "iris_knn_v1_20240103"
+
+    asyncio.run(scenario())
+
+
+def test_pin_wins_over_refresh_waiting_on_lock(
+    iris_model, tmp_path, registry, published
+):
+    """
+    Testa se um `refresh` que aguardava o lock não ativa a versão mais nova por cima
+    de um `pin` feito nesse intervalo.
+    """
+    save(iris_model, tmp_path, "iris_knn_v1_20240101")
+
+    async def scenario():
+        await registry.start()
+        save(iris_model, tmp_path, "iris_knn_v1_20240102")
+        async with registry._lock:
+            refresh = asyncio.create_task(registry.refresh())
+            # Deixa o refresh indexar o diretório e parar no lock da ativação.
+            while "iris_knn_v1_20240102" not in registry.entries:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.01)
+            pin = asyncio.create_task(registry.pin("iris_knn_v1_20240101"))
+            await asyncio.sleep(0)
+        return await refresh, await pin
+
+    activated, pinned = asyncio.run(scenario())
+
+    assert activated == []
+    assert pinned.version == "iris_knn_v1_20240101"
+    assert published["version"] == "iris_knn_v1_20240101"
+    assert registry.pinned_versions == {"knn": "iris_knn_v1_20240101"}
+
+
+def test_rollback_after_concurrent_pin(iris_model, tmp_path, registry, published):
+    """
+    Testa se um rollback enfileirado atrás de um `pin` volta para a versão servida
+    antes do pin, sem descartar outra versão do histórico.
+    """
+    save(iris_model, tmp_path, "iris_knn_v1_20240101")
+
+    async def scenario():
+        await registry.start()
+        save(iris_model, tmp_path, "iris_knn_v1_20240102")
+        await registry.refresh()
+        async with registry._lock:
+            pin = asyncio.create_task(registry.pin("iris_knn_v1_20240101"))
+            rollback = asyncio.create_task(registry.rollback("knn"))
+            await asyncio.sleep(0)
+        await pin, await rollback
+        assert published["version"] == "iris_knn_v1_20240102"
+        assert registry.history["knn"] == ["iris_knn_v1_20240101"]
+
+        # A versão ativa no topo do histórico é ignorada.
+        registry.history["knn"].append("iris_knn_v1_20240102")
+        await registry.rollback("knn")
+
+    asyncio.run(scenario())
+
+    assert published["version"] == "iris_knn_v1_20240101"
+    assert registry.pinned_versions == {"knn": "iris_knn_v1_20240101"}
+    assert registry.history["knn"] == []
+
+
+def test_broken_artifact_keeps_current_model(iris_model, tmp_path, registry, published):
+    """
+    Testa se um artefato corrompido não substitui o modelo em produção.
+    """
+    save(iris_model, tmp_path, "iris_knn_v1_20240101")
+
+    async def scenario():
+        await registry.start()
+        with open(tmp_path / "iris_knn_v1_20240102.pkl", "wb") as f:
+            f.write(b"corrompido")
+        with pytest.raises(Exception):
+            await registry.refresh()
+        # A mesma falha não é retentada enquanto o arquivo não mudar.
+        assert await registry.refresh() == []
+
+    asyncio.run(scenario())
+
+    assert published["version"] == "iris_knn_v1_20240101"
+
+
+def test_warmup_rejects_inaccurate_model(iris_model, tmp_path, registry, published):
+    """
+    Testa se um artefato que erra as linhas de aquecimento, como um GaussianNB
+    treinado sobre dados padronizados e salvo sem o scaler, não entra em produção.
+    """
+    X, y = datasets.load_iris(return_X_y=True)
+    save(iris_model, tmp_path, "iris_knn_v1_20240101")
+    save(
+        GaussianNB().fit(StandardScaler().fit_transform(X), y),
+        tmp_path,
+        "iris_knn_v1_20240102",
+    )
+
+    async def scenario():
+        registry.scan()
+        await registry.activate("iris_knn_v1_20240101")
+        with pytest.raises(ValueError, match="aquecimento"):
+            await registry.refresh()
+
+    asyncio.run(scenario())
+
+    assert published["version"] == "iris_knn_v1_20240101"
+
+
+def test_start_without_models_raises(registry):
+    with pytest.raises(ModelNotFoundError):
+        asyncio.run(registry.start())
+
+
+def test_admin_pin_unknown_version(iris_model, tmp_path, registry):
+    """
+    Testa se o endpoint administrativo responde 404 para uma versão desconhecida.
+    """
+    from desafio1.api.v1.main import app
+    from fastapi.testclient import TestClient
+
+    save(iris_model, tmp_path, "iris_knn_v1_20240101")
+    registry.scan()
+    app.state.registry = registry
+    try:
+        client = TestClient(app)
+        listing = client.get("/v1/admin/models")
+        response = client.post("/v1/admin/models/pin", json={"version": "nope"})
+    finally:
+        app.state.registry = None
+
+    assert listing.json()["models"][0]["version"] == "iris_knn_v1_20240101"
+    assert response.status_code == 404
+
+
+def test_admin_pin_broken_artifact(iris_model, tmp_path, registry, published):
+    """
+    Testa se fixar uma versão cujo artefato não carrega responde 422 e mantém a
+    versão em produção.
+    """
+    from desafio1.api.v1.main import app
+    from fastapi.testclient import TestClient
+
+    save(iris_model, tmp_path, "iris_knn_v1_20240101")
+    asyncio.run(registry.start())
+    with open(tmp_path / "iris_knn_v1_20240102.pkl", "wb") as f:
+        f.write(b"corrompido")
+    registry.scan()
+    app.state.registry = registry
+    try:
+        client = TestClient(app)
+        response = client.post(
+            "/v1/admin/models/pin", json={"version": "iris_knn_v1_20240102"}
+        )
+    finally:
+        app.state.registry = None
+
+    assert response.status_code == 422
+    assert published["version"] == "iris_knn_v1_20240101"
+    assert registry.pinned_versions == {}
+
+
+def test_registry_tracks_each_family(iris_model, tmp_path, published):
+    """
+    Testa se cada família de algoritmo tem sua própria versão ativa.
+    """
+    swaps = []
+    registry = ModelRegistry(
+        str(tmp_path / "iris_*_v1_*.pkl"),
+        load,
+        lambda model, entry: swaps.append(entry.version),
+        poll_interval_s=0,
+    )
+    save(iris_model, tmp_path, "iris_knn_v1_20240101")
+    save(iris_model, tmp_path, "iris_knn_v1_20240102")
+    save(iris_model, tmp_path, "iris_lr_v1_20240101")
+
+    asyncio.run(registry.start())
+
+    assert registry.active_versions == {
+        "knn": "iris_knn_v1_20240102",
+        "lr": "iris_lr_v1_20240101",
+    }
+    assert sorted(swaps) == ["iris_knn_v1_20240102", "iris_lr_v1_20240101"]
+
+
+def entry(algorithm, accuracy, p95_us=None, numpy_p95_us=None):
+    profile = {}
+    if p95_us is not None:
+        profile["latency"] = {"single_row_p95_us": p95_us}
+    if numpy_p95_us is not None:
+        profile["numpy_scorer"] = {"latency": {"single_row_p95_us": numpy_p95_us}}
+    return ModelManifestEntry(
+        version=f"iris_{algorithm}_v1_20240101",
+        algorithm=algorithm,
+        path="",
+        created_at="",
+        checksum="",
+        size_bytes=0,
+        metrics={"accuracy": accuracy},
+        profile=profile,
+    )
+
+
+def test_select_default_model_under_latency_slo():
+    """
+    Testa se o modelo padrão é o mais preciso dentro do SLO, o mais rápido quando
+    nenhum o atende, e o configurado quando não há medições.
+    """
+    entries = [
+        entry("knn", 0.97, p95_us=1500.0, numpy_p95_us=40.0),
+        entry("lr", 0.95, p95_us=300.0),
+        entry("nb", 0.93, p95_us=200.0),
+        entry("dt", 0.99),
+    ]
+
+    assert select_default_model(entries, 1.0, "knn") == "lr"
+    assert select_default_model(entries, 2.0, "knn") == "knn"
+    assert select_default_model(entries, 1.0, "knn", scorer="numpy") == "knn"
+    assert select_default_model(entries, 0.1, "knn") == "nb"
+    assert select_default_model([entry("dt", 0.99)], 1.0, "knn") == "knn"
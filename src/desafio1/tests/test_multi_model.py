@@ -0,0 +1,159 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+from desafio1.api.config import settings
+from desafio1.api.services.model_registry import ModelManifestEntry
+from desafio1.api.services.prediction_service import EnsembleModel
+from desafio1.api.services.shadow import ShadowComparator
+from desafio1.api.v1.main import (
+    app,
+    publish_model,
+    start_inference_services,
+    stop_inference_services,
+)
+from fastapi.testclient import TestClient
+from sklearn import datasets
+from sklearn.naive_bayes import GaussianNB
+
+ROW = {"sepal_length": 6.0, "sepal_width": 2.9, "petal_length": 4.5, "petal_width": 1.5}
+
+
+@pytest.fixture
+def models(iris_model, app_state):
+    X, y = datasets.load_iris(return_X_y=True)
+    nb = GaussianNB().fit(X, y)
+    models = {"knn": iris_model, "nb": nb}
+    models["ensemble"] = EnsembleModel(models)
+    app.state.models = models
+    app.state.shadow = ShadowComparator()
+    return models
+
+
+def test_routes_to_requested_model(models):
+    """
+    Testa se `?model=` escolhe o modelo que responde à requisição.
+    """
+    client = TestClient(app)
+    row = np.array([list(ROW.values())])
+
+    for name in ("knn", "nb", "ensemble"):
+        response = client.post(f"/v1/iris/predict?model={name}", json=ROW)
+        assert response.status_code == 200
+        expected = models[name].predict_proba(row).max()
+        assert response.json()["probability"] == pytest.approx(expected)
+
+    assert client.post("/v1/iris/predict?model=svm", json=ROW).status_code == 404
+    assert client.get("/v1/iris/models").json()["models"] == ["ensemble", "knn", "nb"]
+
+
+def test_ensemble_averages_probabilities(models):
+    X, _ = datasets.load_iris(return_X_y=True)
+
+    expected = (models["knn"].predict_proba(X) + models["nb"].predict_proba(X)) / 2
+
+    np.testing.assert_allclose(models["ensemble"].predict_proba(X), expected)
+
+
+def test_shadow_result_is_not_returned(models):
+    """
+    Testa se o modelo shadow é avaliado e comparado sem alterar a resposta.
+    """
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            response = await c.post(
+                "/v1/iris/predict/batch?model=knn&shadow=nb",
+                json={"instances": [ROW] * 10},
+            )
+        await app.state.shadow.drain()
+        return response
+
+    response = asyncio.run(scenario())
+
+    row = np.array([list(ROW.values())])
+    knn_probability = models["knn"].predict_proba(row).max()
+    assert response.json()["predictions"][0]["probability"] == pytest.approx(
+        knn_probability
+    )
+    stats = app.state.shadow.stats()["knn->nb"]
+    assert stats["rows"] == 10
+    assert 0.0 <= stats["agreement_rate"] <= 1.0
+
+
+def test_default_model_follows_latency_slo(models, monkeypatch):
+    """
+    Testa se, com SLO de latência, requisições sem `?model=` usam o modelo mais
+    preciso que o atende, enquanto `?model=` continua escolhendo qualquer modelo.
+    """
+    monkeypatch.setattr(settings, "latency_slo_ms", 1.0)
+    client = TestClient(app)
+    row = np.array([list(ROW.values())])
+    profiles = {"knn": (0.97, 2000.0), "nb": (0.93, 300.0)}
+    for name, (accuracy, p95_us) in profiles.items():
+        publish_model(
+            models[name],
+            ModelManifestEntry(
+                version=f"iris_{name}_v1_20240101",
+                algorithm=name,
+                path="",
+                created_at="",
+                checksum="",
+                size_bytes=0,
+                metrics={"accuracy": accuracy},
+                profile={"latency": {"single_row_p95_us": p95_us}},
+            ),
+        )
+
+    assert client.get("/v1/iris/models").json()["default_model"] == "nb"
+    response = client.post("/v1/iris/predict/batch", json={"instances": [ROW]})
+    expected = models["nb"].predict_proba(row).max()
+    assert response.json()["predictions"][0]["probability"] == pytest.approx(expected)
+    response = client.post(
+        "/v1/iris/predict/batch?model=knn", json={"instances": [ROW]}
+    )
+    expected = models["knn"].predict_proba(row).max()
+    assert response.json()["predictions"][0]["probability"] == pytest.approx(expected)
+
+
+def test_inference_services_use_resolved_default_model(models, monkeypatch):
+    """
+    Testa se o executor e o micro-batcher usam o modelo padrão escolhido pelo SLO,
+    tanto ao iniciar quanto depois de uma nova publicação.
+    """
+    monkeypatch.setattr(settings, "latency_slo_ms", 1.0)
+
+    def entry(name, accuracy, p95_us):
+        return ModelManifestEntry(
+            version=f"iris_{name}_v1_20240101",
+            algorithm=name,
+            path="",
+            created_at="",
+            checksum="",
+            size_bytes=0,
+            metrics={"accuracy": accuracy},
+            profile={"latency": {"single_row_p95_us": p95_us}},
+        )
+
+    publish_model(models["nb"], entry("nb", 0.93, 300.0))
+    row = list(ROW.values())
+
+    async def scenario():
+        await start_inference_services(app)
+        try:
+            services = (app.state.executor, app.state.batcher)
+            before = [s.default_model for s in services]
+            publish_model(models["knn"], entry("knn", 0.97, 300.0))
+            after = [s.default_model for s in services]
+            return before, after, await app.state.batcher.submit(row)
+        finally:
+            await stop_inference_services(app)
+
+    before, after, (_, probability) = asyncio.run(scenario())
+
+    assert before == ["nb", "nb"]
+    assert after == ["knn", "knn"]
+    expected = models["knn"].predict_proba(np.array([row])).max()
+    assert probability == pytest.approx(expected)
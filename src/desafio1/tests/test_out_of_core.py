@@ -0,0 +1,153 @@
+import json
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from desafio1.api.services.model_registry import metrics_path, reference_path
+from desafio1.models.ml.iris_train import IrisModelTrainer
+from desafio1.models.ml.out_of_core import (
+    FEATURES,
+    ReservoirSampler,
+    fit_out_of_core,
+    iter_chunks,
+)
+from sklearn import datasets
+
+SPECIES = np.array(["setosa", "versicolor", "virginica"])
+
+
+@pytest.fixture
+def partitions(tmp_path):
+    """
+    Grava 3 partições Parquet (uma por dia) de 20 mil linhas cada, sorteadas do
+    Íris com ruído, e uma partição CSV no formato do UCI.
+    """
+    X, y = datasets.load_iris(return_X_y=True)
+    rng = np.random.default_rng(0)
+    for day in range(1, 4):
+        rows = rng.integers(0, len(y), 20_000)
+        noisy = X[rows] + rng.normal(0, 0.05, (len(rows), X.shape[1]))
+        table = pa.table(
+            {
+                **{name: noisy[:, i] for i, name in enumerate(FEATURES)},
+                "species": SPECIES[y[rows]],
+            }
+        )
+        os.makedirs(tmp_path / f"date=2024-01-0{day}")
+        pq.write_table(table, tmp_path / f"date=2024-01-0{day}" / "part.parquet")
+    with open(tmp_path / "extra.csv", "w") as f:
+        f.write(",".join([*FEATURES, "species"]) + "\n")
+        for features, label in zip(X, y):
+            f.write(",".join(map(str, features)) + f",Iris-{SPECIES[label]}\n")
+    return tmp_path
+
+
+def test_reservoir_keeps_a_bounded_uniform_sample():
+    """
+    Testa se a amostra de cada classe fica limitada ao tamanho do reservatório e
+    cobre o fluxo inteiro, e não só os primeiros blocos.
+    """
+    sampler = ReservoirSampler(size=500, n_features=1, random_state=0)
+    for start in range(0, 100_000, 1_000):
+        values = np.arange(start, start + 1_000, dtype=float).reshape(-1, 1)
+        sampler.update(values, np.zeros(1_000, dtype=int))
+
+    X, y = sampler.arrays()
+
+    assert X.shape == (500, 1) and (y == 0).all()
+    assert len(np.unique(X)) == 500
+    assert 40_000 < X.mean() < 60_000
+
+
+@pytest.mark.parametrize("algorithm", ["knn", "nb"])
+def test_fit_out_of_core_bounds_memory(partitions, algorithm):
+    """
+    Testa se o treino em blocos lê todas as partições, ajusta o scaler com a base
+    inteira e mantém o pico de memória abaixo do tamanho da base.
+    """
+    model, report = fit_out_of_core(
+        [str(partitions)], algorithm, chunk_rows=2_000, reservoir_size=200
+    )
+
+    X_all = np.concatenate(
+        [
+            X
+            for X, _ in iter_chunks(
+                sorted(str(p) for p in partitions.rglob("*.parquet")), 10_000
+            )
+        ]
+    )
+    assert report["partitions"] == 4
+    assert report["rows"] == 60_150
+    assert report["chunks"] >= 30
+    assert report["accuracy"] > 0.9
+    if algorithm == "knn":
+        assert report["fit_rows"] == 3 * 200
+    # A base tem 60 mil linhas x 5 colunas de 8 bytes (~2.4 MB).
+    assert report["peak_memory"]["python_numpy_bytes"] < X_all.nbytes / 2
+    np.testing.assert_allclose(
+        model.named_steps["scaler"].mean_, X_all.mean(axis=0), atol=0.02
+    )
+
+
+def test_run_out_of_core_saves_model_and_report(partitions, tmp_path):
+    """
+    Testa se o treino fora da memória salva o modelo e grava o relatório, com o pico
+    de memória, nas métricas lidas pelo registry.
+    """
+    model_path = str(tmp_path / "models" / "iris_{algorithm}_v1_20240101.pkl")
+
+    IrisModelTrainer().run_out_of_core(
+        [str(partitions / "date=*")], model_path, chunk_rows=5_000
+    )
+
+    path = metrics_path(str(tmp_path / "models" / "iris_knn_v1_20240101.pkl"))
+    with open(path) as f:
+        metrics = json.load(f)
+    assert metrics["algorithm"] == "knn"
+    assert metrics["accuracy"] == metrics["out_of_core"]["accuracy"] > 0.9
+    assert metrics["out_of_core"]["partitions"] == 3
+    assert metrics["out_of_core"]["peak_memory"]["python_numpy_bytes"] > 0
+    with open(reference_path(path.replace(".metrics.json", ".pkl"))) as f:
+        reference = json.load(f)
+    assert reference["rows"] == metrics["out_of_core"]["rows"]
+
+
+@pytest.mark.parametrize("algorithm", ["knn", "nb"])
+def test_fit_out_of_core_skips_chunks_without_training_rows(tmp_path, algorithm):
+    """
+    Testa se blocos sorteados inteiros para teste (partições de uma linha) não
+    quebram o ajuste do scaler.
+    """
+    X, y = datasets.load_iris(return_X_y=True)
+    for i, (features, label) in enumerate(zip(X, y)):
+        table = pa.table(
+            {
+                **{name: [value] for name, value in zip(FEATURES, features)},
+                "species": [SPECIES[label]],
+            }
+        )
+        pq.write_table(table, tmp_path / f"part-{i:03d}.parquet")
+
+    model, report = fit_out_of_core([str(tmp_path)], algorithm, chunk_rows=100)
+
+    assert report["chunks"] == len(y)
+    assert 0 < report["test_rows"] < len(y)
+    assert report["train_rows"] + report["test_rows"] == len(y)
+    assert report["accuracy"] > 0.8
+
+
+def test_run_out_of_core_without_test_rows(partitions, tmp_path, capsys):
+    """
+    Testa se o treino sem linhas de teste grava o relatório sem acurácia.
+    """
+    model_path = str(tmp_path / "models" / "iris_{algorithm}_v1_20240101.pkl")
+
+    report = IrisModelTrainer().run_out_of_core(
+        [str(partitions / "date=*")], model_path, algorithm="nb", test_size=0.0
+    )
+
+    assert report["test_rows"] == 0 and report["accuracy"] is None
+    assert "acurácia no teste: n/d" in capsys.readouterr().out
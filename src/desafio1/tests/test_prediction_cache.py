@@ -0,0 +1,112 @@
+import time
+
+import pytest
+from desafio1.api.services.model_registry import ModelManifestEntry
+from desafio1.api.services.prediction_cache import PredictionCache, entry_size
+from desafio1.api.v1.main import app, publish_model
+from fastapi.testclient import TestClient
+
+ROW = {"sepal_length": 6.0, "sepal_width": 2.9, "petal_length": 4.5, "petal_width": 1.5}
+
+
+def test_quantized_keys_share_entry():
+    """
+    Testa se medições que diferem abaixo da precisão configurada usam a mesma entrada.
+    """
+    cache = PredictionCache(precision=1)
+    cache.put(cache.key("knn", [5.1, 3.5, 1.4, 0.2]), (0, 1.0), cache.generation)
+
+    assert cache.get(cache.key("knn", [5.1000001, 3.5, 1.4, 0.2])) == (0, 1.0)
+    assert cache.get(cache.key("nb", [5.1, 3.5, 1.4, 0.2])) is None
+    assert PredictionCache().key("knn", [5.1000001]) != PredictionCache().key(
+        "knn", [5.1]
+    )
+
+
+def test_evicts_least_recently_used_within_limits():
+    """
+    Testa se o cache respeita o número de entradas e a memória máxima, removendo as
+    entradas usadas há mais tempo.
+    """
+    cache = PredictionCache(max_entries=2)
+    for i in range(3):
+        if i == 2:
+            cache.get(cache.key("knn", [0.0]))
+        cache.put(cache.key("knn", [float(i)]), (0, 1.0), cache.generation)
+
+    assert cache.get(cache.key("knn", [0.0])) == (0, 1.0)
+    assert cache.get(cache.key("knn", [1.0])) is None
+    assert cache.stats()["evictions"] == 1
+
+    size = entry_size(cache.key("knn", [0.0, 0.0, 0.0, 0.0]), (0, 1.0))
+    cache = PredictionCache(max_bytes=size * 10)
+    for i in range(100):
+        cache.put(cache.key("knn", [float(i)] * 4), (0, 1.0), cache.generation)
+
+    stats = cache.stats()
+    assert stats["entries"] == 10
+    assert stats["memory_bytes"] <= stats["max_bytes"]
+
+
+def test_entries_expire_after_ttl():
+    cache = PredictionCache(ttl_s=0.01)
+    key = cache.key("knn", [1.0])
+    cache.put(key, (1, 0.8), cache.generation)
+    time.sleep(0.02)
+
+    assert cache.get(key) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_invalidate_discards_in_flight_results():
+    """
+    Testa se resultados calculados antes da troca de modelo não entram no cache.
+    """
+    cache = PredictionCache()
+    key = cache.key("knn", [1.0])
+    generation = cache.generation
+    cache.put(key, (1, 0.8), generation)
+
+    cache.invalidate()
+    cache.put(key, (1, 0.8), generation)
+
+    assert cache.get(key) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+@pytest.fixture
+def cached_client(iris_model, app_state):
+    app.state.models = {"knn": iris_model}
+    app.state.cache = PredictionCache(precision=1)
+    yield TestClient(app)
+    app.state.cache = None
+
+
+def test_api_serves_repeated_rows_from_cache(cached_client, iris_model):
+    """
+    Testa se a segunda chamada é atendida pelo cache e se a publicação de um novo
+    modelo o invalida.
+    """
+    first = cached_client.post("/v1/iris/predict", json=ROW).json()
+    second = cached_client.post("/v1/iris/predict", json=ROW).json()
+    batch = cached_client.post(
+        "/v1/iris/predict/batch", json={"instances": [ROW, {**ROW, "sepal_width": 3}]}
+    ).json()
+
+    assert first == second
+    assert batch["predictions"][0]["probability"] == first["probability"]
+    stats = cached_client.get("/v1/iris/cache/stats").json()
+    assert stats["hits"] == 2
+    assert stats["entries"] == 2
+
+    entry = ModelManifestEntry(
+        version="iris_knn_v1_20240102",
+        algorithm="knn",
+        path="iris_knn_v1_20240102.pkl",
+        created_at="2024-01-02T00:00:00",
+        checksum="0" * 64,
+        size_bytes=0,
+    )
+    publish_model(iris_model, entry)
+
+    assert cached_client.get("/v1/iris/cache/stats").json()["entries"] == 0
@@ -0,0 +1,126 @@
+import asyncio
+import glob
+import os
+import time
+
+import httpx
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+from desafio1.api.config import settings
+from desafio1.api.services.prediction_log import PredictionLogger
+from desafio1.api.v1.main import app, start_inference_services, stop_inference_services
+
+ROW = [5.1, 3.5, 1.4, 0.2]
+
+
+def read_log(log_dir):
+    files = sorted(glob.glob(os.path.join(log_dir, "**", "*.parquet"), recursive=True))
+    return files, pq.read_table(files).to_pandas() if files else None
+
+
+def test_logger_writes_daily_partitions(tmp_path):
+    """
+    Testa se predições unitárias e em lote são gravadas na partição do dia, com uma
+    linha por predição.
+    """
+
+    async def scenario():
+        logger = PredictionLogger(str(tmp_path), flush_interval_s=60)
+        await logger.start()
+        await logger.log("single", "knn", "v1", ROW, 0, 0.9)
+        await logger.log(
+            "batch", "nb", "v2", np.array([ROW, ROW]), np.array([0, 1]), np.ones(2)
+        )
+        await logger.stop()
+        return logger.stats()
+
+    stats = asyncio.run(scenario())
+
+    files, table = read_log(tmp_path)
+    day = time.strftime("%Y/%m/%d", time.gmtime())
+    year, month, date = day.split("/")
+    assert len(files) == 1
+    assert f"year={year}/month={month}/day={date}" in files[0]
+    assert stats["logged_rows"] == 3 and stats["files"] == 1
+    assert list(table["endpoint"]) == ["single", "batch", "batch"]
+    assert list(table["model_version"]) == ["v1", "v2", "v2"]
+    assert list(table["prediction"]) == [0, 0, 1]
+    assert table["petal_length"].tolist() == [1.4] * 3
+
+
+def test_records_are_split_by_day(tmp_path):
+    """
+    Testa se registros de dias diferentes vão para partições diferentes.
+    """
+    logger = PredictionLogger(str(tmp_path))
+    day = 24 * 3600
+    records = [
+        (20_000 * day + 10.0, "single", "knn", "v1", 0, ROW, 0, 0.9),
+        (20_001 * day + 10.0, "single", "knn", "v1", 0, ROW, 1, 0.8),
+    ]
+
+    assert logger._write(records) == (2, 2)
+
+    files, _ = read_log(tmp_path)
+    assert [f.split(os.sep)[-2] for f in files] == ["day=04", "day=05"]
+
+
+@pytest.mark.parametrize("policy", ["drop", "block"])
+def test_queue_is_bounded(tmp_path, policy):
+    """
+    Testa se a fila nunca passa de `max_queue_rows`: `drop` descarta os excedentes e
+    `block` aguarda a escrita liberar espaço, sem perder registros.
+    """
+
+    async def scenario():
+        logger = PredictionLogger(
+            str(tmp_path), max_queue_rows=10, flush_interval_s=60, policy=policy
+        )
+        await logger.start()
+        peak = 0
+        for i in range(50):
+            await logger.log("single", "knn", "v1", ROW, i % 3, 0.5)
+            peak = max(peak, logger.stats()["queued_rows"])
+        await logger.stop()
+        return peak, logger.stats()
+
+    peak, stats = asyncio.run(scenario())
+
+    assert peak <= 10
+    assert stats["logged_rows"] + stats["dropped_rows"] == 50
+    if policy == "drop":
+        assert stats["dropped_rows"] == 40
+    else:
+        assert stats["dropped_rows"] == 0
+        assert stats["blocked_requests"] > 0
+
+
+def test_api_predictions_are_flushed_on_shutdown(
+    tmp_path, monkeypatch, iris_model, app_state
+):
+    """
+    Testa se as predições servidas pela API ficam na fila e são gravadas quando os
+    serviços de inferência são encerrados no shutdown.
+    """
+    monkeypatch.setattr(settings, "prediction_log_enabled", True)
+    monkeypatch.setattr(settings, "prediction_log_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "prediction_log_flush_interval_s", 60)
+    app.state.models = {"knn": iris_model}
+
+    async def scenario():
+        await start_inference_services(app)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            row = dict(zip(["sepal_length", "sepal_width", "petal_length"], ROW))
+            row["petal_width"] = ROW[3]
+            await c.post("/v1/iris/predict", json=row)
+            await c.post("/v1/iris/predict/batch", json={"instances": [row, row]})
+        assert read_log(tmp_path)[0] == []
+        await stop_inference_services(app)
+
+    asyncio.run(scenario())
+
+    _, table = read_log(tmp_path)
+    assert sorted(table["endpoint"]) == ["batch", "batch", "single"]
+    assert set(table["prediction"]) == {0}
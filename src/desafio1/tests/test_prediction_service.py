@@ -0,0 +1,22 @@
+import numpy as np
+from desafio1.api.services.prediction_service import predict, predict_with_proba
+from sklearn import datasets
+
+
+def test_predict_with_proba_matches_predict(iris_model):
+    """
+    Testa se a classe derivada do argmax de predict_proba coincide com model.predict.
+    """
+    X, _ = datasets.load_iris(return_X_y=True)
+
+    labels, probabilities = predict_with_proba(iris_model, X)
+
+    np.testing.assert_array_equal(labels, iris_model.predict(X))
+    np.testing.assert_allclose(probabilities, iris_model.predict_proba(X).max(axis=1))
+
+
+def test_predict_single_row(iris_model):
+    """
+    Testa se a predição de uma única linha retorna a classe setosa.
+    """
+    assert predict(iris_model, [5.1, 3.5, 1.4, 0.2]) == 0
@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from desafio1.api.config import DEFAULT_MODEL_PATH, settings
+from desafio1.api.services.model_registry import ModelRegistry
+from desafio1.api.v1.main import app
+from fastapi.testclient import TestClient
+
+
+def test_ready_reflects_startup_state():
+    """
+    Testa se /health responde sempre e /ready só após o modelo ser publicado.
+    """
+    client = TestClient(app)
+
+    app.state.ready = False
+    assert client.get("/health").status_code == 200
+    assert client.get("/ready").status_code == 503
+
+    app.state.ready = True
+    try:
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+    finally:
+        app.state.ready = False
+
+
+def test_startup_serves_all_families_from_default_path(app_state, monkeypatch):
+    """
+    Testa se, com o caminho padrão dos modelos, o startup carrega as famílias
+    versionadas e o ensemble, e se cada uma é roteável por `?model=`.
+    """
+    monkeypatch.chdir(Path(__file__).resolve().parents[3])
+    monkeypatch.setattr(settings, "model_path", DEFAULT_MODEL_PATH)
+    monkeypatch.setattr(settings, "serve_models", [])
+    monkeypatch.setattr(settings, "model_watch_interval_s", 0)
+    monkeypatch.setattr(settings, "prediction_log_enabled", False)
+    row = {
+        "sepal_length": 5.1,
+        "sepal_width": 3.5,
+        "petal_length": 1.4,
+        "petal_width": 0.2,
+    }
+
+    with TestClient(app) as client:
+        models = client.get("/v1/iris/models").json()["models"]
+        statuses = {
+            name: client.post(f"/v1/iris/predict?model={name}", json=row).status_code
+            for name in models
+        }
+
+    assert sorted(models) == ["dt", "ensemble", "knn", "lr"]
+    assert set(statuses.values()) == {200}
+
+
+def test_registry_filters_served_algorithms(tmp_path):
+    """
+    Testa se o registry ignora famílias fora de IRIS_SERVE_MODELS.
+    """
+    for version in ("iris_knn_v1_20240101", "iris_dt_v1_20240101"):
+        (tmp_path / f"{version}.pkl").write_bytes(b"")
+
+    registry = ModelRegistry(
+        str(tmp_path / "iris_*_v1_*.pkl"),
+        loader=lambda path: None,
+        on_swap=lambda model, entry: None,
+        algorithms=["knn"],
+    )
+
+    assert [e.algorithm for e in registry.scan()] == ["knn"]
+
+
+def test_api_import_skips_heavy_modules():
+    """
+    Testa se importar a API não carrega pandas nem scikit-learn.
+    """
+    code = (
+        "import sys, desafio1.api.v1.main; "
+        "print(sorted(m for m in ('pandas', 'sklearn') if m in sys.modules))"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    assert output.strip() == "[]"
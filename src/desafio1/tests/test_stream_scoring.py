@@ -0,0 +1,179 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+from desafio1.api.config import settings
+from desafio1.api.services.stream_scoring import (
+    ChunkedRowReader,
+    LineTooLongError,
+    score_async_stream,
+    score_stream,
+)
+from desafio1.api.services.prediction_service import predict_with_proba
+from desafio1.api.v1.main import app
+from desafio1.api.v1.routers.iris_router import CLASS_MAPPING
+from fastapi.testclient import TestClient
+
+ROWS = [[5.1, 3.5, 1.4, 0.2], [6.3, 2.8, 5.1, 1.5], [7.2, 3.6, 6.1, 2.5]]
+NAMES = ["sepal_length", "sepal_width", "petal_length", "petal_width"]
+
+
+def ndjson(rows):
+    return "".join(json.dumps(dict(zip(NAMES, r))) + "\n" for r in rows).encode()
+
+
+def test_reader_emits_fixed_size_chunks_across_piece_boundaries():
+    """
+    Testa se as linhas são remontadas corretamente quando os pedaços de bytes cortam
+    linhas ao meio, e se os blocos têm sempre o tamanho configurado.
+    """
+    data = ndjson(ROWS * 5) + b"\n{bad json}\n"
+    reader = ChunkedRowReader("ndjson", chunk_size=4)
+
+    chunks = []
+    for start in range(0, len(data), 7):
+        end = start + 7
+        chunks.extend(reader.feed(data[start:end]))
+    chunks.extend(reader.close())
+
+    assert [len(c) for c in chunks] == [4, 4, 4, 4]
+    rows = [row for chunk in chunks for row in chunk]
+    assert [index for index, _, _ in rows] == list(range(16))
+    assert rows[1][1] == ROWS[1]
+    assert rows[-1][1] is None
+    assert rows[-1][2].startswith("JSON inválido")
+
+
+def test_reader_handles_csv_with_and_without_header():
+    with_header = b"petal_width,petal_length,sepal_width,sepal_length,species\n"
+    with_header += b"0.2,1.4,3.5,5.1,setosa\n1.5,5.1,2.8\n"
+    reader = ChunkedRowReader("csv")
+    (chunk,) = reader.feed(with_header) + reader.close()
+
+    assert chunk[0] == (0, ROWS[0], None)
+    assert "colunas" in chunk[1][2]
+
+    reader = ChunkedRowReader("csv")
+    (chunk,) = reader.feed(b"5.1,3.5,1.4,0.2") + reader.close()
+    assert chunk == [(0, ROWS[0], None)]
+
+
+def test_reader_only_takes_feature_names_as_header():
+    """
+    Testa se uma primeira linha não numérica sem os nomes das características é
+    tratada como linha de dados, e não como cabeçalho.
+    """
+    reader = ChunkedRowReader("csv")
+    (chunk,) = reader.feed(b"a,b,c,d\n5.1,3.5,1.4,0.2\n") + reader.close()
+
+    assert chunk[0][1] is None
+    assert chunk[1] == (1, ROWS[0], None)
+
+
+def test_reader_caps_line_length():
+    """
+    Testa se uma linha sem quebra que passa do limite interrompe a leitura sem
+    perder as linhas anteriores.
+    """
+    reader = ChunkedRowReader("ndjson", chunk_size=2, max_line_bytes=100)
+    data = ndjson(ROWS)
+
+    chunks = reader.feed(data) + reader.feed(b"[" + b"1," * 40)
+    with pytest.raises(LineTooLongError) as error:
+        reader.feed(b"1," * 40)
+    chunks += error.value.chunks + reader.close()
+
+    rows = [row for chunk in chunks for row in chunk]
+    assert [features for _, features, _ in rows] == ROWS
+    assert reader.rows_read == 3
+
+
+def test_score_stream_matches_model(iris_model):
+    """
+    Testa se a avaliação em blocos do arquivo inteiro retorna as mesmas predições do
+    modelo, na ordem da entrada.
+    """
+    rows = np.random.default_rng(0).uniform(0.5, 7.5, size=(50, 4)).round(1)
+    data = ndjson(rows.tolist())
+
+    output = "".join(
+        score_stream([data[:100], data[100:]], iris_model, "ndjson", CLASS_MAPPING, 8)
+    )
+
+    results = [json.loads(line) for line in output.splitlines()]
+    assert [r["index"] for r in results] == list(range(50))
+    assert [r["prediction"] for r in results] == iris_model.predict(rows).tolist()
+
+
+@pytest.fixture
+def client(iris_model, app_state):
+    app.state.models = {"knn": iris_model}
+    return TestClient(app)
+
+
+def test_stream_endpoint_ndjson_and_csv(client, iris_model):
+    expected = iris_model.predict(ROWS).tolist()
+
+    response = client.post(
+        "/v1/iris/predict/stream",
+        content=ndjson(ROWS) + b'{"sepal_length": 1}\n',
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [r.get("prediction") for r in results] == expected + [None]
+    assert "sepal_width" in results[-1]["error"]
+
+    csv_body = ",".join(NAMES) + "\n" + "\n".join(",".join(map(str, r)) for r in ROWS)
+    response = client.post(
+        "/v1/iris/predict/stream",
+        content=csv_body,
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0] == "index,prediction,class_name,probability,error"
+    assert [int(line.split(",")[1]) for line in lines[1:]] == expected
+
+    assert client.post("/v1/iris/predict/stream?format=xml").status_code == 400
+
+
+def test_stream_endpoint_rejects_long_lines(client, monkeypatch):
+    """
+    Testa se uma linha longa antes do envio do primeiro bloco responde 413.
+    """
+    monkeypatch.setattr(settings, "stream_max_line_bytes", 100)
+    long_line = b"[" + b"1," * 100 + b"1]\n"
+
+    response = client.post("/v1/iris/predict/stream", content=ndjson(ROWS) + long_line)
+
+    assert response.status_code == 413
+    assert "bytes" in response.json()["detail"]
+
+
+def test_async_stream_ends_with_error_after_first_chunk(iris_model):
+    """
+    Testa se, com a saída já iniciada, uma linha longa vira a última linha da saída
+    depois das linhas lidas antes dela.
+    """
+
+    async def pieces():
+        yield ndjson(ROWS)
+        yield b"[" + b"1," * 100
+
+    async def infer(data):
+        return predict_with_proba(iris_model, data)
+
+    async def collect():
+        stream = score_async_stream(
+            pieces(), infer, "ndjson", CLASS_MAPPING, 2, max_line_bytes=100
+        )
+        return "".join([text async for text in stream])
+
+    results = [json.loads(line) for line in asyncio.run(collect()).splitlines()]
+
+    predictions = [r.get("prediction") for r in results[:3]]
+    assert predictions == iris_model.predict(ROWS).tolist()
+    assert results[3]["index"] == 3
+    assert "bytes" in results[3]["error"]
@@ -0,0 +1,223 @@
+"""
+Vazão e latência do funil de decisão de crédito contra bureaus simulados.
+
+Sobe os bureaus simulados (`desafio2.funnel.stub_bureaus`) em um uvicorn local,
+gera propostas sintéticas (uma fração `--repeat-rate` de clientes repetidos, que
+podem usar o cache) e, para cada modo e nível de concorrência, mede:
+
+- decisões/s e latência p50/p95/p99 de cada decisão;
+- requisições enviadas aos bureaus por decisão;
+- fração de decisões tomadas em cada etapa do funil.
+
+Modos:
+
+- `concurrent`: bureaus consultados ao mesmo tempo, com cache (padrão do motor);
+- `sequential`: bureaus consultados um a um, com cache;
+- `no_cache`: bureaus consultados ao mesmo tempo, sem cache.
+
+Uso:
+    PYTHONPATH=src python -m desafio2.benchmarks.bench_funnel
+    PYTHONPATH=src python -m desafio2.benchmarks.bench_funnel \\
+        --proposals 5000 --concurrency 1 64 256 --latency-ms scr=30 bvs=50 serasa=80
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import date
+from typing import Any, Dict, List
+
+import httpx
+import numpy as np
+from desafio2.funnel.bureaus import BureauClient
+from desafio2.funnel.engine import FunnelEngine
+from desafio2.funnel.schemas import Proposal
+from desafio2.funnel.stub_bureaus import BUREAUS, DEFAULT_LATENCY_MS
+from desafio2.pipeline.synthetic import make_proposal
+
+MODES = ("concurrent", "sequential", "no_cache")
+DAY = date(2024, 6, 1)
+
+
+def make_proposals(n: int, repeat_rate: float, seed: int = 0) -> List[Proposal]:
+    """
+    Gera propostas sintéticas; uma fração `repeat_rate` reaproveita o CPF de uma
+    proposta anterior.
+
+    Args:
+        n (int): Quantidade de propostas.
+        repeat_rate (float): Fração de clientes repetidos.
+        seed (int): Semente do gerador.
+
+    Returns:
+        List[Proposal]: Propostas na ordem em que chegam ao motor.
+    """
+    rng = random.Random(seed)
+    proposals: List[Proposal] = []
+    for index in range(n):
+        proposal = Proposal.from_raw(make_proposal(rng, DAY, index))
+        if proposals and rng.random() < repeat_rate:
+            earlier = rng.choice(proposals)
+            proposal = proposal.model_copy(update={"document": earlier.document})
+        proposals.append(proposal)
+    return proposals
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_ready(
+    base_url: str, server: subprocess.Popen, timeout_s: float = 30
+) -> None:
+    deadline = time.perf_counter() + timeout_s
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.perf_counter() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError(
+                    "Os bureaus simulados encerraram antes de ficar prontos."
+                )
+            try:
+                if (await client.get("/ready")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise TimeoutError("Os bureaus simulados não ficaram prontos a tempo.")
+
+
+async def bench_mode(
+    base_url: str,
+    proposals: List[Proposal],
+    mode: str,
+    concurrency: int,
+    timeout_s: float,
+) -> Dict[str, Any]:
+    """
+    Avalia as propostas com um motor novo (cache vazio) e resume a execução.
+
+    Args:
+        base_url (str): URL dos bureaus simulados.
+        proposals (List[Proposal]): Propostas avaliadas.
+        mode (str): Um de `MODES`.
+        concurrency (int): Avaliações simultâneas.
+        timeout_s (float): Timeout de cada consulta.
+
+    Returns:
+        Dict[str, Any]: Vazão, latências, requisições por decisão e etapas.
+    """
+    bureaus = [
+        BureauClient(
+            name,
+            f"{base_url}/{name}",
+            timeout_s=timeout_s,
+            cache_ttl_s=0.0 if mode == "no_cache" else 86_400.0,
+            max_connections=concurrency,
+        )
+        for name in BUREAUS
+    ]
+    engine = FunnelEngine(bureaus, concurrent_bureaus=mode != "sequential")
+    async with engine:
+        start = time.perf_counter()
+        decisions = await engine.decide_many(proposals, concurrency=concurrency)
+        seconds = time.perf_counter() - start
+        bureau_stats = engine.stats()["bureaus"].values()
+
+    latencies = np.array([d.elapsed_ms for d in decisions])
+    stages = Counter(d.stage for d in decisions)
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "decisions_per_s": len(decisions) / seconds,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "requests_per_decision": sum(s["requests"] for s in bureau_stats)
+        / len(decisions),
+        "review": sum(d.outcome == "review" for d in decisions) / len(decisions),
+        "stages": {stage: stages[stage] / len(decisions) for stage in stages},
+    }
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    latency_ms = {
+        **DEFAULT_LATENCY_MS,
+        **{
+            name: float(value)
+            for name, value in (item.split("=", 1) for item in args.latency_ms)
+        },
+    }
+    port = free_port()
+    src_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    env = {**os.environ, "PYTHONPATH": os.path.abspath(src_dir)}
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "desafio2.funnel.stub_bureaus",
+            "--port",
+            str(port),
+            "--latency-ms",
+            *(f"{name}={value}" for name, value in latency_ms.items()),
+        ],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    proposals = make_proposals(args.proposals, args.repeat_rate)
+    results = []
+    try:
+        await wait_ready(base_url, server)
+        for mode in args.modes:
+            for concurrency in args.concurrency:
+                results.append(
+                    await bench_mode(
+                        base_url, proposals, mode, concurrency, args.timeout_s
+                    )
+                )
+    finally:
+        server.terminate()
+        server.wait()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--proposals", type=int, default=2_000)
+    parser.add_argument("--repeat-rate", type=float, default=0.3)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64, 256])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument(
+        "--latency-ms",
+        nargs="*",
+        default=[],
+        help="Latência média por bureau (ex.: scr=30 bvs=50 serasa=80).",
+    )
+    parser.add_argument("--timeout-s", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(
+        f"{'modo':>10} {'conc':>5} {'decisões/s':>11} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'req/decisão':>12} {'review':>7}  etapas"
+    )
+    for row in asyncio.run(run(args)):
+        stages = " ".join(
+            f"{stage}={share:.0%}" for stage, share in sorted(row["stages"].items())
+        )
+        print(
+            f"{row['mode']:>10} {row['concurrency']:>5} "
+            f"{row['decisions_per_s']:>11.0f} {row['p50_ms']:>8.1f} "
+            f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} "
+            f"{row['requests_per_decision']:>12.2f} {row['review']:>7.1%}  {stages}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Vazão do pipeline Raw -> Bronze -> Silver em volumes sintéticos de propostas.
+
+Para cada volume diário, gera a zona Raw uma vez (fora da medição) e, para cada
+quantidade de processos, copia a Raw para um bucket novo e mede:
+
+- duração total da execução e vazão em propostas/s e MB/s de Raw (gzip);
+- vazão de cada etapa por processo (soma das durações das tarefas do pool);
+- duração de uma segunda execução, que não tem partições pendentes.
+
+Uso:
+    PYTHONPATH=src python -m desafio2.benchmarks.bench_pipeline
+    PYTHONPATH=src python -m desafio2.benchmarks.bench_pipeline \\
+        --proposals 10000 100000 --days 2 --files-per-day 8 --workers 1 4
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from desafio2.pipeline.runner import run_pipeline
+from desafio2.pipeline.synthetic import generate_raw
+
+START = date(2024, 6, 1)
+
+
+def run(
+    volumes: List[int],
+    days: int,
+    files_per_day: int,
+    workers: List[int],
+    chunk_records: int,
+) -> List[Dict[str, Any]]:
+    """
+    Mede o pipeline para cada volume diário e quantidade de processos.
+
+    Args:
+        volumes (List[int]): Propostas por dia.
+        days (int): Dias (partições) gerados.
+        files_per_day (int): Arquivos Raw por dia.
+        workers (List[int]): Quantidades de processos do pool.
+        chunk_records (int): Propostas por bloco na Bronze.
+
+    Returns:
+        List[Dict[str, Any]]: Uma linha por volume e quantidade de processos.
+    """
+    results = []
+    until = START + timedelta(days=days - 1)
+    for proposals in volumes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = os.path.join(tmp_dir, "source")
+            raw = generate_raw(source, START, days, proposals, files_per_day)
+            for n_workers in workers:
+                bucket = os.path.join(tmp_dir, f"bucket-{n_workers}")
+                shutil.copytree(source, bucket)
+                report = run_pipeline(
+                    bucket,
+                    until=until,
+                    max_workers=n_workers,
+                    chunk_records=chunk_records,
+                )
+                start = time.perf_counter()
+                run_pipeline(bucket, until=until, max_workers=n_workers)
+                noop_s = time.perf_counter() - start
+
+                bronze = report["bronze"].values()
+                silver = report["silver"].values()
+                records = sum(m["records"] for m in bronze)
+                silver_rows = sum(m["rows_in"] for m in silver)
+                results.append(
+                    {
+                        "proposals": proposals,
+                        "workers": n_workers,
+                        "seconds": report["seconds"],
+                        "proposals_per_s": records / report["seconds"],
+                        "raw_mb_per_s": raw["bytes"] / 1e6 / report["seconds"],
+                        "bronze_per_proc": records / sum(m["seconds"] for m in bronze),
+                        "silver_rows_per_proc": silver_rows
+                        / sum(m["seconds"] for m in silver),
+                        "noop_s": noop_s,
+                    }
+                )
+                shutil.rmtree(bucket)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--proposals", type=int, nargs="+", default=[10_000, 100_000, 500_000]
+    )
+    parser.add_argument("--days", type=int, default=2)
+    parser.add_argument("--files-per-day", type=int, default=8)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=sorted({1, os.cpu_count() or 1})
+    )
+    parser.add_argument("--chunk-records", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'propostas/dia':>13} {'procs':>5} {'total s':>8} {'propostas/s':>12} "
+        f"{'MB/s raw':>9} {'bronze/s/proc':>14} {'silver linhas/s/proc':>21} "
+        f"{'no-op s':>8}"
+    )
+    for row in run(
+        args.proposals, args.days, args.files_per_day, args.workers, args.chunk_records
+    ):
+        print(
+            f"{row['proposals']:>13} {row['workers']:>5} {row['seconds']:>8.2f} "
+            f"{row['proposals_per_s']:>12.0f} {row['raw_mb_per_s']:>9.2f} "
+            f"{row['bronze_per_proc']:>14.0f} {row['silver_rows_per_proc']:>21.0f} "
+            f"{row['noop_s']:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
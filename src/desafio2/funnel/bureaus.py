@@ -0,0 +1,186 @@
+"""
+Clientes das consultas online aos bureaus (SCR, BVS e Serasa).
+
+Cada bureau tem um `BureauClient` com:
+
+- um `httpx.AsyncClient` próprio, reaproveitado por todas as decisões: as conexões
+  HTTP ficam abertas (keep-alive) em um pool limitado a `max_connections`, sem um
+  handshake TCP por consulta;
+- timeout por consulta, aplicado também a quem aguarda uma consulta já em andamento;
+- cache LRU com TTL do resultado por CPF, já que a resposta de um bureau vale por
+  um período (ex.: um dia) e o mesmo cliente costuma fazer várias propostas;
+- consultas concorrentes ao mesmo CPF agrupadas em uma só requisição.
+
+O resultado de uma consulta em andamento não é descartado quando a decisão que a
+pediu termina antes (ex.: outro bureau já reprovou a proposta): a requisição já foi
+enviada, e a resposta abastece o cache.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+BureauResult = Dict[str, Any]
+# Campos da resposta que o funil avalia e o tipo de cada um.
+INT_FIELDS = ("score", "negative_records")
+FIELD_TYPES = {"overdue": bool, "cpf_status": str}
+
+
+class BureauClient:
+    """
+    Cliente de um bureau de crédito, com pool de conexões, timeout e cache.
+
+    Args:
+        provider (str): Nome do bureau (`scr`, `bvs`, `serasa`).
+        base_url (str): URL base; a consulta é `GET <base_url>/consulta/<cpf>`.
+        timeout_s (float): Tempo máximo de uma consulta, em segundos.
+        cache_ttl_s (float): Validade do resultado em cache; 0 desliga o cache.
+        cache_max_entries (int): CPFs mantidos no cache (LRU).
+        max_connections (int): Conexões simultâneas do pool.
+        transport (httpx.AsyncBaseTransport, optional): Transporte do httpx (ex.:
+            `httpx.ASGITransport` nos testes).
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        base_url: str,
+        timeout_s: float = 0.5,
+        cache_ttl_s: float = 86_400.0,
+        cache_max_entries: int = 100_000,
+        max_connections: int = 100,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.provider = provider
+        self.timeout_s = timeout_s
+        self.cache_ttl_s = cache_ttl_s
+        self.cache_max_entries = cache_max_entries
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout_s,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=transport,
+        )
+        self._cache: "OrderedDict[str, Tuple[BureauResult, float]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._counters = {
+            "requests": 0,
+            "cache_hits": 0,
+            "coalesced": 0,
+            "errors": 0,
+            "timeouts": 0,
+        }
+
+    async def aclose(self) -> None:
+        """Fecha as conexões do pool."""
+        await self.client.aclose()
+
+    async def check(self, document: str) -> BureauResult:
+        """
+        Consulta um CPF, usando o cache e as consultas em andamento.
+
+        Args:
+            document (str): CPF só com dígitos.
+
+        Returns:
+            BureauResult: Resposta do bureau.
+
+        Raises:
+            asyncio.TimeoutError: Se a consulta passar de `timeout_s`.
+            httpx.HTTPError: Se a consulta falhar.
+            ValueError: Se a resposta não for um objeto JSON com os campos esperados.
+        """
+        cached = self._cache_get(document)
+        if cached is not None:
+            self._counters["cache_hits"] += 1
+            return cached
+        task = self._in_flight.get(document)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(document))
+            self._in_flight[document] = task
+            task.add_done_callback(lambda t: self._done(document, t))
+        else:
+            self._counters["coalesced"] += 1
+        try:
+            # shield: o timeout (ou o cancelamento) de quem aguarda não cancela a
+            # requisição compartilhada.
+            return await asyncio.wait_for(asyncio.shield(task), self.timeout_s)
+        except asyncio.TimeoutError:
+            self._counters["timeouts"] += 1
+            raise
+
+    async def _fetch(self, document: str) -> BureauResult:
+        self._counters["requests"] += 1
+        response = await self.client.get(f"/consulta/{document}")
+        response.raise_for_status()
+        result = self._validate(response.json())
+        self._cache_put(document, result)
+        return result
+
+    def _validate(self, result: Any) -> BureauResult:
+        # A resposta só entra no cache depois de validada: um campo com tipo errado
+        # quebraria as regras do funil em todas as consultas seguintes ao mesmo CPF.
+        if not isinstance(result, dict):
+            raise ValueError(
+                f"Resposta inválida do bureau {self.provider}: {type(result).__name__}."
+            )
+        result = dict(result)
+        for field in INT_FIELDS:
+            value = result.get(field)
+            if value is None:
+                # Ausente e nulo são equivalentes: o funil usa o valor padrão.
+                result.pop(field, None)
+            elif isinstance(value, float) and value.is_integer():
+                result[field] = int(value)
+            elif isinstance(value, bool) or not isinstance(value, int):
+                raise ValueError(
+                    f"Resposta inválida do bureau {self.provider}: {field}={value!r}."
+                )
+        for field, expected in FIELD_TYPES.items():
+            if field in result and not isinstance(result[field], expected):
+                raise ValueError(
+                    f"Resposta inválida do bureau {self.provider}: "
+                    f"{field}={result[field]!r}."
+                )
+        return result
+
+    def _done(self, document: str, task: asyncio.Task) -> None:
+        self._in_flight.pop(document, None)
+        # Marca a exceção como lida mesmo se ninguém mais aguardar a tarefa.
+        if not task.cancelled() and task.exception() is not None:
+            self._counters["errors"] += 1
+
+    def _cache_get(self, document: str) -> Optional[BureauResult]:
+        entry = self._cache.get(document)
+        if entry is None:
+            return None
+        result, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._cache[document]
+            return None
+        self._cache.move_to_end(document)
+        return result
+
+    def _cache_put(self, document: str, result: BureauResult) -> None:
+        if self.cache_ttl_s <= 0:
+            return
+        self._cache[document] = (result, time.monotonic() + self.cache_ttl_s)
+        self._cache.move_to_end(document)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna os contadores do cliente.
+
+        Returns:
+            Dict[str, Any]: Requisições enviadas, acertos de cache, consultas
+                agrupadas, erros, timeouts e CPFs em cache.
+        """
+        return {**self._counters, "cached": len(self._cache)}
@@ -0,0 +1,390 @@
+"""
+Motor do funil de decisão de crédito do desafio 2.
+
+A arquitetura descreve o funil como uma árvore de decisão: SCR online, listas de
+bloqueio e liberação, filtros rígidos (menor de idade, maior que 74 anos, score
+mínimo...), consultas online à BVS e à Serasa e, por fim, o modelo interno de curto,
+médio ou longo prazo. O motor avalia as etapas da mais barata para a mais cara e
+encerra a avaliação na primeira reprovação:
+
+1. `lists`: CPF na lista de bloqueio reprova sem nenhuma consulta externa. CPFs da
+   lista de liberação (ex.: clientes com histórico interno) dispensam os bureaus.
+2. `hard_filters`: idade e comprometimento de renda, calculados com os dados da
+   própria proposta.
+3. `bureaus`: SCR, BVS e Serasa são consultados ao mesmo tempo (asyncio), e cada
+   resposta é avaliada assim que chega (score mínimo, negativações, situação do CPF);
+   a primeira reprovação encerra a etapa sem esperar os demais. Se um bureau não
+   responder a tempo e nenhum outro reprovar, a proposta vai para análise manual
+   (`review`). O SCR, que no diagrama é a primeira etapa, é consultado aqui: por ser
+   remoto, fica depois das regras locais.
+4. `model`: o modelo interno do segmento de prazo estima a probabilidade de
+   inadimplência, comparada com o limite do segmento na política.
+"""
+
+import asyncio
+import math
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import httpx
+from desafio2.funnel.bureaus import BureauClient, BureauResult
+from desafio2.funnel.schemas import Decision, FunnelPolicy, Proposal
+
+# Prazo máximo, em meses, dos segmentos avaliados pelo modelo interno.
+SHORT_TERM_MAX_MONTHS = 12
+MEDIUM_TERM_MAX_MONTHS = 36
+
+
+def term_segment(term_months: int) -> str:
+    """Segmento de prazo (`curto_prazo`, `medio_prazo` ou `longo_prazo`)."""
+    if term_months <= SHORT_TERM_MAX_MONTHS:
+        return "curto_prazo"
+    if term_months <= MEDIUM_TERM_MAX_MONTHS:
+        return "medio_prazo"
+    return "longo_prazo"
+
+
+class AccessLists:
+    """
+    Listas de bloqueio e de liberação de CPFs.
+
+    Args:
+        blocked (Set[str], optional): CPFs reprovados sem consulta.
+        allowed (Set[str], optional): CPFs que dispensam as consultas aos bureaus.
+    """
+
+    def __init__(
+        self, blocked: Optional[Set[str]] = None, allowed: Optional[Set[str]] = None
+    ) -> None:
+        self.blocked = {re.sub(r"\D", "", d) for d in blocked or ()}
+        self.allowed = {re.sub(r"\D", "", d) for d in allowed or ()}
+
+    @classmethod
+    def from_files(
+        cls, blocked_path: Optional[str] = None, allowed_path: Optional[str] = None
+    ) -> "AccessLists":
+        """
+        Carrega as listas de arquivos texto com um CPF por linha.
+
+        Args:
+            blocked_path (str, optional): Arquivo da lista de bloqueio.
+            allowed_path (str, optional): Arquivo da lista de liberação.
+
+        Returns:
+            AccessLists: Listas carregadas.
+        """
+
+        def read(path: Optional[str]) -> Set[str]:
+            if not path:
+                return set()
+            with open(path, encoding="utf-8") as f:
+                return {line.strip() for line in f if line.strip()}
+
+        return cls(read(blocked_path), read(allowed_path))
+
+
+class ScorecardModel:
+    """
+    Modelo interno de probabilidade de inadimplência: um scorecard logístico por
+    segmento de prazo.
+
+    É o ponto de extensão do modelo treinado: qualquer objeto com
+    `default_probability(segment, features)` pode ser passado ao motor.
+
+    Args:
+        weights (Dict[str, Dict[str, float]], optional): Intercepto e pesos de cada
+            atributo, por segmento.
+    """
+
+    DEFAULT_WEIGHTS: Dict[str, Dict[str, float]] = {
+        "curto_prazo": {"intercept": -3.0, "score": -0.55, "commitment": 3.0},
+        "medio_prazo": {"intercept": -3.3, "score": -0.65, "commitment": 3.5},
+        "longo_prazo": {"intercept": -3.7, "score": -0.75, "commitment": 4.0},
+    }
+    # Atributos padronizados: (score - 500) / 100 e comprometimento de renda. Sem
+    # consulta aos bureaus (lista de liberação), o score é tratado como o centro.
+    SCORE_CENTER = 500.0
+    SCORE_SCALE = 100.0
+
+    def __init__(self, weights: Optional[Dict[str, Dict[str, float]]] = None) -> None:
+        self.weights = weights or self.DEFAULT_WEIGHTS
+
+    def default_probability(self, segment: str, features: Dict[str, Any]) -> float:
+        """
+        Estima a probabilidade de inadimplência de uma proposta.
+
+        Args:
+            segment (str): Segmento de prazo.
+            features (Dict[str, Any]): `score` (menor score entre os bureaus, ou
+                None) e `commitment` (fração da renda comprometida).
+
+        Returns:
+            float: Probabilidade entre 0 e 1.
+        """
+        weights = self.weights[segment]
+        score = features.get("score")
+        score_z = (
+            0.0 if score is None else (score - self.SCORE_CENTER) / self.SCORE_SCALE
+        )
+        z = (
+            weights["intercept"]
+            + weights["score"] * score_z
+            + weights["commitment"] * features["commitment"]
+        )
+        return 1.0 / (1.0 + math.exp(-z))
+
+
+def bureau_rejection(
+    provider: str, result: BureauResult, policy: FunnelPolicy
+) -> Optional[str]:
+    """
+    Avalia a resposta de um bureau.
+
+    Args:
+        provider (str): Bureau consultado.
+        result (BureauResult): Resposta (`score`, `negative_records` e, conforme o
+            bureau, `overdue` ou `cpf_status`).
+        policy (FunnelPolicy): Limites da política.
+
+    Returns:
+        Optional[str]: Motivo da reprovação, ou None se a resposta for aceita.
+    """
+    if result.get("cpf_status", "regular") != "regular":
+        return f"{provider}_cpf_{result['cpf_status']}"
+    if result.get("overdue"):
+        return f"{provider}_overdue"
+    if result.get("negative_records", 0) > policy.max_negative_records:
+        return f"{provider}_negative_records"
+    if result.get("score") is not None and result["score"] < policy.min_score:
+        return f"{provider}_low_score"
+    return None
+
+
+class FunnelEngine:
+    """
+    Avalia propostas pelo funil, da etapa mais barata para a mais cara.
+
+    Args:
+        bureaus (Sequence[BureauClient]): Clientes dos bureaus consultados online.
+        policy (FunnelPolicy, optional): Limites das regras.
+        lists (AccessLists, optional): Listas de bloqueio e liberação.
+        model (Any, optional): Modelo interno (padrão: `ScorecardModel`).
+        concurrent_bureaus (bool): Consulta os bureaus ao mesmo tempo; com False,
+            em sequência (usado para comparação no benchmark).
+    """
+
+    def __init__(
+        self,
+        bureaus: Sequence[BureauClient],
+        policy: Optional[FunnelPolicy] = None,
+        lists: Optional[AccessLists] = None,
+        model: Optional[Any] = None,
+        concurrent_bureaus: bool = True,
+    ) -> None:
+        self.bureaus = list(bureaus)
+        self.policy = policy or FunnelPolicy()
+        self.lists = lists or AccessLists()
+        self.model = model or ScorecardModel()
+        self.concurrent_bureaus = concurrent_bureaus
+        self._outcomes: Counter = Counter()
+        self._reasons: Counter = Counter()
+
+    async def __aenter__(self) -> "FunnelEngine":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Fecha os pools de conexão dos bureaus."""
+        await asyncio.gather(*(bureau.aclose() for bureau in self.bureaus))
+
+    async def decide(self, proposal: Proposal) -> Decision:
+        """
+        Avalia uma proposta.
+
+        Args:
+            proposal (Proposal): Proposta a avaliar.
+
+        Returns:
+            Decision: Resultado, etapa em que foi decidido e respostas dos bureaus.
+        """
+        start = time.perf_counter()
+        decision = await self._evaluate(proposal)
+        decision.elapsed_ms = (time.perf_counter() - start) * 1e3
+        self._outcomes[decision.outcome] += 1
+        if decision.reason:
+            self._reasons[decision.reason] += 1
+        return decision
+
+    async def decide_many(
+        self, proposals: Sequence[Proposal], concurrency: int = 100
+    ) -> List[Decision]:
+        """
+        Avalia várias propostas, com até `concurrency` avaliações ao mesmo tempo.
+
+        Uma falha inesperada na avaliação de uma proposta não interrompe as demais:
+        ela vai para análise manual (`review`, motivo `evaluation_error`).
+
+        Args:
+            proposals (Sequence[Proposal]): Propostas a avaliar.
+            concurrency (int): Avaliações simultâneas.
+
+        Returns:
+            List[Decision]: Decisões, na ordem das propostas.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(proposal: Proposal) -> Decision:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    return await self.decide(proposal)
+                except Exception:
+                    decision = Decision(
+                        proposal_id=proposal.proposal_id,
+                        outcome="review",
+                        stage="error",
+                        reason="evaluation_error",
+                        elapsed_ms=(time.perf_counter() - start) * 1e3,
+                    )
+                    self._outcomes[decision.outcome] += 1
+                    self._reasons[decision.reason] += 1
+                    return decision
+
+        return list(await asyncio.gather(*(bounded(p) for p in proposals)))
+
+    async def _evaluate(self, proposal: Proposal) -> Decision:
+        policy = self.policy
+
+        def decided(outcome: str, stage: str, **fields: Any) -> Decision:
+            return Decision(
+                proposal_id=proposal.proposal_id, outcome=outcome, stage=stage, **fields
+            )
+
+        if proposal.document in self.lists.blocked:
+            return decided("rejected", "lists", reason="blocked")
+
+        age = proposal.age()
+        if age < policy.min_age:
+            return decided("rejected", "hard_filters", reason="underage")
+        if age > policy.max_age:
+            return decided("rejected", "hard_filters", reason="over_max_age")
+        installment = proposal.amount / max(proposal.term_months, 1)
+        commitment = (
+            installment / proposal.monthly_income
+            if proposal.monthly_income > 0
+            else math.inf
+        )
+        if commitment > policy.max_income_commitment:
+            return decided("rejected", "hard_filters", reason="income_commitment")
+
+        results: Dict[str, BureauResult] = {}
+        if proposal.document not in self.lists.allowed:
+            rejection, unavailable = await self._check_bureaus(
+                proposal.document, results
+            )
+            if rejection:
+                return decided(
+                    "rejected", "bureaus", reason=rejection, bureau_results=results
+                )
+            if unavailable:
+                return decided(
+                    "review",
+                    "bureaus",
+                    reason="unavailable_" + "_".join(sorted(unavailable)),
+                    bureau_results=results,
+                )
+
+        segment = term_segment(proposal.term_months)
+        scores = [r["score"] for r in results.values() if r.get("score") is not None]
+        probability = self.model.default_probability(
+            segment,
+            {"score": min(scores) if scores else None, "commitment": commitment},
+        )
+        approved = probability <= policy.max_default_probability[segment]
+        return decided(
+            "approved" if approved else "rejected",
+            "model",
+            reason=None if approved else f"{segment}_default_risk",
+            segment=segment,
+            default_probability=probability,
+            bureau_results=results,
+        )
+
+    async def _check_bureaus(
+        self, document: str, results: Dict[str, BureauResult]
+    ) -> Tuple[Optional[str], List[str]]:
+        """
+        Consulta os bureaus e avalia cada resposta assim que ela chega.
+
+        Returns:
+            Tuple[Optional[str], List[str]]: Motivo da primeira reprovação (ou None)
+                e bureaus indisponíveis.
+        """
+        unavailable: List[str] = []
+        if not self.concurrent_bureaus:
+            for bureau in self.bureaus:
+                try:
+                    results[bureau.provider] = await bureau.check(document)
+                except (asyncio.TimeoutError, httpx.HTTPError, ValueError):
+                    unavailable.append(bureau.provider)
+                    continue
+                rejection = bureau_rejection(
+                    bureau.provider, results[bureau.provider], self.policy
+                )
+                if rejection:
+                    return rejection, unavailable
+            return None, unavailable
+
+        tasks = {
+            asyncio.ensure_future(bureau.check(document)): bureau.provider
+            for bureau in self.bureaus
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    provider = tasks[task]
+                    try:
+                        results[provider] = task.result()
+                    except (asyncio.TimeoutError, httpx.HTTPError, ValueError):
+                        unavailable.append(provider)
+                        continue
+                    rejection = bureau_rejection(
+                        provider, results[provider], self.policy
+                    )
+                    if rejection:
+                        return rejection, unavailable
+        finally:
+            # Curto-circuito: deixa de aguardar os demais bureaus. As requisições já
+            # enviadas terminam em segundo plano e abastecem o cache (ver
+            # BureauClient.check).
+            for task in pending:
+                task.cancel()
+            # Respostas que chegaram junto com a reprovação não são avaliadas; lê
+            # a exceção para o asyncio não registrar "Task exception was never
+            # retrieved".
+            for task in tasks:
+                if task.done() and not task.cancelled():
+                    task.exception()
+        return None, unavailable
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna os contadores do motor e dos clientes dos bureaus.
+
+        Returns:
+            Dict[str, Any]: Decisões por resultado, ocorrências de cada motivo e os
+                contadores de cada bureau.
+        """
+        return {
+            "outcomes": dict(self._outcomes),
+            "reasons": dict(self._reasons),
+            "bureaus": {bureau.provider: bureau.stats() for bureau in self.bureaus},
+        }
@@ -0,0 +1,131 @@
+"""
+Schemas do funil de decisão de crédito: proposta de entrada, política e decisão.
+"""
+
+import re
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, field_validator
+
+# Resultados possíveis de uma decisão. `review` encaminha a proposta para análise
+# manual quando uma consulta obrigatória não pôde ser feita.
+OUTCOMES = ("approved", "rejected", "review")
+# Etapas do funil, na ordem de avaliação.
+FUNNEL_STAGES = ("lists", "hard_filters", "bureaus", "model")
+
+
+class Proposal(BaseModel):
+    """Proposta avaliada pelo funil.
+
+    Attributes:
+        proposal_id (str): Identificador da proposta.
+        document (str): CPF do cliente (pontuação é removida).
+        birth_date (date): Data de nascimento.
+        monthly_income (float): Renda mensal declarada.
+        amount (float): Valor solicitado.
+        term_months (int): Prazo em meses.
+        product (str, optional): Produto (`curto_prazo`, `medio_prazo`, `longo_prazo`).
+        created_at (datetime, optional): Criação da proposta; a idade é calculada
+            nessa data (ou na data da decisão, quando ausente).
+    """
+
+    proposal_id: str
+    document: str
+    birth_date: date
+    monthly_income: float
+    amount: float
+    term_months: int
+    product: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    @field_validator("document")
+    @classmethod
+    def only_digits(cls, value: str) -> str:
+        return re.sub(r"\D", "", value)
+
+    @classmethod
+    def from_raw(cls, record: Dict[str, Any]) -> "Proposal":
+        """
+        Monta a proposta a partir do JSON aninhado recebido na zona Raw.
+
+        Args:
+            record (Dict[str, Any]): Proposta com `customer` e `loan`.
+
+        Returns:
+            Proposal: Proposta validada.
+        """
+        customer = record.get("customer") or {}
+        loan = record.get("loan") or {}
+        return cls(
+            proposal_id=record["proposal_id"],
+            document=customer["document"],
+            birth_date=customer["birth_date"],
+            monthly_income=customer["monthly_income"],
+            amount=loan["amount"],
+            term_months=loan["term_months"],
+            product=loan.get("product"),
+            created_at=record.get("created_at"),
+        )
+
+    def age(self, on: Optional[date] = None) -> int:
+        """Idade em anos completos na data `on` (padrão: criação da proposta ou hoje)."""
+        if on is None:
+            on = self.created_at.date() if self.created_at else date.today()
+        birthday_ahead = (on.month, on.day) < (
+            self.birth_date.month,
+            self.birth_date.day,
+        )
+        return on.year - self.birth_date.year - int(birthday_ahead)
+
+
+class FunnelPolicy(BaseModel):
+    """Parâmetros das regras do funil.
+
+    Attributes:
+        min_age (int): Idade mínima (filtro rígido).
+        max_age (int): Idade máxima (filtro rígido).
+        max_income_commitment (float): Fração máxima da renda comprometida com a
+            parcela (valor / prazo).
+        min_score (int): Score mínimo em cada bureau consultado.
+        max_negative_records (int): Negativações aceitas em cada bureau.
+        max_default_probability (Dict[str, float]): Probabilidade máxima de
+            inadimplência aceita pelo modelo interno, por segmento de prazo.
+    """
+
+    min_age: int = 18
+    max_age: int = 74
+    max_income_commitment: float = 0.35
+    min_score: int = 300
+    max_negative_records: int = 0
+    max_default_probability: Dict[str, float] = {
+        "curto_prazo": 0.15,
+        "medio_prazo": 0.12,
+        "longo_prazo": 0.08,
+    }
+
+
+class Decision(BaseModel):
+    """Resultado da avaliação de uma proposta.
+
+    Attributes:
+        proposal_id (str): Identificador da proposta.
+        outcome (str): `approved`, `rejected` ou `review`.
+        stage (str): Etapa do funil em que a decisão foi tomada (`error` quando a
+            avaliação falhou em `FunnelEngine.decide_many`).
+        reason (str, optional): Regra que reprovou ou encaminhou a proposta.
+        segment (str, optional): Segmento de prazo avaliado pelo modelo interno.
+        default_probability (float, optional): Probabilidade de inadimplência.
+        bureau_results (Dict[str, Dict[str, Any]]): Respostas dos bureaus recebidas
+            até a decisão.
+        elapsed_ms (float): Duração da avaliação, em milissegundos.
+    """
+
+    proposal_id: str
+    outcome: str
+    stage: str
+    reason: Optional[str] = None
+    segment: Optional[str] = None
+    default_probability: Optional[float] = None
+    bureau_results: Dict[str, Dict[str, Any]] = {}
+    elapsed_ms: float = 0.0
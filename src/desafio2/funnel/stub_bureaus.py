@@ -0,0 +1,140 @@
+"""
+Servidor local que simula as consultas online dos bureaus (SCR, BVS e Serasa).
+
+Substitui os bureaus nos testes (via `httpx.ASGITransport`, sem rede) e no
+benchmark (em um uvicorn local). Cada bureau responde em `/<bureau>/consulta/<cpf>`
+depois de uma latência configurável, com uma resposta determinística derivada do
+CPF (o mesmo CPF recebe sempre a mesma resposta), no formato de cada bureau:
+
+- `scr`: `score`, `negative_records` e `overdue` (operações em atraso);
+- `bvs`: `score`, `negative_records` e `cpf_status`;
+- `serasa`: `score` e `negative_records`.
+
+`/stats` retorna as consultas recebidas por bureau.
+
+Uso:
+    PYTHONPATH=src python -m desafio2.funnel.stub_bureaus --port 8100 \\
+        --latency-ms scr=30 bvs=50 serasa=80
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import FastAPI, HTTPException
+
+BUREAUS = ("scr", "bvs", "serasa")
+DEFAULT_LATENCY_MS = {"scr": 30.0, "bvs": 50.0, "serasa": 80.0}
+
+
+def stub_response(provider: str, document: str) -> Dict[str, Any]:
+    """
+    Resposta determinística de um bureau para um CPF.
+
+    Cerca de 12% dos CPFs têm score abaixo de 300, 5% têm negativações, 4% têm
+    operações em atraso no SCR e 2% têm o CPF irregular na BVS.
+
+    Args:
+        provider (str): Bureau consultado.
+        document (str): CPF.
+
+    Returns:
+        Dict[str, Any]: Resposta no formato do bureau.
+    """
+    digest = int(hashlib.sha256(f"{provider}:{document}".encode()).hexdigest(), 16)
+    response: Dict[str, Any] = {
+        "provider": provider,
+        "document": document,
+        "score": 200 + (digest >> 16) % 800,
+        "negative_records": 1 if digest % 20 == 0 else 0,
+    }
+    if provider == "scr":
+        response["overdue"] = (digest >> 8) % 25 == 0
+    elif provider == "bvs":
+        response["cpf_status"] = "irregular" if (digest >> 8) % 50 == 0 else "regular"
+    return response
+
+
+def create_stub_app(
+    latency_ms: Optional[Dict[str, float]] = None,
+    jitter: float = 0.2,
+    failure_rate: float = 0.0,
+    overrides: Optional[Dict[Tuple[str, str], Dict[str, Any]]] = None,
+    seed: int = 0,
+) -> FastAPI:
+    """
+    Cria o app dos bureaus simulados.
+
+    Args:
+        latency_ms (Dict[str, float], optional): Latência média de cada bureau.
+        jitter (float): Variação relativa da latência (uniforme, ± `jitter`).
+        failure_rate (float): Fração das consultas que respondem 503.
+        overrides (Dict[Tuple[str, str], Dict[str, Any]], optional): Respostas
+            fixas por (bureau, CPF), mescladas à resposta padrão.
+        seed (int): Semente da latência e das falhas.
+
+    Returns:
+        FastAPI: App com as rotas dos bureaus e `/stats`.
+    """
+    latency_ms = {**DEFAULT_LATENCY_MS, **(latency_ms or {})}
+    overrides = overrides or {}
+    rng = random.Random(seed)
+    requests: Counter = Counter()
+    app = FastAPI(title="Bureaus simulados")
+
+    @app.get("/ready")
+    async def ready() -> Dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/stats")
+    async def stats() -> Dict[str, int]:
+        return dict(requests)
+
+    @app.get("/{provider}/consulta/{document}")
+    async def consulta(provider: str, document: str) -> Dict[str, Any]:
+        if provider not in BUREAUS:
+            raise HTTPException(status_code=404, detail="Bureau desconhecido")
+        requests[provider] += 1
+        delay = latency_ms[provider] * rng.uniform(1 - jitter, 1 + jitter)
+        await asyncio.sleep(delay / 1e3)
+        if rng.random() < failure_rate:
+            raise HTTPException(status_code=503, detail="Bureau indisponível")
+        return {
+            **stub_response(provider, document),
+            **overrides.get((provider, document), {}),
+        }
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Sobe os bureaus simulados.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument(
+        "--latency-ms",
+        nargs="*",
+        default=[],
+        help="Latência média por bureau (ex.: scr=30 bvs=50 serasa=80).",
+    )
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    latency_ms = {
+        name: float(value)
+        for name, value in (item.split("=", 1) for item in args.latency_ms)
+    }
+    app = create_stub_app(latency_ms, args.jitter, args.failure_rate)
+    uvicorn.run(
+        app, host=args.host, port=args.port, log_level="warning", access_log=False
+    )
+
+
+if __name__ == "__main__":
+    main()
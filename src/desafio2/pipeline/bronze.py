@@ -0,0 +1,224 @@
+"""
+Zona Bronze: explode das propostas brutas em Parquet.
+
+Cada proposta chega na zona Raw como uma linha JSON (NDJSON, opcionalmente gzip),
+com todas as informações aninhadas:
+
+    {"proposal_id": "...", "created_at": "...", "channel": "...",
+     "customer": {"document": "...", "birth_date": "...", ...},
+     "loan": {"amount": ..., "term_months": ..., "product": "..."},
+     "bureau_checks": [{"provider": "scr", "status": "...", "score": ...}, ...]}
+
+A Bronze só faz o explode, sem limpar nada: os objetos aninhados viram colunas
+(`customer_document`, `loan_amount`...) e cada consulta de `bureau_checks` vira uma
+linha (`check_*`), repetindo os campos da proposta. Propostas sem consultas geram uma
+linha com `check_*` nulos. Os valores são gravados como texto, exatamente como
+chegaram, para que o schema das partições não dependa do tipo enviado pela origem;
+a conversão e a validação ficam para a Silver. Campos desconhecidos vão, em JSON,
+para a coluna `_extra`, e a linha de origem fica em `_source_file`/`_source_line`.
+
+O arquivo é lido em streaming, em blocos de `chunk_records` propostas, e cada bloco
+é gravado como um row group; a memória não depende do tamanho do arquivo. Linhas que
+não são um objeto JSON válido são contadas e descartadas.
+"""
+
+import gzip
+import io
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Incrementar quando a saída mudar: as partições já processadas são refeitas.
+BRONZE_VERSION = 1
+EXPLODE_FIELD = "bureau_checks"
+EXPLODE_PREFIX = "check_"
+
+# Colunas de texto da Bronze, na ordem gravada.
+PROPOSAL_COLUMNS = (
+    "proposal_id",
+    "created_at",
+    "channel",
+    "customer_document",
+    "customer_birth_date",
+    "customer_monthly_income",
+    "customer_state",
+    "loan_amount",
+    "loan_term_months",
+    "loan_product",
+)
+CHECK_COLUMNS = (
+    "check_provider",
+    "check_status",
+    "check_score",
+    "check_negative_records",
+)
+BRONZE_SCHEMA = pa.schema(
+    [pa.field(name, pa.string()) for name in PROPOSAL_COLUMNS]
+    + [pa.field("check_index", pa.int32())]
+    + [pa.field(name, pa.string()) for name in CHECK_COLUMNS]
+    + [
+        pa.field("_extra", pa.string()),
+        pa.field("_source_file", pa.string()),
+        pa.field("_source_line", pa.int64()),
+    ]
+)
+
+
+def open_raw(path: str) -> io.TextIOBase:
+    """Abre um arquivo da zona Raw em modo texto, descompactando `.gz`."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def iter_raw_records(
+    path: str, chunk_records: int = 50_000
+) -> Iterator[Tuple[List[Tuple[int, Dict[str, Any]]], int]]:
+    """
+    Lê um arquivo NDJSON em blocos, sem carregá-lo inteiro.
+
+    Args:
+        path (str): Arquivo `.jsonl` ou `.jsonl.gz`.
+        chunk_records (int): Propostas por bloco.
+
+    Yields:
+        Tuple[List[Tuple[int, Dict[str, Any]]], int]: Pares (número da linha,
+            proposta) do bloco e quantas linhas malformadas foram descartadas nele.
+    """
+    records: List[Tuple[int, Dict[str, Any]]] = []
+    malformed = 0
+    with open_raw(path) as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                malformed += 1
+                continue
+            if not isinstance(record, dict):
+                malformed += 1
+                continue
+            records.append((line_number, record))
+            if len(records) >= chunk_records:
+                yield records, malformed
+                records, malformed = [], 0
+    if records or malformed:
+        yield records, malformed
+
+
+def _text(value: Any) -> Optional[str]:
+    """Representa um valor JSON escalar como texto (objetos e listas em JSON)."""
+    if value is None or type(value) is str:
+        return value
+    if type(value) is bool:
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _flatten(obj: Dict[str, Any], prefix: str, out: Dict[str, Any]) -> Dict[str, Any]:
+    for key, value in obj.items():
+        if isinstance(value, dict):
+            _flatten(value, f"{prefix}{key}_", out)
+        else:
+            out[f"{prefix}{key}"] = value
+    return out
+
+
+def explode_records(
+    records: List[Tuple[int, Dict[str, Any]]], source_file: str
+) -> pa.Table:
+    """
+    Achata e explode um bloco de propostas em linhas da Bronze.
+
+    Args:
+        records (List[Tuple[int, Dict[str, Any]]]): Pares (linha, proposta).
+        source_file (str): Chave do arquivo de origem.
+
+    Returns:
+        pa.Table: Tabela com o schema `BRONZE_SCHEMA`, uma linha por consulta.
+    """
+    columns: Dict[str, List[Any]] = {name: [] for name in BRONZE_SCHEMA.names}
+    proposal_columns = [columns[name] for name in PROPOSAL_COLUMNS]
+    check_columns = [columns[name] for name in CHECK_COLUMNS]
+    check_index = columns["check_index"]
+    extra_column = columns["_extra"]
+    source_lines = columns["_source_line"]
+
+    for line_number, record in records:
+        checks = record.pop(EXPLODE_FIELD, None)
+        flat = _flatten(record, "", {})
+        values = [_text(flat.pop(name, None)) for name in PROPOSAL_COLUMNS]
+        if not isinstance(checks, list) or not checks:
+            if checks not in (None, []):
+                flat[EXPLODE_FIELD] = checks
+            checks = [None]
+        for i, check in enumerate(checks):
+            extra = dict(flat)
+            if isinstance(check, dict):
+                check_flat = _flatten(check, EXPLODE_PREFIX, {})
+                check_values = [
+                    _text(check_flat.pop(name, None)) for name in CHECK_COLUMNS
+                ]
+                extra.update(check_flat)
+                check_index.append(i)
+            else:
+                check_values = [None] * len(CHECK_COLUMNS)
+                if check is not None:
+                    extra[f"{EXPLODE_PREFIX}{i}"] = check
+                check_index.append(i if check is not None else None)
+            for column, value in zip(proposal_columns, values):
+                column.append(value)
+            for column, value in zip(check_columns, check_values):
+                column.append(value)
+            extra_column.append(
+                json.dumps(extra, ensure_ascii=False, default=str) if extra else None
+            )
+            source_lines.append(line_number)
+
+    columns["_source_file"] = [source_file] * len(source_lines)
+    return pa.table(columns, schema=BRONZE_SCHEMA)
+
+
+def explode_file(
+    bucket_root: str, raw_key: str, out_key: str, chunk_records: int = 50_000
+) -> Dict[str, Any]:
+    """
+    Converte um arquivo da zona Raw em um arquivo Parquet da Bronze.
+
+    Roda nos processos do pool do pipeline; por isso recebe a raiz do bucket e
+    chaves, e não objetos abertos.
+
+    Args:
+        bucket_root (str): Raiz do bucket.
+        raw_key (str): Chave do arquivo de origem.
+        out_key (str): Chave do Parquet de destino (na área de montagem).
+        chunk_records (int): Propostas lidas por bloco (um row group por bloco).
+
+    Returns:
+        Dict[str, Any]: Propostas lidas, linhas gravadas, linhas malformadas, bytes
+            lidos e duração em segundos.
+    """
+    start = time.perf_counter()
+    raw_path = os.path.join(bucket_root, *raw_key.split("/"))
+    out_path = os.path.join(bucket_root, *out_key.split("/"))
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    stats = {"records": 0, "rows": 0, "malformed": 0}
+    with pq.ParquetWriter(out_path + ".tmp", BRONZE_SCHEMA) as writer:
+        for records, malformed in iter_raw_records(raw_path, chunk_records):
+            stats["records"] += len(records)
+            stats["malformed"] += malformed
+            if records:
+                table = explode_records(records, raw_key)
+                stats["rows"] += table.num_rows
+                writer.write_table(table)
+    os.replace(out_path + ".tmp", out_path)
+    stats["bytes"] = os.path.getsize(raw_path)
+    stats["seconds"] = time.perf_counter() - start
+    return stats
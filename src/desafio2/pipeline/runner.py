@@ -0,0 +1,296 @@
+"""
+Execução incremental do pipeline Raw -> Bronze -> Silver.
+
+A execução padrão é o batch D-1: processa as partições da zona Raw até ontem que
+ainda não foram processadas (a partição de hoje continua recebendo arquivos).
+Cada arquivo Raw vira uma parte da Bronze em um processo do pool, e a Silver de um
+dia é enviada ao pool assim que a Bronze dele é publicada, de modo que dias
+diferentes se sobrepõem.
+
+A idempotência vem dos marcadores `_SUCCESS`: cada partição publicada guarda a
+impressão digital da sua origem (nome, tamanho e data de modificação dos arquivos
+Raw, e a versão do código da etapa). Uma partição cuja origem não mudou é pulada;
+um arquivo novo ou reenviado para um dia já processado faz esse dia ser refeito
+por inteiro, substituindo a partição anterior, sem duplicar linhas. Uma execução
+interrompida não deixa partições sem marcador visíveis como completas, e a
+próxima execução descarta o que ficou na área de montagem. Só uma execução por
+bucket deve rodar de cada vez.
+
+Uso:
+    PYTHONPATH=src python -m desafio2.pipeline.runner --bucket ./data/bucket
+    PYTHONPATH=src python -m desafio2.pipeline.runner --bucket ./data/bucket \\
+        --date 2024-06-01 2024-06-02 --workers 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from desafio2.pipeline.bronze import BRONZE_VERSION, explode_file
+from desafio2.pipeline.silver import SILVER_VERSION, clean_partition
+from desafio2.pipeline.storage import LocalBucket, partition_prefix
+
+
+def fingerprint(*parts: Any) -> str:
+    """Resume valores serializáveis em JSON em um hash curto."""
+    payload = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def raw_fingerprint(bucket: LocalBucket, keys: Sequence[str]) -> str:
+    """
+    Impressão digital dos arquivos de uma partição Raw, sem ler o conteúdo.
+
+    Args:
+        bucket (LocalBucket): Bucket dos arquivos.
+        keys (Sequence[str]): Chaves da partição.
+
+    Returns:
+        str: Hash de nome, tamanho e data de modificação de cada arquivo.
+    """
+    entries = []
+    for key in keys:
+        stat = os.stat(bucket.path(key))
+        entries.append((key, stat.st_size, stat.st_mtime_ns))
+    return fingerprint(entries)
+
+
+def _run_inline(func: Callable[..., Any], *args: Any) -> Future:
+    future: Future = Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def run_pipeline(
+    bucket_root: str,
+    days: Optional[List[date]] = None,
+    until: Optional[date] = None,
+    max_workers: Optional[int] = None,
+    chunk_records: int = 50_000,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """
+    Processa as partições pendentes da Raw até a Silver.
+
+    Args:
+        bucket_root (str): Raiz do bucket.
+        days (List[date], optional): Dias a processar. Por padrão, todas as
+            partições da Raw até `until`.
+        until (date, optional): Último dia processado quando `days` não é informado
+            (padrão: ontem, o batch D-1).
+        max_workers (int, optional): Processos do pool; `os.cpu_count()` quando
+            None. Com 0, tudo roda em série no processo principal.
+        chunk_records (int): Propostas lidas por bloco na Bronze.
+        force (bool): Reprocessa as partições mesmo sem mudança na origem.
+
+    Returns:
+        Dict[str, Any]: Marcadores das partições publicadas em cada zona, dias
+            pulados por já estarem atualizados, erros e a duração total.
+    """
+    start = time.perf_counter()
+    bucket = LocalBucket(bucket_root)
+    bucket.clean_staging()
+    if days is None:
+        until = until or date.today() - timedelta(days=1)
+        days = [day for day in bucket.partitions("raw") if day <= until]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    report: Dict[str, Any] = {
+        "bronze": {},
+        "silver": {},
+        "skipped": {"bronze": [], "silver": []},
+        "errors": [],
+    }
+    pool = ProcessPoolExecutor(max_workers) if max_workers > 0 else None
+    futures: Dict[Future, tuple] = {}
+    bronze_jobs: Dict[date, Dict[str, Any]] = {}
+
+    def submit(func: Callable[..., Any], *args: Any) -> Future:
+        return pool.submit(func, *args) if pool else _run_inline(func, *args)
+
+    def submit_silver(day: date) -> None:
+        bronze_marker = bucket.success_marker("bronze", day)
+        if bronze_marker is None:
+            return
+        expected = fingerprint(SILVER_VERSION, bronze_marker["fingerprint"])
+        marker = bucket.success_marker("silver", day)
+        if (
+            not force
+            and marker is not None
+            and marker["fingerprint"] == expected
+            and bucket.success_marker("quarantine", day) is not None
+        ):
+            report["skipped"]["silver"].append(day.isoformat())
+            return
+        silver_staging = bucket.staging_prefix("silver", day)
+        quarantine_staging = bucket.staging_prefix("quarantine", day)
+        future = submit(
+            clean_partition,
+            bucket.root,
+            partition_prefix("bronze", day),
+            silver_staging,
+            quarantine_staging,
+        )
+        futures[future] = ("silver", day, expected, silver_staging, quarantine_staging)
+
+    try:
+        for day in days:
+            keys = bucket.list(partition_prefix("raw", day))
+            expected = fingerprint(BRONZE_VERSION, raw_fingerprint(bucket, keys))
+            marker = bucket.success_marker("bronze", day)
+            if not force and marker is not None and marker["fingerprint"] == expected:
+                report["skipped"]["bronze"].append(day.isoformat())
+                submit_silver(day)
+                continue
+            if not keys:
+                continue
+            staging = bucket.staging_prefix("bronze", day)
+            bronze_jobs[day] = {
+                "fingerprint": expected,
+                "staging": staging,
+                "pending": len(keys),
+                "results": [],
+                "failed": False,
+            }
+            # Uma parte por arquivo Raw, na ordem das chaves: a Silver identifica a
+            # origem de cada linha pela posição da parte.
+            for i, key in enumerate(keys):
+                out_key = f"{staging}/part-{i:05d}.parquet"
+                future = submit(explode_file, bucket.root, key, out_key, chunk_records)
+                futures[future] = ("bronze", day)
+
+        while futures:
+            done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, day, *info = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    report["errors"].append(
+                        {"stage": stage, "day": day.isoformat(), "error": repr(e)}
+                    )
+                    if stage == "bronze":
+                        bronze_jobs[day]["failed"] = True
+                        bronze_jobs[day]["pending"] -= 1
+                    continue
+
+                if stage == "bronze":
+                    job = bronze_jobs[day]
+                    job["results"].append(result)
+                    job["pending"] -= 1
+                    if job["pending"] or job["failed"]:
+                        continue
+                    marker = {
+                        "fingerprint": job["fingerprint"],
+                        "version": BRONZE_VERSION,
+                        "files": len(job["results"]),
+                        "completed_at": _now(),
+                    }
+                    for field in ("records", "rows", "malformed", "bytes", "seconds"):
+                        marker[field] = sum(r[field] for r in job["results"])
+                    bucket.publish(job["staging"], "bronze", day, marker)
+                    report["bronze"][day.isoformat()] = marker
+                    submit_silver(day)
+                else:
+                    expected, silver_staging, quarantine_staging = info
+                    marker = {
+                        "fingerprint": expected,
+                        "version": SILVER_VERSION,
+                        "completed_at": _now(),
+                        **result,
+                    }
+                    bucket.publish(
+                        quarantine_staging,
+                        "quarantine",
+                        day,
+                        {
+                            "fingerprint": expected,
+                            "rows": result["rows_rejected"],
+                            "rejected_by_reason": result["rejected_by_reason"],
+                        },
+                    )
+                    bucket.publish(silver_staging, "silver", day, marker)
+                    report["silver"][day.isoformat()] = marker
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        bucket.clean_staging()
+
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Processa as partições pendentes da Raw até a Silver."
+    )
+    parser.add_argument("--bucket", default="./data/bucket", help="Raiz do bucket.")
+    parser.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        nargs="+",
+        default=None,
+        help="Dias a processar (AAAA-MM-DD). Padrão: partições pendentes até ontem.",
+    )
+    parser.add_argument(
+        "--until",
+        type=date.fromisoformat,
+        default=None,
+        help="Último dia processado sem --date (padrão: ontem).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processos do pool (padrão: núcleos disponíveis; 0 roda em série).",
+    )
+    parser.add_argument("--chunk-records", type=int, default=50_000)
+    parser.add_argument(
+        "--force", action="store_true", help="Reprocessa partições já atualizadas."
+    )
+    args = parser.parse_args()
+
+    report = run_pipeline(
+        args.bucket,
+        days=args.date,
+        until=args.until,
+        max_workers=args.workers,
+        chunk_records=args.chunk_records,
+        force=args.force,
+    )
+    for day, marker in report["bronze"].items():
+        print(
+            f"bronze {day}: {marker['records']} propostas, {marker['rows']} linhas, "
+            f"{marker['malformed']} linhas malformadas"
+        )
+    for day, marker in report["silver"].items():
+        print(
+            f"silver {day}: {marker['rows_out']} linhas, {marker['rows_rejected']} "
+            f"em quarentena, {marker['duplicate_rows']} duplicadas"
+        )
+    for stage in ("bronze", "silver"):
+        if report["skipped"][stage]:
+            print(f"{stage}: {len(report['skipped'][stage])} partições já atualizadas")
+    for error in report["errors"]:
+        print(f"erro em {error['stage']} {error['day']}: {error['error']}")
+    print(f"Concluído em {report['seconds']:.1f} s.")
+    if report["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+"""
+Zona Silver: limpeza, correção e qualidade dos dados da Bronze.
+
+Cada partição diária da Bronze é processada em duas passadas, em blocos, sem carregar
+a partição inteira:
+
+1. Deduplicação: a origem reenvia propostas (mesmo `proposal_id`). A primeira
+   passada lê só as chaves de cada proposta e escolhe a versão mais recente
+   (`created_at`; empates ficam com o último arquivo/linha). As linhas das demais
+   versões são descartadas e contadas.
+2. Limpeza: os textos da Bronze são normalizados (espaços, caixa, CPF só com
+   dígitos) e convertidos para os tipos do `SILVER_SCHEMA`, com operações
+   vetorizadas do Arrow. Cada linha é verificada pelas regras de `QUALITY_RULES`; as
+   reprovadas vão para a zona `quarantine` com o motivo (a primeira regra violada),
+   e as aprovadas para a Silver.
+
+As regras são de qualidade de dado (formato, domínio, plausibilidade), e não as
+regras de negócio do funil: a faixa de idade aceita para crédito, por exemplo, é
+aplicada depois, sobre a Silver. O relatório de qualidade de cada partição (linhas
+lidas, duplicadas, reprovadas por regra e fração de nulos por coluna) é gravado no
+marcador `_SUCCESS`.
+"""
+
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from desafio2.pipeline.bronze import BRONZE_SCHEMA
+from desafio2.pipeline.storage import LocalBucket
+
+# Incrementar quando as regras mudarem: as partições já processadas são refeitas.
+SILVER_VERSION = 2
+BRAZILIAN_STATES = tuple(
+    "AC AL AM AP BA CE DF ES GO MA MG MS MT PA PB PE PI PR RJ RN RO RR RS SC SE SP TO".split()
+)
+BUREAU_PROVIDERS = ("scr", "serasa", "bvs")
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+DATE_FORMAT = "%Y-%m-%d"
+NUMBER_PATTERN = r"^-?\d+(\.\d+)?([eE][-+]?\d+)?$"
+MAX_AGE_YEARS = 120
+MAX_TERM_MONTHS = 420
+MAX_SCORE = 1000
+# Limite de plausibilidade; também mantém o valor dentro do int32 da Silver.
+MAX_NEGATIVE_RECORDS = 10_000
+
+# Ordem de avaliação: o motivo gravado na quarentena é a primeira regra violada.
+QUALITY_RULES = (
+    "missing_proposal_id",
+    "invalid_created_at",
+    "invalid_document",
+    "invalid_birth_date",
+    "invalid_income",
+    "invalid_amount",
+    "invalid_term",
+    "invalid_state",
+    "invalid_provider",
+    "invalid_score",
+    "invalid_negative_records",
+)
+
+SILVER_SCHEMA = pa.schema(
+    [
+        pa.field("proposal_id", pa.string()),
+        pa.field("created_at", pa.timestamp("s")),
+        pa.field("channel", pa.string()),
+        pa.field("customer_document", pa.string()),
+        pa.field("customer_birth_date", pa.date32()),
+        pa.field("customer_age", pa.int16()),
+        pa.field("customer_monthly_income", pa.float64()),
+        pa.field("customer_state", pa.string()),
+        pa.field("loan_amount", pa.float64()),
+        pa.field("loan_term_months", pa.int16()),
+        pa.field("loan_product", pa.string()),
+        pa.field("check_index", pa.int32()),
+        pa.field("check_provider", pa.string()),
+        pa.field("check_status", pa.string()),
+        pa.field("check_score", pa.int16()),
+        pa.field("check_negative_records", pa.int32()),
+        pa.field("_source_file", pa.string()),
+        pa.field("_source_line", pa.int64()),
+    ]
+)
+QUARANTINE_SCHEMA = BRONZE_SCHEMA.append(pa.field("reject_reason", pa.string()))
+
+_NULL_TEXT = pa.scalar(None, pa.string())
+
+
+def _text(column: Any) -> pa.Array:
+    """Remove espaços das pontas; textos vazios viram nulos."""
+    text = pc.utf8_trim_whitespace(column)
+    return pc.if_else(pc.equal(text, ""), _NULL_TEXT, text)
+
+
+def _number(text: pa.Array) -> Tuple[pa.Array, pa.Array]:
+    """
+    Converte texto em float64.
+
+    Returns:
+        Tuple[pa.Array, pa.Array]: Valores (nulos quando ausentes ou inválidos) e a
+            máscara dos valores presentes que não são números.
+    """
+    is_number = pc.match_substring_regex(text, NUMBER_PATTERN)
+    values = pc.cast(pc.if_else(is_number, text, _NULL_TEXT), pa.float64())
+    return values, pc.and_kleene(pc.is_valid(text), pc.invert(is_number))
+
+
+def valid_cpf(digits: pa.Array) -> np.ndarray:
+    """
+    Valida CPFs (só dígitos) pelos dois dígitos verificadores, de forma vetorizada.
+
+    Os textos de exatamente 11 dígitos ASCII são lidos direto do buffer do Arrow
+    como uma matriz (n, 11); os demais (outro tamanho, letras, caracteres não ASCII)
+    são trocados por zeros antes da leitura e marcados como inválidos. Sequências
+    repetidas (ex.: 111.111.111-11), que passam no cálculo, são rejeitadas.
+
+    Args:
+        digits (pa.Array): CPFs só com dígitos; nulos são inválidos.
+
+    Returns:
+        np.ndarray: Máscara booleana dos CPFs válidos.
+    """
+    # Bytes, e não caracteres: só textos ASCII de 11 dígitos ocupam 11 bytes.
+    has_format = pc.fill_null(pc.match_substring_regex(digits, r"^[0-9]{11}$"), False)
+    padded = pc.if_else(has_format, digits, "00000000000")
+    first_offset, last_offset = padded.offset, padded.offset + len(padded)
+    offsets = np.frombuffer(padded.buffers()[1], dtype=np.int32)
+    start, end = offsets[first_offset], offsets[last_offset]
+    data = np.frombuffer(padded.buffers()[2], dtype=np.uint8)[start:end]
+    matrix = data.reshape(-1, 11).astype(np.int64) - 48
+    first = (matrix[:, :9] @ np.arange(10, 1, -1)) * 10 % 11 % 10
+    second = (matrix[:, :10] @ np.arange(11, 1, -1)) * 10 % 11 % 10
+    repeated = (matrix == matrix[:, :1]).all(axis=1)
+    return (
+        has_format.to_numpy(zero_copy_only=False)
+        & (first == matrix[:, 9])
+        & (second == matrix[:, 10])
+        & ~repeated
+    )
+
+
+def _age(birth_date: pa.Array, reference: pa.Array) -> pa.Array:
+    """Idade em anos completos na data de referência."""
+    years = pc.subtract(pc.year(reference), pc.year(birth_date))
+    birthday_ahead = pc.less(
+        pc.add(pc.multiply(pc.month(reference), 100), pc.day(reference)),
+        pc.add(pc.multiply(pc.month(birth_date), 100), pc.day(birth_date)),
+    )
+    return pc.subtract(years, pc.cast(birthday_ahead, pa.int64()))
+
+
+def clean_table(table: pa.Table) -> Tuple[pa.Table, pa.Table]:
+    """
+    Normaliza, converte e valida um bloco de linhas da Bronze.
+
+    Args:
+        table (pa.Table): Linhas com o `BRONZE_SCHEMA`.
+
+    Returns:
+        Tuple[pa.Table, pa.Table]: Linhas aprovadas (`SILVER_SCHEMA`) e reprovadas
+            (`QUARANTINE_SCHEMA`, com `reject_reason`).
+    """
+    if table.num_rows == 0:
+        return SILVER_SCHEMA.empty_table(), QUARANTINE_SCHEMA.empty_table()
+    table = table.combine_chunks()
+    column = {name: table.column(name).chunk(0) for name in table.column_names}
+
+    proposal_id = _text(column["proposal_id"])
+    created_at = pc.strptime(
+        _text(column["created_at"]), TIMESTAMP_FORMAT, "s", error_is_null=True
+    )
+    document = pc.replace_substring_regex(
+        _text(column["customer_document"]), r"[.\-\s]", ""
+    )
+    birth_date = pc.cast(
+        pc.strptime(
+            _text(column["customer_birth_date"]), DATE_FORMAT, "s", error_is_null=True
+        ),
+        pa.date32(),
+    )
+    age = _age(birth_date, pc.cast(created_at, pa.date32()))
+    income, income_not_number = _number(_text(column["customer_monthly_income"]))
+    amount, _ = _number(_text(column["loan_amount"]))
+    term, _ = _number(_text(column["loan_term_months"]))
+    state = pc.utf8_upper(_text(column["customer_state"]))
+    provider = pc.utf8_lower(_text(column["check_provider"]))
+    score, score_not_number = _number(_text(column["check_score"]))
+    negative_records, negatives_not_number = _number(
+        _text(column["check_negative_records"])
+    )
+    has_check = pc.is_valid(column["check_index"])
+
+    violations = {
+        "missing_proposal_id": pc.is_null(proposal_id),
+        "invalid_created_at": pc.is_null(created_at),
+        "invalid_document": pa.array(~valid_cpf(document)),
+        "invalid_birth_date": pc.or_kleene(
+            pc.is_null(age),
+            pc.or_(pc.less(age, 0), pc.greater(age, MAX_AGE_YEARS)),
+        ),
+        "invalid_income": pc.or_kleene(income_not_number, pc.less(income, 0)),
+        "invalid_amount": pc.or_kleene(pc.is_null(amount), pc.less_equal(amount, 0)),
+        "invalid_term": pc.or_kleene(
+            pc.is_null(term),
+            pc.or_(
+                pc.not_equal(term, pc.floor(term)),
+                pc.or_(pc.less(term, 1), pc.greater(term, MAX_TERM_MONTHS)),
+            ),
+        ),
+        "invalid_state": pc.invert(
+            pc.is_in(state, value_set=pa.array(BRAZILIAN_STATES))
+        ),
+        "invalid_provider": pc.and_(
+            has_check,
+            pc.invert(pc.is_in(provider, value_set=pa.array(BUREAU_PROVIDERS))),
+        ),
+        "invalid_score": pc.or_kleene(
+            score_not_number,
+            pc.or_(
+                pc.not_equal(score, pc.floor(score)),
+                pc.or_(pc.less(score, 0), pc.greater(score, MAX_SCORE)),
+            ),
+        ),
+        "invalid_negative_records": pc.or_kleene(
+            negatives_not_number,
+            pc.or_(
+                pc.not_equal(negative_records, pc.floor(negative_records)),
+                pc.or_(
+                    pc.less(negative_records, 0),
+                    pc.greater(negative_records, MAX_NEGATIVE_RECORDS),
+                ),
+            ),
+        ),
+    }
+    reason = pa.nulls(table.num_rows, pa.string())
+    for rule in reversed(QUALITY_RULES):
+        reason = pc.if_else(pc.fill_null(violations[rule], False), rule, reason)
+    approved = pc.is_null(reason)
+
+    silver = pa.table(
+        {
+            "proposal_id": proposal_id,
+            "created_at": created_at,
+            "channel": pc.utf8_lower(_text(column["channel"])),
+            "customer_document": document,
+            "customer_birth_date": birth_date,
+            "customer_age": age,
+            "customer_monthly_income": income,
+            "customer_state": state,
+            "loan_amount": amount,
+            "loan_term_months": term,
+            "loan_product": pc.utf8_lower(_text(column["loan_product"])),
+            "check_index": column["check_index"],
+            "check_provider": provider,
+            "check_status": pc.utf8_lower(_text(column["check_status"])),
+            "check_score": score,
+            "check_negative_records": negative_records,
+            "_source_file": column["_source_file"],
+            "_source_line": column["_source_line"],
+        }
+    ).filter(approved)
+    # Os valores aprovados já estão dentro das faixas dos tipos menores.
+    silver = silver.cast(SILVER_SCHEMA, safe=False)
+    rejected = table.append_column("reject_reason", reason).filter(pc.invert(approved))
+    return silver, rejected.cast(QUARANTINE_SCHEMA)
+
+
+def record_ids(table: pa.Table, part_index: int) -> pa.Array:
+    """
+    Identificador de cada proposta de origem: a parte da Bronze (um arquivo Raw por
+    parte) nos 32 bits altos e a linha do arquivo nos baixos.
+    """
+    return pc.add(pc.cast(table.column("_source_line"), pa.int64()), part_index << 32)
+
+
+def latest_records(paths: List[str]) -> pa.Array:
+    """
+    Escolhe a versão mais recente de cada `proposal_id` de uma partição.
+
+    Args:
+        paths (List[str]): Partes da Bronze da partição, na ordem dos arquivos Raw.
+
+    Returns:
+        pa.Array: `record_ids` das versões mantidas.
+    """
+    keys = []
+    for part_index, path in enumerate(paths):
+        table = pq.read_table(
+            path, columns=["proposal_id", "created_at", "check_index", "_source_line"]
+        )
+        # Uma linha por proposta: a da primeira consulta (ou a única, sem consultas).
+        table = table.filter(pc.fill_null(pc.equal(table["check_index"], 0), True))
+        keys.append(
+            pa.table(
+                {
+                    "proposal_id": _text(table["proposal_id"]),
+                    "created_at": pc.fill_null(
+                        pc.strptime(
+                            _text(table["created_at"]),
+                            TIMESTAMP_FORMAT,
+                            "s",
+                            error_is_null=True,
+                        ),
+                        pa.scalar(0, pa.timestamp("s")),
+                    ),
+                    "record_id": record_ids(table, part_index),
+                }
+            )
+        )
+    if not keys:
+        return pa.array([], pa.int64())
+    keys = pa.concat_tables(keys)
+    keys = keys.filter(pc.is_valid(keys["proposal_id"])).sort_by(
+        [
+            ("proposal_id", "ascending"),
+            ("created_at", "ascending"),
+            ("record_id", "ascending"),
+        ]
+    )
+    ids = pc.dictionary_encode(keys["proposal_id"]).combine_chunks().indices.to_numpy()
+    is_last = np.append(ids[1:] != ids[:-1], True) if len(ids) else np.array([], bool)
+    return keys["record_id"].combine_chunks().filter(pa.array(is_last))
+
+
+def clean_partition(
+    bucket_root: str,
+    bronze_prefix: str,
+    silver_prefix: str,
+    quarantine_prefix: str,
+    batch_rows: int = 100_000,
+) -> Dict[str, Any]:
+    """
+    Gera a Silver e a quarentena de uma partição da Bronze.
+
+    Roda nos processos do pool do pipeline. Cada parte da Bronze gera uma parte na
+    Silver e uma na quarentena, sob os prefixos de montagem recebidos.
+
+    Args:
+        bucket_root (str): Raiz do bucket.
+        bronze_prefix (str): Prefixo da partição da Bronze.
+        silver_prefix (str): Prefixo de montagem da Silver.
+        quarantine_prefix (str): Prefixo de montagem da quarentena.
+        batch_rows (int): Linhas da Bronze processadas por bloco.
+
+    Returns:
+        Dict[str, Any]: Relatório de qualidade da partição.
+    """
+    start = time.perf_counter()
+    bucket = LocalBucket(bucket_root)
+    paths = [bucket.path(key) for key in bucket.list(bronze_prefix)]
+    winners = latest_records(paths)
+    report: Dict[str, Any] = {
+        "rows_in": 0,
+        "duplicate_rows": 0,
+        "rows_out": 0,
+        "rows_rejected": 0,
+        "proposals_out": len(winners),
+        "rejected_by_reason": {rule: 0 for rule in QUALITY_RULES},
+    }
+    null_counts = {name: 0 for name in SILVER_SCHEMA.names}
+
+    for part_index, path in enumerate(paths):
+        name = os.path.basename(path)
+        silver_path = bucket.path(f"{silver_prefix}/{name}")
+        quarantine_path = bucket.path(f"{quarantine_prefix}/{name}")
+        for out_path in (silver_path, quarantine_path):
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        with pq.ParquetWriter(
+            silver_path + ".tmp", SILVER_SCHEMA
+        ) as silver_writer, pq.ParquetWriter(
+            quarantine_path + ".tmp", QUARANTINE_SCHEMA
+        ) as quarantine_writer:
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows):
+                table = pa.Table.from_batches([batch])
+                report["rows_in"] += table.num_rows
+                # Versões antigas de propostas reenviadas; linhas sem id seguem para
+                # a quarentena.
+                kept = pc.or_(
+                    pc.is_null(_text(table["proposal_id"])),
+                    pc.is_in(record_ids(table, part_index), value_set=winners),
+                )
+                table = table.filter(kept)
+                report["duplicate_rows"] += len(kept) - table.num_rows
+                silver, rejected = clean_table(table)
+                silver_writer.write_table(silver)
+                quarantine_writer.write_table(rejected)
+                report["rows_out"] += silver.num_rows
+                report["rows_rejected"] += rejected.num_rows
+                for reason, count in zip(
+                    *np.unique(
+                        rejected["reject_reason"].to_numpy(zero_copy_only=False),
+                        return_counts=True,
+                    )
+                ):
+                    report["rejected_by_reason"][reason] += int(count)
+                for column_name in SILVER_SCHEMA.names:
+                    null_counts[column_name] += silver[column_name].null_count
+        os.replace(silver_path + ".tmp", silver_path)
+        os.replace(quarantine_path + ".tmp", quarantine_path)
+
+    report["null_rate"] = {
+        name: count / report["rows_out"] if report["rows_out"] else 0.0
+        for name, count in null_counts.items()
+    }
+    report["seconds"] = time.perf_counter() - start
+    return report
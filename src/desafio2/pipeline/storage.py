@@ -0,0 +1,178 @@
+"""
+Substituto local do bucket de dados do desafio 2.
+
+As zonas da arquitetura são prefixos de um mesmo bucket, particionados por data de
+chegada como no S3:
+
+    raw/year=AAAA/month=MM/day=DD/<arquivo>.jsonl[.gz]
+    bronze/year=AAAA/month=MM/day=DD/part-*.parquet
+    silver/year=AAAA/month=MM/day=DD/part-*.parquet
+    quarantine/year=AAAA/month=MM/day=DD/part-*.parquet
+
+Cada chave é um caminho relativo à raiz do bucket. As escritas usam um arquivo
+temporário renomeado no fim (como um PUT, o objeto aparece inteiro ou não aparece),
+e uma partição é publicada trocando o diretório montado em `_staging/` pelo
+definitivo. Uma partição só é considerada completa quando tem o marcador `_SUCCESS`,
+gravado por último.
+"""
+
+import json
+import os
+import shutil
+import uuid
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+ZONES = ("raw", "bronze", "silver", "quarantine")
+SUCCESS_MARKER = "_SUCCESS"
+STAGING_PREFIX = "_staging"
+
+
+def partition_prefix(zone: str, day: date) -> str:
+    """
+    Monta o prefixo da partição de um dia em uma zona.
+
+    Args:
+        zone (str): Zona do bucket (`raw`, `bronze`, `silver` ou `quarantine`).
+        day (date): Data da partição.
+
+    Returns:
+        str: Prefixo `zona/year=AAAA/month=MM/day=DD`.
+    """
+    return f"{zone}/year={day:%Y}/month={day:%m}/day={day:%d}"
+
+
+class LocalBucket:
+    """
+    Bucket de objetos em um diretório local.
+
+    Args:
+        root (str): Diretório raiz do bucket.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = os.path.abspath(root)
+
+    def path(self, key: str) -> str:
+        """Retorna o caminho local de uma chave."""
+        return os.path.join(self.root, *key.split("/"))
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def list(self, prefix: str) -> List[str]:
+        """
+        Lista as chaves de objetos sob um prefixo, recursivamente e em ordem.
+
+        Arquivos temporários e marcadores (nomes iniciados por `.` ou `_`) não são
+        listados.
+
+        Args:
+            prefix (str): Prefixo (diretório) a listar.
+
+        Returns:
+            List[str]: Chaves encontradas; vazia se o prefixo não existir.
+        """
+        base = self.path(prefix)
+        keys = []
+        for dir_path, dir_names, file_names in os.walk(base):
+            dir_names[:] = sorted(d for d in dir_names if not d.startswith((".", "_")))
+            relative = os.path.relpath(dir_path, self.root).replace(os.sep, "/")
+            for name in sorted(file_names):
+                if not name.startswith((".", "_")):
+                    keys.append(f"{relative}/{name}")
+        return keys
+
+    def partitions(self, zone: str) -> List[date]:
+        """
+        Lista as datas das partições `year=/month=/day=` de uma zona.
+
+        Args:
+            zone (str): Zona do bucket.
+
+        Returns:
+            List[date]: Datas das partições, em ordem.
+        """
+        days = []
+        for key in self.list(zone):
+            parts = dict(
+                part.split("=", 1) for part in key.split("/")[1:-1] if "=" in part
+            )
+            try:
+                days.append(
+                    date(int(parts["year"]), int(parts["month"]), int(parts["day"]))
+                )
+            except (KeyError, ValueError):
+                continue
+        return sorted(set(days))
+
+    def put_bytes(self, key: str, data: bytes) -> None:
+        """Grava um objeto de forma atômica (temporário + rename)."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def read_json(self, key: str) -> Optional[Dict[str, Any]]:
+        """Lê um objeto JSON; None se ele não existir."""
+        try:
+            with open(self.path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def write_json(self, key: str, payload: Dict[str, Any]) -> None:
+        self.put_bytes(key, json.dumps(payload, indent=2, default=str).encode("utf-8"))
+
+    def staging_prefix(self, zone: str, day: date) -> str:
+        """
+        Reserva um prefixo temporário onde a partição de um dia é montada.
+
+        Args:
+            zone (str): Zona de destino.
+            day (date): Data da partição.
+
+        Returns:
+            str: Prefixo único sob `_staging/`, fora das listagens da zona.
+        """
+        return (
+            f"{STAGING_PREFIX}/{uuid.uuid4().hex}/"
+            f"{partition_prefix(zone, day).replace('/', '-')}"
+        )
+
+    def publish(
+        self, staging_prefix: str, zone: str, day: date, marker: Dict[str, Any]
+    ) -> None:
+        """
+        Publica uma partição montada em `staging_prefix`, substituindo a anterior.
+
+        O diretório montado troca de lugar com o publicado por renames, e o marcador
+        `_SUCCESS` é gravado por último: uma falha no meio deixa a partição sem
+        marcador, e a próxima execução a refaz. Como no S3, leitores concorrentes
+        podem ver a partição ausente durante a troca.
+
+        Args:
+            staging_prefix (str): Prefixo retornado por `staging_prefix`.
+            zone (str): Zona de destino.
+            day (date): Data da partição.
+            marker (Dict[str, Any]): Conteúdo do `_SUCCESS` (origem, contagens...).
+        """
+        target = self.path(partition_prefix(zone, day))
+        staging = self.path(staging_prefix)
+        os.makedirs(staging, exist_ok=True)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if os.path.exists(target):
+            os.replace(target, f"{staging}.old")
+        os.replace(staging, target)
+        self.write_json(f"{partition_prefix(zone, day)}/{SUCCESS_MARKER}", marker)
+        shutil.rmtree(os.path.dirname(staging), ignore_errors=True)
+
+    def success_marker(self, zone: str, day: date) -> Optional[Dict[str, Any]]:
+        """Lê o `_SUCCESS` de uma partição; None se ela não estiver completa."""
+        return self.read_json(f"{partition_prefix(zone, day)}/{SUCCESS_MARKER}")
+
+    def clean_staging(self) -> None:
+        """Remove partições montadas por execuções interrompidas."""
+        shutil.rmtree(self.path(STAGING_PREFIX), ignore_errors=True)
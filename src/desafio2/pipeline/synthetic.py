@@ -0,0 +1,238 @@
+"""
+Gerador de propostas sintéticas na zona Raw, para testes e benchmarks.
+
+Cada dia recebe `files_per_day` arquivos NDJSON (gzip por padrão) com propostas no
+formato descrito em `desafio2.pipeline.bronze`. Uma fração `dirty_rate` das propostas
+tem um defeito que a Silver deve reprovar (CPF inválido, valor negativo, estado ou
+bureau desconhecido, id ausente, linha JSON truncada), uma fração `duplicate_rate` é
+reenviada mais tarde com outro valor, e parte dos números chega como texto, como em
+origens reais.
+
+Uso:
+    PYTHONPATH=src python -m desafio2.pipeline.synthetic --bucket ./data/bucket \\
+        --start 2024-06-01 --days 3 --proposals 100000
+"""
+
+import argparse
+import gzip
+import json
+import random
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List
+
+from desafio2.pipeline.silver import BRAZILIAN_STATES, BUREAU_PROVIDERS
+from desafio2.pipeline.storage import LocalBucket, partition_prefix
+
+CHANNELS = ("app", "web", "agencia", "parceiro")
+PRODUCTS = ("curto_prazo", "medio_prazo", "longo_prazo")
+DEFECTS = (
+    "invalid_document",
+    "invalid_amount",
+    "invalid_state",
+    "invalid_provider",
+    "missing_proposal_id",
+    "malformed_json",
+)
+
+
+def make_cpf(rng: random.Random, formatted: bool) -> str:
+    """Gera um CPF com dígitos verificadores válidos."""
+    digits = [rng.randrange(10) for _ in range(9)]
+    for weight in (10, 11):
+        total = sum(d * w for d, w in zip(digits, range(weight, 1, -1)))
+        digits.append(total * 10 % 11 % 10)
+    text = "".join(map(str, digits))
+    if formatted:
+        return f"{text[:3]}.{text[3:6]}.{text[6:9]}-{text[9:]}"
+    return text
+
+
+def make_proposal(rng: random.Random, day: date, index: int) -> Dict[str, Any]:
+    """
+    Gera uma proposta válida criada no dia `day`.
+
+    Args:
+        rng (random.Random): Gerador de números aleatórios.
+        day (date): Dia de criação.
+        index (int): Sequencial da proposta no dia (compõe o `proposal_id`).
+
+    Returns:
+        Dict[str, Any]: Proposta no formato da zona Raw.
+    """
+    created_at = datetime.combine(day, datetime.min.time()) + timedelta(
+        seconds=rng.randrange(86_400)
+    )
+    birth_date = day - timedelta(days=rng.randrange(16 * 365, 85 * 365))
+    as_text = rng.random() < 0.1
+    amount = round(rng.uniform(500, 80_000), 2)
+    checks = [
+        {
+            "provider": provider,
+            "status": rng.choice(("ok", "ok", "ok", "pendente")),
+            "score": rng.randrange(0, 1001),
+            "negative_records": rng.choice((0, 0, 0, 1, 2)),
+        }
+        for provider in BUREAU_PROVIDERS
+        if rng.random() < 0.9
+    ]
+    return {
+        "proposal_id": f"P{day:%Y%m%d}{index:09d}",
+        "created_at": created_at.strftime("%Y-%m-%dT%H:%M:%S"),
+        "channel": rng.choice(CHANNELS),
+        "customer": {
+            "document": make_cpf(rng, formatted=rng.random() < 0.5),
+            "birth_date": birth_date.isoformat(),
+            "monthly_income": round(rng.lognormvariate(8.2, 0.7), 2),
+            "state": rng.choice(BRAZILIAN_STATES),
+        },
+        "loan": {
+            "amount": f"{amount:.2f}" if as_text else amount,
+            "term_months": rng.choice((6, 12, 24, 36, 48, 60, 96)),
+            "product": rng.choice(PRODUCTS),
+        },
+        "bureau_checks": checks,
+    }
+
+
+def _apply_defect(proposal: Dict[str, Any], defect: str) -> None:
+    if defect == "invalid_document":
+        document = proposal["customer"]["document"]
+        last = str((int(document[-1]) + 1) % 10)
+        proposal["customer"]["document"] = document[:-1] + last
+    elif defect == "invalid_amount":
+        proposal["loan"]["amount"] = -abs(float(proposal["loan"]["amount"]))
+    elif defect == "invalid_state":
+        proposal["customer"]["state"] = "XX"
+    elif defect == "invalid_provider" and proposal["bureau_checks"]:
+        proposal["bureau_checks"][0]["provider"] = "spc"
+    elif defect == "missing_proposal_id":
+        proposal["proposal_id"] = None
+
+
+def generate_day(
+    rng: random.Random,
+    day: date,
+    proposals: int,
+    dirty_rate: float = 0.02,
+    duplicate_rate: float = 0.01,
+) -> List[str]:
+    """
+    Gera as linhas NDJSON de um dia.
+
+    Returns:
+        List[str]: Linhas, em ordem de chegada (reenvios depois do original).
+    """
+    lines = []
+    resent = []
+    for index in range(proposals):
+        proposal = make_proposal(rng, day, index)
+        defect = rng.choice(DEFECTS) if rng.random() < dirty_rate else None
+        if defect:
+            _apply_defect(proposal, defect)
+        line = json.dumps(proposal, separators=(",", ":"))
+        if defect == "malformed_json":
+            half = len(line) // 2
+            line = line[:half]
+        lines.append(line)
+        if not defect and rng.random() < duplicate_rate:
+            resent.append(proposal)
+    for proposal in resent:
+        created_at = datetime.fromisoformat(proposal["created_at"])
+        later = min(
+            created_at + timedelta(minutes=rng.randrange(1, 120)),
+            datetime.combine(day, datetime.max.time()).replace(microsecond=0),
+        )
+        proposal["created_at"] = later.strftime("%Y-%m-%dT%H:%M:%S")
+        proposal["loan"]["amount"] = round(float(proposal["loan"]["amount"]) * 0.9, 2)
+        position = rng.randrange(len(lines) - len(resent) // 2, len(lines) + 1)
+        lines.insert(position, json.dumps(proposal, separators=(",", ":")))
+    return lines
+
+
+def generate_raw(
+    bucket_root: str,
+    start: date,
+    days: int,
+    proposals_per_day: int,
+    files_per_day: int = 4,
+    dirty_rate: float = 0.02,
+    duplicate_rate: float = 0.01,
+    compress: bool = True,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Grava propostas sintéticas na zona Raw de um bucket.
+
+    Args:
+        bucket_root (str): Raiz do bucket.
+        start (date): Primeiro dia gerado.
+        days (int): Quantidade de dias (partições).
+        proposals_per_day (int): Propostas por dia, antes dos reenvios.
+        files_per_day (int): Arquivos por dia (as propostas são divididas entre eles).
+        dirty_rate (float): Fração de propostas com defeito.
+        duplicate_rate (float): Fração de propostas reenviadas.
+        compress (bool): Grava `.jsonl.gz` em vez de `.jsonl`.
+        seed (int): Semente do gerador.
+
+    Returns:
+        Dict[str, Any]: Arquivos, linhas e bytes gravados.
+    """
+    rng = random.Random(seed)
+    bucket = LocalBucket(bucket_root)
+    summary = {"files": 0, "lines": 0, "bytes": 0}
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        lines = generate_day(rng, day, proposals_per_day, dirty_rate, duplicate_rate)
+        size = -(-len(lines) // files_per_day)
+        for part in range(files_per_day):
+            first, last = part * size, (part + 1) * size
+            chunk = lines[first:last]
+            data = ("\n".join(chunk) + "\n").encode("utf-8") if chunk else b""
+            suffix = ".jsonl"
+            if compress:
+                data, suffix = gzip.compress(data, compresslevel=1), ".jsonl.gz"
+            key = f"{partition_prefix('raw', day)}/proposals-{part:03d}{suffix}"
+            bucket.put_bytes(key, data)
+            summary["files"] += 1
+            summary["lines"] += len(chunk)
+            summary["bytes"] += len(data)
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Gera propostas sintéticas na zona Raw."
+    )
+    parser.add_argument("--bucket", default="./data/bucket", help="Raiz do bucket.")
+    parser.add_argument(
+        "--start",
+        type=date.fromisoformat,
+        default=date.today() - timedelta(days=1),
+        help="Primeiro dia gerado (AAAA-MM-DD; padrão: ontem).",
+    )
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--proposals", type=int, default=10_000, help="Por dia.")
+    parser.add_argument("--files-per-day", type=int, default=4)
+    parser.add_argument("--dirty-rate", type=float, default=0.02)
+    parser.add_argument("--duplicate-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    summary = generate_raw(
+        args.bucket,
+        args.start,
+        args.days,
+        args.proposals,
+        files_per_day=args.files_per_day,
+        dirty_rate=args.dirty_rate,
+        duplicate_rate=args.duplicate_rate,
+        seed=args.seed,
+    )
+    print(
+        f"{summary['files']} arquivos, {summary['lines']} linhas, "
+        f"{summary['bytes'] / 1e6:.1f} MB em {args.bucket}/raw"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import copy
+import json
+from typing import Any, Callable, Dict
+
+import pytest
+
+BASE_PROPOSAL: Dict[str, Any] = {
+    "proposal_id": "P0001",
+    "created_at": "2024-06-01T10:00:00",
+    "channel": "App",
+    "customer": {
+        "document": "529.982.247-25",
+        "birth_date": "1990-06-02",
+        "monthly_income": 5200.5,
+        "state": "sp",
+    },
+    "loan": {"amount": "15000.00", "term_months": 24, "product": "medio_prazo"},
+    "bureau_checks": [
+        {"provider": "SCR", "status": "ok", "score": 710, "negative_records": 0},
+        {"provider": "serasa", "status": "ok", "score": "655", "negative_records": 1},
+    ],
+}
+
+
+@pytest.fixture
+def make_proposal() -> Callable[..., Dict[str, Any]]:
+    """
+    Monta uma proposta válida, com campos sobrescritos por caminho
+    (ex.: `**{"customer.state": "XX"}`).
+    """
+
+    def build(**overrides: Any) -> Dict[str, Any]:
+        proposal = copy.deepcopy(BASE_PROPOSAL)
+        for path, value in overrides.items():
+            *parents, leaf = path.split(".")
+            target = proposal
+            for parent in parents:
+                target = target[parent]
+            target[leaf] = value
+        return proposal
+
+    return build
+
+
+@pytest.fixture
+def write_ndjson() -> Callable[..., None]:
+    """Grava propostas (dicionários ou linhas já prontas) em um arquivo NDJSON."""
+
+    def write(path: Any, proposals: Any) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for proposal in proposals:
+                line = proposal if isinstance(proposal, str) else json.dumps(proposal)
+                f.write(line + "\n")
+
+    return write
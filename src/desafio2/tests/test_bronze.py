@@ -0,0 +1,65 @@
+import gzip
+import json
+
+import pyarrow.parquet as pq
+from desafio2.pipeline.bronze import BRONZE_SCHEMA, explode_file, explode_records
+
+
+def test_explode_flattens_and_repeats_proposal_per_check(make_proposal):
+    """
+    Testa se cada consulta vira uma linha com os campos da proposta achatados, com
+    os valores gravados como texto, sem limpeza.
+    """
+    table = explode_records([(7, make_proposal())], "raw/a.jsonl")
+
+    rows = table.to_pylist()
+    assert table.schema == BRONZE_SCHEMA
+    assert len(rows) == 2
+    assert [row["check_provider"] for row in rows] == ["SCR", "serasa"]
+    assert [row["check_index"] for row in rows] == [0, 1]
+    assert {row["customer_document"] for row in rows} == {"529.982.247-25"}
+    assert rows[0]["customer_monthly_income"] == "5200.5"
+    assert rows[1]["check_score"] == "655"
+    assert rows[0]["_source_file"] == "raw/a.jsonl" and rows[0]["_source_line"] == 7
+    assert rows[0]["_extra"] is None
+
+
+def test_explode_keeps_proposals_without_checks_and_unknown_fields(make_proposal):
+    """
+    Testa se uma proposta sem consultas gera uma linha com `check_*` nulos e se
+    campos desconhecidos vão para `_extra`.
+    """
+    no_checks = make_proposal(bureau_checks=[])
+    unknown = make_proposal(**{"customer.nickname": "Ana", "bureau_checks": "n/a"})
+
+    rows = explode_records([(1, no_checks), (2, unknown)], "raw/a.jsonl").to_pylist()
+
+    assert len(rows) == 2
+    assert rows[0]["check_index"] is None and rows[0]["check_provider"] is None
+    assert json.loads(rows[1]["_extra"]) == {
+        "customer_nickname": "Ana",
+        "bureau_checks": "n/a",
+    }
+
+
+def test_explode_file_streams_gzip_and_counts_malformed_lines(
+    tmp_path, make_proposal, write_ndjson
+):
+    """
+    Testa se o arquivo é lido em blocos (um row group por bloco), com gzip, e se
+    linhas que não são objetos JSON são contadas e descartadas.
+    """
+    plain = tmp_path / "raw" / "a.jsonl"
+    lines = [make_proposal(proposal_id=f"P{i}") for i in range(5)]
+    write_ndjson(
+        plain, [lines[0], '{"proposal_id": "P9", "cust', *lines[1:], "[1, 2]", ""]
+    )
+    with open(plain, "rb") as f, gzip.open(str(plain) + ".gz", "wb") as out:
+        out.write(f.read())
+
+    stats = explode_file(str(tmp_path), "raw/a.jsonl.gz", "out/part.parquet", 2)
+
+    assert stats["records"] == 5 and stats["rows"] == 10 and stats["malformed"] == 2
+    parquet = pq.ParquetFile(tmp_path / "out" / "part.parquet")
+    assert parquet.metadata.num_row_groups == 3
+    assert parquet.read().column("_source_line").to_pylist()[-1] == 6
@@ -0,0 +1,303 @@
+import asyncio
+from datetime import date
+
+import httpx
+import pytest
+from desafio2.funnel.bureaus import BureauClient
+from desafio2.funnel.engine import AccessLists, FunnelEngine, ScorecardModel
+from desafio2.funnel.schemas import Proposal
+from desafio2.funnel.stub_bureaus import BUREAUS, create_stub_app
+
+DOCUMENT = "52998224725"
+GOOD = {"score": 850, "negative_records": 0, "overdue": False, "cpf_status": "regular"}
+
+
+def proposal(**fields):
+    values = {
+        "proposal_id": "P1",
+        "document": "529.982.247-25",
+        "birth_date": date(1990, 6, 2),
+        "monthly_income": 5000.0,
+        "amount": 12000.0,
+        "term_months": 24,
+        "created_at": "2024-06-01T10:00:00",
+        **fields,
+    }
+    return Proposal(**values)
+
+
+def make_engine(
+    latency_ms=None,
+    overrides=None,
+    timeout_s=2.0,
+    failure_rate=0.0,
+    uncached=(),
+    **kwargs,
+):
+    """Motor com os três bureaus apontando para o app simulado, sem rede."""
+    latencies = {name: 1.0 for name in BUREAUS}
+    latencies.update(latency_ms or {})
+    responses = {(name, DOCUMENT): GOOD for name in BUREAUS}
+    responses.update(overrides or {})
+    app = create_stub_app(
+        latencies, jitter=0.0, failure_rate=failure_rate, overrides=responses
+    )
+    transport = httpx.ASGITransport(app=app)
+    bureaus = [
+        BureauClient(
+            name,
+            f"http://bureaus/{name}",
+            timeout_s=timeout_s,
+            cache_ttl_s=0.0 if name in uncached else 60.0,
+            transport=transport,
+        )
+        for name in BUREAUS
+    ]
+    return FunnelEngine(bureaus, **kwargs)
+
+
+def requests(engine):
+    return {name: s["requests"] for name, s in engine.stats()["bureaus"].items()}
+
+
+def test_local_rules_short_circuit_without_remote_calls():
+    """
+    Testa se a lista de bloqueio e os filtros rígidos reprovam sem consultar os
+    bureaus.
+    """
+
+    async def run():
+        engine = make_engine(lists=AccessLists(blocked={"529.982.247-25"}))
+        async with engine:
+            blocked = await engine.decide(proposal())
+            minor = await engine.decide(
+                proposal(document="1", birth_date=date(2007, 1, 1))
+            )
+            elder = await engine.decide(
+                proposal(document="2", birth_date=date(1940, 1, 1))
+            )
+            indebted = await engine.decide(proposal(document="3", amount=60_000.0))
+        return engine, [blocked, minor, elder, indebted]
+
+    engine, decisions = asyncio.run(run())
+
+    assert [(d.outcome, d.stage, d.reason) for d in decisions] == [
+        ("rejected", "lists", "blocked"),
+        ("rejected", "hard_filters", "underage"),
+        ("rejected", "hard_filters", "over_max_age"),
+        ("rejected", "hard_filters", "income_commitment"),
+    ]
+    assert set(requests(engine).values()) == {0}
+
+
+def test_bureaus_are_checked_concurrently():
+    """
+    Testa se os três bureaus são consultados ao mesmo tempo: a decisão leva o tempo
+    do mais lento, e não a soma.
+    """
+
+    async def run():
+        async with make_engine({name: 150.0 for name in BUREAUS}) as engine:
+            return await engine.decide(proposal())
+
+    decision = asyncio.run(run())
+
+    assert decision.outcome == "approved" and decision.stage == "model"
+    assert decision.segment == "medio_prazo"
+    assert set(decision.bureau_results) == set(BUREAUS)
+    assert decision.elapsed_ms < 400
+
+
+def test_first_bureau_rejection_short_circuits():
+    """
+    Testa se a primeira resposta reprovada encerra a decisão sem esperar o bureau
+    mais lento.
+    """
+
+    async def run():
+        engine = make_engine(
+            {"scr": 5.0, "bvs": 1000.0, "serasa": 1000.0},
+            overrides={("scr", DOCUMENT): {"score": 120}},
+        )
+        async with engine:
+            return await engine.decide(proposal())
+
+    decision = asyncio.run(run())
+
+    assert (decision.outcome, decision.reason) == ("rejected", "scr_low_score")
+    assert list(decision.bureau_results) == ["scr"]
+    assert decision.elapsed_ms < 500
+
+
+@pytest.mark.parametrize(
+    "latency_ms, failure_rate, reason",
+    [
+        ({"serasa": 1000.0}, 0.0, "unavailable_serasa"),
+        (None, 1.0, "unavailable_bvs_scr_serasa"),
+    ],
+)
+def test_unavailable_bureau_sends_to_review(latency_ms, failure_rate, reason):
+    """Testa se timeouts e erros dos bureaus levam a proposta para análise manual."""
+
+    async def run():
+        engine = make_engine(latency_ms, timeout_s=0.1, failure_rate=failure_rate)
+        async with engine:
+            return await engine.decide(proposal())
+
+    decision = asyncio.run(run())
+
+    assert (decision.outcome, decision.stage, decision.reason) == (
+        "review",
+        "bureaus",
+        reason,
+    )
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        [],
+        {**GOOD, "score": "850"},
+        {**GOOD, "negative_records": 0.5},
+        {**GOOD, "overdue": "false"},
+        {**GOOD, "cpf_status": None},
+    ],
+)
+def test_malformed_bureau_response_sends_to_review(body):
+    """
+    Testa se uma resposta que não é um objeto JSON, ou cujos campos têm o tipo
+    errado, conta como bureau indisponível e não entra no cache.
+    """
+
+    async def run():
+        engine = make_engine()
+        engine.bureaus[0] = BureauClient(
+            "scr",
+            "http://bureaus/scr",
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json=body)
+            ),
+        )
+        async with engine:
+            return await engine.decide(proposal()), engine.stats()["bureaus"]["scr"]
+
+    decision, stats = asyncio.run(run())
+
+    assert (decision.outcome, decision.reason) == ("review", "unavailable_scr")
+    assert stats["errors"] == 1 and stats["cached"] == 0
+
+
+def test_bureau_response_fields_are_coerced():
+    """
+    Testa se números inteiros enviados como float viram `int` e campos nulos são
+    tratados como ausentes.
+    """
+    body = {"score": 850.0, "negative_records": None, "overdue": False}
+
+    async def run():
+        client = BureauClient(
+            "scr",
+            "http://bureaus/scr",
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json=body)
+            ),
+        )
+        try:
+            return await client.check(DOCUMENT)
+        finally:
+            await client.aclose()
+
+    result = asyncio.run(run())
+
+    assert result == {"score": 850, "overdue": False}
+    assert type(result["score"]) is int
+
+
+def test_decide_many_isolates_failed_proposals():
+    """
+    Testa se a falha na avaliação de uma proposta vira `review` sem derrubar as
+    demais do lote.
+    """
+
+    class FlakyModel(ScorecardModel):
+        def default_probability(self, segment, features):
+            if segment == "longo_prazo":
+                raise RuntimeError("modelo indisponível")
+            return super().default_probability(segment, features)
+
+    async def run():
+        engine = make_engine(lists=AccessLists(allowed={DOCUMENT}), model=FlakyModel())
+        async with engine:
+            decisions = await engine.decide_many(
+                [proposal(), proposal(proposal_id="P2", term_months=48)]
+            )
+        return decisions, engine.stats()
+
+    decisions, stats = asyncio.run(run())
+
+    assert [(d.outcome, d.stage) for d in decisions] == [
+        ("approved", "model"),
+        ("review", "error"),
+    ]
+    assert decisions[1].reason == "evaluation_error"
+    assert stats["reasons"] == {"evaluation_error": 1}
+
+
+def test_bureau_results_are_cached_and_coalesced():
+    """
+    Testa se consultas simultâneas ao mesmo CPF viram uma requisição por bureau e
+    se uma nova proposta do mesmo cliente usa o cache, exceto sem TTL.
+    """
+
+    async def run():
+        async with make_engine(
+            {name: 50.0 for name in BUREAUS}, uncached=("serasa",)
+        ) as engine:
+            await asyncio.gather(engine.decide(proposal()), engine.decide(proposal()))
+            await engine.decide(proposal(proposal_id="P2"))
+            return engine.stats()["bureaus"]
+
+    stats = asyncio.run(run())
+
+    assert stats["scr"]["requests"] == 1 and stats["scr"]["coalesced"] == 1
+    assert stats["scr"]["cache_hits"] == 1
+    # O Serasa está sem cache: a terceira decisão consulta de novo.
+    assert stats["serasa"]["requests"] == 2 and stats["serasa"]["cache_hits"] == 0
+
+
+def test_allow_list_skips_bureaus():
+    """Testa se um CPF da lista de liberação vai direto para o modelo interno."""
+
+    async def run():
+        async with make_engine(lists=AccessLists(allowed={DOCUMENT})) as engine:
+            return await engine.decide(
+                proposal(amount=6000.0, term_months=6)
+            ), requests(engine)
+
+    decision, counts = asyncio.run(run())
+
+    assert (decision.outcome, decision.stage, decision.segment) == (
+        "approved",
+        "model",
+        "curto_prazo",
+    )
+    assert set(counts.values()) == {0}
+
+
+def test_proposal_from_raw_record():
+    """Testa a leitura de uma proposta no formato da zona Raw."""
+    record = {
+        "proposal_id": "P9",
+        "created_at": "2024-06-01T10:00:00",
+        "customer": {
+            "document": "529.982.247-25",
+            "birth_date": "1990-06-02",
+            "monthly_income": "5000",
+        },
+        "loan": {"amount": 12000, "term_months": "24", "product": "medio_prazo"},
+    }
+
+    parsed = Proposal.from_raw(record)
+
+    assert parsed.document == DOCUMENT and parsed.term_months == 24
+    assert parsed.age() == 33
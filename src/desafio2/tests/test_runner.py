@@ -0,0 +1,124 @@
+import os
+import shutil
+from datetime import date, timedelta
+from pathlib import Path
+
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import pytest
+from desafio2.pipeline.runner import run_pipeline
+from desafio2.pipeline.storage import LocalBucket, partition_prefix
+from desafio2.pipeline.synthetic import generate_raw
+
+DAY = date(2024, 6, 1)
+
+
+@pytest.fixture
+def bucket_root(tmp_path):
+    """Bucket com dois dias de propostas sintéticas (defeitos e reenvios)."""
+    root = str(tmp_path / "bucket")
+    generate_raw(
+        root, DAY, days=2, proposals_per_day=400, files_per_day=2, dirty_rate=0.05
+    )
+    return root
+
+
+def read_zone(root, zone, day):
+    return pq.read_table(LocalBucket(root).path(partition_prefix(zone, day)))
+
+
+def test_pipeline_publishes_deduplicated_silver(bucket_root):
+    """
+    Testa se cada dia gera Bronze, Silver e quarentena com marcador, e se a Silver
+    mantém só a versão mais recente de cada proposta reenviada.
+    """
+    report = run_pipeline(bucket_root, until=DAY + timedelta(days=1), max_workers=0)
+
+    assert sorted(report["silver"]) == ["2024-06-01", "2024-06-02"]
+    assert not report["errors"]
+    marker = report["silver"]["2024-06-01"]
+    silver = read_zone(bucket_root, "silver", DAY)
+    quarantine = read_zone(bucket_root, "quarantine", DAY)
+    assert silver.num_rows == marker["rows_out"]
+    assert quarantine.num_rows == marker["rows_rejected"]
+    assert marker["duplicate_rows"] > 0
+    assert (
+        marker["rows_in"]
+        == marker["rows_out"] + marker["rows_rejected"] + marker["duplicate_rows"]
+    )
+    keys = silver.group_by(["proposal_id", "check_index"]).aggregate(
+        [("_source_line", "count_distinct")]
+    )
+    assert pc.max(keys["_source_line_count_distinct"]).as_py() == 1
+    assert LocalBucket(bucket_root).list("_staging") == []
+
+
+def test_pipeline_is_incremental(bucket_root, make_proposal, write_ndjson):
+    """
+    Testa se uma segunda execução pula os dias já processados e se um arquivo novo
+    em um dia processado refaz só esse dia, sem duplicar linhas.
+    """
+    until = DAY + timedelta(days=1)
+    run_pipeline(bucket_root, until=until, max_workers=0)
+    rows_before = read_zone(bucket_root, "silver", DAY).num_rows
+
+    again = run_pipeline(bucket_root, until=until, max_workers=0)
+    assert again["bronze"] == {} and again["silver"] == {}
+    assert sorted(again["skipped"]["silver"]) == ["2024-06-01", "2024-06-02"]
+
+    late_file = LocalBucket(bucket_root).path(
+        f"{partition_prefix('raw', DAY)}/proposals-late.jsonl"
+    )
+    write_ndjson(Path(late_file), [make_proposal(proposal_id="LATE1")])
+    late = run_pipeline(bucket_root, until=until, max_workers=0)
+
+    assert list(late["silver"]) == ["2024-06-01"]
+    assert late["skipped"]["silver"] == ["2024-06-02"]
+    assert read_zone(bucket_root, "silver", DAY).num_rows == rows_before + 2
+
+
+def test_default_run_processes_up_to_yesterday(tmp_path):
+    """Testa se a execução padrão (D-1) não processa a partição de hoje."""
+    root = str(tmp_path / "bucket")
+    today = date.today()
+    generate_raw(root, today - timedelta(days=1), days=2, proposals_per_day=20)
+
+    report = run_pipeline(root, max_workers=0)
+
+    assert list(report["silver"]) == [(today - timedelta(days=1)).isoformat()]
+    assert LocalBucket(root).success_marker("bronze", today) is None
+
+
+def test_parallel_run_matches_serial_run(bucket_root, tmp_path):
+    """Testa se o pool de processos produz as mesmas partições da execução em série."""
+    parallel_root = str(tmp_path / "parallel")
+    shutil.copytree(bucket_root, parallel_root)
+    until = DAY + timedelta(days=1)
+
+    run_pipeline(bucket_root, until=until, max_workers=0)
+    run_pipeline(parallel_root, until=until, max_workers=2)
+
+    for zone in ("bronze", "silver", "quarantine"):
+        for day in (DAY, until):
+            assert read_zone(parallel_root, zone, day).equals(
+                read_zone(bucket_root, zone, day)
+            )
+
+
+def test_failed_partition_is_not_published(bucket_root):
+    """
+    Testa se um arquivo ilegível impede a publicação só do seu dia, que fica sem
+    marcador e é refeito na execução seguinte.
+    """
+    bucket = LocalBucket(bucket_root)
+    broken = bucket.list(partition_prefix("raw", DAY))[0]
+    with open(bucket.path(broken), "wb") as f:
+        f.write(b"not gzip")
+
+    report = run_pipeline(bucket_root, until=DAY + timedelta(days=1), max_workers=0)
+
+    assert [error["day"] for error in report["errors"]] == ["2024-06-01"]
+    assert list(report["silver"]) == ["2024-06-02"]
+    assert bucket.success_marker("bronze", DAY) is None
+    assert not os.path.exists(bucket.path(partition_prefix("silver", DAY)))
+    assert bucket.list("_staging") == []
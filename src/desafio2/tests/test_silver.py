@@ -0,0 +1,103 @@
+from datetime import date
+
+import pyarrow as pa
+import pytest
+from desafio2.pipeline.bronze import explode_records
+from desafio2.pipeline.silver import (
+    QUARANTINE_SCHEMA,
+    SILVER_SCHEMA,
+    clean_table,
+    valid_cpf,
+)
+
+
+def test_clean_table_normalizes_and_types_valid_rows(make_proposal):
+    """
+    Testa se uma proposta válida sai com os textos normalizados, os números
+    convertidos (inclusive os enviados como texto) e a idade na data da proposta.
+    """
+    silver, rejected = clean_table(explode_records([(1, make_proposal())], "f"))
+
+    rows = silver.to_pylist()
+    assert silver.schema == SILVER_SCHEMA and rejected.num_rows == 0
+    assert rows[0]["customer_document"] == "52998224725"
+    assert rows[0]["customer_state"] == "SP" and rows[0]["channel"] == "app"
+    assert rows[0]["customer_birth_date"] == date(1990, 6, 2)
+    assert rows[0]["customer_age"] == 33
+    assert rows[0]["loan_amount"] == 15000.0 and rows[0]["loan_term_months"] == 24
+    assert [row["check_provider"] for row in rows] == ["scr", "serasa"]
+    assert [row["check_score"] for row in rows] == [710, 655]
+
+
+@pytest.mark.parametrize(
+    "overrides, reason",
+    [
+        ({"proposal_id": "  "}, "missing_proposal_id"),
+        ({"created_at": "01/06/2024"}, "invalid_created_at"),
+        ({"customer.document": "529.982.247-24"}, "invalid_document"),
+        ({"customer.document": "123.456.789-0é"}, "invalid_document"),
+        ({"customer.birth_date": "2024-06-02"}, "invalid_birth_date"),
+        ({"customer.monthly_income": "cinco mil"}, "invalid_income"),
+        ({"loan.amount": "1.500,00"}, "invalid_amount"),
+        ({"loan.amount": 0}, "invalid_amount"),
+        ({"loan.term_months": 12.5}, "invalid_term"),
+        ({"customer.state": "XX"}, "invalid_state"),
+        ({"bureau_checks": [{"provider": "scr", "score": 700.5}]}, "invalid_score"),
+        (
+            {"bureau_checks": [{"provider": "scr", "negative_records": 3e9}]},
+            "invalid_negative_records",
+        ),
+    ],
+)
+def test_clean_table_rejects_with_first_violated_rule(make_proposal, overrides, reason):
+    """
+    Testa se uma proposta com defeito vai inteira para a quarentena, com o motivo,
+    e mantém os valores originais da Bronze.
+    """
+    bronze = explode_records([(1, make_proposal(**overrides))], "f")
+
+    silver, rejected = clean_table(bronze)
+
+    assert silver.num_rows == 0
+    assert rejected.schema == QUARANTINE_SCHEMA
+    assert set(rejected["reject_reason"].to_pylist()) == {reason}
+    assert rejected.drop_columns(["reject_reason"]).equals(bronze)
+
+
+def test_clean_table_rejects_only_the_invalid_check(make_proposal):
+    """
+    Testa se uma consulta de bureau inválida reprova só a própria linha, e se uma
+    proposta sem consultas é aprovada.
+    """
+    proposal = make_proposal(
+        **{"bureau_checks": [{"provider": "spc"}, {"provider": "bvs", "score": 2000}]}
+    )
+    proposal["bureau_checks"].append({"provider": "bvs", "score": 500})
+    records = [(1, proposal), (2, make_proposal(proposal_id="P2", bureau_checks=[]))]
+
+    silver, rejected = clean_table(explode_records(records, "f"))
+
+    assert rejected["reject_reason"].to_pylist() == [
+        "invalid_provider",
+        "invalid_score",
+    ]
+    assert silver["check_index"].to_pylist() == [2, None]
+
+
+def test_valid_cpf():
+    """Testa os dígitos verificadores e a rejeição de sequências repetidas."""
+    documents = pa.array(
+        [
+            "52998224725",
+            "52998224724",
+            "11111111111",
+            "123",
+            None,
+            # Letra que passaria no cálculo (vale 17) e caractere não ASCII.
+            "5299822A779",
+            "1234567890é",
+            "52998224725",
+        ]
+    )
+
+    assert valid_cpf(documents).tolist() == [True] + [False] * 6 + [True]